@@ -9,26 +9,26 @@ Usage:
     # One-shot question
     python3 -m agent.cli --single "How is my driver trending?"
     python3 -m agent.cli -s "Summarize my last session"
+
+    # Keep a warm agent running; -s forwards to it while it is up
+    python3 -m agent.cli --daemon
+    python3 -m agent.cli --stop-daemon
 """
 from __future__ import annotations
 
 import argparse
 import asyncio
 import os
+import sys
 
 # Allow running inside Claude Code by clearing env vars that
 # interfere with the Agent SDK subprocess transport.
 for _key in ("CLAUDECODE", "CLAUDE_CODE_SSE_PORT", "CLAUDE_CODE_ENTRYPOINT"):
     os.environ.pop(_key, None)
 
-from claude_agent_sdk import (
-    AssistantMessage,
-    ClaudeSDKClient,
-    ResultMessage,
-    TextBlock,
-)
-
-from agent.core import create_golf_agent_options, single_query
+# Only the daemon client is imported up front: a query forwarded to a
+# running daemon never loads the Agent SDK or golf_db in this process.
+from agent import daemon
 
 
 # ---------------------------------------------------------------------------
@@ -43,6 +43,15 @@ async def interactive_chat() -> None:
     and prints assistant text responses.  Exits on quit/exit/q,
     EOFError (Ctrl-D), or KeyboardInterrupt (Ctrl-C).
     """
+    from claude_agent_sdk import (
+        AssistantMessage,
+        ClaudeSDKClient,
+        ResultMessage,
+        TextBlock,
+    )
+
+    from agent.core import create_golf_agent_options
+
     options = create_golf_agent_options()
 
     print("Golf Agent (type 'quit', 'exit', or 'q' to stop)")
@@ -89,6 +98,8 @@ async def interactive_chat() -> None:
 
 async def one_shot(question: str) -> None:
     """Send a single question and print the response."""
+    from agent.core import single_query
+
     response = await single_query(question)
     print(response)
 
@@ -111,9 +122,46 @@ def main() -> None:
         default=None,
         help="Ask a single question (non-interactive mode).",
     )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run a long-lived agent that answers --single queries from a warm state.",
+    )
+    parser.add_argument(
+        "--stop-daemon",
+        action="store_true",
+        help="Stop a running agent daemon.",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Answer --single in this process even if a daemon is running.",
+    )
 
     args = parser.parse_args()
 
+    try:
+        if args.daemon:
+            daemon.serve()
+            return
+        if args.stop_daemon:
+            print("Agent daemon stopped." if daemon.stop() else "No agent daemon running.")
+            return
+        response = None
+        if args.single and not args.no_daemon:
+            response = daemon.forward(args.single)
+    except daemon.DaemonError as e:
+        print(f"Agent daemon error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if response is not None:
+        print(response)
+        return
+
+    from agent.data_access import get_agent_data
+
+    # Load the shots snapshot while the SDK subprocess starts up
+    get_agent_data().warm()
+
     if args.single:
         asyncio.run(one_shot(args.single))
     else:
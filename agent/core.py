@@ -69,9 +69,11 @@ back to these fundamentals.
 - Summarize session statistics (averages, Big 3 metrics)
 - Show per-club statistics across all sessions
 - Show trends for any metric over recent sessions
+- Find the past sessions most relevant to a question in one lookup
 - Tag sessions with labels (e.g. "Warmup", "Competition")
 - Update session types (e.g. "Driver Focus", "Mixed Practice")
 - Batch-rename session display names
+- Tag or retype many sessions at once in a single bulk update
 
 ## What You CANNOT Do
 
@@ -129,17 +131,23 @@ def create_golf_agent_options(**overrides) -> ClaudeAgentOptions:
 # ---------------------------------------------------------------------------
 
 
-async def single_query(prompt: str, **option_overrides) -> str:
+async def single_query(
+    prompt: str,
+    options: ClaudeAgentOptions | None = None,
+    **option_overrides,
+) -> str:
     """Send a single prompt and return the combined text response.
 
-    Creates a fresh set of options (with any *option_overrides* applied),
-    fires a ``query()``, and collects all ``TextBlock`` content from
-    ``AssistantMessage`` responses.
+    Uses *options* when given (the agent daemon reuses one set, and with
+    it one MCP server, for every query); otherwise creates a fresh set
+    with any *option_overrides* applied.  Fires a ``query()`` and
+    collects all ``TextBlock`` content from ``AssistantMessage`` responses.
 
     Returns:
         Joined text from all assistant text blocks.
     """
-    options = create_golf_agent_options(**option_overrides)
+    if options is None:
+        options = create_golf_agent_options(**option_overrides)
     parts: list[str] = []
 
     try:
@@ -0,0 +1,252 @@
+"""Golf Agent daemon — a long-lived process that answers one-shot queries.
+
+``python -m agent.cli -s ...`` otherwise pays for importing the Agent
+SDK, building the MCP server and loading the shots snapshot on every
+invocation, so the first tool call of each query starts cold.  The
+daemon does that once and then serves queries over a local Unix socket:
+the agent options and in-process MCP server are reused, and the shared
+snapshot (agent.data_access) is kept warm, reloading in the background
+when the database changes.
+
+The protocol is one JSON request line and one JSON response line per
+connection::
+
+    {"op": "query", "prompt": "..."}  -> {"ok": true, "response": "..."}
+    {"op": "ping"}                    -> {"ok": true, "pid": ..., "uptime": ..., "queries": ...}
+    {"op": "stop"}                    -> {"ok": true}
+
+Failures come back as ``{"ok": false, "error": "..."}``.
+
+This module only imports the standard library at load time, so the
+client side (``forward()``) adds nothing to CLI startup; the server
+imports the agent modules when it starts.
+
+Exports:
+    DEFAULT_SOCKET_PATH — socket path (``GOLF_AGENT_SOCKET`` overrides)
+    DaemonError         — the daemon answered with an error
+    request()           — send one request; None if no daemon is running
+    forward()           — ask a running daemon a question
+    serve()             — run the daemon in the foreground
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import signal
+import socket
+import tempfile
+import time
+from typing import Any
+
+DEFAULT_SOCKET_PATH = os.environ.get("GOLF_AGENT_SOCKET") or os.path.join(
+    tempfile.gettempdir(), f"golf-agent-{getattr(os, 'getuid', lambda: 'user')()}.sock",
+)
+
+# Waiting for an answer covers the whole agent turn, tool calls included
+QUERY_TIMEOUT = float(os.environ.get("GOLF_AGENT_DAEMON_TIMEOUT", "300"))
+
+CONNECT_TIMEOUT = 1.0
+
+# How often the daemon re-checks the database and reloads a stale snapshot
+REFRESH_INTERVAL = 30.0
+
+# Largest request line accepted
+MAX_REQUEST_BYTES = 1 << 20
+
+
+class DaemonError(RuntimeError):
+    """The daemon was reached but could not answer the request."""
+
+
+def is_supported() -> bool:
+    """Unix sockets are needed (not available on some Windows builds)."""
+    return hasattr(socket, "AF_UNIX")
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+
+def request(
+    payload: dict[str, Any],
+    socket_path: str | None = None,
+    timeout: float = QUERY_TIMEOUT,
+) -> dict[str, Any] | None:
+    """Send one request to the daemon and return its response.
+
+    Returns:
+        The decoded response, or None when no daemon is listening
+        (no socket file, or a stale one left by a dead process).
+
+    Raises:
+        DaemonError: The connection broke or the reply was not valid JSON.
+    """
+    if not is_supported():
+        return None
+    path = socket_path or DEFAULT_SOCKET_PATH
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+        sock.settimeout(timeout)
+        try:
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                if chunk.endswith(b"\n"):
+                    break
+        except OSError as e:
+            raise DaemonError(f"Agent daemon connection failed: {e}") from e
+    try:
+        return json.loads(b"".join(chunks))
+    except ValueError as e:
+        raise DaemonError("Agent daemon sent an invalid response") from e
+
+
+def forward(prompt: str, socket_path: str | None = None, timeout: float = QUERY_TIMEOUT) -> str | None:
+    """Ask the running daemon a question.
+
+    Returns:
+        The agent's answer, or None when no daemon is running (the caller
+        then answers in-process).
+
+    Raises:
+        DaemonError: The daemon failed to answer.
+    """
+    response = request({"op": "query", "prompt": prompt}, socket_path, timeout)
+    if response is None:
+        return None
+    if not response.get("ok"):
+        raise DaemonError(response.get("error") or "Agent daemon query failed")
+    return response.get("response", "")
+
+
+def ping(socket_path: str | None = None) -> dict[str, Any] | None:
+    """Daemon status, or None when it is not running."""
+    try:
+        return request({"op": "ping"}, socket_path, timeout=CONNECT_TIMEOUT)
+    except DaemonError:
+        return None
+
+
+def stop(socket_path: str | None = None) -> bool:
+    """Ask the daemon to exit; False when none was running."""
+    return request({"op": "stop"}, socket_path, timeout=CONNECT_TIMEOUT) is not None
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+
+class AgentDaemon:
+    """Serves one-shot queries from a warm agent over a Unix socket."""
+
+    def __init__(self, socket_path: str | None = None, refresh_interval: float = REFRESH_INTERVAL):
+        self.socket_path = socket_path or DEFAULT_SOCKET_PATH
+        self.refresh_interval = refresh_interval
+        self.queries = 0
+        self._started = time.monotonic()
+        self._options = None
+        self._server: asyncio.AbstractServer | None = None
+        self._stopped: asyncio.Event | None = None
+
+    def _warm(self) -> None:
+        """Start a snapshot reload if the database changed (no-op when fresh)."""
+        from agent.data_access import get_agent_data
+
+        get_agent_data().warm()
+
+    async def start(self) -> None:
+        """Build the agent, warm the snapshot and listen on the socket."""
+        from agent.core import create_golf_agent_options
+
+        if ping(self.socket_path) is not None:
+            raise DaemonError(f"An agent daemon is already listening on {self.socket_path}")
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # left by a daemon that did not shut down cleanly
+
+        self._options = create_golf_agent_options()
+        self._warm()
+        self._stopped = asyncio.Event()
+        self._server = await asyncio.start_unix_server(
+            self._handle, path=self.socket_path, limit=MAX_REQUEST_BYTES,
+        )
+        os.chmod(self.socket_path, 0o600)
+
+    async def _keep_warm(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            self._warm()
+
+    async def _dispatch(self, payload: dict[str, Any]) -> dict[str, Any]:
+        from agent.core import single_query
+
+        op = payload.get("op")
+        if op == "ping":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "uptime": round(time.monotonic() - self._started, 1),
+                "queries": self.queries,
+            }
+        if op == "stop":
+            self._stopped.set()
+            return {"ok": True}
+        if op == "query":
+            prompt = str(payload.get("prompt") or "").strip()
+            if not prompt:
+                return {"ok": False, "error": "Empty prompt"}
+            self.queries += 1
+            return {"ok": True, "response": await single_query(prompt, options=self._options)}
+        return {"ok": False, "error": f"Unknown op: {op}"}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                payload = json.loads(await reader.readline())
+                response = await self._dispatch(payload if isinstance(payload, dict) else {})
+            except Exception as e:
+                response = {"ok": False, "error": str(e) or type(e).__name__}
+            writer.write(json.dumps(response, default=str).encode("utf-8") + b"\n")
+            await writer.drain()
+        except ConnectionError:
+            pass  # client went away
+        finally:
+            writer.close()
+
+    async def serve_forever(self) -> None:
+        """Serve until a stop request or SIGINT/SIGTERM, then remove the socket."""
+        await self.start()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._stopped.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # not on the main thread, or unsupported platform
+        refresher = asyncio.create_task(self._keep_warm())
+        try:
+            await self._stopped.wait()
+        finally:
+            refresher.cancel()
+            self._server.close()
+            await self._server.wait_closed()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+
+def serve(socket_path: str | None = None) -> None:
+    """Run the agent daemon in the foreground until stopped."""
+    if not is_supported():
+        raise DaemonError("The agent daemon needs Unix domain sockets")
+    daemon = AgentDaemon(socket_path)
+    print(f"Golf agent daemon listening on {daemon.socket_path} (pid {os.getpid()})")
+    asyncio.run(daemon.serve_forever())
@@ -0,0 +1,269 @@
+"""Async data access for the golf agent tools.
+
+The Agent SDK runs tool handlers on a single asyncio event loop, but
+golf_db is synchronous.  Calling it directly from an ``async`` tool
+blocks the loop, so several tool calls requested in one turn run one
+after another.  This module moves every golf_db call onto a small,
+bounded thread pool and keeps one warm snapshot of the shots table that
+all read tools share.
+
+Exports:
+    AgentDataAccess   — thread-pool adapter with the shared snapshot
+    get_agent_data()  — process-wide AgentDataAccess
+    instrumented()    — decorator adding timeouts and latency stats to a tool
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable
+
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+import golf_db  # noqa: E402
+import pandas as pd  # noqa: E402
+from services.shot_query import ShotQueryCache, db_version  # noqa: E402
+from services.stats_cube import get_stats_cube  # noqa: E402
+from services.tool_results import EncodedResult  # noqa: E402
+
+# SQLite serializes writers anyway; a few readers is plenty
+DEFAULT_WORKERS = int(os.environ.get("GOLF_AGENT_DB_WORKERS", "4"))
+
+# Per-tool wall clock budget before the agent gets a timeout message
+DEFAULT_TIMEOUT = float(os.environ.get("GOLF_AGENT_TOOL_TIMEOUT", "30"))
+
+# Snapshot age limit when the database file cannot be stat'ed
+SNAPSHOT_TTL = 60.0
+
+# Latency samples kept per tool
+_LATENCY_WINDOW = 500
+
+
+class AgentDataAccess:
+    """Runs golf_db calls off the event loop and shares a shots snapshot.
+
+    The snapshot is loaded at most once at a time; concurrent callers
+    wait on the same load.  It is reused until the SQLite file changes
+    (modification time of the database or its WAL), until
+    ``invalidate()`` is called after an agent write, or, when the file
+    cannot be stat'ed, for ``snapshot_ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_WORKERS,
+        snapshot_ttl: float = SNAPSHOT_TTL,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.snapshot_ttl = snapshot_ttl
+        self._executor: ThreadPoolExecutor | None = None
+        # Re-entrant: a failed load's done-callback may run while held
+        self._lock = threading.RLock()
+        self._snapshot: pd.DataFrame | None = None
+        self._snapshot_version: tuple | None = None
+        self._snapshot_loaded_at = 0.0
+        self._loading: Future | None = None
+        self._generation = 0  # bumped by invalidate() to discard in-flight loads
+        self._latencies: dict[str, deque] = defaultdict(lambda: deque(maxlen=_LATENCY_WINDOW))
+        self._timeouts: dict[str, int] = defaultdict(int)
+        self._bytes_saved: dict[str, int] = defaultdict(int)
+        # Filtered queries (golf_db.query_shots) reused until the data changes
+        self.queries = ShotQueryCache(
+            query_fn=lambda **filters: golf_db.query_shots(**filters),
+            db_path=getattr(golf_db, "SQLITE_DB_PATH", None),
+        )
+
+    # -- thread pool --------------------------------------------------------
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="golf-agent-db",
+                )
+            return self._executor
+
+    async def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking function on the pool and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool(), functools.partial(fn, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        """Stop the pool (waits for running calls)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    # -- shots snapshot -----------------------------------------------------
+
+    def _db_version(self) -> tuple | None:
+        return db_version(getattr(golf_db, "SQLITE_DB_PATH", None))
+
+    def _is_fresh(self, version: tuple | None) -> bool:
+        if self._snapshot is None:
+            return False
+        if version is not None:
+            return version == self._snapshot_version
+        return time.monotonic() - self._snapshot_loaded_at < self.snapshot_ttl
+
+    def _load_snapshot(self, generation: int) -> pd.DataFrame:
+        version = self._db_version()
+        df = golf_db.get_all_shots(read_mode="sqlite")
+        with self._lock:
+            if generation == self._generation:
+                self._snapshot = df
+                self._snapshot_version = version
+                self._snapshot_loaded_at = time.monotonic()
+                self._loading = None
+        return df
+
+    def _snapshot_future(self) -> Future:
+        version = self._db_version()
+        with self._lock:
+            if self._is_fresh(version):
+                done: Future = Future()
+                done.set_result(self._snapshot)
+                return done
+            if self._loading is None:
+                self._loading = self._pool().submit(self._load_snapshot, self._generation)
+                self._loading.add_done_callback(self._clear_failed_load)
+            return self._loading
+
+    def _clear_failed_load(self, future: Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            with self._lock:
+                if self._loading is future:
+                    self._loading = None
+
+    async def all_shots(self) -> pd.DataFrame:
+        """Every shot, from the shared snapshot (loaded off the event loop).
+
+        Callers must not modify the returned frame in place.  A caller
+        that is cancelled (e.g. by a tool timeout) stops waiting without
+        cancelling the load the other callers share.
+        """
+        return await asyncio.shield(asyncio.wrap_future(self._snapshot_future()))
+
+    async def query_shots(self, **filters: Any) -> pd.DataFrame:
+        """Filtered, limit-aware shots (golf_db.query_shots, cached)."""
+        return await self.call(self.queries.query_shots, **filters)
+
+    async def session_data(self, session_id: str) -> pd.DataFrame:
+        """Shots for one session (an indexed query, run on the pool)."""
+        return await self.call(golf_db.get_session_data, session_id=session_id, read_mode="sqlite")
+
+    async def cube_stats(self, metrics: list[str], **kwargs: Any) -> pd.DataFrame | None:
+        """Per-club/session roll-ups from the stats cube (run on the pool).
+
+        Returns None when the database file is not available or the cube
+        cannot be read; callers then fall back to the shots snapshot.
+        """
+        cube = get_stats_cube()
+        if not cube.available():
+            return None
+        try:
+            table = await self.call(cube.stats, metrics, **kwargs)
+        except (sqlite3.Error, OSError):
+            return None
+        return None if table.empty else table
+
+    def warm(self) -> Future:
+        """Start loading the snapshot in the background, e.g. at startup."""
+        return self._snapshot_future()
+
+    def invalidate(self) -> None:
+        """Drop the snapshot and cached queries; the next read reloads."""
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+            self._snapshot_version = None
+            self._loading = None
+        self.queries.clear()
+
+    # -- latency instrumentation --------------------------------------------
+
+    def record(self, tool: str, seconds: float, timed_out: bool = False) -> None:
+        """Record one tool call."""
+        with self._lock:
+            self._latencies[tool].append(seconds)
+            if timed_out:
+                self._timeouts[tool] += 1
+
+    def record_result(self, tool: str, encoded: EncodedResult) -> None:
+        """Record the bytes a tool saved by encoding/summarizing its result."""
+        with self._lock:
+            self._bytes_saved[tool] += encoded.bytes_saved
+
+    def latency_stats(self) -> dict[str, dict[str, float]]:
+        """Per-tool call count, p50/p95/max latency (ms), timeouts and result bytes saved."""
+        with self._lock:
+            samples = {name: list(values) for name, values in self._latencies.items()}
+            timeouts = dict(self._timeouts)
+            bytes_saved = dict(self._bytes_saved)
+        stats = {}
+        for name, values in samples.items():
+            if not values:
+                continue
+            ordered = sorted(values)
+            stats[name] = {
+                "calls": len(ordered),
+                "p50_ms": round(ordered[len(ordered) // 2] * 1000, 2),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2),
+                "max_ms": round(ordered[-1] * 1000, 2),
+                "timeouts": timeouts.get(name, 0),
+                "bytes_saved": bytes_saved.get(name, 0),
+            }
+        return stats
+
+
+_agent_data: AgentDataAccess | None = None
+_agent_data_lock = threading.Lock()
+
+
+def get_agent_data() -> AgentDataAccess:
+    """Return the process-wide AgentDataAccess."""
+    global _agent_data
+    with _agent_data_lock:
+        if _agent_data is None:
+            _agent_data = AgentDataAccess()
+        return _agent_data
+
+
+def instrumented(
+    name: str,
+    timeout: float | None = None,
+) -> Callable[[Callable[[dict], Awaitable[dict]]], Callable[[dict], Awaitable[dict]]]:
+    """Wrap a tool handler with a timeout and latency recording.
+
+    On timeout the agent receives a text result instead of an error, so
+    the conversation can continue.  The pooled golf_db call keeps running
+    to completion in its worker thread.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(args: dict[str, Any]) -> dict[str, Any]:
+            limit = DEFAULT_TIMEOUT if timeout is None else timeout
+            data = get_agent_data()
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(handler(args), timeout=limit)
+            except asyncio.TimeoutError:
+                data.record(name, time.perf_counter() - start, timed_out=True)
+                return {"content": [{
+                    "type": "text",
+                    "text": f"Tool '{name}' timed out after {limit:g}s. Try a narrower query.",
+                }]}
+            data.record(name, time.perf_counter() - start)
+            return result
+        return wrapper
+    return decorator
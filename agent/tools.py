@@ -1,7 +1,9 @@
 """Golf Agent SDK tool definitions.
 
 Provides read and write tools that wrap golf_db functions for use
-with the Claude Agent SDK MCP server.
+with the Claude Agent SDK MCP server.  golf_db calls run on the bounded
+thread pool in agent.data_access, so concurrent tool calls overlap
+instead of blocking the event loop.
 
 Exports:
     ALL_TOOLS  — list of SdkMcpTool objects
@@ -23,6 +25,17 @@ if _project_root not in sys.path:
 
 import golf_db  # noqa: E402
 import pandas as pd  # noqa: E402
+from agent.data_access import get_agent_data, instrumented  # noqa: E402
+from services.feature_store import attach_features  # noqa: E402
+from services.session_index import DEFAULT_K, get_session_index  # noqa: E402
+from services.stats_cube import CUBE_METRICS, SHOTS_METRIC, valid_values  # noqa: E402
+from services.tool_results import DEFAULT_BUDGET_BYTES, encode_table  # noqa: E402
+
+# Size limit for tabular tool results before they are summarized
+RESULT_BUDGET_BYTES = int(os.environ.get("GOLF_AGENT_RESULT_BUDGET", DEFAULT_BUDGET_BYTES))
+
+# Averages reported per club by get_club_stats
+_CLUB_STAT_COLUMNS = ["carry", "total", "ball_speed", "club_speed", "smash", "face_angle", "club_path"]
 
 
 # ---------------------------------------------------------------------------
@@ -38,6 +51,14 @@ def _safe_mean(series: pd.Series) -> float | None:
     return round(float(filtered.mean()), 1)
 
 
+def _metric_mean(series: pd.Series, metric: str) -> float | None:
+    """Mean of a metric's valid readings (same rules as the stats cube)."""
+    values = valid_values(series, metric)
+    if values.empty:
+        return None
+    return round(float(values.mean()), 1)
+
+
 def _safe_std(series: pd.Series) -> float | None:
     """Std dev of non-null values, rounded to 1 decimal."""
     filtered = series.dropna()
@@ -46,24 +67,18 @@ def _safe_std(series: pd.Series) -> float | None:
     return round(float(filtered.std()), 1)
 
 
-def _df_to_summary(df: pd.DataFrame, columns: list[str]) -> str:
+def _df_to_summary(df: pd.DataFrame, columns: list[str], tool_name: str | None = None) -> str:
     """Convert a DataFrame to a readable text table.
 
-    Selects only the requested columns (that exist), formats each row
-    as a pipe-delimited line, and returns the whole thing as a string.
+    Selects only the requested columns (that exist) and renders them as
+    pipe-delimited lines.  Results over the tool-result budget become a
+    per-club summary with percentiles and sample rows; the bytes saved
+    are recorded against ``tool_name``.
     """
-    available = [c for c in columns if c in df.columns]
-    if not available or df.empty:
-        return "(no data)"
-    subset = df[available].copy()
-    # Round numeric columns for readability
-    for col in subset.select_dtypes(include=["number"]).columns:
-        subset[col] = subset[col].round(1)
-    lines = [" | ".join(str(c) for c in available)]
-    lines.append("-" * len(lines[0]))
-    for _, row in subset.iterrows():
-        lines.append(" | ".join(str(row[c]) if pd.notna(row[c]) else "-" for c in available))
-    return "\n".join(lines)
+    encoded = encode_table(df, columns, budget_bytes=RESULT_BUDGET_BYTES)
+    if tool_name:
+        get_agent_data().record_result(tool_name, encoded)
+    return encoded.text
 
 
 def _text_result(text: str) -> dict[str, Any]:
@@ -82,31 +97,53 @@ def _json_result(obj: Any) -> dict[str, Any]:
 
 @tool(
     "query_shots",
-    "Query shot data for a session. Optionally filter by club and limit rows.",
+    "Query shot data for a session. Optionally filter by club, keep only shots "
+    "flagged as swing flaw anomalies at import, and limit rows.",
     {
         "type": "object",
         "properties": {
             "session_id": {"type": "string", "description": "Session ID to query"},
             "club": {"type": "string", "description": "Optional club filter (e.g. 'Driver', '7 Iron')"},
             "limit": {"type": "integer", "description": "Max rows to return (default 50)"},
+            "anomalous_only": {
+                "type": "boolean",
+                "description": "Only shots flagged as anomalous, most anomalous first (default false)",
+            },
         },
         "required": ["session_id"],
     },
 )
+@instrumented("query_shots")
 async def query_shots(args: dict[str, Any]) -> dict[str, Any]:
     """Return readable shot data for a session."""
     session_id = args["session_id"]
     club_filter = args.get("club")
     limit = args.get("limit", 50)
-
-    df = golf_db.get_session_data(session_id=session_id, read_mode="sqlite")
+    anomalous_only = args.get("anomalous_only")
+
+    # Session, club and limit are applied in SQL; anomaly ranking needs
+    # every shot of the session first
+    data = get_agent_data()
+    df = await data.query_shots(
+        session_id=session_id, club=club_filter or None,
+        limit=None if anomalous_only else limit,
+    )
     if df.empty:
+        in_session = await data.query_shots(session_id=session_id, columns=["shot_id"], limit=1)
+        if club_filter and not in_session.empty:
+            return _text_result(f"No shots found for club '{club_filter}' in session {session_id}.")
         return _text_result(f"No shots found for session {session_id}.")
 
-    if club_filter:
-        df = df[df["club"].str.lower() == club_filter.lower()]
+    if anomalous_only:
+        # Scores are written at import time; this is an indexed lookup
+        from services.anomaly_scoring import get_anomaly_scorer
+        flagged = await data.call(
+            get_anomaly_scorer().anomalous_shots, session_id=session_id, limit=-1,
+        )
+        df = df.merge(flagged[["shot_id", "anomaly_score", "flaws"]], on="shot_id")
         if df.empty:
-            return _text_result(f"No shots found for club '{club_filter}' in session {session_id}.")
+            return _text_result(f"No anomalous shots flagged in session {session_id}.")
+        df = df.sort_values("anomaly_score", ascending=False)
 
     df = df.head(limit)
 
@@ -114,8 +151,9 @@ async def query_shots(args: dict[str, Any]) -> dict[str, Any]:
         "shot_id", "club", "carry", "total", "ball_speed", "club_speed",
         "smash", "launch_angle", "back_spin", "side_spin",
         "face_angle", "club_path", "impact_x", "impact_y",
+        "anomaly_score", "flaws",
     ]
-    text = _df_to_summary(df, display_cols)
+    text = _df_to_summary(df, display_cols, tool_name="query_shots")
     return _text_result(f"Session {session_id} — {len(df)} shots:\n{text}")
 
 
@@ -128,9 +166,10 @@ async def query_shots(args: dict[str, Any]) -> dict[str, Any]:
         "required": [],
     },
 )
+@instrumented("get_session_list")
 async def get_session_list(args: dict[str, Any]) -> dict[str, Any]:
     """Return a list of all sessions."""
-    sessions = golf_db.get_unique_sessions(read_mode="sqlite")
+    sessions = await get_agent_data().call(golf_db.get_unique_sessions, read_mode="sqlite")
     if not sessions:
         return _text_result("No sessions found.")
 
@@ -154,10 +193,11 @@ async def get_session_list(args: dict[str, Any]) -> dict[str, Any]:
         "required": ["session_id"],
     },
 )
+@instrumented("get_session_summary")
 async def get_session_summary(args: dict[str, Any]) -> dict[str, Any]:
     """Compute and return aggregate stats for a session."""
     session_id = args["session_id"]
-    df = golf_db.get_session_data(session_id=session_id, read_mode="sqlite")
+    df = await get_agent_data().session_data(session_id)
     if df.empty:
         return _text_result(f"No data found for session {session_id}.")
 
@@ -186,16 +226,11 @@ async def get_session_summary(args: dict[str, Any]) -> dict[str, Any]:
     if "club_path" in df.columns:
         big3["avg_club_path"] = _safe_mean(df["club_path"])
         big3["std_club_path"] = _safe_std(df["club_path"])
+    if "strike_distance" not in df.columns and "impact_x" in df.columns and "impact_y" in df.columns:
+        df = await get_agent_data().call(attach_features, df)
     if "strike_distance" in df.columns:
         big3["avg_strike_distance"] = _safe_mean(df["strike_distance"])
         big3["std_strike_distance"] = _safe_std(df["strike_distance"])
-    elif "impact_x" in df.columns and "impact_y" in df.columns:
-        import math
-        ix = df["impact_x"].fillna(0)
-        iy = df["impact_y"].fillna(0)
-        strike = (ix**2 + iy**2).apply(math.sqrt)
-        big3["avg_strike_distance"] = _safe_mean(strike)
-        big3["std_strike_distance"] = _safe_std(strike)
     summary["big3"] = big3
 
     return _json_result(summary)
@@ -212,11 +247,30 @@ async def get_session_summary(args: dict[str, Any]) -> dict[str, Any]:
         "required": [],
     },
 )
+@instrumented("get_club_stats")
 async def get_club_stats(args: dict[str, Any]) -> dict[str, Any]:
     """Group all shots by club and compute averages."""
     club_filter = args.get("club")
 
-    df = golf_db.get_all_shots(read_mode="sqlite")
+    # Pre-aggregated club x session cells answer this without reading shots
+    table = await get_agent_data().cube_stats(
+        _CLUB_STAT_COLUMNS + [SHOTS_METRIC],
+        clubs=[club_filter] if club_filter else None,
+        quantiles=None,
+    )
+    if table is not None:
+        means = table.pivot(index="club", columns="metric", values="mean").round(1)
+        counts = table[table["metric"] == SHOTS_METRIC].set_index("club")["count"]
+        stats = []
+        for club_name, row in means.iterrows():
+            entry: dict[str, Any] = {"club": club_name, "shot_count": int(counts.get(club_name, 0))}
+            for col in _CLUB_STAT_COLUMNS:
+                value = row.get(col)
+                entry[f"avg_{col}"] = float(value) if pd.notna(value) else None
+            stats.append(entry)
+        return _json_result(stats)
+
+    df = await get_agent_data().all_shots()
     if df.empty:
         return _text_result("No shot data available.")
 
@@ -234,13 +288,9 @@ async def get_club_stats(args: dict[str, Any]) -> dict[str, Any]:
             "club": club_name,
             "shot_count": len(group),
         }
-        for col in ["carry", "total", "ball_speed", "club_speed", "smash"]:
+        for col in _CLUB_STAT_COLUMNS:
             if col in group.columns:
-                entry[f"avg_{col}"] = _safe_mean(group[col])
-        if "face_angle" in group.columns:
-            entry["avg_face_angle"] = _safe_mean(group["face_angle"])
-        if "club_path" in group.columns:
-            entry["avg_club_path"] = _safe_mean(group["club_path"])
+                entry[f"avg_{col}"] = _metric_mean(group[col], col)
         stats.append(entry)
 
     return _json_result(stats)
@@ -264,12 +314,26 @@ async def get_club_stats(args: dict[str, Any]) -> dict[str, Any]:
         "required": [],
     },
 )
+@instrumented("get_trends")
 async def get_trends(args: dict[str, Any]) -> dict[str, Any]:
     """Return per-session averages of a metric for recent sessions."""
     metric = args.get("metric", "carry")
     num_sessions = args.get("sessions", 10)
 
-    df = golf_db.get_all_shots(read_mode="sqlite")
+    if metric in CUBE_METRICS:
+        table = await get_agent_data().cube_stats([metric], by=("session_id",), quantiles=None)
+        if table is not None:
+            grouped = (
+                table.rename(columns={"last_date": "date", "mean": "value"})
+                .set_index("session_id")[["date", "value", "count"]]
+                .dropna(subset=["value"])
+                .sort_values("date", ascending=False)
+                .head(num_sessions)
+                .sort_values("date")
+            )
+            return _format_trend(metric, grouped)
+
+    df = await get_agent_data().all_shots()
     if df.empty:
         return _text_result("No shot data available.")
 
@@ -292,6 +356,11 @@ async def get_trends(args: dict[str, Any]) -> dict[str, Any]:
         .sort_values("date")
     )
 
+    return _format_trend(metric, grouped)
+
+
+def _format_trend(metric: str, grouped: pd.DataFrame) -> dict[str, Any]:
+    """Render per-session date/value/count rows as a trend table."""
     if grouped.empty:
         return _text_result(f"No valid data for metric '{metric}'.")
 
@@ -305,6 +374,34 @@ async def get_trends(args: dict[str, Any]) -> dict[str, Any]:
     return _text_result("\n".join(lines))
 
 
+@tool(
+    "find_sessions",
+    "Find the past sessions most relevant to a question (clubs, shot shape, strike, tags, "
+    "'last N weeks') or most similar to a session ('session 84512' or '#84512'), with club "
+    "mix and Big 3 averages. "
+    "One call instead of listing sessions and summarizing each.",
+    {
+        "type": "object",
+        "properties": {
+            "query": {"type": "string", "description": "Question or keywords, e.g. 'driver fade last month'"},
+            "k": {"type": "integer", "description": f"Number of sessions (default {DEFAULT_K})"},
+        },
+        "required": ["query"],
+    },
+)
+@instrumented("find_sessions")
+async def find_sessions(args: dict[str, Any]) -> dict[str, Any]:
+    """Retrieve relevant sessions from the local session index."""
+    query = args["query"]
+    k = int(args.get("k") or DEFAULT_K)
+    hits = await get_agent_data().call(get_session_index().search, query, k=k)
+    if not hits:
+        return _text_result("No sessions found.")
+    lines = [f"{len(hits)} sessions for '{query}' (best first):"]
+    lines += [f"- {hit.describe()}" for hit in hits]
+    return _text_result("\n".join(lines))
+
+
 # ---------------------------------------------------------------------------
 # Write Tools (safe)
 # ---------------------------------------------------------------------------
@@ -321,17 +418,20 @@ async def get_trends(args: dict[str, Any]) -> dict[str, Any]:
         "required": ["session_id", "tag"],
     },
 )
+@instrumented("tag_session")
 async def tag_session(args: dict[str, Any]) -> dict[str, Any]:
     """Apply a tag to all shots in a session."""
     session_id = args["session_id"]
     tag = args["tag"]
 
-    df = golf_db.get_session_data(session_id=session_id, read_mode="sqlite")
+    df = await get_agent_data().session_data(session_id)
     if df.empty:
         return _text_result(f"No shots found for session {session_id}.")
 
     shot_ids = df["shot_id"].tolist()
-    updated = golf_db.update_shot_metadata(shot_ids, "shot_tag", tag)
+    data = get_agent_data()
+    updated = await data.call(golf_db.update_shot_metadata, shot_ids, "shot_tag", tag)
+    data.invalidate()
     return _text_result(f"Tagged {updated} shots in session {session_id} as '{tag}'.")
 
 
@@ -347,17 +447,20 @@ async def tag_session(args: dict[str, Any]) -> dict[str, Any]:
         "required": ["session_id", "session_type"],
     },
 )
+@instrumented("update_session_type")
 async def update_session_type_tool(args: dict[str, Any]) -> dict[str, Any]:
     """Set session_type for all shots in a session."""
     session_id = args["session_id"]
     session_type = args["session_type"]
 
-    df = golf_db.get_session_data(session_id=session_id, read_mode="sqlite")
+    df = await get_agent_data().session_data(session_id)
     if df.empty:
         return _text_result(f"No shots found for session {session_id}.")
 
     shot_ids = df["shot_id"].tolist()
-    updated = golf_db.update_shot_metadata(shot_ids, "session_type", session_type)
+    data = get_agent_data()
+    updated = await data.call(golf_db.update_shot_metadata, shot_ids, "session_type", session_type)
+    data.invalidate()
     return _text_result(
         f"Updated session type to '{session_type}' for {updated} shots in session {session_id}."
     )
@@ -372,12 +475,89 @@ async def update_session_type_tool(args: dict[str, Any]) -> dict[str, Any]:
         "required": [],
     },
 )
+@instrumented("batch_rename_sessions")
 async def batch_rename_sessions(args: dict[str, Any]) -> dict[str, Any]:
     """Trigger batch rename of all session display names."""
-    updated = golf_db.batch_update_session_names()
+    data = get_agent_data()
+    updated = await data.call(golf_db.batch_update_session_names)
+    data.invalidate()
     return _text_result(f"Renamed {updated} sessions with auto-generated display names.")
 
 
+# Entries accepted per bulk_update_sessions call
+BULK_UPDATE_LIMIT = 500
+
+# bulk_update_sessions argument -> shots column
+_BULK_FIELDS = (("tag", "shot_tag"), ("session_type", "session_type"))
+
+
+@tool(
+    "bulk_update_sessions",
+    "Tag and/or set the session type of many sessions in one transaction. "
+    "Use this instead of repeated tag_session/update_session_type calls when changing several sessions.",
+    {
+        "type": "object",
+        "properties": {
+            "updates": {
+                "type": "array",
+                "description": f"One entry per session (at most {BULK_UPDATE_LIMIT})",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "session_id": {"type": "string", "description": "Session ID to update"},
+                        "tag": {"type": "string", "description": "Tag label to apply to all its shots"},
+                        "session_type": {"type": "string", "description": "Session type label"},
+                    },
+                    "required": ["session_id"],
+                },
+            },
+        },
+        "required": ["updates"],
+    },
+)
+@instrumented("bulk_update_sessions")
+async def bulk_update_sessions(args: dict[str, Any]) -> dict[str, Any]:
+    """Apply tags and session types to many sessions with one golf_db batch."""
+    entries = args.get("updates") or []
+    if not entries:
+        return _text_result("No updates given.")
+    if len(entries) > BULK_UPDATE_LIMIT:
+        return _text_result(
+            f"Too many updates ({len(entries)}); send at most {BULK_UPDATE_LIMIT} per call."
+        )
+
+    updates = []
+    skipped = []
+    for entry in entries:
+        session_id = str(entry.get("session_id") or "").strip()
+        fields = [(column, entry[key]) for key, column in _BULK_FIELDS if entry.get(key)]
+        if not session_id or not fields:
+            skipped.append(session_id or "?")
+            continue
+        updates.extend((session_id, column, value) for column, value in fields)
+    if not updates:
+        return _text_result("Each update needs a session_id and a tag or session_type.")
+
+    data = get_agent_data()
+    try:
+        result = await data.call(golf_db.batch_update_sessions, updates)
+    except ValueError as e:
+        return _text_result(f"Update rejected: {e}")
+    data.invalidate()
+
+    lines = [
+        f"Updated {result.updated_shots} shots across {len(result.touched_sessions)} sessions "
+        f"in one transaction (batch {result.batch_id})."
+    ]
+    if result.missing_sessions:
+        lines.append(f"No shots found for sessions: {', '.join(result.missing_sessions)}.")
+    if skipped:
+        lines.append(f"Skipped entries without a session_id or field: {', '.join(skipped)}.")
+    if result.sync_error:
+        lines.append(f"Saved locally; cloud sync failed: {result.sync_error}")
+    return _text_result("\n".join(lines))
+
+
 # ---------------------------------------------------------------------------
 # Exports
 # ---------------------------------------------------------------------------
@@ -388,9 +568,11 @@ ALL_TOOLS: list = [
     get_session_summary,
     get_club_stats,
     get_trends,
+    find_sessions,
     tag_session,
     update_session_type_tool,
     batch_rename_sessions,
+    bulk_update_sessions,
 ]
 
 TOOL_NAMES: list[str] = [f"mcp__golf__{t.name}" for t in ALL_TOOLS]
@@ -19,11 +19,13 @@ from components.direction_tendency import (
 from components.heatmap_chart import render_impact_heatmap
 
 
-def render_big3_detail_view(df: pd.DataFrame) -> None:
+def render_big3_detail_view(df: pd.DataFrame, window: str = "all") -> None:
     """Render the full Big 3 tabbed detail view.
 
     Args:
         df: DataFrame with shot data including Big 3 columns.
+        window: Label of the session/date range shown, used to key the
+            strike-density cache.
     """
     if df.empty:
         st.info("No data available for Big 3 analysis")
@@ -92,4 +94,4 @@ def render_big3_detail_view(df: pd.DataFrame) -> None:
             "Where the ball contacts the club face is the biggest factor in distance "
             "consistency. Center strikes maximize energy transfer (smash factor)."
         )
-        render_impact_heatmap(df)
+        render_impact_heatmap(df, window=window)
@@ -6,15 +6,26 @@ import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 from utils.chart_theme import themed_figure
+from services.analytics.strike_density import FACE_GRID, density_cache
 
 
-def render_impact_heatmap(df: pd.DataFrame, use_optix: bool = True) -> None:
+def _density_club_key(df: pd.DataFrame) -> str:
+    """Cache key part for the clubs in ``df`` (single club name or sorted list)."""
+    if 'club' not in df.columns:
+        return "all"
+    clubs = sorted(str(c) for c in df['club'].dropna().unique())
+    return clubs[0] if len(clubs) == 1 else "|".join(clubs) or "all"
+
+
+def render_impact_heatmap(df: pd.DataFrame, use_optix: bool = True, window: str = "all") -> None:
     """
     Render a heatmap of impact locations on the club face.
 
     Args:
         df: DataFrame containing shot data with impact_x, impact_y or optix_x, optix_y
         use_optix: If True, use optix_x/optix_y (more precise), else use impact_x/impact_y
+        window: Label of the time window / session the frame covers; with the
+            club(s) it keys the cached density grid so reruns only bin new shots
     """
     st.subheader("Impact Location Heatmap")
 
@@ -44,6 +55,30 @@ def render_impact_heatmap(df: pd.DataFrame, use_optix: bool = True) -> None:
     # Create heatmap using hexbin style
     fig = themed_figure()
 
+    # Density layer from the shared binned KDE engine (cached per club/window)
+    shot_ids = df_filtered['shot_id'] if 'shot_id' in df_filtered.columns else None
+    density = density_cache.get(
+        f"{_density_club_key(df_filtered)}:{x_col}",
+        window,
+        df_filtered[x_col].to_numpy(dtype=float),
+        df_filtered[y_col].to_numpy(dtype=float),
+        shot_ids=shot_ids,
+        grid=FACE_GRID,
+    ).density()
+    if density is not None:
+        fig.add_trace(go.Contour(
+            x=FACE_GRID.xs,
+            y=FACE_GRID.ys,
+            z=density,
+            colorscale='Hot',
+            reversescale=True,
+            showscale=False,
+            opacity=0.55,
+            contours=dict(coloring='heatmap', showlines=False),
+            hoverinfo='skip',
+            name='Strike Density',
+        ))
+
     # Add scatter points with color based on smash factor (if available)
     if 'smash' in df_filtered.columns:
         color_data = df_filtered['smash']
@@ -7,18 +7,39 @@ It leverages function calling to query golf data and provide personalized insigh
 Features:
 - Multi-model support (gemini-3.0-flash-preview, gemini-3.0-pro-preview)
 - Function calling for dynamic data access
+- Streaming replies, with the function calls of one turn run concurrently
 - Conversation history management
 - Flexible thinking levels for reasoning control
 """
 
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import google.generativeai as genai
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, Iterator, List, Optional, Any
 import json
 from datetime import datetime
 import golf_db
+from services.shot_query import ShotQueryCache
+from services.session_index import DEFAULT_K, get_session_index
+from services.stats_cube import CUBE_METRICS, get_stats_cube
+from services.tool_results import encode_json
+
+
+def _decode_args(args: Any) -> Dict[str, Any]:
+    """
+    Function-call arguments as plain Python values.
+
+    Gemini sends every number as a float (protobuf Struct), so whole
+    numbers are turned back into ints for arguments like ``limit``.
+    """
+    return {
+        key: int(value) if isinstance(value, float) and value.is_integer() else value
+        for key, value in dict(args).items()
+    }
 
 
 class GeminiCoach:
@@ -40,7 +61,23 @@ class GeminiCoach:
 
     THINKING_LEVELS = ['minimal', 'low', 'medium', 'high']
 
-    def __init__(self, model_type: str = 'flash', thinking_level: str = 'medium', api_key: Optional[str] = None):
+    # Threads for function calls requested together in one model turn
+    FUNCTION_WORKERS = 4
+
+    # Rounds of function calls executed per message; further calls are
+    # answered with an error and the model must reply without tools
+    MAX_FUNCTION_ROUNDS = 8
+
+    # tool_config for the final reply once the round limit is reached
+    NO_FUNCTION_CALLS = {'function_calling_config': {'mode': 'NONE'}}
+
+    def __init__(
+        self,
+        model_type: str = 'flash',
+        thinking_level: str = 'medium',
+        api_key: Optional[str] = None,
+        model_factory: Optional[Callable[..., Any]] = None,
+    ):
         """
         Initialize the Gemini Coach.
 
@@ -48,13 +85,18 @@ class GeminiCoach:
             model_type: 'flash' or 'pro'
             thinking_level: Reasoning intensity ('minimal', 'low', 'medium', 'high')
             api_key: Google API key (reads from GEMINI_API_KEY env var if not provided)
+            model_factory: Builds the model from genai.GenerativeModel's keyword
+                arguments; offline stand-ins (see services.ai.providers.mock_provider)
+                need no API key
         """
+        self._model_factory = model_factory or genai.GenerativeModel
+
         # Configure API key
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
-        if not self.api_key:
-            raise ValueError("GEMINI_API_KEY environment variable not set and no API key provided")
-
-        genai.configure(api_key=self.api_key)
+        if model_factory is None:
+            if not self.api_key:
+                raise ValueError("GEMINI_API_KEY environment variable not set and no API key provided")
+            genai.configure(api_key=self.api_key)
 
         # Model configuration
         self.model_name = self.MODELS.get(model_type, self.MODELS['flash'])
@@ -72,6 +114,13 @@ class GeminiCoach:
         self.conversation_history = []
         self.chat_session = None
 
+        # Query results reused across function calls in this conversation
+        self._queries = ShotQueryCache()
+        # Bytes trimmed from function results by compact encoding/summaries
+        self.result_bytes_saved = 0
+        self._stats_lock = threading.Lock()
+        self._function_pool: Optional[ThreadPoolExecutor] = None
+
         # Register function calling tools
         self.available_functions = self._register_functions()
 
@@ -93,6 +142,7 @@ class GeminiCoach:
             'get_club_gapping': self._get_club_gapping,
             'find_outliers': self._find_outliers,
             'list_sessions': self._list_sessions,
+            'find_sessions': self._find_sessions,
             'get_session_overview': self._get_session_overview,
             'list_tag_catalog': self._list_tag_catalog,
             'get_tag_distribution': self._get_tag_distribution,
@@ -234,6 +284,26 @@ class GeminiCoach:
                     }
                 }
             },
+            {
+                'name': 'find_sessions',
+                'description': 'Find the past sessions most relevant to a question (clubs, shot shape, '
+                               'strike, tags, "last N weeks") or most similar to a session ID, with '
+                               'club mix and Big 3 averages. One call instead of listing and querying sessions.',
+                'parameters': {
+                    'type': 'object',
+                    'properties': {
+                        'query': {
+                            'type': 'string',
+                            'description': 'The question or keywords, e.g. "driver fade last month" or a session ID.'
+                        },
+                        'k': {
+                            'type': 'integer',
+                            'description': f'Number of sessions to return. Default is {DEFAULT_K}.'
+                        }
+                    },
+                    'required': ['query']
+                }
+            },
             {
                 'name': 'get_session_overview',
                 'description': 'Summarize a session with counts, clubs, tags, and date range.',
@@ -293,11 +363,12 @@ When analyzing data:
 - Be specific with numbers and examples
 - Consider session tags (Warmup, Practice, Round) and session_type context
 - Prefer session_overview or tag_distribution when summarizing workflows
+- Use find_sessions to locate relevant past sessions before querying them
 
 Provide coaching in a friendly, encouraging tone while being technically accurate.
 Focus on actionable advice the golfer can implement in their next practice session."""
 
-        model = genai.GenerativeModel(
+        model = self._model_factory(
             model_name=self.model_name,
             generation_config=self.generation_config,
             system_instruction=system_instruction,
@@ -323,38 +394,28 @@ Focus on actionable advice the golfer can implement in their next practice sessi
             JSON string with shot data
         """
         try:
-            df = golf_db.get_all_shots()
-
-            if df.empty:
-                return json.dumps({'error': 'No shot data available in database'})
-
-            # Apply filters
-            if session_id:
-                df = df[df['session_id'] == session_id]
-            if club:
-                df = df[df['club'] == club]
-            if shot_tag and 'shot_tag' in df.columns:
-                df = df[df['shot_tag'] == shot_tag]
-            if session_type and 'session_type' in df.columns:
-                df = df[df['session_type'] == session_type]
-
-            # Limit results
-            df = df.head(limit)
-
-            # Select relevant columns
             cols = [
                 'session_id', 'shot_id', 'club', 'carry', 'total', 'ball_speed',
                 'club_speed', 'smash', 'launch_angle', 'back_spin', 'side_spin'
             ]
-            df = df[[col for col in cols if col in df.columns]]
-
-            # Convert to records
-            result = {
-                'count': len(df),
-                'shots': df.to_dict('records')
-            }
+            # Filters, columns and limit are applied by SQLite
+            df = self._queries.query_shots(
+                session_id=session_id or None,
+                club=club or None,
+                shot_tag=shot_tag or None,
+                session_type=session_type or None,
+                columns=cols,
+                limit=limit,
+            )
+
+            if df.empty and not (session_id or club or shot_tag or session_type):
+                return json.dumps({'error': 'No shot data available in database'})
 
-            return json.dumps(result)
+            # Column-oriented JSON, summarized if it exceeds the result budget
+            encoded = encode_json(df)
+            with self._stats_lock:
+                self.result_bytes_saved += encoded.bytes_saved
+            return encoded.text
         except Exception as e:
             return json.dumps({'error': str(e)})
 
@@ -373,20 +434,13 @@ Focus on actionable advice the golfer can implement in their next practice sessi
             JSON string with statistics
         """
         try:
-            df = golf_db.get_all_shots()
-
-            if df.empty:
-                return json.dumps({'error': 'No shot data available'})
-
-            # Apply filters
-            if session_id:
-                df = df[df['session_id'] == session_id]
-            if club:
-                df = df[df['club'] == club]
-            if shot_tag and 'shot_tag' in df.columns:
-                df = df[df['shot_tag'] == shot_tag]
-            if session_type and 'session_type' in df.columns:
-                df = df[df['session_type'] == session_type]
+            df = self._queries.query_shots(
+                session_id=session_id or None,
+                club=club or None,
+                shot_tag=shot_tag or None,
+                session_type=session_type or None,
+                columns=[metric],
+            )
 
             if metric not in df.columns:
                 return json.dumps({'error': f'Metric {metric} not found in data'})
@@ -422,16 +476,12 @@ Focus on actionable advice the golfer can implement in their next practice sessi
             JSON string with profile data
         """
         try:
-            df = golf_db.get_all_shots()
-
-            if df.empty:
-                return json.dumps({'error': 'No shot data available'})
-
-            if club:
-                df = df[df['club'] == club]
-
             # Calculate baselines for key metrics
             metrics = ['carry', 'total', 'ball_speed', 'club_speed', 'smash', 'launch_angle', 'back_spin']
+            df = self._queries.query_shots(club=club or None, columns=['club'] + metrics)
+
+            if df.empty and not club:
+                return json.dumps({'error': 'No shot data available'})
             profile = {}
 
             for metric in metrics:
@@ -458,6 +508,27 @@ Focus on actionable advice the golfer can implement in their next practice sessi
         except Exception as e:
             return json.dumps({'error': str(e)})
 
+    def _cube_means(self, metric: str, by: str, club: Optional[str] = None) -> Optional[pd.Series]:
+        """
+        Per-group averages from the stats cube.
+
+        Returns:
+            Series of means indexed by ``by``, or None if the metric is not
+            pre-aggregated or the cube has no data (callers fall back to shots)
+        """
+        cube = get_stats_cube()
+        if metric not in CUBE_METRICS or not cube.available():
+            return None
+        try:
+            table = cube.stats(
+                [metric], by=(by,), clubs=[club] if club else None, quantiles=None,
+            )
+        except Exception:
+            return None
+        if table.empty:
+            return None
+        return table.set_index(by)['mean'].dropna()
+
     def _analyze_trends(self, club: str, metric: str) -> str:
         """
         Analyze performance trends over sessions.
@@ -466,21 +537,17 @@ Focus on actionable advice the golfer can implement in their next practice sessi
             JSON string with trend analysis
         """
         try:
-            df = golf_db.get_all_shots()
+            session_avg = self._cube_means(metric, by='session_id', club=club)
+            if session_avg is None:
+                df = self._queries.query_shots(club=club, columns=['session_id', metric])
 
-            if df.empty:
-                return json.dumps({'error': 'No shot data available'})
+                if metric not in df.columns:
+                    return json.dumps({'error': f'Metric {metric} not found'})
 
-            # Filter by club
-            df = df[df['club'] == club]
-
-            if metric not in df.columns:
-                return json.dumps({'error': f'Metric {metric} not found'})
-
-            # Group by session and calculate average
-            session_avg = df.groupby('session_id')[metric].apply(
-                lambda x: x.replace([0, 99999], np.nan).dropna().mean()
-            ).dropna()
+                # Group by session and calculate average
+                session_avg = df.groupby('session_id')[metric].apply(
+                    lambda x: x.replace([0, 99999], np.nan).dropna().mean()
+                ).dropna()
 
             if len(session_avg) < 2:
                 return json.dumps({'error': 'Need at least 2 sessions for trend analysis'})
@@ -517,15 +584,18 @@ Focus on actionable advice the golfer can implement in their next practice sessi
             JSON string with gapping analysis
         """
         try:
-            df = golf_db.get_all_shots()
+            club_avg = self._cube_means('carry', by='club')
+            if club_avg is None:
+                df = self._queries.query_shots(columns=['club', 'carry'])
 
-            if df.empty:
-                return json.dumps({'error': 'No shot data available'})
+                if df.empty:
+                    return json.dumps({'error': 'No shot data available'})
 
-            # Calculate average carry for each club
-            club_avg = df.groupby('club')['carry'].apply(
-                lambda x: x.replace([0, 99999], np.nan).dropna().mean()
-            ).dropna().sort_values(ascending=False)
+                # Calculate average carry for each club
+                club_avg = df.groupby('club')['carry'].apply(
+                    lambda x: x.replace([0, 99999], np.nan).dropna().mean()
+                ).dropna()
+            club_avg = club_avg.sort_values(ascending=False)
 
             if len(club_avg) < 2:
                 return json.dumps({'error': 'Need at least 2 clubs for gapping analysis'})
@@ -560,17 +630,6 @@ Focus on actionable advice the golfer can implement in their next practice sessi
             JSON string with outlier information
         """
         try:
-            df = golf_db.get_all_shots()
-
-            if df.empty:
-                return json.dumps({'error': 'No shot data available'})
-
-            # Apply filters
-            if session_id:
-                df = df[df['session_id'] == session_id]
-            if club:
-                df = df[df['club'] == club]
-
             outliers = []
 
             # Check for unrealistic values
@@ -584,6 +643,15 @@ Focus on actionable advice the golfer can implement in their next practice sessi
                 ('back_spin', -2000, 12000, 'Back spin'),
             ]
 
+            df = self._queries.query_shots(
+                session_id=session_id or None,
+                club=club or None,
+                columns=['session_id', 'shot_id', 'club'] + [check[0] for check in checks],
+            )
+
+            if df.empty and not (session_id or club):
+                return json.dumps({'error': 'No shot data available'})
+
             for metric, min_val, max_val, label in checks:
                 if metric in df.columns:
                     invalid = df[(df[metric] < min_val) | (df[metric] > max_val)]
@@ -624,10 +692,18 @@ Focus on actionable advice the golfer can implement in their next practice sessi
         except Exception as e:
             return json.dumps({'error': str(e)})
 
+    def _find_sessions(self, query: str, k: int = DEFAULT_K) -> str:
+        """Sessions most relevant to a question, from the local session index."""
+        try:
+            hits = get_session_index().search(query, k=k)
+            return json.dumps({'count': len(hits), 'sessions': [hit.to_dict() for hit in hits]})
+        except Exception as e:
+            return json.dumps({'error': str(e)})
+
     def _get_session_overview(self, session_id: str) -> str:
         """Summarize a session with counts, clubs, tags, and date range."""
         try:
-            df = golf_db.get_session_data(session_id)
+            df = self._queries.query_shots(session_id=session_id)
             if df.empty:
                 return json.dumps({'error': f'No data found for session {session_id}'})
 
@@ -659,7 +735,7 @@ Focus on actionable advice the golfer can implement in their next practice sessi
     def _get_tag_distribution(self, session_id: str) -> str:
         """Summarize tag counts for a session."""
         try:
-            df = golf_db.get_session_data(session_id)
+            df = self._queries.query_shots(session_id=session_id, columns=['session_id', 'shot_tag'])
             if df.empty:
                 return json.dumps({'error': f'No data found for session {session_id}'})
             if 'shot_tag' not in df.columns:
@@ -669,82 +745,172 @@ Focus on actionable advice the golfer can implement in their next practice sessi
         except Exception as e:
             return json.dumps({'error': str(e)})
 
-    def chat(self, user_message: str) -> Dict[str, Any]:
+    def _function_executor(self) -> ThreadPoolExecutor:
+        """Thread pool for concurrent function calls (created on first use)."""
+        with self._stats_lock:
+            if self._function_pool is None:
+                self._function_pool = ThreadPoolExecutor(
+                    max_workers=self.FUNCTION_WORKERS, thread_name_prefix='gemini-fn'
+                )
+            return self._function_pool
+
+    def _call_function(self, name: str, args: Dict[str, Any]) -> str:
+        """Run one registered function; errors are returned to the model as JSON."""
+        fn = self.available_functions.get(name)
+        if fn is None:
+            return json.dumps({'error': f'Unknown function: {name}'})
+        try:
+            return fn(**args)
+        except Exception as e:
+            return json.dumps({'error': str(e)})
+
+    def _execute_function_calls(self, fn_calls: List[Any]) -> List[Dict[str, Any]]:
         """
-        Send a message to the AI coach and get a response with function calling.
+        Execute the function calls of one model turn.
+
+        Independent calls requested together run concurrently on the
+        function pool; results are returned in request order.
+
+        Returns:
+            List of {'function', 'arguments', 'result'} dicts
+        """
+        requests = [(fn_call.name, _decode_args(fn_call.args)) for fn_call in fn_calls]
+        if len(requests) == 1:
+            results = [self._call_function(*requests[0])]
+        else:
+            pool = self._function_executor()
+            futures = [pool.submit(self._call_function, name, args) for name, args in requests]
+            results = [future.result() for future in futures]
+        return [
+            {'function': name, 'arguments': args, 'result': result}
+            for (name, args), result in zip(requests, results)
+        ]
+
+    @staticmethod
+    def _refuse_function_calls(fn_calls: List[Any]) -> List[Dict[str, Any]]:
+        """Error results for calls past MAX_FUNCTION_ROUNDS (nothing is executed)."""
+        error = json.dumps({'error': 'Function call limit reached; answer with the data already retrieved.'})
+        return [
+            {'function': fn_call.name, 'arguments': _decode_args(fn_call.args), 'result': error}
+            for fn_call in fn_calls
+        ]
+
+    @staticmethod
+    def _function_response(calls: List[Dict[str, Any]]) -> Any:
+        """One message carrying every function result of a turn back to the model."""
+        return genai.protos.Content(
+            parts=[
+                genai.protos.Part(
+                    function_response=genai.protos.FunctionResponse(
+                        name=call['function'],
+                        response={'result': call['result']}
+                    )
+                )
+                for call in calls
+            ]
+        )
+
+    @staticmethod
+    def _chunk_parts(chunk: Any) -> List[Any]:
+        """Content parts of one streamed response chunk."""
+        if not getattr(chunk, 'candidates', None):
+            return []
+        return list(chunk.candidates[0].content.parts)
+
+    def chat_stream(self, user_message: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a reply to a message, executing function calls as requested.
+
+        Text is yielded as soon as the model produces it. When a turn asks
+        for function calls, all of them run concurrently and their results
+        go back to the model in a single message. After
+        ``MAX_FUNCTION_ROUNDS`` rounds, further calls are answered with an
+        error instead of being run, and the model is asked to reply with
+        function calling disabled, so the chat history never ends on an
+        unanswered call.
 
         Args:
             user_message: User's question or request
 
-        Returns:
-            Dictionary with response and any function calls made
+        Yields:
+            ``{'type': 'text', 'text': str}`` per text chunk,
+            ``{'type': 'function_calls', 'calls': [...]}`` per executed batch,
+            and finally ``{'type': 'done', ...}`` with the chat() result plus
+            ``ttft`` (time to first token) and ``latency`` in seconds
         """
-        try:
-            # Send message
-            response = self.chat_session.send_message(user_message)
-
-            # Track function calls
-            function_calls = []
-
-            # Handle function calling if present
-            while response.candidates[0].content.parts:
-                part = response.candidates[0].content.parts[0]
-
-                # Check if this is a function call
-                if hasattr(part, 'function_call'):
-                    fn_call = part.function_call
-                    fn_name = fn_call.name
-                    fn_args = dict(fn_call.args)
-
-                    # Execute function
-                    if fn_name in self.available_functions:
-                        fn_result = self.available_functions[fn_name](**fn_args)
-
-                        # Track the call
-                        function_calls.append({
-                            'function': fn_name,
-                            'arguments': fn_args,
-                            'result': fn_result
-                        })
+        start = time.perf_counter()
+        ttft = None
+        text_parts: List[str] = []
+        function_calls: List[Dict[str, Any]] = []
+        error = None
 
-                        # Send function response back to model
-                        response = self.chat_session.send_message(
-                            genai.protos.Content(
-                                parts=[genai.protos.Part(
-                                    function_response=genai.protos.FunctionResponse(
-                                        name=fn_name,
-                                        response={'result': fn_result}
-                                    )
-                                )]
-                            )
-                        )
-                    else:
-                        break
-                else:
-                    # No more function calls, we have the final response
+        try:
+            message: Any = user_message
+            send_options: Dict[str, Any] = {}
+            for round_number in range(self.MAX_FUNCTION_ROUNDS + 2):
+                pending = []
+                for chunk in self.chat_session.send_message(message, stream=True, **send_options):
+                    for part in self._chunk_parts(chunk):
+                        fn_call = getattr(part, 'function_call', None)
+                        if fn_call is not None and fn_call.name:
+                            pending.append(fn_call)
+                            continue
+                        text = getattr(part, 'text', '')
+                        if text:
+                            if ttft is None:
+                                ttft = time.perf_counter() - start
+                            text_parts.append(text)
+                            yield {'type': 'text', 'text': text}
+
+                if not pending or round_number > self.MAX_FUNCTION_ROUNDS:
                     break
+                if round_number < self.MAX_FUNCTION_ROUNDS:
+                    calls = self._execute_function_calls(pending)
+                else:
+                    calls = self._refuse_function_calls(pending)
+                    send_options = {'tool_config': self.NO_FUNCTION_CALLS}
+                function_calls.extend(calls)
+                yield {'type': 'function_calls', 'calls': calls}
+                message = self._function_response(calls)
+        except Exception as e:
+            error = str(e)
+
+        latency = time.perf_counter() - start
+        result: Dict[str, Any] = {
+            'type': 'done',
+            'function_calls': function_calls,
+            'model': self.model_name,
+            'thinking_level': self.thinking_level,
+            'ttft': ttft if ttft is not None else latency,
+            'latency': latency,
+        }
+        if error is not None:
+            result['response'] = f"Error: {error}"
+            result['error'] = error
+        else:
+            result['response'] = ''.join(text_parts) or "Sorry, I couldn't generate a response."
+        yield result
 
-            # Extract final text response
-            final_text = response.text if hasattr(response, 'text') else "Sorry, I couldn't generate a response."
+    def chat(self, user_message: str) -> Dict[str, Any]:
+        """
+        Send a message to the AI coach and get a response with function calling.
 
-            return {
-                'response': final_text,
-                'function_calls': function_calls,
-                'model': self.model_name,
-                'thinking_level': self.thinking_level
-            }
+        Args:
+            user_message: User's question or request
 
-        except Exception as e:
-            return {
-                'response': f"Error: {str(e)}",
-                'function_calls': [],
-                'error': str(e)
-            }
+        Returns:
+            Dictionary with response, function calls made and timings
+        """
+        for event in self.chat_stream(user_message):
+            if event['type'] == 'done':
+                return {key: value for key, value in event.items() if key != 'type'}
+        return {'response': "Sorry, I couldn't generate a response.", 'function_calls': []}
 
     def reset_conversation(self):
         """Reset the conversation history and start fresh."""
         self._initialize_chat()
         self.conversation_history = []
+        self._queries.clear()
 
     def get_conversation_history(self) -> List[Dict]:
         """Get the full conversation history."""
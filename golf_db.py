@@ -30,7 +30,49 @@ class _GolfDBProxy(types.ModuleType):
             setattr(_real_db, name, value)
 
     def __dir__(self):
-        return dir(_real_db)
+        return sorted(set(dir(_real_db)) | {'query_shots', 'batch_update_sessions'})
+
+    def query_shots(self, session_id=None, club=None, shot_tag=None,
+                    session_type=None, columns=None, limit=None):
+        """Filtered, limit-aware shot query pushed down to SQLite.
+
+        See services.shot_query.query_shots. Falls back to filtering
+        get_all_shots() in pandas if the local database cannot be read.
+        """
+        import sqlite3
+        from services.shot_query import filter_frame, query_shots
+
+        filters = dict(session_id=session_id, club=club, shot_tag=shot_tag,
+                       session_type=session_type, columns=columns, limit=limit)
+        try:
+            return query_shots(_real_db.SQLITE_DB_PATH, **filters)
+        except sqlite3.Error:
+            return filter_frame(_real_db.get_all_shots(), **filters)
+
+    def batch_update_sessions(self, updates, recompute_stats=True):
+        """Apply many session metadata updates in one transaction.
+
+        Writes every (session_id, field, value) update and one change_log
+        batch in a single SQLite transaction, then pushes the batch to
+        Supabase and recomputes session stats once per touched session.
+        See services.batch_writes.
+
+        Returns:
+            BatchResult (updated_shots, touched_sessions, missing_sessions,
+            sync_error)
+        """
+        from services.batch_writes import apply_session_updates, sync_session_updates
+
+        result = apply_session_updates(
+            _real_db.SQLITE_DB_PATH, updates,
+            allowed_fields=_real_db.ALLOWED_UPDATE_FIELDS,
+        )
+        if result.updated_shots and _real_db.supabase:
+            result.sync_error = sync_session_updates(_real_db.supabase, result)
+        if recompute_stats:
+            for session_id in result.touched_sessions:
+                _real_db.compute_session_stats(session_id)
+        return result
 
 
 # Replace this module in sys.modules with the proxy
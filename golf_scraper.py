@@ -225,6 +225,26 @@ def run_scraper(url, progress_callback, session_date=None):
                 print(f'Error processing shot {shot.get("id")}: {e}')
                 continue
 
+    if total_shots_imported:
+        # Score the new shots against each club's cached swing flaw detector
+        try:
+            from services.anomaly_scoring import get_anomaly_scorer
+            get_anomaly_scorer().score_new()
+        except Exception as e:
+            print(f"Anomaly scoring warning: {e}")
+        # Derived features (smash, strike distance, ...) for the new shots
+        try:
+            from services.feature_store import get_feature_store
+            get_feature_store().backfill()
+        except Exception as e:
+            print(f"Feature backfill warning: {e}")
+        # Per-club/per-session aggregates for the coaches
+        try:
+            from services.stats_cube import get_stats_cube
+            get_stats_cube().refresh()
+        except Exception as e:
+            print(f"Stats cube warning: {e}")
+
     progress_callback(f"Import complete!")
     log_run("success", "Import complete")
     return {
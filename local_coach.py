@@ -15,20 +15,27 @@ Usage:
 
 import re
 import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import date
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict, replace
 
 import pandas as pd
 import numpy as np
 
 import golf_db
+from services.shot_query import ShotQueryCache, db_version
+from services.stats_cube import SHOTS_METRIC, get_stats_cube, parse_window
 
 # ML imports - optional
 try:
     from ml.train_models import DistancePredictor
     from ml.classifiers import ShotShapeClassifier, classify_shot_shape, ShotShape
     from ml.anomaly_detection import SwingFlawDetector, detect_swing_flaws, SwingFlaw
+    from ml.registry import model_registry
     HAS_ML = True
 except ImportError:
     HAS_ML = False
@@ -63,27 +70,82 @@ class LocalCoach:
         comparison = coach.get_club_comparison(["Driver", "3 Wood"])
     """
 
+    # Metrics reported by club statistics
+    CLUB_STAT_METRICS = ['carry', 'total', 'ball_speed', 'club_speed', 'smash', 'launch_angle', 'back_spin']
+
     # Intent patterns for routing queries
     INTENT_PATTERNS = {
         'driver_stats': r'\b(driver|1w|1-wood)\b.*|.*(how|what).*\b(driver|1w|1-wood)\b',
         'iron_stats': r'\b(\d+)\s*iron\b|\b(\d+i)\b',
-        'club_comparison': r'\bcompare\b|\bvs\b|\bbetween\b',
+        'club_comparison': r'\bcompare\b|\bvs\b|\bbetween\b|\b(?:by|per|each)\s+club\b',
         'session_analysis': r'\bsession\b|\btoday\b|\blast\b.*\bpractice\b',
         'trend_analysis': r'\btrend\b|\bprogress\b|\bimproving\b|\bgetting\b',
         'swing_issue': r'\bslice\b|\bhook\b|\bfade\b|\bdraw\b|\bshank\b|\btopping\b',
-        'consistency': r'\bconsisten\b|\bvariabl\b|\binconsisten\b',
-        'gapping': r'\bgap\b|\bdistance\s*gap\b|\byardage\b',
+        'consistency': r'\b(?:in)?consisten(?:t|cy)\b|\bvariab(?:le|ility)\b',
+        'gapping': r'\bgap(?:s|ping)?\b|\bdistance\s*gap\b|\byardages?\b',
         'profile': r'\bprofile\b|\boverall\b|\bsummary\b',
     }
 
+    # Answers kept per (intent, entity, window) until the data changes
+    RESPONSE_CACHE_SIZE = 64
+
+    # All INTENT_PATTERNS in one regex (built on first use)
+    _intent_regex: Optional['re.Pattern'] = None
+    _intent_groups: List[Tuple[str, int, int]] = []
+
     def __init__(self):
         """Initialize the local coach."""
-        self.distance_predictor = None
-        self.shot_classifier = None
-        self.flaw_detector = None
-
-        # Try to load ML models if available
+        # Models come from the process-wide registry; this just warms it
         self._load_ml_models()
+        # Process-wide (see get_coach()): filtered queries and answers
+        # depend only on the data and are reused until it changes
+        self._queries = ShotQueryCache()
+        self._responses: 'OrderedDict[Tuple, CoachResponse]' = OrderedDict()
+        self._responses_version: Optional[Tuple] = None
+        self._responses_lock = threading.Lock()
+        self.response_hits = 0
+        self.response_misses = 0
+
+    def clear_query_cache(self) -> None:
+        """Forget cached queries and answers (they also expire when the data changes)."""
+        self._queries.clear()
+        with self._responses_lock:
+            self._responses.clear()
+
+    def _data_version(self) -> Optional[Tuple]:
+        """Change marker of the shots database (None if it cannot be stat'ed)."""
+        return db_version(getattr(golf_db, 'SQLITE_DB_PATH', None))
+
+    def _cube_stats(self, metrics: List[str], **kwargs) -> Optional[pd.DataFrame]:
+        """Roll-up from the stats cube, or None if it is empty or unreadable."""
+        cube = get_stats_cube()
+        if not cube.available():
+            return None
+        try:
+            table = cube.stats(metrics, **kwargs)
+        except (sqlite3.Error, OSError):
+            return None
+        return None if table.empty else table
+
+    @property
+    def distance_predictor(self) -> Optional['DistancePredictor']:
+        """Shared distance model (None if not trained yet)."""
+        return model_registry.get('distance') if HAS_ML else None
+
+    @property
+    def club_distance_predictor(self) -> Optional['ClubDistancePredictor']:
+        """Shared per-club distance models (None if not trained yet)."""
+        return model_registry.get('distance_by_club') if HAS_ML else None
+
+    @property
+    def shot_classifier(self) -> Optional['ShotShapeClassifier']:
+        """Shared shot shape classifier."""
+        return model_registry.get('shot_classifier') if HAS_ML else None
+
+    @property
+    def flaw_detector(self) -> Optional['SwingFlawDetector']:
+        """Shared swing flaw detector."""
+        return model_registry.get('flaw_detector') if HAS_ML else None
 
     @property
     def ml_available(self) -> bool:
@@ -91,25 +153,20 @@ class LocalCoach:
         return self.distance_predictor is not None or HAS_ML
 
     def _load_ml_models(self) -> None:
-        """Load ML models if available."""
+        """Load ML models into the shared registry (once per process)."""
         if not HAS_ML:
             return
 
-        try:
-            # Distance prediction
-            predictor = DistancePredictor()
-            if Path(predictor.model_path).exists():
-                predictor.load()
-                self.distance_predictor = predictor
-        except Exception:
-            pass
-
-        # Shot classifier and flaw detector use rule-based by default
-        try:
-            self.shot_classifier = ShotShapeClassifier()
-            self.flaw_detector = SwingFlawDetector()
-        except Exception:
-            pass
+        # Distance prediction loads when a trained model exists on disk;
+        # shot classifier and flaw detector use rule-based by default
+        for name in ('distance', 'shot_classifier', 'flaw_detector'):
+            model_registry.get(name)
+
+    def get_model_stats(self) -> List[Dict[str, Any]]:
+        """Load time, memory and version of each shared ML model."""
+        if not HAS_ML:
+            return []
+        return [asdict(stats) for stats in model_registry.stats()]
 
     def _detect_intent(self, query: str) -> Tuple[str, Optional[str]]:
         """
@@ -121,19 +178,43 @@ class LocalCoach:
         Returns:
             Tuple of (intent, extracted_entity)
         """
-        query_lower = query.lower()
+        regex, groups = self._compiled_intents()
+        match = regex.match(query.lower())
+        if not match:
+            return 'general', None
 
-        for intent, pattern in self.INTENT_PATTERNS.items():
-            match = re.search(pattern, query_lower)
-            if match:
+        for intent, index, group_count in groups:
+            if match.start(index) >= 0:
                 # Extract entity (e.g., club name, session ID)
-                entity = None
-                if match.groups():
-                    entity = next((g for g in match.groups() if g), None)
+                captured = match.groups()[index:index + group_count]
+                entity = next((g for g in captured if g), None)
                 return intent, entity
 
         return 'general', None
 
+    @classmethod
+    def _compiled_intents(cls) -> Tuple['re.Pattern', List[Tuple[str, int, int]]]:
+        """
+        Combine INTENT_PATTERNS into one precompiled regex.
+
+        Each pattern becomes a lookahead ``(?=[\\s\\S]*?(pattern))`` tried in
+        dict order from the start of the query, so the first intent that
+        matches anywhere wins, as with one re.search() per pattern.
+
+        Returns:
+            The regex and, per intent, its (name, group index, inner group count)
+        """
+        if cls._intent_regex is None:
+            alternatives, groups, index = [], [], 1
+            for intent, pattern in cls.INTENT_PATTERNS.items():
+                group_count = re.compile(pattern).groups
+                alternatives.append(f'(?=[\\s\\S]*?({pattern}))')
+                groups.append((intent, index, group_count))
+                index += group_count + 1
+            cls._intent_groups = groups
+            cls._intent_regex = re.compile('|'.join(alternatives))
+        return cls._intent_regex, cls._intent_groups
+
     def get_response(self, query: str) -> CoachResponse:
         """
         Get a response to a user's question.
@@ -145,22 +226,57 @@ class LocalCoach:
             CoachResponse with message and data
         """
         intent, entity = self._detect_intent(query)
+        since = parse_window(query)
+
+        # Same question on unchanged data: answer without touching the DB
+        version = self._data_version()
+        key = (intent, (entity or '').strip().lower(), since)
+        if version is not None:
+            cached = self._cached_response(key, version)
+            if cached is not None:
+                return cached
 
         handlers = {
             'driver_stats': self._handle_driver_stats,
             'iron_stats': lambda e: self._handle_club_stats(f"{e} Iron" if e else None),
-            'club_comparison': self._handle_comparison,
+            'club_comparison': lambda e: self._handle_comparison(e, since),
             'session_analysis': self._handle_session_analysis,
             'trend_analysis': self._handle_trends,
             'swing_issue': self._handle_swing_issue,
             'consistency': self._handle_consistency,
-            'gapping': self._handle_gapping,
+            'gapping': lambda e: self._handle_gapping(e, since),
             'profile': self._handle_profile,
             'general': self._handle_general,
         }
 
         handler = handlers.get(intent, self._handle_general)
-        return handler(entity)
+        response = handler(entity)
+        if version is not None:
+            self._store_response(key, version, response)
+        return response
+
+    def _cached_response(self, key: Tuple, version: Tuple) -> Optional[CoachResponse]:
+        """Cached answer for key, dropping every entry if the data changed."""
+        with self._responses_lock:
+            if version != self._responses_version:
+                self._responses.clear()
+                self._responses_version = version
+            response = self._responses.get(key)
+            if response is None:
+                self.response_misses += 1
+                return None
+            self._responses.move_to_end(key)
+            self.response_hits += 1
+        # Callers get their own copy of the top-level fields
+        return replace(response)
+
+    def _store_response(self, key: Tuple, version: Tuple, response: CoachResponse) -> None:
+        with self._responses_lock:
+            if version != self._responses_version:
+                return
+            self._responses[key] = replace(response)
+            while len(self._responses) > self.RESPONSE_CACHE_SIZE:
+                self._responses.popitem(last=False)
 
     def _handle_driver_stats(self, _: Any) -> CoachResponse:
         """Handle driver statistics queries."""
@@ -168,34 +284,35 @@ class LocalCoach:
 
     def _handle_club_stats(self, club: Optional[str]) -> CoachResponse:
         """Handle statistics for a specific club."""
-        df = golf_db.get_all_shots()
+        # Pre-aggregated per club and session; no shots are read
+        table = self._cube_stats(
+            self.CLUB_STAT_METRICS + [SHOTS_METRIC], by=(),
+            clubs=[club] if club else None, quantiles=None,
+        )
+        if table is not None:
+            stats = self._club_stats_from_cube(table)
+            return self._club_stats_response(club, stats)
 
-        if df.empty:
-            return CoachResponse(
-                message="I don't have any shot data yet. Import some sessions first!",
-                confidence=0.9
-            )
+        club_df = self._queries.query_shots(club=club)
 
-        if club:
-            # Validate club column exists and is string type before using .str accessor
-            if 'club' not in df.columns:
-                return CoachResponse(
-                    message="No club data found in shots. Check your data import.",
-                    confidence=0.8
-                )
-            club_df = df[df['club'].astype(str).str.lower() == club.lower()]
-            if club_df.empty:
-                available = df['club'].unique().tolist()
+        if club_df.empty:
+            clubs = self._queries.query_shots(columns=['club']) if club else club_df
+            if clubs.empty:
                 return CoachResponse(
-                    message=f"No data for {club}. Available clubs: {', '.join(available[:5])}",
-                    data={'available_clubs': available},
-                    confidence=0.8
+                    message="I don't have any shot data yet. Import some sessions first!",
+                    confidence=0.9
                 )
-        else:
-            club_df = df
+            available = clubs['club'].dropna().unique().tolist()
+            return CoachResponse(
+                message=f"No data for {club}. Available clubs: {', '.join(map(str, available[:5]))}",
+                data={'available_clubs': available},
+                confidence=0.8
+            )
+
+        return self._club_stats_response(club, self._calculate_club_stats(club_df))
 
-        # Calculate stats
-        stats = self._calculate_club_stats(club_df)
+    def _club_stats_response(self, club: Optional[str], stats: Dict[str, Any]) -> CoachResponse:
+        """Format club statistics with suggestions."""
         club_name = club or "all clubs"
 
         message = self._format_club_stats(club_name, stats)
@@ -208,6 +325,22 @@ class LocalCoach:
             confidence=0.85
         )
 
+    def _club_stats_from_cube(self, table: pd.DataFrame) -> Dict[str, Any]:
+        """Stats in the _calculate_club_stats() shape from an overall cube roll-up."""
+        stats: Dict[str, Any] = {}
+        for row in table.itertuples(index=False):
+            if row.metric == SHOTS_METRIC:
+                stats['shot_count'] = int(row.count)
+                stats['session_count'] = int(row.sessions)
+            else:
+                stats[row.metric] = {
+                    'avg': round(float(row.mean), 1),
+                    'std': round(float(row.std), 1),
+                    'min': round(float(row.min), 1),
+                    'max': round(float(row.max), 1),
+                }
+        return stats
+
     def _calculate_club_stats(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Calculate statistics for a DataFrame of shots."""
         stats = {}
@@ -282,21 +415,41 @@ class LocalCoach:
 
         return suggestions
 
-    def _handle_comparison(self, _: Any) -> CoachResponse:
+    def _handle_comparison(self, _: Any, since: Optional[date] = None) -> CoachResponse:
         """Handle club comparison queries."""
-        return self.get_club_comparison()
+        return self.get_club_comparison(since=since)
 
-    def get_club_comparison(self, clubs: Optional[List[str]] = None) -> CoachResponse:
+    def get_club_comparison(
+        self,
+        clubs: Optional[List[str]] = None,
+        since: Optional[date] = None,
+    ) -> CoachResponse:
         """
         Compare performance across clubs.
 
         Args:
             clubs: List of club names to compare (uses all if not specified)
+            since: Only sessions on or after this date
 
         Returns:
             CoachResponse with comparison data
         """
-        df = golf_db.get_all_shots()
+        title = "Club Comparison (by carry distance):"
+        if since:
+            title = f"Club Comparison since {since.isoformat()} (by carry distance):"
+
+        table = self._cube_stats(['carry', 'total', SHOTS_METRIC], by=('club',), since=since, quantiles=None)
+        if table is not None:
+            club_stats = table.pivot(index='club', columns='metric', values='mean')
+            club_stats = club_stats.reindex(columns=['carry', 'total'])
+            club_stats['shots'] = table[table['metric'] == SHOTS_METRIC].set_index('club')['count']
+            return self._club_comparison_response(title, club_stats, clubs)
+
+        df = self._queries.query_shots(columns=['club', 'carry', 'total', 'shot_id', 'session_date', 'date_added'])
+        if since and not df.empty:
+            dates = df['session_date'].fillna(df['date_added']) if 'session_date' in df.columns else df.get('date_added')
+            if dates is not None:
+                df = df[dates.astype(str) >= since.isoformat()]
 
         if df.empty:
             return CoachResponse(
@@ -320,13 +473,22 @@ class LocalCoach:
             'shot_id': 'count'
         }).rename(columns={'shot_id': 'shots'})
 
+        return self._club_comparison_response(title, club_stats, clubs)
+
+    def _club_comparison_response(
+        self,
+        title: str,
+        club_stats: pd.DataFrame,
+        clubs: Optional[List[str]],
+    ) -> CoachResponse:
+        """Format per-club carry/total averages and gapping."""
         club_stats = club_stats.dropna().sort_values('carry', ascending=False)
 
         if clubs:
             club_stats = club_stats[club_stats.index.isin(clubs)]
 
         # Format message
-        parts = ["Club Comparison (by carry distance):"]
+        parts = [title]
         for club, row in club_stats.head(10).iterrows():
             parts.append(f"  - {club}: {row['carry']:.0f} yards ({int(row['shots'])} shots)")
 
@@ -344,7 +506,7 @@ class LocalCoach:
 
     def _handle_session_analysis(self, _: Any) -> CoachResponse:
         """Handle session analysis queries."""
-        df = golf_db.get_all_shots()
+        df = self._queries.query_shots(columns=['session_id', 'date_added'])
 
         if df.empty:
             return CoachResponse(
@@ -359,7 +521,7 @@ class LocalCoach:
                 confidence=0.8
             )
 
-        df['date_added'] = pd.to_datetime(df['date_added'], errors='coerce')
+        df = df.assign(date_added=pd.to_datetime(df['date_added'], errors='coerce'))
 
         # Filter to rows with valid dates
         valid_dates = df[df['date_added'].notna()]
@@ -381,7 +543,7 @@ class LocalCoach:
         Returns:
             CoachResponse with session insights
         """
-        df = golf_db.get_session_data(session_id)
+        df = self._queries.query_shots(session_id=session_id)
 
         if df is None or df.empty:
             return CoachResponse(
@@ -422,18 +584,22 @@ class LocalCoach:
 
     def _handle_trends(self, _: Any) -> CoachResponse:
         """Handle trend analysis queries."""
-        df = golf_db.get_all_shots()
+        table = self._cube_stats(['carry'], by=('session_id',), quantiles=None)
+        if table is not None:
+            session_avgs = table.set_index('session_id')['mean'].dropna()
+        else:
+            df = self._queries.query_shots(columns=['session_id', 'carry'])
 
-        if df.empty:
-            return CoachResponse(
-                message="No data available for trend analysis.",
-                confidence=0.9
-            )
+            if df.empty:
+                return CoachResponse(
+                    message="No data available for trend analysis.",
+                    confidence=0.9
+                )
 
-        # Analyze carry trend
-        session_avgs = df.groupby('session_id')['carry'].apply(
-            lambda x: x.replace([0, 99999], np.nan).mean()
-        ).dropna()
+            # Analyze carry trend
+            session_avgs = df.groupby('session_id')['carry'].apply(
+                lambda x: x.replace([0, 99999], np.nan).mean()
+            ).dropna()
 
         if len(session_avgs) < 3:
             return CoachResponse(
@@ -464,7 +630,7 @@ class LocalCoach:
 
     def _handle_swing_issue(self, entity: Any) -> CoachResponse:
         """Handle swing issue queries."""
-        df = golf_db.get_all_shots()
+        df = self._queries.query_shots()
 
         if df.empty:
             return CoachResponse(
@@ -506,18 +672,23 @@ class LocalCoach:
 
     def _handle_consistency(self, _: Any) -> CoachResponse:
         """Handle consistency analysis queries."""
-        df = golf_db.get_all_shots()
+        table = self._cube_stats(['carry'], by=('club',), quantiles=None)
+        if table is not None:
+            by_club = table.set_index('club')
+            cv_by_club = (by_club['std'] / by_club['mean'] * 100).dropna().sort_values()
+        else:
+            df = self._queries.query_shots(columns=['club', 'carry'])
 
-        if df.empty:
-            return CoachResponse(
-                message="No data available to analyze consistency.",
-                confidence=0.9
-            )
+            if df.empty:
+                return CoachResponse(
+                    message="No data available to analyze consistency.",
+                    confidence=0.9
+                )
 
-        # Calculate consistency metrics
-        cv_by_club = df.groupby('club')['carry'].apply(
-            lambda x: x.replace([0, 99999], np.nan).std() / x.replace([0, 99999], np.nan).mean() * 100
-        ).dropna().sort_values()
+            # Calculate consistency metrics
+            cv_by_club = df.groupby('club')['carry'].apply(
+                lambda x: x.replace([0, 99999], np.nan).std() / x.replace([0, 99999], np.nan).mean() * 100
+            ).dropna().sort_values()
 
         parts = ["Consistency Analysis (lower % = more consistent):"]
         for club, cv in cv_by_club.head(5).items():
@@ -537,13 +708,13 @@ class LocalCoach:
             confidence=0.85
         )
 
-    def _handle_gapping(self, _: Any) -> CoachResponse:
+    def _handle_gapping(self, _: Any, since: Optional[date] = None) -> CoachResponse:
         """Handle distance gapping queries."""
-        return self.get_club_comparison()  # Uses same logic
+        return self.get_club_comparison(since=since)  # Uses same logic
 
     def _handle_profile(self, _: Any) -> CoachResponse:
         """Handle profile/summary queries."""
-        df = golf_db.get_all_shots()
+        df = self._queries.query_shots(columns=['session_id', 'club'])
 
         if df.empty:
             return CoachResponse(
@@ -598,6 +769,7 @@ class LocalCoach:
         launch_angle: float = 12.0,
         back_spin: float = 2500,
         club_speed: Optional[float] = None,
+        club: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Predict carry distance using ML model.
@@ -607,22 +779,27 @@ class LocalCoach:
             launch_angle: Launch angle in degrees
             back_spin: Back spin in rpm
             club_speed: Club speed in mph (optional)
+            club: Club name; uses that club's model when per-club models exist
 
         Returns:
             Dict with predicted distance and confidence
         """
-        if not self.distance_predictor:
+        club_predictor = self.club_distance_predictor if club else None
+        predictor = club_predictor or self.distance_predictor
+        if not predictor:
             return {
                 'error': 'Distance prediction model not available. Train it first.',
                 'fallback_estimate': self._estimate_distance(ball_speed),
             }
 
         try:
-            result = self.distance_predictor.predict(
+            kwargs = {'club': club} if club_predictor else {}
+            result = predictor.predict(
                 ball_speed=ball_speed,
                 launch_angle=launch_angle,
                 back_spin=back_spin,
                 club_speed=club_speed,
+                **kwargs,
             )
             return {
                 'predicted_carry': result.predicted_value,
@@ -641,7 +818,22 @@ class LocalCoach:
         return ball_speed * 1.65
 
 
+_coach: Optional[LocalCoach] = None
+_coach_lock = threading.Lock()
+
+
 # Convenience function
 def get_coach() -> LocalCoach:
-    """Get a LocalCoach instance."""
-    return LocalCoach()
+    """
+    Get the shared LocalCoach instance.
+
+    The coach keeps no conversation history. Its query and answer caches
+    are shared by every conversation in the process and are dropped
+    whenever the shots database changes.
+    """
+    global _coach
+    if _coach is None:
+        with _coach_lock:
+            if _coach is None:
+                _coach = LocalCoach()
+    return _coach
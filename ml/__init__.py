@@ -2,9 +2,13 @@
 ML Module for GolfDataApp.
 
 Provides local machine learning models for:
-- Distance prediction (carry/total based on launch conditions)
+- Distance prediction (carry/total based on launch conditions),
+  globally or sharded per club
 - Shot shape classification (draw, fade, straight, etc.)
 - Swing flaw detection via anomaly detection
+- A process-wide registry sharing loaded models (see ml.registry)
+- Compiled single-shot inference for live feeds (see ml.fast_inference)
+- Benchmarks on deterministic synthetic data (see ml.benchmarks)
 
 Note: Some features require ML dependencies (scikit-learn, xgboost, joblib).
 Rule-based classification and detection work without these dependencies.
@@ -16,12 +20,20 @@ __all__ = [
     'load_model',
     'save_model',
     'DistancePredictor',
+    'ClubDistancePredictor',
+    'train_club_models',
     'ShotShapeClassifier',
     'ShotShape',
     'classify_shot_shape',
+    'classify_shot_shapes',
     'SwingFlawDetector',
     'SwingFlaw',
     'detect_swing_flaws',
+    'detect_swing_flaws_frame',
+    'ModelRegistry',
+    'model_registry',
+    'compile_distance_model',
+    'compile_flaw_detector',
 ]
 
 
@@ -35,18 +47,40 @@ def __getattr__(name):
             'save_model': save_model,
             'DistancePredictor': DistancePredictor,
         }[name]
-    elif name in ('ShotShapeClassifier', 'ShotShape', 'classify_shot_shape'):
-        from .classifiers import ShotShapeClassifier, ShotShape, classify_shot_shape
+    elif name in ('ClubDistancePredictor', 'train_club_models'):
+        from .club_models import ClubDistancePredictor, train_club_models
+        return {
+            'ClubDistancePredictor': ClubDistancePredictor,
+            'train_club_models': train_club_models,
+        }[name]
+    elif name in ('ShotShapeClassifier', 'ShotShape', 'classify_shot_shape', 'classify_shot_shapes'):
+        from .classifiers import ShotShapeClassifier, ShotShape, classify_shot_shape, classify_shot_shapes
         return {
             'ShotShapeClassifier': ShotShapeClassifier,
             'ShotShape': ShotShape,
             'classify_shot_shape': classify_shot_shape,
+            'classify_shot_shapes': classify_shot_shapes,
         }[name]
-    elif name in ('SwingFlawDetector', 'SwingFlaw', 'detect_swing_flaws'):
-        from .anomaly_detection import SwingFlawDetector, SwingFlaw, detect_swing_flaws
+    elif name in ('SwingFlawDetector', 'SwingFlaw', 'detect_swing_flaws', 'detect_swing_flaws_frame'):
+        from .anomaly_detection import (
+            SwingFlawDetector, SwingFlaw, detect_swing_flaws, detect_swing_flaws_frame,
+        )
         return {
             'SwingFlawDetector': SwingFlawDetector,
             'SwingFlaw': SwingFlaw,
             'detect_swing_flaws': detect_swing_flaws,
+            'detect_swing_flaws_frame': detect_swing_flaws_frame,
+        }[name]
+    elif name in ('ModelRegistry', 'model_registry'):
+        from .registry import ModelRegistry, model_registry
+        return {
+            'ModelRegistry': ModelRegistry,
+            'model_registry': model_registry,
+        }[name]
+    elif name in ('compile_distance_model', 'compile_flaw_detector'):
+        from .fast_inference import compile_distance_model, compile_flaw_detector
+        return {
+            'compile_distance_model': compile_distance_model,
+            'compile_flaw_detector': compile_flaw_detector,
         }[name]
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -12,6 +12,9 @@ Usage:
     detector = SwingFlawDetector()
     detector.fit(shots_df)
     flaws = detector.detect(new_shot)
+
+    # Whole session / history at once (columnar, one IsolationForest pass)
+    frame = detector.detect_frame(session_df)
 """
 
 from enum import Enum
@@ -232,6 +235,129 @@ def detect_swing_flaws(
     )
 
 
+# Order in which detect_swing_flaws checks (and lists) flaws
+FLAW_CHECK_ORDER = (
+    SwingFlaw.OVER_THE_TOP,
+    SwingFlaw.EARLY_RELEASE,
+    SwingFlaw.INCONSISTENT_CONTACT,
+    SwingFlaw.STEEP_ATTACK,
+    SwingFlaw.SHALLOW_ATTACK,
+    SwingFlaw.CLUBFACE_CONTROL,
+    SwingFlaw.LOW_COMPRESSION,
+)
+FLAW_COLUMNS = [f'flaw_{flaw.value}' for flaw in FLAW_CHECK_ORDER]
+
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray:
+    """Column as float array (NaN = missing); all-NaN if the column is absent."""
+    if name not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=float)
+
+
+def _frame_smash(df: pd.DataFrame) -> np.ndarray:
+    """Smash column, filled from ball_speed / club_speed where missing."""
+    smash = _column(df, 'smash')
+    ball_speed = _column(df, 'ball_speed')
+    club_speed = _column(df, 'club_speed')
+    computable = np.isnan(smash) & (ball_speed != 0) & (club_speed > 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(computable, ball_speed / club_speed, smash)
+
+
+def detect_swing_flaws_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized ``detect_swing_flaws`` over a DataFrame of shots.
+
+    Applies the same rules with array operations. NaN (or a missing column)
+    is treated like ``None`` in the scalar function.
+
+    Args:
+        df: DataFrame with any of ball_speed, club_speed, attack_angle,
+            club_path, face_angle, impact_x, impact_y, back_spin, smash
+
+    Returns:
+        DataFrame indexed like ``df`` with one boolean ``flaw_<name>`` column
+        per flaw, 'flaw_count', 'smash', 'anomaly_score' and 'is_outlier'
+    """
+    smash = _frame_smash(df)
+    attack = _column(df, 'attack_angle')
+    path = _column(df, 'club_path')
+    face = _column(df, 'face_angle')
+    back_spin = _column(df, 'back_spin')
+    ball_speed = _column(df, 'ball_speed')
+
+    # NaN comparisons are False, so missing inputs never raise a flag
+    with np.errstate(invalid='ignore'):
+        if 'strike_distance' in df.columns:
+            # Precomputed by services.feature_store
+            impact_distance = _column(df, 'strike_distance')
+        else:
+            impact_distance = np.sqrt(_column(df, 'impact_x') ** 2 + _column(df, 'impact_y') ** 2)
+        spin_ratio = back_spin / np.maximum(1, ball_speed)
+
+        flags = {
+            SwingFlaw.OVER_THE_TOP: path < -6.0,
+            SwingFlaw.EARLY_RELEASE: smash < 1.35,
+            SwingFlaw.INCONSISTENT_CONTACT: impact_distance > 15,
+            SwingFlaw.STEEP_ATTACK: attack < -5.0,
+            SwingFlaw.SHALLOW_ATTACK: attack > 8.0,
+            SwingFlaw.CLUBFACE_CONTROL: np.abs(face) > 6.0,
+        }
+        high_smash = smash > 1.52
+        high_spin = spin_ratio > 25
+    flags[SwingFlaw.LOW_COMPRESSION] = high_spin & ~flags[SwingFlaw.EARLY_RELEASE]
+
+    score = np.zeros(len(df))
+    score += np.where(flags[SwingFlaw.OVER_THE_TOP], np.abs(path) / 10, 0.0)
+    score += np.where(flags[SwingFlaw.EARLY_RELEASE], (1.45 - smash) * 2, 0.0)
+    score += np.where(high_smash, 0.5, 0.0)
+    score += np.where(flags[SwingFlaw.INCONSISTENT_CONTACT], impact_distance / 20, 0.0)
+    score += np.where(flags[SwingFlaw.STEEP_ATTACK], np.abs(attack) / 8, 0.0)
+    score += np.where(flags[SwingFlaw.SHALLOW_ATTACK], attack / 10, 0.0)
+    score += np.where(flags[SwingFlaw.CLUBFACE_CONTROL], np.abs(face) / 8, 0.0)
+    score += np.where(high_spin, (spin_ratio - 20) / 10, 0.0)
+    score = np.minimum(1.0, score / 3)
+
+    frame = pd.DataFrame(
+        {f'flaw_{flaw.value}': flags[flaw] for flaw in FLAW_CHECK_ORDER},
+        index=df.index,
+    )
+    frame['flaw_count'] = frame[FLAW_COLUMNS].sum(axis=1).astype(int)
+    frame['smash'] = smash
+    frame['anomaly_score'] = score
+    frame['is_outlier'] = (score > 0.5) | (frame['flaw_count'] >= 2)
+    return frame
+
+
+def summarize_flaw_frame(frame: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Session-level summary of a ``detect_frame`` / ``detect_swing_flaws_frame`` result.
+
+    Flaws are ranked by count; ties keep the order in which they first
+    appear across shots, matching the per-shot aggregation.
+    """
+    counts = frame[FLAW_COLUMNS].sum(axis=0)
+    present = [col for col in FLAW_COLUMNS if counts[col] > 0]
+    first_seen = {col: int(frame[col].to_numpy().argmax()) for col in present}
+    ranked = sorted(
+        present,
+        key=lambda col: (-counts[col], first_seen[col], FLAW_COLUMNS.index(col)),
+    )
+    sorted_flaws = [(col[len('flaw_'):], int(counts[col])) for col in ranked]
+
+    outlier_count = int(frame['is_outlier'].sum())
+    return {
+        'total_shots': len(frame),
+        'outlier_count': outlier_count,
+        'outlier_rate': outlier_count / len(frame),
+        'average_anomaly_score': float(frame['anomaly_score'].mean()),
+        'flaw_counts': dict(sorted_flaws),
+        'most_common_flaw': sorted_flaws[0][0] if sorted_flaws else None,
+        'recommendations': _generate_recommendations(sorted_flaws),
+    }
+
+
 class SwingFlawDetector:
     """
     ML-based swing flaw detector using Isolation Forest.
@@ -415,6 +541,53 @@ class SwingFlawDetector:
             details=details,
         )
 
+    def detect_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Detect swing flaws for a batch of shots in one vectorized pass.
+
+        Rule flags come from ``detect_swing_flaws_frame``. When fitted, the
+        features are scaled once and scored in a single ``score_samples``
+        call; the ML outlier flag is derived from those same scores
+        (``score - offset_ < 0``, which is what ``IsolationForest.predict``
+        computes) instead of a second pass.
+
+        Args:
+            df: DataFrame with session or history shot data
+
+        Returns:
+            DataFrame indexed like ``df`` with the rule columns, plus
+            'rule_score', 'ml_score' and 'ml_outlier'. 'anomaly_score' and
+            'is_outlier' combine rules and ML the same way ``detect`` does.
+        """
+        frame = detect_swing_flaws_frame(df)
+        frame['rule_score'] = frame['anomaly_score']
+
+        if not self._is_fitted or df.empty:
+            frame['ml_score'] = np.nan
+            frame['ml_outlier'] = False
+            return frame
+
+        # Missing values are treated as 0.0, as in detect()
+        source = {'smash': frame['smash'].to_numpy()}
+        X = pd.DataFrame(
+            {
+                f: np.nan_to_num(source[f] if f in source else _column(df, f), nan=0.0)
+                for f in self._feature_names
+            },
+            index=df.index,
+        )
+        raw_ml_score = self.model.score_samples(self.scaler.transform(X))
+
+        # Same normalization as detect(): -0.5 -> 0, -1.0 -> 1.0
+        ml_score = np.clip(1 - (raw_ml_score + 1) / 0.5, 0.0, 1.0)
+        ml_outlier = (raw_ml_score - self.model.offset_) < 0
+
+        frame['ml_score'] = ml_score
+        frame['ml_outlier'] = ml_outlier
+        frame['anomaly_score'] = (frame['rule_score'] + ml_score) / 2
+        frame['is_outlier'] = frame['is_outlier'] | ml_outlier
+        return frame
+
     def analyze_session(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
         Analyze a full session for swing patterns and issues.
@@ -428,47 +601,7 @@ class SwingFlawDetector:
         if df.empty:
             return {'error': 'No data provided'}
 
-        results = []
-        for _, row in df.iterrows():
-            result = self.detect(
-                ball_speed=row.get('ball_speed'),
-                club_speed=row.get('club_speed'),
-                attack_angle=row.get('attack_angle'),
-                club_path=row.get('club_path'),
-                face_angle=row.get('face_angle'),
-                impact_x=row.get('impact_x'),
-                impact_y=row.get('impact_y'),
-                back_spin=row.get('back_spin'),
-                smash=row.get('smash'),
-            )
-            results.append(result)
-
-        # Aggregate flaw counts
-        flaw_counts = {}
-        for result in results:
-            for flaw in result.flaws:
-                if flaw != SwingFlaw.NONE:
-                    flaw_counts[flaw.value] = flaw_counts.get(flaw.value, 0) + 1
-
-        # Sort by frequency
-        sorted_flaws = sorted(flaw_counts.items(), key=lambda x: x[1], reverse=True)
-
-        # Calculate outlier rate
-        outlier_count = sum(1 for r in results if r.is_outlier)
-        outlier_rate = outlier_count / len(results)
-
-        # Average anomaly score
-        avg_score = sum(r.anomaly_score for r in results) / len(results)
-
-        return {
-            'total_shots': len(df),
-            'outlier_count': outlier_count,
-            'outlier_rate': outlier_rate,
-            'average_anomaly_score': avg_score,
-            'flaw_counts': dict(sorted_flaws),
-            'most_common_flaw': sorted_flaws[0][0] if sorted_flaws else None,
-            'recommendations': _generate_recommendations(sorted_flaws),
-        }
+        return summarize_flaw_frame(self.detect_frame(df))
 
 
 def _generate_recommendations(flaw_counts: List[Tuple[str, int]]) -> List[str]:
@@ -0,0 +1,424 @@
+"""
+ML Benchmark and Regression Suite for GolfDataApp.
+
+Times fit, batch predict and single-shot predict for the distance model
+(ml.train_models), the shot shape classifier (ml.classifiers) and the
+swing flaw detector (ml.anomaly_detection) on deterministic synthetic
+datasets (see ml.synthetic), records peak memory for each operation, and
+writes a JSON report. Comparing a report against a saved baseline flags
+operations that got slower or hungrier, entirely offline.
+
+Peak memory is the growth in process RSS while the operation runs
+(sampled on a background thread, so native XGBoost/NumPy allocations
+count); where /proc is unavailable it falls back to tracemalloc, which
+only sees Python-level allocations.
+
+Usage:
+    # 1k, 10k and 100k shots; report under logs/benchmarks/
+    python -m ml.benchmarks
+
+    # Include 1M shots and compare against a baseline
+    python -m ml.benchmarks --scales 1k 10k 100k 1m --compare baseline.json
+
+    # Or use programmatically
+    from ml.benchmarks import run_benchmarks, compare_reports
+    report = run_benchmarks(scales=[1000])
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import warnings
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ml.synthetic import synthetic_dataset
+
+REPORT_VERSION = 1
+
+DEFAULT_SCALES = (1_000, 10_000, 100_000)
+
+# Single-shot predictions timed per model (latency percentiles)
+SINGLE_CALLS = 200
+
+# A metric this many times its baseline counts as a regression
+DEFAULT_THRESHOLD = 1.25
+
+# Memory growth below this is noise, whatever the ratio
+MIN_MEMORY_DELTA_MB = 5.0
+
+DEFAULT_OUTPUT_DIR = Path(__file__).parent.parent / 'logs' / 'benchmarks'
+
+_SCALE_SUFFIXES = {'k': 1_000, 'm': 1_000_000}
+
+
+@dataclass
+class BenchmarkResult:
+    """One timed operation on one dataset size."""
+    model: str
+    operation: str  # 'fit', 'predict_batch' or 'predict_single'
+    scale: int
+    seconds: float
+    peak_memory_mb: float
+    p50_us: Optional[float] = None
+    p99_us: Optional[float] = None
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return f"{self.model}.{self.operation}@{self.scale}"
+
+
+def parse_scale(text: str) -> int:
+    """Parse a dataset size like '10k', '1m' or '2500'."""
+    text = text.strip().lower().replace('_', '')
+    if text and text[-1] in _SCALE_SUFFIXES:
+        return int(float(text[:-1]) * _SCALE_SUFFIXES[text[-1]])
+    return int(text)
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size, or None where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class PeakMemory:
+    """
+    Context manager recording peak memory growth of the enclosed block.
+
+    Usage:
+        with PeakMemory() as mem:
+            model.fit(X, y)
+        print(mem.peak_mb)
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._use_rss = _rss_bytes() is not None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._baseline = 0
+        self._peak = 0
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._peak = max(self._peak, _rss_bytes() or 0)
+
+    def __enter__(self) -> 'PeakMemory':
+        if self._use_rss:
+            self._baseline = self._peak = _rss_bytes()
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        else:
+            tracemalloc.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._use_rss:
+            self._stop.set()
+            self._thread.join()
+            self._peak = max(self._peak, _rss_bytes() or 0)
+            peak = self._peak - self._baseline
+        else:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        self.peak_mb = max(0, peak) / 1e6
+
+
+def _measure(fn: Callable[[], Any]) -> tuple:
+    """Run ``fn`` once; return (result, seconds, peak memory MB)."""
+    with contextlib.redirect_stdout(io.StringIO()), PeakMemory() as mem:
+        t0 = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - t0
+    return result, seconds, mem.peak_mb
+
+
+def _latency(fn: Callable[[Dict[str, float]], Any], rows: List[Dict[str, float]]) -> Dict[str, float]:
+    """Per-call latency percentiles (microseconds) over ``rows``."""
+    timings = np.empty(len(rows))
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i, row in enumerate(rows):
+            t0 = time.perf_counter()
+            fn(row)
+            timings[i] = time.perf_counter() - t0
+    timings *= 1e6
+    return {
+        'seconds': float(timings.sum() / 1e6),
+        'p50_us': float(np.percentile(timings, 50)),
+        'p99_us': float(np.percentile(timings, 99)),
+    }
+
+
+def _single_rows(df: pd.DataFrame, columns: Sequence[str], n: int) -> List[Dict[str, float]]:
+    return [
+        {k: (None if pd.isna(v) else float(v)) for k, v in row.items()}
+        for row in df[list(columns)].head(n).to_dict('records')
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Model suites
+# ---------------------------------------------------------------------------
+
+def _bench_distance(df: pd.DataFrame, scale: int, single_calls: int) -> List[BenchmarkResult]:
+    from ml.train_models import DistancePredictor, train_distance_model
+
+    (model, metadata), fit_s, fit_mem = _measure(lambda: train_distance_model(df, cross_validate=False))
+    predictor = DistancePredictor()
+    predictor.model, predictor.metadata = model, metadata
+    predictor._feature_names = metadata.features
+
+    _, batch_s, batch_mem = _measure(lambda: predictor.predict_batch(df))
+    rows = _single_rows(df, metadata.features, single_calls)
+    single = _latency(lambda row: predictor.predict(**row), rows)
+
+    return [
+        BenchmarkResult('distance', 'fit', scale, fit_s, fit_mem,
+                        details={'samples': metadata.training_samples, 'mae': float(metadata.metrics['mae'])}),
+        BenchmarkResult('distance', 'predict_batch', scale, batch_s, batch_mem),
+        BenchmarkResult('distance', 'predict_single', scale, single['seconds'], 0.0,
+                        p50_us=single['p50_us'], p99_us=single['p99_us'], details={'calls': len(rows)}),
+    ]
+
+
+def _bench_shot_classifier(df: pd.DataFrame, scale: int, single_calls: int) -> List[BenchmarkResult]:
+    from ml.classifiers import RULE_FEATURES, ShotShapeClassifier, classify_shot_shapes
+
+    labeled = df.assign(shot_shape=classify_shot_shapes(df)['shape'])
+    classifier = ShotShapeClassifier()
+    metrics, fit_s, fit_mem = _measure(lambda: classifier.train(labeled))
+    _, batch_s, batch_mem = _measure(lambda: classifier.classify_frame(df))
+    rows = _single_rows(df, RULE_FEATURES, single_calls)
+    single = _latency(lambda row: classifier.classify(**row), rows)
+
+    return [
+        BenchmarkResult('shot_classifier', 'fit', scale, fit_s, fit_mem,
+                        details={'samples': metrics['samples'],
+                                 'training_accuracy': float(metrics['training_accuracy'])}),
+        BenchmarkResult('shot_classifier', 'predict_batch', scale, batch_s, batch_mem),
+        BenchmarkResult('shot_classifier', 'predict_single', scale, single['seconds'], 0.0,
+                        p50_us=single['p50_us'], p99_us=single['p99_us'], details={'calls': len(rows)}),
+    ]
+
+
+def _bench_flaw_detector(df: pd.DataFrame, scale: int, single_calls: int) -> List[BenchmarkResult]:
+    from ml.anomaly_detection import SwingFlawDetector
+
+    detector = SwingFlawDetector()
+    metrics, fit_s, fit_mem = _measure(lambda: detector.fit(df))
+    _, batch_s, batch_mem = _measure(lambda: detector.detect_frame(df))
+    columns = ['ball_speed', 'club_speed', 'attack_angle', 'club_path', 'face_angle', 'impact_x', 'impact_y', 'back_spin']
+    rows = _single_rows(df, columns, single_calls)
+    single = _latency(lambda row: detector.detect(**row), rows)
+
+    return [
+        BenchmarkResult('flaw_detector', 'fit', scale, fit_s, fit_mem,
+                        details={'samples': metrics['samples'], 'outlier_rate': float(metrics['outlier_rate'])}),
+        BenchmarkResult('flaw_detector', 'predict_batch', scale, batch_s, batch_mem),
+        BenchmarkResult('flaw_detector', 'predict_single', scale, single['seconds'], 0.0,
+                        p50_us=single['p50_us'], p99_us=single['p99_us'], details={'calls': len(rows)}),
+    ]
+
+
+SUITES: Dict[str, Callable[[pd.DataFrame, int, int], List[BenchmarkResult]]] = {
+    'distance': _bench_distance,
+    'shot_classifier': _bench_shot_classifier,
+    'flaw_detector': _bench_flaw_detector,
+}
+
+
+# ---------------------------------------------------------------------------
+# Reports
+# ---------------------------------------------------------------------------
+
+def _environment() -> Dict[str, Any]:
+    versions = {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__}
+    for name in ('sklearn', 'xgboost'):
+        try:
+            versions[name] = __import__(name).__version__
+        except Exception:
+            versions[name] = None
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(__file__).parent,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'versions': versions,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'git_commit': commit,
+    }
+
+
+def run_benchmarks(
+    scales: Sequence[int] = DEFAULT_SCALES,
+    models: Optional[Sequence[str]] = None,
+    seed: int = 0,
+    single_calls: int = SINGLE_CALLS,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Run the benchmark suites.
+
+    Args:
+        scales: Dataset sizes (shots)
+        models: Suites to run (all of SUITES if None)
+        seed: Synthetic data seed
+        single_calls: Single-shot predictions timed per model
+        progress: Optional callback for progress messages
+
+    Returns:
+        JSON-serializable report
+    """
+    models = list(models or SUITES)
+    unknown = set(models) - set(SUITES)
+    if unknown:
+        raise ValueError(f"Unknown models: {sorted(unknown)}; choose from {sorted(SUITES)}")
+
+    results: List[BenchmarkResult] = []
+    for scale in scales:
+        df = synthetic_dataset(scale, seed=seed)
+        for model in models:
+            if progress:
+                progress(f"{model} @ {scale:,} shots")
+            with warnings.catch_warnings():
+                # Scalers fitted on DataFrames warn when given arrays
+                warnings.simplefilter('ignore', UserWarning)
+                results.extend(SUITES[model](df, scale, single_calls))
+        del df
+
+    return {
+        'version': REPORT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'seed': seed,
+        'scales': list(scales),
+        'environment': _environment(),
+        'results': [{**asdict(r), 'key': r.key} for r in results],
+    }
+
+
+def compare_reports(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """
+    Compare a report with a baseline, metric by metric.
+
+    Latency uses p50 for single-shot operations and wall time otherwise.
+    Memory only counts as a regression when it grew by at least
+    MIN_MEMORY_DELTA_MB as well as by ``threshold``.
+
+    Returns:
+        One row per shared operation and metric with baseline, current,
+        ratio and a 'regression' flag
+    """
+    previous = {r['key']: r for r in baseline.get('results', [])}
+    rows = []
+    for result in current.get('results', []):
+        before = previous.get(result['key'])
+        if before is None:
+            continue
+        time_metric = 'p50_us' if result.get('p50_us') is not None else 'seconds'
+        for metric in (time_metric, 'peak_memory_mb'):
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            regression = ratio > threshold
+            if metric == 'peak_memory_mb':
+                regression = regression and (new - old) >= MIN_MEMORY_DELTA_MB
+            rows.append({
+                'key': result['key'], 'metric': metric, 'baseline': old,
+                'current': new, 'ratio': ratio, 'regression': regression,
+            })
+    return rows
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(f"{'operation':<34} {'time':>12} {'p99':>10} {'peak MB':>9}")
+    for r in report['results']:
+        if r['p50_us'] is not None:
+            timing, tail = f"{r['p50_us']:.0f} us", f"{r['p99_us']:.0f} us"
+        else:
+            timing, tail = f"{r['seconds']:.3f} s", ''
+        print(f"{r['key']:<34} {timing:>12} {tail:>10} {r['peak_memory_mb']:>9.1f}")
+
+
+def main():
+    """Run ML benchmarks from command line."""
+    parser = argparse.ArgumentParser(description="Benchmark ML training and inference")
+    parser.add_argument(
+        '--scales', nargs='+', default=[str(s) for s in DEFAULT_SCALES],
+        help="Dataset sizes, e.g. 1k 10k 100k 1m",
+    )
+    parser.add_argument('--models', nargs='+', choices=sorted(SUITES), help="Suites to run (default: all)")
+    parser.add_argument('--seed', type=int, default=0, help="Synthetic data seed")
+    parser.add_argument('--single-calls', type=int, default=SINGLE_CALLS, help="Single-shot predictions per model")
+    parser.add_argument('--output', type=Path, help="Report path (default: logs/benchmarks/ml_<timestamp>.json)")
+    parser.add_argument('--compare', type=Path, help="Baseline report to compare against")
+    parser.add_argument(
+        '--threshold', type=float, default=DEFAULT_THRESHOLD,
+        help="Ratio to baseline that counts as a regression",
+    )
+    args = parser.parse_args()
+
+    report = run_benchmarks(
+        scales=[parse_scale(s) for s in args.scales],
+        models=args.models,
+        seed=args.seed,
+        single_calls=args.single_calls,
+        progress=lambda msg: print(f"  running {msg}...", file=sys.stderr),
+    )
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output = DEFAULT_OUTPUT_DIR / f"ml_{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    _print_report(report)
+    print(f"\nReport: {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare_reports(report, baseline, args.threshold)
+        regressions = [r for r in rows if r['regression']]
+        print(f"\nCompared with {args.compare}: {len(rows)} metrics, {len(regressions)} regressions")
+        for r in regressions:
+            print(f"  REGRESSION {r['key']} {r['metric']}: {r['baseline']:.3g} -> {r['current']:.3g} ({r['ratio']:.2f}x)")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
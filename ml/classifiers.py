@@ -20,6 +20,9 @@ Usage:
     classifier = ShotShapeClassifier()
     shape = classifier.classify(face_angle=-2.0, club_path=-4.0, side_spin=-500)
     # Returns: 'draw'
+
+    # Whole history at once (vectorized; shape/confidence[/prob_*] columns)
+    frame = classifier.classify_frame(shots_df)
 """
 
 from enum import Enum
@@ -39,6 +42,15 @@ except ImportError:
     HAS_ML_DEPS = False
 
 
+# Rule thresholds (degrees unless noted)
+STRAIGHT_THRESHOLD = 2.0     # Within 2 degrees is "straight"
+SEVERE_THRESHOLD = 6.0       # More than 6 degrees is hook/slice
+SIDE_SPIN_THRESHOLD = 200.0  # rpm of side spin before a curve is called
+SIDE_SPIN_SCALE = 500.0      # rpm per "degree" of curve magnitude
+
+RULE_FEATURES = ('face_angle', 'club_path', 'side_spin', 'side_distance')
+
+
 class ShotShape(Enum):
     """Shot shape classifications."""
     STRAIGHT = 'straight'
@@ -93,10 +105,6 @@ def classify_shot_shape(
             details={'reason': 'No data provided'},
         )
 
-    # Thresholds (degrees)
-    STRAIGHT_THRESHOLD = 2.0  # Within 2 degrees is "straight"
-    SEVERE_THRESHOLD = 6.0    # More than 6 degrees is hook/slice
-
     # Calculate face-to-path (determines initial direction)
     face_to_path = None
     if has_face and has_path:
@@ -115,12 +123,12 @@ def classify_shot_shape(
             curve_magnitude = abs(face_to_path)
     elif has_spin:
         # Estimate from side spin (rough approximation)
-        if side_spin < -200:
+        if side_spin < -SIDE_SPIN_THRESHOLD:
             curve_direction = -1  # Draw (left spin)
-            curve_magnitude = abs(side_spin) / 500  # Normalize
-        elif side_spin > 200:
+            curve_magnitude = abs(side_spin) / SIDE_SPIN_SCALE  # Normalize
+        elif side_spin > SIDE_SPIN_THRESHOLD:
             curve_direction = 1  # Fade (right spin)
-            curve_magnitude = abs(side_spin) / 500
+            curve_magnitude = abs(side_spin) / SIDE_SPIN_SCALE
 
     # Determine start direction from club path
     start_direction = 0  # -1 = left, 0 = center, 1 = right
@@ -184,6 +192,74 @@ def classify_shot_shape(
     )
 
 
+def _feature_array(df: pd.DataFrame, name: str) -> np.ndarray:
+    """Column as float array (NaN = missing); all-NaN if the column is absent."""
+    if name not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=float)
+
+
+def classify_shot_shapes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized ``classify_shot_shape`` over a DataFrame of shots.
+
+    Applies the same D-plane rules as NumPy masks over the face_angle,
+    club_path, side_spin and side_distance columns. NaN (or a missing
+    column) is treated like ``None`` in the scalar function.
+
+    Args:
+        df: DataFrame with any of the RULE_FEATURES columns
+
+    Returns:
+        DataFrame indexed like ``df`` with 'shape' (ShotShape value strings)
+        and 'confidence' columns
+    """
+    face, path, spin, distance = (_feature_array(df, name) for name in RULE_FEATURES)
+    has_face, has_path, has_spin, has_distance = (
+        ~np.isnan(a) for a in (face, path, spin, distance)
+    )
+
+    # Curve from face-to-path when both are known, otherwise from side spin
+    has_ftp = has_face & has_path
+    face_to_path = face - path
+    use_spin = ~has_ftp & has_spin
+    left = (has_ftp & (face_to_path < -STRAIGHT_THRESHOLD)) | (use_spin & (spin < -SIDE_SPIN_THRESHOLD))
+    right = (has_ftp & (face_to_path > STRAIGHT_THRESHOLD)) | (use_spin & (spin > SIDE_SPIN_THRESHOLD))
+    magnitude = np.where(has_ftp, np.abs(face_to_path), np.abs(spin) / SIDE_SPIN_SCALE)
+    severe = magnitude > SEVERE_THRESHOLD
+    no_curve = ~(left | right)
+
+    # Start direction from club path
+    pulled = has_path & (path < -STRAIGHT_THRESHOLD)
+    pushed = has_path & (path > STRAIGHT_THRESHOLD)
+
+    conditions = [
+        no_curve & pulled,
+        no_curve & pushed,
+        no_curve,
+        left & severe,
+        left,
+        right & severe,
+    ]
+    shape = np.select(
+        conditions,
+        [ShotShape.PULL.value, ShotShape.PUSH.value, ShotShape.STRAIGHT.value,
+         ShotShape.HOOK.value, ShotShape.DRAW.value, ShotShape.SLICE.value],
+        default=ShotShape.FADE.value,
+    ).astype(object)
+    confidence = np.select(conditions, [0.7, 0.7, 0.8, 0.8, 0.75, 0.8], default=0.75)
+
+    # Adjust confidence based on data completeness
+    present = has_face.astype(int) + has_path + has_spin + has_distance
+    confidence = confidence * (0.5 + 0.5 * present / 4)
+
+    no_data = present == 0
+    shape[no_data] = ShotShape.UNKNOWN.value
+    confidence[no_data] = 0.0
+
+    return pd.DataFrame({'shape': shape, 'confidence': confidence}, index=df.index)
+
+
 class ShotShapeClassifier:
     """
     ML-based shot shape classifier with rule-based fallback.
@@ -338,6 +414,51 @@ class ShotShapeClassifier:
             },
         )
 
+    def classify_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Classify a batch of shots in one vectorized pass.
+
+        Rule-based mode uses ``classify_shot_shapes``. When trained, the
+        features are scaled once and run through a single ``predict_proba``
+        call; the predicted class is the most probable one.
+
+        Args:
+            df: DataFrame with shot data
+
+        Returns:
+            DataFrame indexed like ``df`` with 'shape' and 'confidence'
+            columns, plus one 'prob_<class>' column per class when trained
+        """
+        if not self._use_ml or not self.is_trained():
+            return classify_shot_shapes(df)
+
+        if df.empty:
+            columns = ['shape', 'confidence'] + [f'prob_{c}' for c in self.model.classes_]
+            return pd.DataFrame(columns=columns, index=df.index)
+
+        # Missing values are treated as 0.0, as in classify()
+        X = pd.DataFrame(
+            {f: np.nan_to_num(_feature_array(df, f), nan=0.0) for f in self._feature_names},
+            index=df.index,
+        )
+        probabilities = self.model.predict_proba(self.scaler.transform(X))
+        best = probabilities.argmax(axis=1)
+
+        valid_shapes = {s.value for s in ShotShape}
+        labels = [str(c).lower() for c in self.model.classes_]
+        class_shapes = np.array(
+            [label if label in valid_shapes else ShotShape.UNKNOWN.value for label in labels],
+            dtype=object,
+        )
+
+        frame = pd.DataFrame(
+            {'shape': class_shapes[best], 'confidence': probabilities[np.arange(len(best)), best]},
+            index=df.index,
+        )
+        for i, cls in enumerate(self.model.classes_):
+            frame[f'prob_{cls}'] = probabilities[:, i]
+        return frame
+
     def classify_batch(self, df: pd.DataFrame) -> pd.Series:
         """
         Classify shot shapes for a batch of shots.
@@ -348,18 +469,7 @@ class ShotShapeClassifier:
         Returns:
             Series of ShotShape values
         """
-        results = []
-
-        for _, row in df.iterrows():
-            result = self.classify(
-                face_angle=row.get('face_angle'),
-                club_path=row.get('club_path'),
-                side_spin=row.get('side_spin'),
-                side_distance=row.get('side_distance'),
-            )
-            results.append(result.shape.value)
-
-        return pd.Series(results, index=df.index)
+        return self.classify_frame(df)['shape']
 
 
 def get_shot_shape_summary(shape_series: pd.Series) -> Dict[str, Any]:
@@ -0,0 +1,345 @@
+"""
+Per-Club Distance Models for GolfDataApp.
+
+Shards distance prediction into one small XGBoost model per club plus a
+global fallback trained on every shot. Shards train in parallel across a
+process pool and are recorded in a manifest; at prediction time only the
+shard for the requested club is loaded.
+
+Retraining can be limited to clubs with shots newer than their shard's
+data watermark, so a single-club session only rebuilds that club's model.
+
+Usage:
+    # Train every club (and the global fallback)
+    python -m ml.club_models
+
+    # Only clubs with new shots since their shard was trained
+    python -m ml.club_models --changed
+
+    # Or use programmatically
+    from ml.club_models import ClubDistancePredictor, train_club_models
+    train_club_models(clubs=['7 Iron'])
+    predictor = ClubDistancePredictor()
+    carry = predictor.predict(club='7 Iron', ball_speed=120, launch_angle=17)
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from ml.train_models import (
+    MODELS_DIR,
+    DistancePredictor,
+    PredictionResult,
+    _date_added,
+    check_ml_deps,
+    get_training_data,
+    save_model,
+    train_distance_model,
+)
+
+# Shards live alongside the global model so load_model's trusted-dir check applies
+SHARDS_DIR = MODELS_DIR / 'distance_by_club'
+MANIFEST_PATH = SHARDS_DIR / 'manifest.json'
+MANIFEST_VERSION = 1
+
+# Manifest key of the fallback model trained on all clubs
+GLOBAL_SHARD = '__global__'
+
+# Clubs with fewer valid shots than this use the global fallback
+MIN_CLUB_SAMPLES = 50
+
+
+def shard_filename(club: str) -> str:
+    """Filesystem-safe, collision-free model filename for a club."""
+    slug = re.sub(r'[^a-z0-9]+', '_', club.lower()).strip('_') or 'club'
+    digest = hashlib.sha1(club.encode('utf-8')).hexdigest()[:8]
+    return f"{slug}_{digest}.joblib"
+
+
+def read_manifest(path: Path = MANIFEST_PATH) -> Dict[str, Any]:
+    """
+    Read a shard manifest.
+
+    Raises:
+        FileNotFoundError: If no shards have been trained yet
+    """
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _write_manifest(manifest: Dict[str, Any], path: Path) -> None:
+    """Write the manifest atomically so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix='.manifest.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def _train_shard(key: str, df: pd.DataFrame, target: str, model_path: str) -> Tuple[str, Optional[Dict[str, Any]], str]:
+    """Train and save one shard (runs in a worker process)."""
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            model, metadata = train_distance_model(df, target=target, cross_validate=False, n_jobs=1)
+            save_model(model, Path(model_path), metadata)
+    except ValueError as e:
+        return key, None, str(e)
+
+    entry = {
+        'file': Path(model_path).name,
+        'samples': metadata.training_samples,
+        'mae': float(metadata.metrics['mae']),
+        'trained_at': metadata.trained_at,
+        'data_watermark': metadata.data_watermark,
+        'features': metadata.features,
+    }
+    return key, entry, 'trained'
+
+
+def _changed_clubs(df: pd.DataFrame, manifest: Dict[str, Any]) -> List[str]:
+    """Clubs with shots newer than the watermark of the shard serving them."""
+    shards = manifest.get('shards', {})
+    fallback = shards.get(GLOBAL_SHARD, {})
+    latest = _date_added(df).groupby(df['club']).max()
+    changed = []
+    for club, newest in latest.items():
+        watermark = shards.get(club, fallback).get('data_watermark')
+        if not watermark:
+            changed.append(club)
+        elif pd.notna(newest) and newest > pd.Timestamp(watermark):
+            changed.append(club)
+    return changed
+
+
+def train_club_models(
+    df: Optional[pd.DataFrame] = None,
+    clubs: Optional[Iterable[str]] = None,
+    only_changed: bool = False,
+    include_global: Optional[bool] = None,
+    target: str = 'carry',
+    workers: Optional[int] = None,
+    min_samples: int = MIN_CLUB_SAMPLES,
+    manifest_path: Path = MANIFEST_PATH,
+) -> Dict[str, str]:
+    """
+    Train per-club distance shards in parallel and update the manifest.
+
+    Args:
+        df: Shot data with a 'club' column (loads from database if not provided)
+        clubs: Clubs to (re)train; default is every club in the data
+        only_changed: Restrict to clubs with shots newer than their shard
+        include_global: Retrain the global fallback. Defaults to True for a
+            full run, and otherwise only when a retrained club is too small
+            for its own shard (its shots are served by the fallback)
+        target: Target column ('carry' or 'total')
+        workers: Worker processes (default: CPU count, capped at shard count)
+        min_samples: Minimum valid shots for a club to get its own shard
+        manifest_path: Manifest location; shards are written next to it
+
+    Returns:
+        Dict of shard key -> outcome ('trained' or the reason it was skipped)
+    """
+    check_ml_deps()
+
+    if df is None:
+        df = get_training_data()
+    df = df[df['club'].notna()]
+
+    try:
+        manifest = read_manifest(manifest_path)
+    except FileNotFoundError:
+        manifest = {'version': MANIFEST_VERSION, 'target': target, 'shards': {}}
+    if manifest.get('target', target) != target:
+        # A different target invalidates every existing shard
+        manifest = {'version': MANIFEST_VERSION, 'target': target, 'shards': {}}
+
+    selected = list(clubs) if clubs is not None else sorted(df['club'].unique())
+    if only_changed:
+        changed = set(_changed_clubs(df, manifest))
+        selected = [c for c in selected if c in changed]
+    full_run = clubs is None and not only_changed
+
+    club_sizes = df['club'].value_counts()
+    jobs: Dict[str, pd.DataFrame] = {}
+    outcomes: Dict[str, str] = {}
+    for club in selected:
+        if club_sizes.get(club, 0) < min_samples:
+            outcomes[club] = f'fewer than {min_samples} shots; uses global model'
+            manifest['shards'].pop(club, None)
+        else:
+            jobs[club] = df[df['club'] == club]
+
+    if include_global is None:
+        include_global = full_run or any(club not in jobs for club in selected)
+    if include_global:
+        jobs[GLOBAL_SHARD] = df
+
+    if jobs:
+        directory = manifest_path.parent
+        max_workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+        paths = {
+            key: directory / ('global.joblib' if key == GLOBAL_SHARD else shard_filename(key))
+            for key in jobs
+        }
+        if max_workers == 1:
+            results = [_train_shard(key, jobs[key], target, str(paths[key])) for key in jobs]
+        else:
+            # spawn: forking after XGBoost/OpenMP initialized threads is unsafe
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+                futures = [
+                    pool.submit(_train_shard, key, jobs[key], target, str(paths[key]))
+                    for key in jobs
+                ]
+                results = [future.result() for future in futures]
+
+        for key, entry, outcome in results:
+            outcomes[key] = outcome
+            if entry is not None:
+                manifest['shards'][key] = entry
+            elif key != GLOBAL_SHARD:
+                manifest['shards'].pop(key, None)
+
+    manifest['version'] = MANIFEST_VERSION
+    manifest['target'] = target
+    manifest['updated_at'] = datetime.utcnow().isoformat()
+    _write_manifest(manifest, manifest_path)
+    return outcomes
+
+
+class ClubDistancePredictor:
+    """
+    Distance predictor that routes each shot to its club's shard.
+
+    Shards load lazily on first use; clubs without a shard use the global
+    fallback.
+
+    Usage:
+        predictor = ClubDistancePredictor()
+        result = predictor.predict(club='Driver', ball_speed=165, launch_angle=12)
+        carries = predictor.predict_batch(shots_df)  # needs a 'club' column
+    """
+
+    def __init__(self, manifest_path: Optional[Path] = None):
+        """
+        Initialize from a shard manifest.
+
+        Args:
+            manifest_path: Manifest file (uses default if not specified)
+
+        Raises:
+            FileNotFoundError: If no shards have been trained yet
+        """
+        self.manifest_path = Path(manifest_path or MANIFEST_PATH)
+        self.manifest = read_manifest(self.manifest_path)
+        self._shards: Dict[str, DistancePredictor] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def clubs(self) -> List[str]:
+        """Clubs that have their own shard."""
+        return sorted(k for k in self.manifest.get('shards', {}) if k != GLOBAL_SHARD)
+
+    def shard_key(self, club: Optional[str]) -> str:
+        """Manifest key serving a club (the global fallback if it has no shard)."""
+        shards = self.manifest.get('shards', {})
+        if club in shards:
+            return club
+        if GLOBAL_SHARD in shards:
+            return GLOBAL_SHARD
+        raise FileNotFoundError(f"No distance model for {club!r} and no global fallback")
+
+    def shard(self, club: Optional[str]) -> DistancePredictor:
+        """Loaded DistancePredictor serving a club, loading it on first use."""
+        key = self.shard_key(club)
+        with self._lock:
+            predictor = self._shards.get(key)
+            if predictor is None:
+                entry = self.manifest['shards'][key]
+                predictor = DistancePredictor(self.manifest_path.parent / entry['file'])
+                with contextlib.redirect_stdout(io.StringIO()):
+                    predictor.load()
+                self._shards[key] = predictor
+            return predictor
+
+    def loaded_shards(self) -> List[str]:
+        """Manifest keys loaded so far."""
+        with self._lock:
+            return sorted(self._shards)
+
+    def predict(self, club: Optional[str] = None, **kwargs) -> PredictionResult:
+        """
+        Predict carry distance with the club's shard.
+
+        Args:
+            club: Club name (global fallback if None or unknown)
+            **kwargs: Launch conditions, as for DistancePredictor.predict
+
+        Returns:
+            PredictionResult
+        """
+        return self.shard(club).predict(**kwargs)
+
+    def predict_batch(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Predict carry distances, one model call per club.
+
+        Args:
+            df: DataFrame with shot data and a 'club' column
+
+        Returns:
+            Series of predicted distances aligned with ``df``
+        """
+        parts = []
+        for club, group in df.groupby(df['club'].fillna(GLOBAL_SHARD), sort=False):
+            parts.append(self.shard(club).predict_batch(group))
+        if not parts:
+            return pd.Series(dtype=float, index=df.index)
+        return pd.concat(parts).reindex(df.index)
+
+
+def main():
+    """Train per-club distance models from command line."""
+    parser = argparse.ArgumentParser(description="Train per-club distance models")
+    parser.add_argument('--clubs', nargs='+', help="Only retrain these clubs")
+    parser.add_argument(
+        '--changed', action='store_true',
+        help="Only retrain clubs with shots newer than their shard",
+    )
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes")
+    args = parser.parse_args()
+
+    outcomes = train_club_models(
+        clubs=args.clubs, only_changed=args.changed, workers=args.workers,
+    )
+    manifest = read_manifest()
+    if not outcomes:
+        print("No clubs to retrain.")
+    for key, outcome in sorted(outcomes.items()):
+        entry = manifest['shards'].get(key)
+        detail = f"{entry['samples']} shots, MAE {entry['mae']:.2f} yds" if entry and outcome == 'trained' else outcome
+        print(f"  {key:<16} {detail}")
+    print(f"Manifest: {MANIFEST_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,524 @@
+"""
+Low-latency Single-Shot Inference for Live Coaching.
+
+``DistancePredictor.predict`` and ``SwingFlawDetector.detect`` spend most
+of a single-shot call on per-call overhead (DMatrix construction, sklearn
+input validation) rather than on the trees themselves. This module
+compiles a trained model into flat NumPy arrays once and then scores one
+shot by stepping every tree forward in lock-step, one level per NumPy
+operation, on a preallocated fixed-shape input buffer.
+
+- XGBoost distance models: trees are read from the booster's JSON dump;
+  the prediction is ``base_score + sum(leaf values)``.
+- Isolation Forest flaw detector: the StandardScaler is folded into the
+  split thresholds (``(x - mean) / scale <= t`` becomes
+  ``x <= t * scale + mean``), and each leaf stores its final path length,
+  so a score is one traversal and a sum.
+
+Results match the original models to float32 precision.
+
+Usage:
+    # Benchmark against the current path
+    python -m ml.fast_inference
+    python -m ml.fast_inference --shots 5000
+
+    # Or use programmatically
+    from ml.fast_inference import compile_distance_model
+    fast = compile_distance_model(predictor)
+    carry = fast.predict(ball_speed=165, launch_angle=12, back_spin=2500)
+"""
+
+import argparse
+import json
+import time
+import warnings
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ml.anomaly_detection import FlawDetectionResult, SwingFlawDetector, detect_swing_flaws
+from ml.synthetic import synthetic_dataset
+from ml.train_models import DistancePredictor
+
+try:
+    from sklearn.ensemble._iforest import _average_path_length
+except Exception:
+    _average_path_length = None  # only needed to compile a fitted detector
+
+# Launch-condition arguments of DistancePredictor.predict, in call order
+DISTANCE_INPUTS = (
+    'ball_speed', 'launch_angle', 'back_spin', 'club_speed', 'attack_angle', 'dynamic_loft',
+)
+
+# Feature arguments of SwingFlawDetector's ML model
+FLAW_INPUTS = ('smash', 'attack_angle', 'club_path', 'face_angle', 'impact_x', 'impact_y')
+
+
+class CompiledForest:
+    """
+    A tree ensemble flattened into parallel node arrays.
+
+    Nodes of all trees share one index space. Leaves point to themselves,
+    so every tree can take ``depth`` steps regardless of its own depth.
+
+    Attributes:
+        roots: Root node index of each tree
+        feature, threshold: Split feature and threshold per node
+        left, right: Child node indices per node
+        missing_left: Whether NaN goes left at each node
+        value: Leaf value per node (0 for internal nodes)
+        depth: Maximum tree depth
+        inclusive: Split test is ``x <= t`` (sklearn) instead of ``x < t`` (XGBoost)
+    """
+
+    def __init__(
+        self,
+        trees: Sequence[Dict[str, np.ndarray]],
+        n_features: int,
+        inclusive: bool,
+        dtype: type = np.float64,
+    ):
+        """
+        Flatten trees given as dicts of per-node arrays.
+
+        Args:
+            trees: Per tree: 'left', 'right' (-1 for leaves), 'feature',
+                'threshold', 'value' and optionally 'missing_left'
+            n_features: Width of the input vector
+            inclusive: Use ``<=`` for the split test
+            dtype: Dtype inputs and thresholds are compared in
+        """
+        offsets = np.cumsum([0] + [len(t['left']) for t in trees])
+        self.roots = offsets[:-1].astype(np.intp)
+        self.n_features = n_features
+        self.inclusive = inclusive
+        self.dtype = dtype
+
+        lefts, rights = [], []
+        for offset, tree in zip(offsets, trees):
+            ids = np.arange(len(tree['left'])) + offset
+            is_leaf = np.asarray(tree['left']) < 0
+            lefts.append(np.where(is_leaf, ids, np.asarray(tree['left']) + offset))
+            rights.append(np.where(is_leaf, ids, np.asarray(tree['right']) + offset))
+
+        self.left = np.concatenate(lefts).astype(np.intp)
+        self.right = np.concatenate(rights).astype(np.intp)
+        self.feature = np.concatenate([np.maximum(t['feature'], 0) for t in trees]).astype(np.intp)
+        self.threshold = np.concatenate([t['threshold'] for t in trees]).astype(dtype)
+        self.missing_left = np.concatenate([
+            t.get('missing_left', np.zeros(len(t['left']), dtype=bool)) for t in trees
+        ]).astype(bool)
+        self.value = np.concatenate([t['value'] for t in trees]).astype(np.float64)
+        self.depth = max(_tree_depth(t['left'], t['right']) for t in trees)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def leaf_values(self, x: np.ndarray) -> np.ndarray:
+        """Leaf value reached in every tree for one input vector."""
+        node = self.roots
+        has_nan = np.isnan(x).any()
+        for _ in range(self.depth):
+            xv = x[self.feature[node]]
+            thr = self.threshold[node]
+            go_left = xv <= thr if self.inclusive else xv < thr
+            if has_nan:
+                go_left |= np.isnan(xv) & self.missing_left[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return self.value[node]
+
+    def leaf_values_batch(self, X: np.ndarray) -> np.ndarray:
+        """Leaf values of shape (n_rows, n_trees) for a 2-D input."""
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), self.n_trees))
+        for _ in range(self.depth):
+            xv = X[rows, self.feature[node]]
+            thr = self.threshold[node]
+            go_left = xv <= thr if self.inclusive else xv < thr
+            go_left |= np.isnan(xv) & self.missing_left[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return self.value[node]
+
+
+def _tree_depth(left: Sequence[int], right: Sequence[int]) -> int:
+    """Number of edges on the longest root-to-leaf path."""
+    depth, frontier = 0, [0]
+    while True:
+        frontier = [c for n in frontier for c in (left[n], right[n]) if c >= 0]
+        if not frontier:
+            return depth
+        depth += 1
+
+
+def _node_depths(left: Sequence[int], right: Sequence[int]) -> np.ndarray:
+    """Depth (edges from the root) of every node."""
+    depths = np.zeros(len(left), dtype=np.float64)
+    stack = [0]
+    while stack:
+        node = stack.pop()
+        for child in (left[node], right[node]):
+            if child >= 0:
+                depths[child] = depths[node] + 1
+                stack.append(child)
+    return depths
+
+
+# ---------------------------------------------------------------------------
+# Distance model
+# ---------------------------------------------------------------------------
+
+def _xgb_trees(model: Any) -> Tuple[List[Dict[str, np.ndarray]], float]:
+    """Per-tree node arrays and base score of an XGBoost regressor."""
+    booster = model.get_booster() if hasattr(model, 'get_booster') else model
+    learner = json.loads(booster.save_raw('json'))['learner']
+    if learner['gradient_booster'].get('name') != 'gbtree':
+        raise ValueError("Only gbtree boosters can be compiled")
+    if learner['objective']['name'] != 'reg:squarederror':
+        raise ValueError(f"Unsupported objective: {learner['objective']['name']}")
+
+    trees = learner['gradient_booster']['model']['trees']
+    best_iteration = booster.attributes().get('best_iteration')
+    if best_iteration is not None:
+        trees = trees[:int(best_iteration) + 1]
+
+    base_score = float(learner['learner_model_param']['base_score'].strip('[]'))
+    arrays = []
+    for tree in trees:
+        left = np.asarray(tree['left_children'])
+        is_leaf = left < 0
+        conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+        arrays.append({
+            'left': left,
+            'right': np.asarray(tree['right_children']),
+            'feature': np.asarray(tree['split_indices']),
+            # Leaves keep their value in split_conditions
+            'threshold': np.where(is_leaf, np.float32(0), conditions),
+            'value': np.where(is_leaf, conditions, 0.0),
+            'missing_left': np.asarray(tree['default_left'], dtype=bool),
+        })
+    return arrays, base_score
+
+
+class CompiledDistanceModel:
+    """
+    Compiled XGBoost distance model with a fixed-shape input path.
+
+    Usage:
+        fast = CompiledDistanceModel.from_predictor(predictor)
+        carry = fast.predict(ball_speed=165, launch_angle=12)
+    """
+
+    def __init__(self, forest: CompiledForest, base_score: float, feature_names: Sequence[str]):
+        self.forest = forest
+        self.base_score = base_score
+        self.feature_names = list(feature_names)
+        # Position in DISTANCE_INPUTS for each model feature (-1: always 0.0)
+        self._slots = [
+            DISTANCE_INPUTS.index(name) if name in DISTANCE_INPUTS else -1
+            for name in self.feature_names
+        ]
+        self._x = np.zeros(len(self.feature_names), dtype=np.float32)
+
+    @classmethod
+    def from_predictor(cls, predictor: DistancePredictor) -> 'CompiledDistanceModel':
+        """Compile a DistancePredictor (loaded on demand)."""
+        if not predictor.is_loaded():
+            predictor.load()
+        trees, base_score = _xgb_trees(predictor.model)
+        names = predictor._feature_names
+        forest = CompiledForest(trees, len(names), inclusive=False, dtype=np.float32)
+        return cls(forest, base_score, names)
+
+    def predict_array(self, x: np.ndarray) -> float:
+        """Predict from a feature vector ordered like ``feature_names``."""
+        return self.base_score + float(self.forest.leaf_values(x).sum())
+
+    def predict(
+        self,
+        ball_speed: float,
+        launch_angle: float = 12.0,
+        back_spin: float = 2500,
+        club_speed: Optional[float] = None,
+        attack_angle: Optional[float] = None,
+        dynamic_loft: Optional[float] = None,
+    ) -> float:
+        """
+        Predict carry distance for one shot.
+
+        Missing values are estimated exactly as in DistancePredictor.predict.
+
+        Returns:
+            Predicted carry in yards
+        """
+        if club_speed is None:
+            club_speed = ball_speed / 1.5
+        if attack_angle is None:
+            attack_angle = 0.0
+        if dynamic_loft is None:
+            dynamic_loft = launch_angle + 1.0
+        values = (ball_speed, launch_angle, back_spin, club_speed, attack_angle, dynamic_loft)
+
+        x = self._x
+        for i, slot in enumerate(self._slots):
+            x[i] = values[slot] if slot >= 0 else 0.0
+        return self.predict_array(x)
+
+    def predict_batch(self, df: pd.DataFrame) -> pd.Series:
+        """Predict a DataFrame of shots (missing feature columns are 0.0)."""
+        X = np.column_stack([
+            pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=np.float32)
+            if name in df.columns else np.zeros(len(df), dtype=np.float32)
+            for name in self.feature_names
+        ]) if len(df) else np.empty((0, len(self.feature_names)), dtype=np.float32)
+        return pd.Series(self.base_score + self.forest.leaf_values_batch(X).sum(axis=1), index=df.index)
+
+
+def compile_distance_model(predictor: DistancePredictor) -> CompiledDistanceModel:
+    """Compile a DistancePredictor for single-shot inference."""
+    return CompiledDistanceModel.from_predictor(predictor)
+
+
+# ---------------------------------------------------------------------------
+# Flaw detector
+# ---------------------------------------------------------------------------
+
+class CompiledFlawScorer:
+    """
+    Compiled SwingFlawDetector: folded scaler, precomputed path lengths.
+
+    ``detect`` returns the same FlawDetectionResult as
+    ``SwingFlawDetector.detect``.
+
+    Usage:
+        fast = CompiledFlawScorer.from_detector(detector)
+        result = fast.detect(smash=1.38, club_path=4.0, face_angle=-1.0)
+    """
+
+    def __init__(self, forest: CompiledForest, normalizer: float, offset: float, feature_names: Sequence[str]):
+        self.forest = forest
+        self.normalizer = normalizer
+        self.offset = offset
+        self.feature_names = list(feature_names)
+        self._slots = [FLAW_INPUTS.index(name) for name in self.feature_names]
+        self._x = np.zeros(len(self.feature_names), dtype=np.float64)
+
+    @classmethod
+    def from_detector(cls, detector: SwingFlawDetector) -> 'CompiledFlawScorer':
+        """
+        Compile a fitted SwingFlawDetector.
+
+        Raises:
+            ValueError: If the detector is not fitted
+        """
+        if not detector.is_fitted():
+            raise ValueError("SwingFlawDetector must be fitted before compiling")
+        forest_model = detector.model
+        mean = detector.scaler.mean_
+        scale = detector.scaler.scale_
+        n_features = len(detector._feature_names)
+
+        trees = []
+        for estimator, features in zip(forest_model.estimators_, forest_model.estimators_features_):
+            tree = estimator.tree_
+            left, right = tree.children_left, tree.children_right
+            is_leaf = left < 0
+            # Map a tree trained on a feature subset back to input columns
+            columns = np.asarray(features) if len(features) != n_features else np.arange(n_features)
+            feature = np.where(is_leaf, 0, columns[np.maximum(tree.feature, 0)])
+            # sklearn compares float32 scaled inputs; fold the scaler into thresholds
+            threshold = np.where(is_leaf, 0.0, tree.threshold * scale[feature] + mean[feature])
+            path_length = _node_depths(left, right) + _average_path_length(tree.n_node_samples)
+            trees.append({
+                'left': left,
+                'right': right,
+                'feature': feature,
+                'threshold': threshold,
+                'value': np.where(is_leaf, path_length, 0.0),
+            })
+
+        forest = CompiledForest(trees, n_features, inclusive=True)
+        normalizer = len(trees) * float(_average_path_length([forest_model.max_samples_])[0])
+        return cls(forest, normalizer, float(forest_model.offset_), detector._feature_names)
+
+    def score_array(self, x: np.ndarray) -> float:
+        """Isolation Forest ``score_samples`` value for one feature vector."""
+        return -(2.0 ** (-self.forest.leaf_values(x).sum() / self.normalizer))
+
+    def score(self, **features: Optional[float]) -> Tuple[float, float, bool]:
+        """
+        Score one shot.
+
+        Args:
+            **features: Any of FLAW_INPUTS (missing or None is 0.0, as in detect)
+
+        Returns:
+            Tuple of (raw score, normalized 0-1 ml_score, is_ml_outlier)
+        """
+        values = [features.get(name) or 0.0 for name in FLAW_INPUTS]
+        x = self._x
+        for i, slot in enumerate(self._slots):
+            x[i] = values[slot]
+        raw = self.score_array(x)
+        ml_score = max(0.0, min(1.0, 1 - (raw + 1) / 0.5))
+        return raw, ml_score, raw - self.offset < 0
+
+    def detect(
+        self,
+        ball_speed: Optional[float] = None,
+        club_speed: Optional[float] = None,
+        attack_angle: Optional[float] = None,
+        club_path: Optional[float] = None,
+        face_angle: Optional[float] = None,
+        impact_x: Optional[float] = None,
+        impact_y: Optional[float] = None,
+        back_spin: Optional[float] = None,
+        smash: Optional[float] = None,
+    ) -> FlawDetectionResult:
+        """Compiled equivalent of SwingFlawDetector.detect."""
+        rule_result = detect_swing_flaws(
+            ball_speed=ball_speed,
+            club_speed=club_speed,
+            attack_angle=attack_angle,
+            club_path=club_path,
+            face_angle=face_angle,
+            impact_x=impact_x,
+            impact_y=impact_y,
+            back_spin=back_spin,
+            smash=smash,
+        )
+        if smash is None and ball_speed and club_speed and club_speed > 0:
+            smash = ball_speed / club_speed
+
+        _, ml_score, is_ml_outlier = self.score(
+            smash=smash, attack_angle=attack_angle, club_path=club_path,
+            face_angle=face_angle, impact_x=impact_x, impact_y=impact_y,
+        )
+        details = rule_result.details.copy()
+        details['ml_score'] = ml_score
+        details['ml_outlier'] = is_ml_outlier
+        return FlawDetectionResult(
+            flaws=rule_result.flaws,
+            anomaly_score=(rule_result.anomaly_score + ml_score) / 2,
+            is_outlier=rule_result.is_outlier or is_ml_outlier,
+            details=details,
+        )
+
+
+def compile_flaw_detector(detector: SwingFlawDetector) -> CompiledFlawScorer:
+    """Compile a fitted SwingFlawDetector for single-shot inference."""
+    return CompiledFlawScorer.from_detector(detector)
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def _time_calls(fn, rows: List[Dict[str, float]]) -> Dict[str, float]:
+    """Per-call latency percentiles in microseconds."""
+    timings = np.empty(len(rows))
+    for i, row in enumerate(rows):
+        t0 = time.perf_counter()
+        fn(row)
+        timings[i] = time.perf_counter() - t0
+    timings *= 1e6
+    return {
+        'p50_us': float(np.percentile(timings, 50)),
+        'p99_us': float(np.percentile(timings, 99)),
+        'mean_us': float(timings.mean()),
+    }
+
+
+def run_benchmark(shots: int = 2000, predictor: Optional[DistancePredictor] = None, seed: int = 7) -> Dict[str, Any]:
+    """
+    Time single-shot inference: current path vs compiled path.
+
+    Args:
+        shots: Number of single-shot calls per path
+        predictor: Distance model to compile (trained on synthetic data if None)
+        seed: Synthetic data seed
+
+    Returns:
+        Dict of per-model latency stats, speedups and max prediction error
+    """
+    import contextlib
+    import io
+    from ml.train_models import train_distance_model
+
+    data = synthetic_dataset(max(shots, 1000), seed=seed)
+    if predictor is None:
+        predictor = DistancePredictor()
+        with contextlib.redirect_stdout(io.StringIO()):
+            predictor.model, predictor.metadata = train_distance_model(data, cross_validate=False)
+        predictor._feature_names = predictor.metadata.features
+    detector = SwingFlawDetector()
+    detector.fit(data)
+
+    fast_distance = compile_distance_model(predictor)
+    fast_detector = compile_flaw_detector(detector)
+
+    distance_rows = data[list(DISTANCE_INPUTS)].head(shots).to_dict('records')
+    flaw_cols = ['ball_speed', 'club_speed', 'attack_angle', 'club_path', 'face_angle', 'impact_x', 'impact_y', 'back_spin']
+    flaw_rows = data[flaw_cols].head(shots).to_dict('records')
+
+    results: Dict[str, Any] = {'shots': len(distance_rows), 'trees': {
+        'distance': fast_distance.forest.n_trees, 'flaw_detector': fast_detector.forest.n_trees,
+    }}
+    for name, current, compiled, rows in (
+        ('distance', lambda r: predictor.predict(**r), lambda r: fast_distance.predict(**r), distance_rows),
+        ('flaw_detector', lambda r: detector.detect(**r), lambda r: fast_detector.detect(**r), flaw_rows),
+    ):
+        before = _time_calls(current, rows)
+        after = _time_calls(compiled, rows)
+        results[name] = {
+            'current': before,
+            'compiled': after,
+            'speedup_p50': before['p50_us'] / after['p50_us'],
+        }
+
+    sample = distance_rows[:200]
+    results['distance']['max_abs_error'] = max(
+        abs(predictor.predict(**r).predicted_value - fast_distance.predict(**r)) for r in sample
+    )
+    results['flaw_detector']['max_abs_error'] = max(
+        abs(detector.detect(**r).anomaly_score - fast_detector.detect(**r).anomaly_score)
+        for r in flaw_rows[:200]
+    )
+    return results
+
+
+def main():
+    """Benchmark compiled single-shot inference from command line."""
+    parser = argparse.ArgumentParser(description="Benchmark compiled single-shot inference")
+    parser.add_argument('--shots', type=int, default=2000, help="Single-shot calls per path")
+    parser.add_argument(
+        '--saved-model', action='store_true',
+        help="Compile the saved distance model instead of one trained on synthetic data",
+    )
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    predictor = None
+    if args.saved_model:
+        predictor = DistancePredictor()
+        predictor.load()
+    with warnings.catch_warnings():
+        # detect() passes arrays to a scaler fitted on a DataFrame
+        warnings.simplefilter('ignore', UserWarning)
+        results = run_benchmark(args.shots, predictor=predictor)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"Single-shot latency over {results['shots']} calls (microseconds)")
+    for name in ('distance', 'flaw_detector'):
+        r = results[name]
+        print(f"  {name} ({results['trees'][name]} trees)")
+        print(f"    current   p50 {r['current']['p50_us']:9.1f}   p99 {r['current']['p99_us']:9.1f}")
+        print(f"    compiled  p50 {r['compiled']['p50_us']:9.1f}   p99 {r['compiled']['p99_us']:9.1f}")
+        print(f"    speedup   {r['speedup_p50']:.1f}x   max abs error {r['max_abs_error']:.2e}")
+
+
+if __name__ == '__main__':
+    main()
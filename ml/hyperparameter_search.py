@@ -0,0 +1,277 @@
+"""
+Parallel Hyperparameter Search for the Distance Model.
+
+Runs a bounded random or successive-halving search over XGBoost
+parameters and candidate feature sets, scoring each candidate with
+k-fold cross-validation MAE. The feature matrix and fold splits are built
+once and shipped to each worker process a single time (via the pool
+initializer), every fit uses early stopping on its validation fold, and
+candidates are spread across all cores with one XGBoost thread each, so
+wall time scales with the number of cores.
+
+Usage:
+    python -m ml.train_models --search
+    python -m ml.train_models --search --strategy random --trials 40
+
+    # Or use programmatically
+    from ml.hyperparameter_search import search_hyperparameters
+    result = search_hyperparameters(df)
+    predictor.train(df, search=result.summary())
+"""
+
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ml.train_models import check_ml_deps, get_training_data, prepare_features
+
+try:
+    from sklearn.model_selection import KFold
+    from sklearn.metrics import mean_absolute_error
+    import xgboost as xgb
+except Exception:
+    xgb = None  # check_ml_deps() reports the missing dependency
+
+STRATEGIES = ('halving', 'random')
+
+# Candidate feature subsets; None means every available feature
+FEATURE_SETS: Dict[str, Optional[List[str]]] = {
+    'all': None,
+    'no_dynamic_loft': ['ball_speed', 'launch_angle', 'back_spin', 'club_speed', 'attack_angle'],
+    'launch_and_club_speed': ['ball_speed', 'launch_angle', 'back_spin', 'club_speed'],
+    'launch_only': ['ball_speed', 'launch_angle', 'back_spin'],
+}
+
+EARLY_STOPPING_ROUNDS = 25
+MIN_ROUNDS = 50
+MAX_ROUNDS = 800
+HALVING_ETA = 3
+
+
+@dataclass
+class Trial:
+    """One evaluated candidate at one budget."""
+    trial_id: int
+    params: Dict[str, Any]
+    feature_set: str
+    rounds: int
+    cv_mae: float = float('nan')
+    best_rounds: int = 0
+
+
+@dataclass
+class SearchResult:
+    """Winning configuration and the trials behind it."""
+    strategy: str
+    best: Trial
+    features: List[str]
+    trials: List[Trial] = field(default_factory=list)
+    workers: int = 1
+    wall_time_s: float = 0.0
+
+    @property
+    def hyperparameters(self) -> Dict[str, Any]:
+        """Winning XGBoost parameters, with n_estimators from early stopping."""
+        return {**self.best.params, 'n_estimators': self.best.best_rounds}
+
+    def summary(self, top: int = 5) -> Dict[str, Any]:
+        """JSON-serializable summary stored in ModelMetadata.search."""
+        final = sorted(
+            (t for t in self.trials if not math.isnan(t.cv_mae)),
+            key=lambda t: t.cv_mae,
+        )
+        return {
+            'strategy': self.strategy,
+            'hyperparameters': self.hyperparameters,
+            'features': self.features,
+            'feature_set': self.best.feature_set,
+            'cv_mae': self.best.cv_mae,
+            'evaluations': len(self.trials),
+            'candidates': len({t.trial_id for t in self.trials}),
+            'workers': self.workers,
+            'wall_time_s': round(self.wall_time_s, 2),
+            'top_trials': [
+                {'trial_id': t.trial_id, 'feature_set': t.feature_set, 'rounds': t.best_rounds,
+                 'cv_mae': t.cv_mae, 'params': t.params}
+                for t in final[:top]
+            ],
+        }
+
+
+def sample_params(rng: np.random.Generator) -> Dict[str, Any]:
+    """Draw one XGBoost configuration from the search space."""
+    return {
+        'max_depth': int(rng.integers(3, 9)),
+        'learning_rate': float(np.exp(rng.uniform(np.log(0.02), np.log(0.3)))),
+        'subsample': float(rng.uniform(0.6, 1.0)),
+        'colsample_bytree': float(rng.uniform(0.6, 1.0)),
+        'min_child_weight': float(rng.integers(1, 11)),
+        'reg_lambda': float(np.exp(rng.uniform(np.log(0.1), np.log(10.0)))),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Worker side (module level so it pickles under the spawn context)
+# ---------------------------------------------------------------------------
+
+_SHARED: Dict[str, Any] = {}
+
+
+def _init_worker(X: np.ndarray, y: np.ndarray, folds: List[Tuple[np.ndarray, np.ndarray]], seed: int) -> None:
+    _SHARED.update(X=X, y=y, folds=folds, seed=seed)
+
+
+def _evaluate(trial: Trial, columns: Sequence[int]) -> Trial:
+    """Cross-validated MAE of one candidate with early stopping per fold."""
+    X = _SHARED['X'][:, list(columns)]
+    y = _SHARED['y']
+    maes, rounds = [], []
+    for train_idx, val_idx in _SHARED['folds']:
+        model = xgb.XGBRegressor(
+            **trial.params,
+            n_estimators=trial.rounds,
+            early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+            objective='reg:squarederror',
+            random_state=_SHARED['seed'],
+            n_jobs=1,
+        )
+        model.fit(X[train_idx], y[train_idx], eval_set=[(X[val_idx], y[val_idx])], verbose=False)
+        maes.append(mean_absolute_error(y[val_idx], model.predict(X[val_idx])))
+        rounds.append(model.best_iteration + 1)
+    trial.cv_mae = float(np.mean(maes))
+    trial.best_rounds = int(round(np.mean(rounds)))
+    return trial
+
+
+# ---------------------------------------------------------------------------
+# Orchestration
+# ---------------------------------------------------------------------------
+
+def _run_rung(pool: Optional[ProcessPoolExecutor], trials: List[Trial], columns: Dict[str, List[int]]) -> List[Trial]:
+    if pool is None:
+        return [_evaluate(t, columns[t.feature_set]) for t in trials]
+    futures = [pool.submit(_evaluate, t, columns[t.feature_set]) for t in trials]
+    return [f.result() for f in futures]
+
+
+def search_hyperparameters(
+    df: Optional[pd.DataFrame] = None,
+    target: str = 'carry',
+    strategy: str = 'halving',
+    n_trials: int = 27,
+    workers: Optional[int] = None,
+    cv_folds: int = 5,
+    seed: int = 42,
+    min_rounds: int = MIN_ROUNDS,
+    max_rounds: int = MAX_ROUNDS,
+) -> SearchResult:
+    """
+    Search XGBoost parameters and feature sets for the distance model.
+
+    'random' evaluates every candidate at ``max_rounds``. 'halving'
+    (successive halving) evaluates all candidates at ``min_rounds``, keeps
+    the best third, triples the budget, and repeats until one candidate
+    is left or the budget reaches ``max_rounds``. Early stopping caps each
+    fit either way.
+
+    Args:
+        df: Shot data (loads from database if not provided)
+        target: Target column ('carry' or 'total')
+        strategy: 'halving' or 'random'
+        n_trials: Number of candidate configurations
+        workers: Worker processes (default: CPU count)
+        cv_folds: Cross-validation folds
+        seed: Seed for candidate sampling, folds and XGBoost
+        min_rounds: First-rung boosting budget for successive halving
+        max_rounds: Maximum boosting rounds per fit
+
+    Returns:
+        SearchResult with the winning configuration
+    """
+    check_ml_deps()
+    if strategy not in STRATEGIES:
+        raise ValueError(f"strategy must be one of {STRATEGIES}")
+    if n_trials < 1:
+        raise ValueError("n_trials must be >= 1")
+
+    if df is None:
+        df = get_training_data()
+
+    # Feature matrix and folds are built once for the whole search
+    X_df, y_series = prepare_features(df, target)
+    available = list(X_df.columns)
+    X = X_df.to_numpy(dtype=np.float32)
+    y = y_series.to_numpy(dtype=np.float32)
+    folds = list(KFold(n_splits=cv_folds, shuffle=True, random_state=seed).split(X))
+
+    # Column indices per feature set, skipping sets that collapse to a duplicate
+    columns: Dict[str, List[int]] = {}
+    seen = set()
+    for name, subset in FEATURE_SETS.items():
+        chosen = available if subset is None else [f for f in subset if f in available]
+        key = tuple(sorted(chosen))
+        if chosen and key not in seen:
+            seen.add(key)
+            columns[name] = [available.index(f) for f in chosen]
+
+    rng = np.random.default_rng(seed)
+    set_names = list(columns)
+    candidates = [
+        Trial(
+            trial_id=i,
+            params=sample_params(rng),
+            feature_set=set_names[i % len(set_names)],
+            rounds=min_rounds if strategy == 'halving' else max_rounds,
+        )
+        for i in range(n_trials)
+    ]
+
+    max_workers = max(1, min(workers or os.cpu_count() or 1, n_trials))
+    started = time.perf_counter()
+    history: List[Trial] = []
+    pool = None
+    if max_workers > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(X, y, folds, seed),
+        )
+    else:
+        _init_worker(X, y, folds, seed)
+
+    try:
+        rung = candidates
+        while True:
+            results = _run_rung(pool, rung, columns)
+            history.extend(results)
+            ranked = sorted(results, key=lambda t: t.cv_mae)
+            budget = rung[0].rounds
+            if strategy == 'random' or len(ranked) == 1 or budget >= max_rounds:
+                best = ranked[0]
+                break
+            keep = max(1, math.ceil(len(ranked) / HALVING_ETA))
+            next_budget = min(max_rounds, budget * HALVING_ETA)
+            rung = [
+                Trial(t.trial_id, t.params, t.feature_set, next_budget)
+                for t in ranked[:keep]
+            ]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return SearchResult(
+        strategy=strategy,
+        best=best,
+        features=[available[i] for i in columns[best.feature_set]],
+        trials=history,
+        workers=max_workers,
+        wall_time_s=time.perf_counter() - started,
+    )
@@ -0,0 +1,325 @@
+"""
+Process-wide Model Registry for GolfDataApp.
+
+Loads each model once per process and hands the same instance to every
+caller: LocalCoach objects, Streamlit sessions and agent tools all share
+one DistancePredictor instead of re-reading the joblib file per coach.
+
+File-backed models are hot reloaded: the model file's mtime/size is
+checked at most once per ``check_interval`` seconds and the model is
+reloaded when it changes (e.g. after ``python -m ml.train_models``). A
+failed reload keeps serving the previous instance.
+
+Shared instances must be treated as read-only by callers.
+
+Usage:
+    from ml.registry import model_registry
+
+    predictor = model_registry.get('distance')  # None if no model on disk
+    for stats in model_registry.stats():
+        print(stats.name, stats.load_time_ms, stats.memory_bytes)
+"""
+
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# A path, or a zero-argument callable resolving it lazily
+PathSpec = Union[Path, Callable[[], Path], None]
+
+
+@dataclass(frozen=True)
+class ModelStats:
+    """
+    Load statistics for one registered model.
+
+    ``memory_bytes`` is the growth in tracemalloc-traced memory during the
+    load (Python and NumPy allocations); native allocations inside
+    libraries such as XGBoost are not counted.
+    """
+    name: str
+    path: Optional[str]
+    version: Optional[str]
+    loaded: bool
+    load_time_ms: float
+    memory_bytes: int
+    loaded_at: Optional[float]
+    loads: int
+    hits: int
+
+
+class _Entry:
+    """Registry slot for one model (guarded by its own lock)."""
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[..., Any],
+        path: PathSpec,
+        version: Optional[Callable[[Any], Optional[str]]],
+    ):
+        self.name = name
+        self.loader = loader
+        self.path_spec = path
+        self.version_fn = version
+        self.lock = threading.Lock()
+        self.instance: Any = None
+        self.stamp: Optional[Tuple[int, int]] = None
+        self.checked_at = float('-inf')
+        self.version: Optional[str] = None
+        self.load_time_ms = 0.0
+        self.memory_bytes = 0
+        self.loaded_at: Optional[float] = None
+        self.loads = 0
+        self.hits = 0
+
+    @property
+    def path(self) -> Optional[Path]:
+        if callable(self.path_spec):
+            return Path(self.path_spec())
+        return self.path_spec
+
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class ModelRegistry:
+    """
+    Thread-safe, lazily loading cache of model instances.
+
+    Each model loads under its own lock, so concurrent first requests load
+    it once and other models stay available meanwhile. Loads themselves
+    are serialized so the tracemalloc-based memory figure is attributable
+    to a single model.
+
+    Usage:
+        registry = ModelRegistry()
+        registry.register('distance', load_fn, path=model_path)
+        model = registry.get('distance')
+    """
+
+    def __init__(self, check_interval: float = 2.0, track_memory: bool = True):
+        """
+        Initialize the registry.
+
+        Args:
+            check_interval: Seconds between model file change checks
+            track_memory: Measure allocations during load with tracemalloc
+        """
+        self.check_interval = check_interval
+        self.track_memory = track_memory
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self._load_lock = threading.RLock()
+
+    def register(
+        self,
+        name: str,
+        loader: Callable[..., Any],
+        path: PathSpec = None,
+        version: Optional[Callable[[Any], Optional[str]]] = None,
+    ) -> None:
+        """
+        Register a model loader.
+
+        Args:
+            name: Registry key
+            loader: Called as ``loader(path)`` for file-backed models,
+                ``loader()`` otherwise
+            path: Model file to watch for hot reload (or a callable
+                returning it). Without a path the model loads once.
+            version: Optional ``fn(instance) -> str`` reporting the model
+                version; defaults to the file mtime
+        """
+        with self._lock:
+            self._entries[name] = _Entry(name, loader, path, version)
+
+    def is_registered(self, name: str) -> bool:
+        """Check if a model name is registered."""
+        return name in self._entries
+
+    def get(self, name: str) -> Optional[Any]:
+        """
+        Get the shared instance of a model, loading or reloading as needed.
+
+        Args:
+            name: Registered model name
+
+        Returns:
+            The model instance, or None if its file is missing or the
+            first load failed
+
+        Raises:
+            KeyError: If the name is not registered
+        """
+        entry = self._entries[name]
+        with entry.lock:
+            now = time.monotonic()
+            if now - entry.checked_at >= self.check_interval:
+                entry.checked_at = now
+                self._refresh(entry)
+            entry.hits += 1
+            return entry.instance
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Drop cached instances so the next ``get`` reloads them.
+
+        Args:
+            name: Model to drop (all models if not specified)
+        """
+        names = [name] if name is not None else list(self._entries)
+        for key in names:
+            entry = self._entries[key]
+            with entry.lock:
+                entry.instance = None
+                entry.stamp = None
+                entry.checked_at = float('-inf')
+
+    def stats(self) -> List[ModelStats]:
+        """Load time, memory and usage statistics for every registered model."""
+        result = []
+        for entry in list(self._entries.values()):
+            with entry.lock:
+                path = entry.path
+                result.append(ModelStats(
+                    name=entry.name,
+                    path=str(path) if path is not None else None,
+                    version=entry.version,
+                    loaded=entry.instance is not None,
+                    load_time_ms=entry.load_time_ms,
+                    memory_bytes=entry.memory_bytes,
+                    loaded_at=entry.loaded_at,
+                    loads=entry.loads,
+                    hits=entry.hits,
+                ))
+        return result
+
+    def _refresh(self, entry: _Entry) -> None:
+        """Load the entry if it is new or its file changed (entry lock held)."""
+        path = entry.path
+        if path is None:
+            if entry.stamp is None:
+                entry.stamp = (0, 0)
+                self._load(entry, ())
+            return
+
+        stamp = _file_stamp(path)
+        if stamp is None:
+            if entry.instance is not None:
+                logger.info("Model file for '%s' removed: %s", entry.name, path)
+            entry.instance = None
+            entry.stamp = None
+            return
+        if stamp != entry.stamp:
+            # Record the stamp first so a broken file is not retried every call
+            entry.stamp = stamp
+            self._load(entry, (path,), default_version=f"mtime:{stamp[0]}")
+
+    def _load(self, entry: _Entry, args: tuple, default_version: Optional[str] = None) -> None:
+        """Run the loader, recording time and memory (entry lock held)."""
+        with self._load_lock:
+            started_tracing = self.track_memory and not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0] if self.track_memory else 0
+            t0 = time.perf_counter()
+            try:
+                instance = entry.loader(*args)
+            except Exception as exc:
+                logger.warning("Failed to load model '%s': %s", entry.name, exc)
+                return
+            finally:
+                elapsed_ms = (time.perf_counter() - t0) * 1000
+                after = tracemalloc.get_traced_memory()[0] if self.track_memory else 0
+                if started_tracing:
+                    tracemalloc.stop()
+
+        version = default_version
+        if entry.version_fn is not None:
+            try:
+                version = entry.version_fn(instance) or version
+            except Exception:
+                pass
+
+        entry.instance = instance
+        entry.version = version
+        entry.load_time_ms = elapsed_ms
+        entry.memory_bytes = max(0, after - before)
+        entry.loaded_at = time.time()
+        entry.loads += 1
+        if entry.loads > 1:
+            logger.info("Reloaded model '%s' (%s)", entry.name, version)
+
+
+def _distance_model_path() -> Path:
+    from ml.train_models import DISTANCE_MODEL_PATH
+    return DISTANCE_MODEL_PATH
+
+
+def _load_distance_predictor(path: Path) -> Any:
+    from ml.train_models import DistancePredictor
+    predictor = DistancePredictor(model_path=path)
+    predictor.load()
+    return predictor
+
+
+def _distance_version(predictor: Any) -> Optional[str]:
+    return predictor.metadata.version if predictor.metadata else None
+
+
+def _load_compiled_distance_model(path: Path) -> Any:
+    from ml.fast_inference import compile_distance_model
+    return compile_distance_model(_load_distance_predictor(path))
+
+
+def _club_manifest_path() -> Path:
+    from ml.club_models import MANIFEST_PATH
+    return MANIFEST_PATH
+
+
+def _load_club_distance_predictor(path: Path) -> Any:
+    # Shards load lazily per club; a new manifest replaces the whole family
+    from ml.club_models import ClubDistancePredictor
+    return ClubDistancePredictor(path)
+
+
+def _club_distance_version(predictor: Any) -> Optional[str]:
+    return predictor.manifest.get('updated_at')
+
+
+def _load_shot_classifier() -> Any:
+    from ml.classifiers import ShotShapeClassifier
+    return ShotShapeClassifier()
+
+
+def _load_flaw_detector() -> Any:
+    from ml.anomaly_detection import SwingFlawDetector
+    return SwingFlawDetector()
+
+
+# Shared by LocalCoach, Streamlit sessions and agent tools
+model_registry = ModelRegistry()
+model_registry.register(
+    'distance', _load_distance_predictor, path=_distance_model_path, version=_distance_version,
+)
+model_registry.register('distance_compiled', _load_compiled_distance_model, path=_distance_model_path)
+model_registry.register(
+    'distance_by_club', _load_club_distance_predictor,
+    path=_club_manifest_path, version=_club_distance_version,
+)
+model_registry.register('shot_classifier', _load_shot_classifier)
+model_registry.register('flaw_detector', _load_flaw_detector)
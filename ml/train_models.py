@@ -8,6 +8,12 @@ Usage:
     # Train a new model
     python -m ml.train_models
 
+    # Update the existing model on shots added since it was trained
+    python -m ml.train_models --incremental
+
+    # Search hyperparameters and feature sets across all cores, then train
+    python -m ml.train_models --search
+
     # Or use programmatically
     from ml.train_models import train_distance_model, DistancePredictor
     predictor = DistancePredictor()
@@ -17,6 +23,7 @@ Usage:
 
 import os
 import json
+import argparse
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any, List, Tuple
@@ -55,6 +62,13 @@ MODELS_DIR = Path(__file__).parent.parent / 'models'
 DISTANCE_MODEL_PATH = MODELS_DIR / 'distance_model.joblib'
 MODEL_METADATA_PATH = MODELS_DIR / 'model_metadata.json'
 
+# Parameters used when no search result is given
+DEFAULT_HYPERPARAMETERS = {
+    'n_estimators': 100,
+    'max_depth': 5,
+    'learning_rate': 0.1,
+}
+
 # Trusted directory for model loading (security: prevent path traversal)
 TRUSTED_MODEL_DIR = MODELS_DIR
 
@@ -70,6 +84,31 @@ class ModelMetadata:
     target: str
     metrics: Dict[str, float]
     hyperparameters: Dict[str, Any]
+    # Incremental training state (defaults keep older metadata files loadable)
+    data_watermark: Optional[str] = None  # Latest date_added the model has seen
+    training_mode: str = 'full'
+    incremental_updates: int = 0  # Incremental updates since the last full build
+    # Winning configuration and metrics from a --search run, if any
+    search: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class DriftReport:
+    """Accuracy of the current model on shots it has not seen yet."""
+    new_samples: int
+    baseline_mae: float
+    window_mae: float
+    drift_ratio: float
+    drifted: bool
+
+
+@dataclass
+class RetrainResult:
+    """Outcome of an incremental retraining run."""
+    action: str  # 'skipped', 'incremental', 'full'
+    reason: str
+    drift: Optional[DriftReport] = None
+    metadata: Optional[ModelMetadata] = None
 
 
 @dataclass
@@ -169,13 +208,18 @@ def get_training_data() -> pd.DataFrame:
     return df
 
 
-def prepare_features(df: pd.DataFrame, target: str = 'carry') -> Tuple[pd.DataFrame, pd.Series]:
+def prepare_features(
+    df: pd.DataFrame,
+    target: str = 'carry',
+    min_samples: int = 50,
+) -> Tuple[pd.DataFrame, pd.Series]:
     """
     Prepare features for training.
 
     Args:
         df: Raw shot data
         target: Target column to predict
+        min_samples: Minimum number of valid rows required
 
     Returns:
         Tuple of (features DataFrame, target Series)
@@ -198,7 +242,7 @@ def prepare_features(df: pd.DataFrame, target: str = 'carry') -> Tuple[pd.DataFr
 
     df_clean = df[valid_mask].copy()
 
-    if len(df_clean) < 50:
+    if len(df_clean) < min_samples:
         raise ValueError(f"Insufficient training data: {len(df_clean)} samples")
 
     # Extract features that exist
@@ -219,6 +263,10 @@ def train_distance_model(
     target: str = 'carry',
     test_size: float = 0.2,
     random_state: int = 42,
+    cross_validate: bool = True,
+    n_jobs: Optional[int] = None,
+    hyperparameters: Optional[Dict[str, Any]] = None,
+    features: Optional[List[str]] = None,
 ) -> Tuple[Any, ModelMetadata]:
     """
     Train an XGBoost model for distance prediction.
@@ -228,6 +276,10 @@ def train_distance_model(
         target: Target column ('carry' or 'total')
         test_size: Fraction for test set
         random_state: Random seed
+        cross_validate: Also report 5-fold cross-validation MAE
+        n_jobs: XGBoost threads (None uses the library default)
+        hyperparameters: XGBoost parameters (DEFAULT_HYPERPARAMETERS if None)
+        features: Feature subset to train on (all available if None)
 
     Returns:
         Tuple of (trained model, metadata)
@@ -240,7 +292,10 @@ def train_distance_model(
 
     # Prepare features
     X, y = prepare_features(df, target)
+    if features is not None:
+        X = X[[f for f in features if f in X.columns]]
     features = list(X.columns)
+    params = dict(hyperparameters or DEFAULT_HYPERPARAMETERS)
 
     print(f"Training with {len(X)} samples, {len(features)} features")
     print(f"Features: {features}")
@@ -252,11 +307,10 @@ def train_distance_model(
 
     # Train XGBoost model
     model = xgb.XGBRegressor(
-        n_estimators=100,
-        max_depth=5,
-        learning_rate=0.1,
+        **params,
         objective='reg:squarederror',
         random_state=random_state,
+        n_jobs=n_jobs,
     )
 
     model.fit(X_train, y_train)
@@ -271,10 +325,17 @@ def train_distance_model(
     print(f"Test RMSE: {rmse:.2f} yards")
     print(f"Test R2: {r2:.3f}")
 
+    metrics = {
+        'mae': mae,
+        'rmse': rmse,
+        'r2': r2,
+    }
+
     # Cross-validation
-    cv_scores = cross_val_score(model, X, y, cv=5, scoring='neg_mean_absolute_error')
-    cv_mae = -cv_scores.mean()
-    print(f"Cross-validation MAE: {cv_mae:.2f} yards (+/- {cv_scores.std():.2f})")
+    if cross_validate:
+        cv_scores = cross_val_score(model, X, y, cv=5, scoring='neg_mean_absolute_error')
+        metrics['cv_mae'] = -cv_scores.mean()
+        print(f"Cross-validation MAE: {metrics['cv_mae']:.2f} yards (+/- {cv_scores.std():.2f})")
 
     # Create metadata
     metadata = ModelMetadata(
@@ -284,20 +345,240 @@ def train_distance_model(
         training_samples=len(X),
         features=features,
         target=target,
+        metrics=metrics,
+        hyperparameters=params,
+        data_watermark=_latest_date_added(df),
+    )
+
+    return model, metadata
+
+
+def _date_added(df: pd.DataFrame) -> pd.Series:
+    """date_added as UTC timestamps (naive values are taken as UTC)."""
+    if 'date_added' not in df.columns:
+        return pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns, UTC]')
+    return pd.to_datetime(df['date_added'], errors='coerce', utc=True, format='mixed')
+
+
+def _latest_date_added(df: pd.DataFrame) -> Optional[str]:
+    """Latest date_added in the data as an ISO string, if known."""
+    latest = _date_added(df).max()
+    return None if pd.isna(latest) else latest.isoformat()
+
+
+def _shots_since(df: pd.DataFrame, watermark: Optional[str]) -> pd.DataFrame:
+    """Shots added after the watermark, oldest first."""
+    if not watermark:
+        return df.iloc[0:0]
+    # Compare as naive UTC datetime64 so the filter stays vectorized
+    cutoff = pd.Timestamp(watermark)
+    if cutoff.tzinfo is not None:
+        cutoff = cutoff.tz_convert(None)
+    added = _date_added(df).dt.tz_convert(None).to_numpy()
+    positions = np.flatnonzero(added > cutoff.to_datetime64())
+    order = positions[np.argsort(added[positions], kind='stable')]
+    return df.iloc[order]
+
+
+def check_drift(
+    model,
+    metadata: ModelMetadata,
+    df_new: pd.DataFrame,
+    tolerance: float = 0.15,
+    min_samples: int = 30,
+) -> DriftReport:
+    """
+    Measure model accuracy on shots added after it was trained.
+
+    Those shots were never used for fitting, so they form a natural
+    held-out window. The model counts as drifted when its MAE on the
+    window exceeds its recorded MAE by more than ``tolerance``.
+
+    Args:
+        model: Trained model
+        metadata: Metadata of the trained model
+        df_new: Shots added since the model's watermark
+        tolerance: Allowed relative MAE increase (0.15 = 15%)
+        min_samples: Minimum valid shots needed to judge drift
+
+    Returns:
+        DriftReport
+    """
+    X, y = prepare_features(df_new, metadata.target, min_samples=min_samples)
+    X = X.reindex(columns=metadata.features, fill_value=0.0)
+    window_mae = float(mean_absolute_error(y, model.predict(X)))
+    baseline_mae = float(metadata.metrics['mae'])
+    ratio = window_mae / baseline_mae if baseline_mae > 0 else float('inf')
+    return DriftReport(
+        new_samples=len(X),
+        baseline_mae=baseline_mae,
+        window_mae=window_mae,
+        drift_ratio=ratio,
+        drifted=ratio > 1 + tolerance,
+    )
+
+
+def continue_training(
+    model,
+    metadata: ModelMetadata,
+    df_new: pd.DataFrame,
+    rounds: int = 25,
+    holdout_fraction: float = 0.2,
+    min_samples: int = 30,
+) -> Tuple[Any, ModelMetadata]:
+    """
+    Continue boosting an existing XGBoost model on new shots.
+
+    The most recent ``holdout_fraction`` of the new shots is held out to
+    score the update; the earlier shots add ``rounds`` trees on top of the
+    existing booster. The old model is scored on the same held-out shots
+    (``metrics['holdout_previous_mae']``) so the two can be compared.
+
+    Args:
+        model: Trained XGBRegressor
+        metadata: Metadata of the trained model
+        df_new: Shots added since the model's watermark, oldest first
+        rounds: Boosting rounds to add
+        holdout_fraction: Share of the newest shots used for evaluation
+        min_samples: Minimum valid new shots required
+
+    Returns:
+        Tuple of (updated model, updated metadata)
+    """
+    check_ml_deps()
+
+    X, y = prepare_features(df_new, metadata.target, min_samples=min_samples)
+    X = X.reindex(columns=metadata.features, fill_value=0.0)
+    n_holdout = max(1, int(len(X) * holdout_fraction))
+    X_fit, y_fit = X.iloc[:-n_holdout], y.iloc[:-n_holdout]
+    X_hold, y_hold = X.iloc[-n_holdout:], y.iloc[-n_holdout:]
+
+    params = model.get_params()
+    params['n_estimators'] = rounds
+    updated = xgb.XGBRegressor(**params)
+    updated.fit(X_fit, y_fit, xgb_model=model.get_booster())
+
+    y_pred = updated.predict(X_hold)
+    mae = mean_absolute_error(y_hold, y_pred)
+    previous_holdout_mae = mean_absolute_error(y_hold, model.predict(X_hold))
+    hyperparameters = dict(metadata.hyperparameters)
+    hyperparameters['n_estimators'] = hyperparameters.get('n_estimators', 0) + rounds
+
+    updated_metadata = ModelMetadata(
+        model_type=metadata.model_type,
+        version=metadata.version,
+        trained_at=datetime.utcnow().isoformat(),
+        training_samples=metadata.training_samples + len(X_fit),
+        features=metadata.features,
+        target=metadata.target,
         metrics={
             'mae': mae,
-            'rmse': rmse,
-            'r2': r2,
-            'cv_mae': cv_mae,
-        },
-        hyperparameters={
-            'n_estimators': 100,
-            'max_depth': 5,
-            'learning_rate': 0.1,
+            'rmse': np.sqrt(mean_squared_error(y_hold, y_pred)),
+            'r2': r2_score(y_hold, y_pred),
+            'previous_mae': metadata.metrics.get('mae'),
+            'holdout_previous_mae': float(previous_holdout_mae),
         },
+        hyperparameters=hyperparameters,
+        data_watermark=_latest_date_added(df_new) or metadata.data_watermark,
+        training_mode='incremental',
+        incremental_updates=metadata.incremental_updates + 1,
+        search=metadata.search,
     )
+    return updated, updated_metadata
 
-    return model, metadata
+
+def retrain_distance_model(
+    predictor: Optional['DistancePredictor'] = None,
+    df: Optional[pd.DataFrame] = None,
+    min_new_shots: int = 30,
+    drift_tolerance: float = 0.15,
+    full_rebuild_every: int = 10,
+    incremental_rounds: int = 25,
+    force_full: bool = False,
+    train_if_missing: bool = True,
+) -> RetrainResult:
+    """
+    Retrain the distance model only when its accuracy has degraded.
+
+    Shots added after the model's data watermark (``trained_at`` for older
+    models) form a held-out window. If the model's MAE on that window has
+    drifted past ``drift_tolerance``, the model continues boosting on the
+    new shots; every ``full_rebuild_every`` updates, or when no model exists
+    yet, it is rebuilt from scratch instead. An incremental update that
+    does worse than the old model on the held-out shots also falls back to
+    a full rebuild. A full rebuild without enough valid shots to train on
+    is skipped rather than raised.
+
+    Args:
+        predictor: DistancePredictor to update (default model path if None)
+        df: All shot data (loads from database if not provided)
+        min_new_shots: Minimum new shots before drift is evaluated
+        drift_tolerance: Allowed relative MAE increase before retraining
+        full_rebuild_every: Incremental updates between full rebuilds
+        incremental_rounds: Boosting rounds added per incremental update
+        force_full: Rebuild from scratch regardless of drift
+        train_if_missing: Train a first model when none exists (False
+            leaves that to an explicit run, e.g. the post-sync step)
+
+    Returns:
+        RetrainResult describing what was done
+    """
+    check_ml_deps()
+    predictor = predictor or DistancePredictor()
+
+    if df is None:
+        df = get_training_data()
+
+    def full_rebuild(reason: str, drift: Optional[DriftReport] = None) -> RetrainResult:
+        # Keep the configuration chosen by the last --search run, if any
+        search = predictor.metadata.search if predictor.metadata else None
+        try:
+            prepare_features(df)
+        except ValueError as e:
+            return RetrainResult('skipped', str(e), drift)
+        predictor.train(df, cross_validate=False, search=search)
+        return RetrainResult('full', reason, drift, predictor.metadata)
+
+    if not Path(predictor.model_path).exists():
+        if not train_if_missing:
+            return RetrainResult('skipped', 'no model trained yet')
+        return full_rebuild('no existing model')
+    if not predictor.is_loaded():
+        predictor.load()
+    if force_full:
+        return full_rebuild('forced full rebuild')
+    metadata = predictor.metadata
+    if metadata is None or 'mae' not in metadata.metrics:
+        return full_rebuild('model has no metadata to compare against')
+
+    df_new = _shots_since(df, metadata.data_watermark or metadata.trained_at)
+    try:
+        drift = check_drift(
+            predictor.model, metadata, df_new,
+            tolerance=drift_tolerance, min_samples=min_new_shots,
+        )
+    except ValueError:
+        return RetrainResult('skipped', f'fewer than {min_new_shots} new shots')
+
+    if not drift.drifted:
+        return RetrainResult(
+            'skipped',
+            f'no drift (window MAE {drift.window_mae:.2f} vs {drift.baseline_mae:.2f} yards)',
+            drift,
+        )
+    if metadata.incremental_updates + 1 >= full_rebuild_every:
+        return full_rebuild('periodic full rebuild', drift)
+
+    model, new_metadata = continue_training(
+        predictor.model, metadata, df_new,
+        rounds=incremental_rounds, min_samples=min_new_shots,
+    )
+    if new_metadata.metrics['mae'] > new_metadata.metrics['holdout_previous_mae']:
+        return full_rebuild('incremental update did not improve held-out MAE', drift)
+
+    predictor.model, predictor.metadata = model, new_metadata
+    save_model(model, predictor.model_path, new_metadata)
+    return RetrainResult('incremental', f'drift ratio {drift.drift_ratio:.2f}', drift, new_metadata)
 
 
 class DistancePredictor:
@@ -351,18 +632,33 @@ class DistancePredictor:
             print("Warning: Model loaded without feature names, using defaults")
         print(f"Loaded distance model: {self.model_path}")
 
-    def train(self, df: Optional[pd.DataFrame] = None, save: bool = True) -> ModelMetadata:
+    def train(
+        self,
+        df: Optional[pd.DataFrame] = None,
+        save: bool = True,
+        cross_validate: bool = True,
+        search: Optional[Dict[str, Any]] = None,
+    ) -> ModelMetadata:
         """
         Train a new model.
 
         Args:
             df: Training data (loads from database if not provided)
             save: Whether to save the model
+            cross_validate: Also report 5-fold cross-validation MAE
+            search: Search summary (see ml.hyperparameter_search) whose
+                winning hyperparameters and features are used and recorded
 
         Returns:
             Model metadata
         """
-        self.model, self.metadata = train_distance_model(df)
+        self.model, self.metadata = train_distance_model(
+            df,
+            cross_validate=cross_validate,
+            hyperparameters=search['hyperparameters'] if search else None,
+            features=search['features'] if search else None,
+        )
+        self.metadata.search = search
         self._feature_names = self.metadata.features
 
         if save:
@@ -472,6 +768,28 @@ class DistancePredictor:
 
 def main():
     """Train models from command line."""
+    parser = argparse.ArgumentParser(description="Train GolfDataApp ML models")
+    parser.add_argument(
+        '--incremental', action='store_true',
+        help="Update the existing model on new shots only if its accuracy drifted",
+    )
+    parser.add_argument(
+        '--full', action='store_true',
+        help="With --incremental, force a full rebuild",
+    )
+    parser.add_argument(
+        '--search', action='store_true',
+        help="Search XGBoost parameters and feature sets before training",
+    )
+    parser.add_argument(
+        '--strategy', choices=('halving', 'random'), default='halving',
+        help="Search strategy (default: successive halving)",
+    )
+    parser.add_argument('--trials', type=int, default=27, help="Search candidates")
+    parser.add_argument('--workers', type=int, default=None, help="Search worker processes")
+    parser.add_argument('--seed', type=int, default=42, help="Search random seed")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("GolfDataApp Model Training")
     print("=" * 60)
@@ -482,10 +800,40 @@ def main():
     # Initialize predictor
     predictor = DistancePredictor()
 
+    if args.incremental:
+        result = retrain_distance_model(predictor, force_full=args.full)
+        print(f"Action: {result.action} ({result.reason})")
+        if result.drift:
+            print(f"New shots: {result.drift.new_samples}, "
+                  f"window MAE {result.drift.window_mae:.2f} vs baseline "
+                  f"{result.drift.baseline_mae:.2f} yards")
+        if result.metadata and result.action != 'skipped':
+            print(f"MAE: {result.metadata.metrics['mae']:.2f} yards")
+        return
+
+    search = None
+    df = None
+    if args.search:
+        from ml.hyperparameter_search import search_hyperparameters
+
+        df = get_training_data()
+        print(f"Searching {args.trials} candidates ({args.strategy})...")
+        result = search_hyperparameters(
+            df, strategy=args.strategy, n_trials=args.trials,
+            workers=args.workers, seed=args.seed,
+        )
+        search = result.summary()
+        print(f"Evaluations: {search['evaluations']} on {result.workers} worker(s) "
+              f"in {result.wall_time_s:.1f}s")
+        print(f"Best CV MAE: {result.best.cv_mae:.2f} yards "
+              f"(feature set '{result.best.feature_set}')")
+        print(f"Best parameters: {result.hyperparameters}")
+        print()
+
     # Train
     print("Training distance prediction model...")
     print()
-    metadata = predictor.train()
+    metadata = predictor.train(df, search=search)
 
     print()
     print("Training complete!")
@@ -141,7 +141,7 @@ with tab_big3:
                 st.info("No shots in selected date range.")
                 st.stop()
 
-        render_big3_detail_view(df)
+        render_big3_detail_view(df, window=f"{selected_session_id}:{start_date}:{end_date}")
 
 
 # ================================================================
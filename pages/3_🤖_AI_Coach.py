@@ -10,14 +10,19 @@ Features:
 - Model selection per provider (Flash for speed, Pro for complex reasoning)
 - Thinking level control for response depth
 - Function call transparency
+- Streaming replies with time-to-first-token and turn latency
+- Relevant past sessions retrieved locally and added to each prompt
 """
 
 import streamlit as st
 from datetime import datetime
 import json
+import sqlite3
+import time
 import golf_db
 from services.ai import list_providers, get_provider
 from services.data_access import get_unique_sessions, get_session_data, get_all_shots
+from services.session_index import get_session_index
 from utils.session_state import get_read_mode
 from utils.responsive import add_responsive_css
 from components import (
@@ -212,34 +217,76 @@ with st.expander("Auto-Generated Insights", expanded=True):
 # Main chat interface
 st.subheader("Chat with Your Coach")
 
+
+def render_function_calls(function_calls: list) -> None:
+    """Show the function calls behind a reply, with a short result preview."""
+    if not function_calls:
+        return
+    with st.expander("Function Calls Made", expanded=False):
+        for i, fn_call in enumerate(function_calls, 1):
+            st.markdown(f"**{i}. {fn_call['function']}**")
+            st.json(fn_call['arguments'])
+
+            # Show result preview
+            try:
+                result_data = json.loads(fn_call['result'])
+                if 'error' in result_data:
+                    st.error(f"Error: {result_data['error']}")
+                else:
+                    # Show summary
+                    if 'count' in result_data:
+                        st.info(f"Retrieved {result_data['count']} shots")
+                    elif 'metric' in result_data:
+                        st.info(f"Stats: avg={result_data.get('mean', 'N/A'):.1f}, std={result_data.get('std', 'N/A'):.1f}")
+                    elif 'total_shots' in result_data:
+                        st.info(f"Profile: {result_data['total_shots']} total shots")
+                    elif 'club' in result_data and 'sessions' in result_data:
+                        st.info(f"Trend: {result_data['sessions']} sessions analyzed")
+                    elif 'gaps' in result_data:
+                        st.info(f"Gapping: {len(result_data['gaps'])} gaps analyzed")
+                    elif 'total_outliers' in result_data:
+                        st.info(f"Found {result_data['total_outliers']} outliers")
+            except:
+                pass
+
+
+def render_timing(timing: dict) -> None:
+    """Show time to first token and total turn latency."""
+    if timing:
+        st.caption(f"First token: {timing['ttft']:.2f}s · Turn: {timing['latency']:.2f}s")
+
+
 # Display conversation history
 for message in st.session_state.messages:
     with st.chat_message(message["role"]):
         st.markdown(message["content"])
 
         # Show function calls if present
-        if message.get("function_calls"):
-            with st.expander("Function Calls Made"):
-                for i, fn_call in enumerate(message["function_calls"], 1):
-                    st.markdown(f"**{i}. {fn_call['function']}**")
-                    st.json(fn_call['arguments'])
-                    # Show result preview
-                    try:
-                        result_data = json.loads(fn_call['result'])
-                        if 'error' in result_data:
-                            st.error(f"Error: {result_data['error']}")
-                        else:
-                            # Show summary of result
-                            if 'count' in result_data:
-                                st.info(f"Retrieved {result_data['count']} shots")
-                            elif 'metric' in result_data:
-                                st.info(f"Calculated stats for {result_data['metric']}")
-                    except:
-                        pass
+        render_function_calls(message.get("function_calls"))
+        render_timing(message.get("timing"))
+
+
+# Past sessions summarized in each prompt (saves list/query round trips)
+RETRIEVED_SESSIONS = 5
+
+
+def retrieved_sessions(user_prompt: str) -> str:
+    """
+    Compact lines on the sessions most relevant to the question, or ''.
+
+    Only for providers that opt in with USES_SESSION_CONTEXT (those that
+    call functions); the Local coach routes on the raw question.
+    """
+    if not getattr(provider_cls, "USES_SESSION_CONTEXT", False):
+        return ""
+    try:
+        return get_session_index().context(user_prompt, k=RETRIEVED_SESSIONS)
+    except (sqlite3.Error, OSError):
+        return ""
 
 
 def build_context_prompt(user_prompt: str) -> str:
-    """Build prompt with current focus context."""
+    """Build prompt with current focus context and retrieved sessions."""
     context_lines = []
     if focus_session_id:
         context_lines.append(f"Focus session_id: {focus_session_id}")
@@ -249,10 +296,67 @@ def build_context_prompt(user_prompt: str) -> str:
         context_lines.append(f"Focus club: {focus_club}")
     if focus_tag != "All Tags":
         context_lines.append(f"Focus shot_tag: {focus_tag}")
-    if not context_lines:
-        return user_prompt
-    context = "Context:\n" + "\n".join([f"- {line}" for line in context_lines])
-    return f"{context}\n\n{user_prompt}"
+    sections = []
+    if context_lines:
+        sections.append("Context:\n" + "\n".join([f"- {line}" for line in context_lines]))
+    retrieved = retrieved_sessions(user_prompt)
+    if retrieved:
+        sections.append(retrieved)
+    return "\n\n".join(sections + [user_prompt])
+
+
+def respond(user_prompt: str) -> None:
+    """
+    Generate, display and record the assistant's reply.
+
+    Providers with chat_stream() stream text into the message as it
+    arrives (function calls of a turn run concurrently on their side);
+    others are called once behind a spinner.
+    """
+    coach = st.session_state.coach
+    coach_prompt = build_context_prompt(user_prompt)
+
+    if hasattr(coach, "chat_stream"):
+        status = st.empty()
+        response_data = {}
+
+        def text_chunks():
+            for event in coach.chat_stream(coach_prompt):
+                if event["type"] == "text":
+                    status.empty()
+                    yield event["text"]
+                elif event["type"] == "function_calls":
+                    names = ", ".join(call["function"] for call in event["calls"])
+                    status.caption(f"Ran {len(event['calls'])} function call(s): {names}")
+                elif event["type"] == "done":
+                    response_data.update(event)
+
+        streamed = st.write_stream(text_chunks())
+        status.empty()
+        if not streamed:
+            st.markdown(response_data.get("response", ""))
+    else:
+        start = time.perf_counter()
+        with st.spinner("Thinking..."):
+            response_data = coach.chat(coach_prompt)
+        latency = time.perf_counter() - start
+        response_data.setdefault("ttft", latency)
+        response_data.setdefault("latency", latency)
+        st.markdown(response_data['response'])
+
+    timing = {"ttft": response_data["ttft"], "latency": response_data["latency"]}
+
+    # Show function calls if any were made
+    render_function_calls(response_data.get('function_calls'))
+    render_timing(timing)
+
+    # Add assistant message to history
+    st.session_state.messages.append({
+        "role": "assistant",
+        "content": response_data['response'],
+        "function_calls": response_data.get('function_calls', []),
+        "timing": timing,
+    })
 
 
 # Check if we need to generate a response (e.g., after button click rerun)
@@ -260,26 +364,7 @@ if st.session_state.messages and st.session_state.messages[-1]["role"] == "user"
     # Last message is from user with no response - generate one now
     last_user_msg = st.session_state.messages[-1]["content"]
     with st.chat_message("assistant"):
-        with st.spinner("Thinking..."):
-            coach_prompt = build_context_prompt(last_user_msg)
-            response_data = st.session_state.coach.chat(coach_prompt)
-
-            # Display response
-            st.markdown(response_data['response'])
-
-            # Show function calls if any
-            if response_data.get('function_calls'):
-                with st.expander("Function Calls Made", expanded=False):
-                    for i, fn_call in enumerate(response_data['function_calls'], 1):
-                        st.markdown(f"**{i}. {fn_call['function']}**")
-                        st.json(fn_call['arguments'])
-
-            # Add assistant message to history
-            st.session_state.messages.append({
-                "role": "assistant",
-                "content": response_data['response'],
-                "function_calls": response_data.get('function_calls', [])
-            })
+        respond(last_user_msg)
 
 # Suggested questions (show when no messages)
 if len(st.session_state.messages) == 0:
@@ -324,48 +409,7 @@ if prompt := st.chat_input("Ask me anything about your golf game..."):
 
     # Get AI response
     with st.chat_message("assistant"):
-        with st.spinner("Thinking..."):
-            coach_prompt = build_context_prompt(prompt)
-            response_data = st.session_state.coach.chat(coach_prompt)
-
-            # Display response
-            st.markdown(response_data['response'])
-
-            # Show function calls if any were made
-            if response_data.get('function_calls'):
-                with st.expander("Function Calls Made", expanded=False):
-                    for i, fn_call in enumerate(response_data['function_calls'], 1):
-                        st.markdown(f"**{i}. {fn_call['function']}**")
-                        st.json(fn_call['arguments'])
-
-                        # Show result preview
-                        try:
-                            result_data = json.loads(fn_call['result'])
-                            if 'error' in result_data:
-                                st.error(f"Error: {result_data['error']}")
-                            else:
-                                # Show summary
-                                if 'count' in result_data:
-                                    st.info(f"Retrieved {result_data['count']} shots")
-                                elif 'metric' in result_data:
-                                    st.info(f"Stats: avg={result_data.get('mean', 'N/A'):.1f}, std={result_data.get('std', 'N/A'):.1f}")
-                                elif 'total_shots' in result_data:
-                                    st.info(f"Profile: {result_data['total_shots']} total shots")
-                                elif 'club' in result_data and 'sessions' in result_data:
-                                    st.info(f"Trend: {result_data['sessions']} sessions analyzed")
-                                elif 'gaps' in result_data:
-                                    st.info(f"Gapping: {len(result_data['gaps'])} gaps analyzed")
-                                elif 'total_outliers' in result_data:
-                                    st.info(f"Found {result_data['total_outliers']} outliers")
-                        except:
-                            pass
-
-            # Add assistant message to history
-            st.session_state.messages.append({
-                "role": "assistant",
-                "content": response_data['response'],
-                "function_calls": response_data.get('function_calls', [])
-            })
+        respond(prompt)
 
 # Help section at the bottom
 with st.expander("How to Use the AI Coach"):
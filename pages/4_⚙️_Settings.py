@@ -15,6 +15,7 @@ import observability
 from services.data_access import (
     get_unique_sessions,
     get_session_data,
+    get_anomalous_shots,
     clear_all_caches,
 )
 from utils.session_state import get_read_mode
@@ -374,6 +375,14 @@ with tab_maintenance:
         else:
             st.success("No outliers detected!")
 
+        st.subheader("Swing Flaw Flags")
+        flagged_df = get_anomalous_shots(session_id=selected_session_id)
+        if not flagged_df.empty:
+            st.warning(f"{len(flagged_df)} shots flagged by swing flaw scoring at import")
+            st.dataframe(flagged_df, use_container_width=True, hide_index=True)
+        else:
+            st.success("No shots flagged by swing flaw scoring.")
+
         st.divider()
 
         st.subheader("Data Validation")
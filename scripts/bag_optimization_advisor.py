@@ -4,9 +4,27 @@
 from __future__ import annotations
 
 import argparse
+import math
 import re
 import sqlite3
+import sys
 from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from shot_stream import group_by_key
+
+# The bootstrap engine lives in the app package at the repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from services.analytics.bootstrap import (  # noqa: E402
+    DEFAULT_CONFIDENCE,
+    DEFAULT_RESAMPLES,
+    DEFAULT_SEED,
+    BootstrapResult,
+    bootstrap_club_stats,
+)
 
 EXCLUDED_CLUBS = ("Other", "Putter", "Sim Round")
 OVERLAP_THRESHOLD = 10.0
@@ -19,6 +37,8 @@ class ClubStat:
     club: str
     avg_carry: float
     shot_count: int
+    ci_low: float = math.nan
+    ci_high: float = math.nan
 
 
 @dataclass
@@ -128,7 +148,12 @@ def format_table(rows: list[list[str]], headers: list[str]) -> str:
     return "\n".join(output)
 
 
-def fetch_stats(db_path: str) -> tuple[int, int, list[ClubStat]]:
+def fetch_stats(
+    db_path: str,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    confidence: float = DEFAULT_CONFIDENCE,
+    seed: int | None = DEFAULT_SEED,
+) -> tuple[int, int, list[ClubStat], BootstrapResult]:
     with sqlite3.connect(db_path) as connection:
         cursor = connection.cursor()
 
@@ -160,31 +185,38 @@ def fetch_stats(db_path: str) -> tuple[int, int, list[ClubStat]]:
         )
         included_shots = int(cursor.fetchone()[0])
 
-        cursor.execute(
+        groups = group_by_key(
+            connection,
             f"""
-            SELECT
-                TRIM(club) AS club,
-                AVG({carry_column}) AS avg_carry,
-                COUNT(*) AS shot_count
+            SELECT TRIM(club) AS club, {carry_column}
             FROM shots
             WHERE club IS NOT NULL
               AND TRIM(club) != ''
               AND TRIM(club) NOT IN ({placeholders})
               AND {carry_column} >= 10
-            GROUP BY TRIM(club)
-            HAVING COUNT(*) > 0
-            ORDER BY avg_carry DESC, club ASC
             """,
             EXCLUDED_CLUBS,
+            ("carry",),
         )
 
-        club_stats = [
-            ClubStat(club=row[0], avg_carry=float(row[1]), shot_count=int(row[2]))
-            for row in cursor.fetchall()
-            if row[1] is not None
-        ]
+    samples = {club: np.frombuffer(group["carry"]) for club, group in groups.items()}
+    boot = bootstrap_club_stats(samples, n_resamples, confidence, seed)
+
+    club_stats = []
+    for club in boot.clubs:
+        mean_ci = boot.ci(club, "mean")
+        club_stats.append(
+            ClubStat(
+                club=club,
+                avg_carry=mean_ci.estimate,
+                shot_count=len(samples[club]),
+                ci_low=mean_ci.low,
+                ci_high=mean_ci.high,
+            )
+        )
+    club_stats.sort(key=lambda stat: (-stat.avg_carry, stat.club))
 
-    return total_shots, included_shots, club_stats
+    return total_shots, included_shots, club_stats, boot
 
 
 def recommend_for_overlap(longer: ClubStat, shorter: ClubStat, gap: float) -> str:
@@ -256,7 +288,26 @@ def recommend_for_inversion(longer: ClubStat, shorter: ClubStat) -> str:
     )
 
 
-def detect_issues(stats: list[ClubStat]) -> list[Issue]:
+def format_ci(low: float, high: float, confidence: float) -> str:
+    return f"{confidence * 100:.0f}% CI {low:.1f}-{high:.1f} yd"
+
+
+def recommend_more_data(longer: ClubStat, shorter: ClubStat, threshold: float) -> str:
+    fewer = longer if longer.shot_count <= shorter.shot_count else shorter
+    return (
+        f"Within sampling noise of the {threshold:.0f} yd threshold: log more {fewer.club} "
+        f"shots ({fewer.shot_count} so far) before changing the bag."
+    )
+
+
+def detect_issues(stats: list[ClubStat], boot: BootstrapResult | None = None) -> list[Issue]:
+    """Flag overlaps, excessive gaps and inversions between adjacent clubs.
+
+    With ``boot``, an overlap or gap is only reported as confirmed when the
+    bootstrap CI of the gap lies entirely past the threshold. If the point
+    estimate crosses the threshold but the CI does not, the issue is
+    reported as "Possible" and the action asks for more shots.
+    """
     issues: list[Issue] = []
     existing_iron_numbers = {
         iron_number
@@ -268,28 +319,40 @@ def detect_issues(stats: list[ClubStat]) -> list[Issue]:
         longer = stats[index]
         shorter = stats[index + 1]
         gap = longer.avg_carry - shorter.avg_carry
+        gap_ci = boot.difference_ci(longer.club, shorter.club) if boot is not None else None
+        ci_note = f" ({format_ci(gap_ci.low, gap_ci.high, boot.confidence)})" if gap_ci is not None else ""
 
         if gap < OVERLAP_THRESHOLD:
+            confirmed = gap_ci is None or gap_ci.high < OVERLAP_THRESHOLD
             issues.append(
                 Issue(
-                    issue_type="Overlap",
+                    issue_type="Overlap" if confirmed else "Possible Overlap",
                     details=(
                         f"{longer.club} ({longer.avg_carry:.1f} yd) and {shorter.club} "
-                        f"({shorter.avg_carry:.1f} yd) are only {gap:.1f} yd apart."
+                        f"({shorter.avg_carry:.1f} yd) are only {gap:.1f} yd apart{ci_note}."
+                    ),
+                    action=(
+                        recommend_for_overlap(longer, shorter, gap)
+                        if confirmed
+                        else recommend_more_data(longer, shorter, OVERLAP_THRESHOLD)
                     ),
-                    action=recommend_for_overlap(longer, shorter, gap),
                 )
             )
 
         if gap > GAP_THRESHOLD:
+            confirmed = gap_ci is None or gap_ci.low > GAP_THRESHOLD
             issues.append(
                 Issue(
-                    issue_type="Excessive Gap",
+                    issue_type="Excessive Gap" if confirmed else "Possible Gap",
                     details=(
                         f"{longer.club} ({longer.avg_carry:.1f} yd) to {shorter.club} "
-                        f"({shorter.avg_carry:.1f} yd) leaves a {gap:.1f} yd gap."
+                        f"({shorter.avg_carry:.1f} yd) leaves a {gap:.1f} yd gap{ci_note}."
+                    ),
+                    action=(
+                        recommend_for_gap(longer, shorter, gap, existing_iron_numbers)
+                        if confirmed
+                        else recommend_more_data(longer, shorter, GAP_THRESHOLD)
                     ),
-                    action=recommend_for_gap(longer, shorter, gap, existing_iron_numbers),
                 )
             )
 
@@ -316,8 +379,13 @@ def detect_issues(stats: list[ClubStat]) -> list[Issue]:
     return issues
 
 
-def build_report(db_path: str) -> str:
-    total_shots, included_shots, stats = fetch_stats(db_path)
+def build_report(
+    db_path: str,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    confidence: float = DEFAULT_CONFIDENCE,
+    seed: int | None = DEFAULT_SEED,
+) -> str:
+    total_shots, included_shots, stats, boot = fetch_stats(db_path, n_resamples, confidence, seed)
 
     lines: list[str] = []
     lines.append("BAG OPTIMIZATION ADVISOR")
@@ -328,6 +396,10 @@ def build_report(db_path: str) -> str:
         )
     )
     lines.append(f"Shots analyzed: {included_shots} of {total_shots}")
+    lines.append(
+        f"Uncertainty: {boot.n_resamples} bootstrap resamples, "
+        f"{confidence * 100:.0f}% CIs (seed {seed})"
+    )
     lines.append("")
 
     if not stats:
@@ -339,15 +411,17 @@ def build_report(db_path: str) -> str:
             str(index + 1),
             stat.club,
             f"{stat.avg_carry:.1f}",
+            f"{stat.ci_low:.1f}-{stat.ci_high:.1f}",
             str(stat.shot_count),
         ]
         for index, stat in enumerate(stats)
     ]
     lines.append("Average Carry by Club (Longest to Shortest)")
-    lines.append(format_table(table_rows, ["#", "Club", "Avg Carry (yd)", "Shots"]))
+    ci_header = f"{confidence * 100:.0f}% CI (yd)"
+    lines.append(format_table(table_rows, ["#", "Club", "Avg Carry (yd)", ci_header, "Shots"]))
     lines.append("")
 
-    issues = detect_issues(stats)
+    issues = detect_issues(stats, boot)
     if not issues:
         lines.append("No overlap, excessive gaps, or inversions detected with current thresholds.")
         return "\n".join(lines)
@@ -367,12 +441,30 @@ def parse_args() -> argparse.Namespace:
         default="golf_stats.db",
         help="Path to SQLite database (default: golf_stats.db)",
     )
+    parser.add_argument(
+        "--resamples",
+        type=int,
+        default=DEFAULT_RESAMPLES,
+        help=f"Bootstrap resamples per club (default: {DEFAULT_RESAMPLES})",
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=DEFAULT_CONFIDENCE,
+        help=f"Confidence level for gap CIs (default: {DEFAULT_CONFIDENCE})",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=DEFAULT_SEED,
+        help=f"Random seed for resampling (default: {DEFAULT_SEED})",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    print(build_report(args.db))
+    print(build_report(args.db, args.resamples, args.confidence, args.seed))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,94 @@
+"""Shared helpers for the matplotlib chart scripts.
+
+- ``save_figure_atomic``: write a figure to a temp file in the target
+  directory and ``os.replace`` it into place, so a reader never sees a
+  half-written PNG (and a failed render leaves the previous file intact).
+- ``write_text_atomic``: same guarantee for text reports.
+- ``snapshot_database``: copy the live SQLite DB with the backup API so a
+  batch of charts all read one consistent snapshot.
+- ``apply_chart_theme``: one-time matplotlib/seaborn setup, used as the
+  process-pool initializer so workers reuse it across charts.
+
+Import from a script with ``from chart_render import ...``.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import Any
+
+os.environ.setdefault("MPLCONFIGDIR", "/tmp/matplotlib")
+os.environ.setdefault("XDG_CACHE_HOME", "/tmp")
+
+# mkstemp creates 0600 files; renamed outputs should get normal permissions.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_FILE_MODE = 0o666 & ~_UMASK
+
+
+def _atomic_target(output_path: Path) -> tuple[int, str]:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{output_path.stem}.",
+        suffix=output_path.suffix,
+        dir=str(output_path.parent),
+    )
+    os.fchmod(fd, _FILE_MODE)
+    return fd, tmp_name
+
+
+def save_figure_atomic(fig: Any, output_path: Path, **savefig_kwargs: Any) -> Path:
+    """Save ``fig`` to ``output_path`` atomically and return the path."""
+    output_path = Path(output_path)
+    fd, tmp_name = _atomic_target(output_path)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            fig.savefig(handle, format=output_path.suffix.lstrip(".") or "png", **savefig_kwargs)
+        os.replace(tmp_name, output_path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    return output_path
+
+
+def write_text_atomic(text: str, output_path: Path) -> Path:
+    """Write ``text`` to ``output_path`` atomically and return the path."""
+    output_path = Path(output_path)
+    fd, tmp_name = _atomic_target(output_path)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(tmp_name, output_path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    return output_path
+
+
+def snapshot_database(db_path: Path, snapshot_path: Path) -> Path:
+    """Copy ``db_path`` into ``snapshot_path`` using the SQLite backup API."""
+    db_path = Path(db_path)
+    if not db_path.exists():
+        raise FileNotFoundError(f"Database not found: {db_path}")
+    source = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=10)
+    try:
+        target = sqlite3.connect(str(snapshot_path))
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+    finally:
+        source.close()
+    return Path(snapshot_path)
+
+
+def apply_chart_theme() -> None:
+    """Select the Agg backend once per process."""
+    import matplotlib
+
+    matplotlib.use("Agg")
@@ -7,9 +7,22 @@ import argparse
 import math
 import sqlite3
 import statistics
+import sys
 from collections import defaultdict
+from pathlib import Path
 from typing import Dict, Iterable, List
 
+# The bootstrap engine lives in the app package at the repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from services.analytics.bootstrap import (  # noqa: E402
+    DEFAULT_CONFIDENCE,
+    DEFAULT_RESAMPLES,
+    DEFAULT_SEED,
+    ConfidenceInterval,
+    bootstrap_club_stats,
+)
+
 
 EXCLUDED_CLUBS = {"Sim Round", "Other", "Putter"}
 
@@ -70,7 +83,16 @@ def render_table(headers: List[str], rows: List[List[str]]) -> str:
     return "\n".join(out)
 
 
-def generate_report(db_path: str) -> str:
+def format_ci(ci: ConfidenceInterval, decimals: int = 1) -> str:
+    return f"{ci.estimate:.{decimals}f} [{ci.low:.{decimals}f}-{ci.high:.{decimals}f}]"
+
+
+def generate_report(
+    db_path: str,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    confidence: float = DEFAULT_CONFIDENCE,
+    seed: int | None = DEFAULT_SEED,
+) -> str:
     with sqlite3.connect(db_path) as conn:
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
@@ -99,8 +121,10 @@ def generate_report(db_path: str) -> str:
         by_club[row["club"]].append(row)
 
     table_rows: List[List[str]] = []
+    carry_samples: Dict[str, List[float]] = {}
     for club, shots in by_club.items():
         carry_values = [v for v in (to_float(r["carry"]) for r in shots) if v is not None]
+        carry_samples[club] = carry_values
         ball_speed_values = [v for v in (to_float(r["ball_speed"]) for r in shots) if v is not None]
         smash_values = [v for v in (to_float(r["smash"]) for r in shots) if v is not None]
         launch_values = [v for v in (to_float(r["launch_angle"]) for r in shots) if v is not None]
@@ -172,6 +196,28 @@ def generate_report(db_path: str) -> str:
         "",
         render_table(headers, table_rows),
     ]
+
+    boot = bootstrap_club_stats(carry_samples, n_resamples, confidence, seed)
+    ci_rows = [
+        [
+            club,
+            format_ci(boot.ci(club, "mean")),
+            format_ci(boot.ci(club, "median")),
+            format_ci(boot.ci(club, "p10")),
+            format_ci(boot.ci(club, "p90")),
+            str(len(carry_samples[club])),
+        ]
+        for club in sorted(boot.clubs, key=lambda c: boot.ci(c, "mean").estimate, reverse=True)
+    ]
+    if ci_rows:
+        lines.extend([
+            "",
+            f"CARRY UNCERTAINTY ({confidence * 100:.0f}% bootstrap CI, {n_resamples} resamples, seed {seed})",
+            render_table(
+                ["Club", "Mean Carry", "Median Carry", "P10 Carry", "P90 Carry", "Carry Shots"],
+                ci_rows,
+            ),
+        ])
     return "\n".join(lines)
 
 
@@ -182,12 +228,30 @@ def parse_args() -> argparse.Namespace:
         default="golf_stats.db",
         help="Path to SQLite database file (default: golf_stats.db)",
     )
+    parser.add_argument(
+        "--resamples",
+        type=int,
+        default=DEFAULT_RESAMPLES,
+        help=f"Bootstrap resamples per club (default: {DEFAULT_RESAMPLES})",
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=DEFAULT_CONFIDENCE,
+        help=f"Confidence level for carry CIs (default: {DEFAULT_CONFIDENCE})",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=DEFAULT_SEED,
+        help=f"Random seed for resampling (default: {DEFAULT_SEED})",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    print(generate_report(args.db_path))
+    print(generate_report(args.db_path, args.resamples, args.confidence, args.seed))
 
 
 if __name__ == "__main__":
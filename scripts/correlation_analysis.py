@@ -11,7 +11,11 @@ import json
 import math
 import sqlite3
 from pathlib import Path
-from typing import Any
+from typing import Any, Sequence, Union
+
+from shot_stream import ShotTable, ShotView, load_table
+
+ShotData = Union[ShotTable, ShotView]
 
 EXCLUDED_CLUBS = ("Other", "Putter", "Sim Round")
 MIN_CARRY = 10.0
@@ -193,10 +197,10 @@ def load_shot_data(
     conn: sqlite3.Connection,
     carry_col: str,
     columns: list[str],
-) -> tuple[list[dict[str, float]], dict[str, int]]:
-    """Load all qualifying shots as dicts of {column: float}.
+) -> ShotTable:
+    """Stream all qualifying shots into a compact club-contiguous ShotTable.
 
-    Returns (rows, club_counts) where club_counts maps club name -> shot count.
+    Per-club data is available as zero-copy views via ``table.view(club)``.
     """
     # Build SELECT expression list.
     select_parts: list[str] = ["TRIM(club) AS club"]
@@ -215,41 +219,17 @@ def load_shot_data(
           AND {carry_col} >= ?
     """
     params: tuple[Any, ...] = (*EXCLUDED_CLUBS, MIN_CARRY)
-    raw_rows = conn.execute(query, params).fetchall()
-
-    rows: list[dict[str, float]] = []
-    club_counts: dict[str, int] = {}
-    club_rows: dict[str, list[dict[str, float]]] = {}
-
-    for raw in raw_rows:
-        club = str(raw["club"]).strip()
-        if not club:
-            continue
-
-        row: dict[str, float] = {"_club": 0.0}  # placeholder so club name sticks around
-        row["_club_name"] = club  # type: ignore[assignment]  # we'll handle this
-        valid = True
-        for col in columns:
-            val = to_float(raw[col])
-            if col == "carry" and (val is None or val < MIN_CARRY):
-                valid = False
-                break
-            if val is not None:
-                row[col] = val
-
-        if not valid:
-            continue
+    carry_idx = columns.index("carry") if "carry" in columns else None
 
+    def accept(values: Sequence[float]) -> bool:
+        if carry_idx is not None:
+            carry = values[carry_idx]
+            if carry != carry or carry < MIN_CARRY:
+                return False
         # Only include rows that have at least carry + one other column.
-        numeric_keys = [k for k in row if not k.startswith("_")]
-        if len(numeric_keys) < 2:
-            continue
-
-        rows.append(row)
-        club_counts[club] = club_counts.get(club, 0) + 1
-        club_rows.setdefault(club, []).append(row)
+        return sum(1 for v in values if v == v) >= 2
 
-    return rows, club_counts, club_rows  # type: ignore[return-value]
+    return load_table(conn, query, params, columns, convert=to_float, accept=accept)
 
 
 # ---------------------------------------------------------------------------
@@ -257,7 +237,7 @@ def load_shot_data(
 # ---------------------------------------------------------------------------
 
 def compute_pairwise(
-    rows: list[dict[str, float]],
+    data: ShotData,
     columns: list[str],
 ) -> dict[tuple[str, str], tuple[float, int]]:
     """Compute Pearson r for every column pair.
@@ -268,14 +248,7 @@ def compute_pairwise(
     for i in range(len(columns)):
         for j in range(i + 1, len(columns)):
             col_a, col_b = columns[i], columns[j]
-            xs: list[float] = []
-            ys: list[float] = []
-            for row in rows:
-                va = row.get(col_a)
-                vb = row.get(col_b)
-                if va is not None and vb is not None:
-                    xs.append(va)
-                    ys.append(vb)
+            xs, ys = data.paired(col_a, col_b)
             r = pearson_r(xs, ys)
             if r is not None:
                 key = (col_a, col_b) if col_a < col_b else (col_b, col_a)
@@ -284,7 +257,7 @@ def compute_pairwise(
 
 
 def correlations_with_target(
-    rows: list[dict[str, float]],
+    data: ShotData,
     target: str,
     columns: list[str],
 ) -> list[tuple[str, float, int]]:
@@ -293,17 +266,12 @@ def correlations_with_target(
     Returns sorted list of (column, r, n) by |r| descending.
     """
     results: list[tuple[str, float, int]] = []
+    if target not in columns:
+        return results
     for col in columns:
         if col == target:
             continue
-        xs: list[float] = []
-        ys: list[float] = []
-        for row in rows:
-            vt = row.get(target)
-            vc = row.get(col)
-            if vt is not None and vc is not None:
-                xs.append(vt)
-                ys.append(vc)
+        xs, ys = data.paired(target, col)
         r = pearson_r(xs, ys)
         if r is not None:
             results.append((col, r, len(xs)))
@@ -325,20 +293,19 @@ def is_trivial(col_a: str, col_b: str) -> bool:
 
 
 def build_report(
-    all_rows: list[dict[str, float]],
-    club_counts: dict[str, int],
-    club_rows: dict[str, list[dict[str, float]]],
+    table: ShotTable,
     columns: list[str],
     top_clubs_count: int,
 ) -> str:
     lines: list[str] = []
     bag_order = load_bag_order()
+    club_counts = {club: table.count(club) for club in table.keys}
 
     lines.append("=" * 72)
     lines.append("CORRELATION ANALYSIS REPORT")
     lines.append("=" * 72)
     lines.append("")
-    lines.append(f"Total qualifying shots: {len(all_rows)}")
+    lines.append(f"Total qualifying shots: {len(table)}")
     lines.append(f"Clubs represented: {len(club_counts)}")
     lines.append(f"Numeric columns analyzed: {len(columns)}")
     lines.append(f"  {', '.join(display(c) for c in columns)}")
@@ -353,7 +320,7 @@ def build_report(
     lines.append("-" * 72)
     lines.append("")
 
-    pairwise = compute_pairwise(all_rows, columns)
+    pairwise = compute_pairwise(table, columns)
 
     # Non-trivial pairs sorted by r.
     non_trivial = [
@@ -399,7 +366,7 @@ def build_report(
 
     for club in top_club_names:
         count = club_counts[club]
-        rows_club = club_rows[club]
+        rows_club = table.view(club)
         lines.append(f"  {club} ({count} shots)")
         lines.append(f"  {'~' * (len(club) + len(str(count)) + 9)}")
 
@@ -432,7 +399,7 @@ def build_report(
     lines.append("")
 
     # Overall carry drivers (excluding trivially obvious ones).
-    carry_corrs_all = correlations_with_target(all_rows, "carry", columns)
+    carry_corrs_all = correlations_with_target(table, "carry", columns)
     non_trivial_carry = [
         (col, r, n)
         for col, r, n in carry_corrs_all
@@ -449,7 +416,7 @@ def build_report(
         lines.append("")
 
     # Smash factor drivers overall.
-    smash_corrs_all = correlations_with_target(all_rows, "smash", columns)
+    smash_corrs_all = correlations_with_target(table, "smash", columns)
     non_trivial_smash = [
         (col, r, n)
         for col, r, n in smash_corrs_all
@@ -466,7 +433,7 @@ def build_report(
         lines.append("")
 
     # Face-to-path drivers overall.
-    f2p_corrs_all = correlations_with_target(all_rows, "face_to_path", columns)
+    f2p_corrs_all = correlations_with_target(table, "face_to_path", columns)
     non_trivial_f2p = [
         (col, r, n)
         for col, r, n in f2p_corrs_all
@@ -569,13 +536,13 @@ def main() -> int:
     with build_connection(args.db) as conn:
         carry_col = resolve_carry_column(conn)
         columns = get_available_columns(conn, carry_col)
-        all_rows, club_counts, club_rows = load_shot_data(conn, carry_col, columns)
+        table = load_shot_data(conn, carry_col, columns)
 
-    if not all_rows:
+    if not len(table):
         print("No qualifying shots found. Check your database and filters.")
         return 1
 
-    report = build_report(all_rows, club_counts, club_rows, columns, args.top_clubs)
+    report = build_report(table, columns, args.top_clubs)
     print(report)
     return 0
 
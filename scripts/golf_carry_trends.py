@@ -21,7 +21,10 @@ import pandas as pd
 import seaborn as sns
 from matplotlib.patches import Patch
 
+from chart_render import save_figure_atomic
+
 EXCLUDED_CLUBS = ("Sim Round", "Other", "Putter")
+OUTPUT_PATH = Path("/tmp/golf_carry_trends.png")
 CATEGORY_COLORS = {
     "woods": "#2e7d32",
     "irons": "#1565c0",
@@ -147,21 +150,23 @@ def build_figure(shots_df: pd.DataFrame, output_path: Path) -> None:
     ax_bottom.legend(handles=category_legend, loc="lower right")
 
     fig.tight_layout()
-    fig.savefig(output_path, dpi=150)
+    save_figure_atomic(fig, output_path, dpi=150)
     plt.close(fig)
 
 
-def main() -> None:
-    project_root = Path(__file__).resolve().parents[1]
-    db_path = project_root / "golf_stats.db"
-    output_path = Path("/tmp/golf_carry_trends.png")
-
+def render(db_path: Path, output_path: Path = OUTPUT_PATH) -> Path:
+    """Load shots from ``db_path`` and write the carry trends PNG."""
     shots_df = load_shots_dataframe(db_path)
     if shots_df.empty:
         raise SystemExit("No qualifying shot data found after filtering.")
 
     build_figure(shots_df, output_path)
-    print(output_path)
+    return output_path
+
+
+def main() -> None:
+    project_root = Path(__file__).resolve().parents[1]
+    print(render(project_root / "golf_stats.db", OUTPUT_PATH))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Render the full matplotlib chart pack in parallel from one DB snapshot.
+
+Runs the chart scripts' ``render`` entry points in a process pool instead of
+one after another:
+  - golf_carry_trends.png    (golf_carry_trends.render)
+  - golf_radar.png           (golf_radar.render)
+  - golf_dplane_scatter.png  (golf_dplane_scatter.render)
+  - golf_ml_insights.png     (golf_ml_insights.run, report text alongside)
+  - golf_strike_heatmap.png  (one KDE task per club, then one compose task)
+
+The live database is copied once with the SQLite backup API and every task
+reads that snapshot, so all charts describe the same data even if a sync is
+writing meanwhile. Workers import matplotlib/seaborn/sklearn and the chart
+modules once in the pool initializer and reuse them for every task they
+pick up. Every output is written to a temp file and renamed into place.
+
+Wall-clock time for the pack is roughly the slowest single chart when there
+are at least as many cores as tasks.
+
+Usage:
+    python scripts/golf_chart_pack.py --db golf_stats.db --out-dir /tmp
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any
+
+from chart_render import apply_chart_theme, snapshot_database, write_text_atomic
+
+CHART_MODULES = (
+    "golf_carry_trends",
+    "golf_radar",
+    "golf_dplane_scatter",
+    "golf_ml_insights",
+    "golf_strike_heatmap",
+)
+HEATMAP = "golf_strike_heatmap"
+ML_INSIGHTS = "golf_ml_insights"
+# Submitted first so the slowest work starts on the first free workers.
+RENDER_ORDER = (ML_INSIGHTS, "golf_carry_trends", "golf_dplane_scatter", "golf_radar")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Render all golf charts in parallel.")
+    parser.add_argument("--db", type=Path, default=Path("golf_stats.db"), help="Path to SQLite database.")
+    parser.add_argument("--out-dir", type=Path, default=Path("/tmp"), help="Directory for the PNGs.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: CPU count, capped at the number of tasks).",
+    )
+    return parser.parse_args()
+
+
+# ---------------------------------------------------------------------------
+# Worker-side tasks (module level so they pickle under the spawn context)
+# ---------------------------------------------------------------------------
+
+def _init_worker() -> None:
+    apply_chart_theme()
+    for name in CHART_MODULES:
+        importlib.import_module(name)
+
+
+def _render_chart(name: str, db_path: str, output_path: str) -> tuple[str, float]:
+    started = time.perf_counter()
+    importlib.import_module(name).render(Path(db_path), Path(output_path))
+    return output_path, time.perf_counter() - started
+
+
+def _render_ml_insights(db_path: str, output_path: str) -> tuple[str, float]:
+    started = time.perf_counter()
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        importlib.import_module(ML_INSIGHTS).run(db_path, Path(output_path))
+    write_text_atomic(buffer.getvalue(), Path(output_path).with_suffix(".txt"))
+    return output_path, time.perf_counter() - started
+
+
+def _club_density(
+    club: str, x_values: list[float], y_values: list[float], grid: Any
+) -> tuple[str, Any, float]:
+    started = time.perf_counter()
+    density = importlib.import_module(HEATMAP).compute_club_density(x_values, y_values, grid)
+    return club, density, time.perf_counter() - started
+
+
+def _compose_heatmap(
+    top_clubs: list[tuple[str, int]],
+    club_points: dict[str, tuple[list[float], list[float]]],
+    densities: dict[str, Any],
+    output_path: str,
+) -> tuple[str, float]:
+    started = time.perf_counter()
+    importlib.import_module(HEATMAP).plot_heatmaps(top_clubs, club_points, Path(output_path), densities)
+    return output_path, time.perf_counter() - started
+
+
+# ---------------------------------------------------------------------------
+# Orchestration
+# ---------------------------------------------------------------------------
+
+def render_pack(db_path: Path, out_dir: Path, workers: int | None = None) -> dict[str, dict[str, Any]]:
+    """Render every chart into ``out_dir``; return per-chart status and timings."""
+    heatmap = importlib.import_module(HEATMAP)
+    results: dict[str, dict[str, Any]] = {}
+
+    with tempfile.TemporaryDirectory(prefix="golf_chart_pack_") as tmp_dir:
+        snapshot = str(snapshot_database(db_path, Path(tmp_dir) / "snapshot.db"))
+        top_clubs, club_points = heatmap.load_club_points(Path(snapshot))
+        grid = heatmap.shared_grid(top_clubs, club_points)
+        density_clubs = [club for club, _ in top_clubs] if grid is not None else []
+
+        task_count = len(RENDER_ORDER) + len(density_clubs) + 1
+        max_workers = max(1, min(workers or os.cpu_count() or 1, task_count))
+        context = multiprocessing.get_context("spawn")
+
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context, initializer=_init_worker) as pool:
+            pending: dict[Future, str] = {}
+            for name in RENDER_ORDER:
+                output = str(out_dir / f"{name}.png")
+                if name == ML_INSIGHTS:
+                    pending[pool.submit(_render_ml_insights, snapshot, output)] = name
+                else:
+                    pending[pool.submit(_render_chart, name, snapshot, output)] = name
+
+            density_futures = [
+                pool.submit(_club_density, club, *club_points.get(club, ([], [])), grid)
+                for club in density_clubs
+            ]
+            densities: dict[str, Any] = {}
+            density_seconds = 0.0
+            heatmap_failed = False
+            for future in density_futures:
+                try:
+                    club, density, seconds = future.result()
+                except BaseException as exc:  # noqa: BLE001 - report per chart
+                    results[HEATMAP] = {"error": f"{type(exc).__name__}: {exc}"}
+                    heatmap_failed = True
+                    break
+                densities[club] = density
+                density_seconds = max(density_seconds, seconds)
+            if not heatmap_failed:
+                output = str(out_dir / f"{HEATMAP}.png")
+                compose = pool.submit(_compose_heatmap, top_clubs, club_points, densities, output)
+                pending[compose] = HEATMAP
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    try:
+                        output, seconds = future.result()
+                    except BaseException as exc:  # noqa: BLE001 - report per chart
+                        results[name] = {"error": f"{type(exc).__name__}: {exc}"}
+                        continue
+                    if name == HEATMAP:
+                        seconds += density_seconds
+                    results[name] = {"output": output, "seconds": seconds}
+
+    return results
+
+
+def main() -> int:
+    args = parse_args()
+    if not args.db.exists():
+        raise SystemExit(f"Database not found: {args.db}")
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    results = render_pack(args.db, args.out_dir, args.workers)
+    wall = time.perf_counter() - started
+
+    failed = 0
+    print(f"{'Chart':<22} {'Seconds':>8}  Output")
+    for name in CHART_MODULES:
+        result = results.get(name, {"error": "not rendered"})
+        if "error" in result:
+            failed += 1
+            print(f"{name:<22} {'FAILED':>8}  {result['error']}")
+        else:
+            print(f"{name:<22} {result['seconds']:8.2f}  {result['output']}")
+
+    serial = sum(r.get("seconds", 0.0) for r in results.values())
+    print(f"\nWall clock: {wall:.2f}s (sum of chart times: {serial:.2f}s)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
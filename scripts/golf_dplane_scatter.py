@@ -16,6 +16,8 @@ import matplotlib.pyplot as plt
 from matplotlib.lines import Line2D
 import seaborn as sns
 
+from chart_render import save_figure_atomic
+
 
 EXCLUDED_CLUBS = ("Sim Round", "Other", "Putter")
 OUTPUT_PATH = Path("/tmp/golf_dplane_scatter.png")
@@ -156,10 +158,16 @@ def create_plot(records: list[dict[str, Any]], output_path: Path) -> None:
     ax.legend(handles=legend_handles, title="Legend")
 
     fig.tight_layout()
-    fig.savefig(output_path, dpi=150)
+    save_figure_atomic(fig, output_path, dpi=150)
     plt.close(fig)
 
 
+def render(db_path: Path, output_path: Path = OUTPUT_PATH) -> Path:
+    """Load face/path data from ``db_path`` and write the D-plane PNG."""
+    create_plot(load_shots(db_path), output_path)
+    return output_path
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument(
@@ -179,9 +187,7 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> None:
     args = parse_args()
-    records = load_shots(args.db)
-    create_plot(records, args.out)
-    print(str(args.out))
+    print(str(render(args.db, args.out)))
 
 
 if __name__ == "__main__":
@@ -25,6 +25,7 @@ from sklearn.ensemble import IsolationForest, RandomForestRegressor
 from sklearn.metrics import r2_score
 from sklearn.model_selection import train_test_split
 
+from chart_render import save_figure_atomic
 
 EXCLUDED_CLUBS = ("Sim Round", "Other", "Putter")
 FIGURE_PATH = Path("/tmp/golf_ml_insights.png")
@@ -135,17 +136,14 @@ def dedupe_labels(labels: list[str]) -> list[str]:
     return deduped
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="Golf ML Insights")
-    parser.add_argument("--db", default="golf_stats.db", help="Path to SQLite database")
-    args = parser.parse_args()
-
-    rows = load_rows(args.db)
+def run(db_path: str, figure_path: Path = FIGURE_PATH) -> Path:
+    """Print the insights report for ``db_path`` and save the 2x2 figure."""
+    rows = load_rows(db_path)
     if not rows:
         raise SystemExit("No rows available after filters.")
 
     print("GOLF ML INSIGHTS")
-    print(f"DB: {args.db}")
+    print(f"DB: {db_path}")
     print(f"Filters: exclude clubs {', '.join(EXCLUDED_CLUBS)}; exclude session_type='Sim Round'; exclude shot_type='Other'; carry >= 10")
     print(f"Rows after filters: {len(rows)}")
 
@@ -326,10 +324,18 @@ def main() -> None:
     ax4.set_ylabel("Outlier Count")
 
     fig.tight_layout()
-    fig.savefig(FIGURE_PATH, dpi=150)
+    save_figure_atomic(fig, figure_path, dpi=150)
     plt.close(fig)
 
-    print(f"\nSaved figure: {FIGURE_PATH}")
+    print(f"\nSaved figure: {figure_path}")
+    return figure_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Golf ML Insights")
+    parser.add_argument("--db", default="golf_stats.db", help="Path to SQLite database")
+    args = parser.parse_args()
+    run(args.db, FIGURE_PATH)
 
 
 if __name__ == "__main__":
@@ -17,6 +17,8 @@ matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import numpy as np
 
+from chart_render import save_figure_atomic
+
 
 EXCLUDED_CLUBS = ("sim round", "other", "putter")
 AXES = ["Carry", "Smash Factor", "Consistency", "Accuracy", "Strike Quality"]
@@ -163,14 +165,13 @@ def build_radar_chart(normalized_metrics: dict[str, dict[str, float]], output_pa
     ax.set_title("Top 6 Most-Hit Clubs Radar Profile", pad=20)
     ax.legend(loc="upper right", bbox_to_anchor=(1.25, 1.1))
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    fig.savefig(output_path, dpi=150, bbox_inches="tight")
+    save_figure_atomic(fig, output_path, dpi=150, bbox_inches="tight")
     plt.close(fig)
 
 
-def main() -> None:
-    args = parse_args()
-    with sqlite3.connect(args.db) as connection:
+def render(db_path: Path, output_path: Path) -> Path:
+    """Query the top clubs from ``db_path`` and write the radar PNG."""
+    with sqlite3.connect(db_path) as connection:
         top_clubs = get_top_clubs(connection, limit=6)
         raw_metrics = get_raw_metrics(connection, top_clubs)
 
@@ -178,8 +179,13 @@ def main() -> None:
         raise RuntimeError("No shot data found for requested filters.")
 
     normalized_metrics = normalize_axes(raw_metrics)
-    build_radar_chart(normalized_metrics, args.output)
-    print(str(args.output))
+    build_radar_chart(normalized_metrics, output_path)
+    return output_path
+
+
+def main() -> None:
+    args = parse_args()
+    print(str(render(args.db, args.output)))
 
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import sqlite3
+import sys
 from pathlib import Path
 
 import matplotlib
@@ -11,13 +12,27 @@ import matplotlib
 matplotlib.use("Agg")
 
 import matplotlib.pyplot as plt
+import numpy as np
 import seaborn as sns
 
+from chart_render import save_figure_atomic
+
+# The density engine lives in the app package at the repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from services.analytics.strike_density import DensityGrid, StrikeDensity  # noqa: E402
+
 
 DB_PATH = Path("golf_stats.db")
 OUTPUT_PATH = Path("/tmp/golf_strike_heatmap.png")
 EXCLUDED_CLUBS = ("Sim Round", "Other", "Putter")
 CARRY_MIN = 10.0
+KDE_GRIDSIZE = 200
+KDE_LEVELS = 100
+KDE_THRESH = 0.05
+
+# (x centres, y centres, density grid, contour levels) for one club
+ClubDensity = tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
 
 
 def fetch_top_clubs(connection: sqlite3.Connection, limit: int = 4) -> list[tuple[str, int]]:
@@ -57,23 +72,73 @@ def fetch_impact_points(connection: sqlite3.Connection, club: str) -> tuple[list
     return x_values, y_values
 
 
-def plot_heatmaps(top_clubs: list[tuple[str, int]], club_points: dict[str, tuple[list[float], list[float]]]) -> None:
-    sns.set_theme(style="white")
-    fig, axes = plt.subplots(2, 2, figsize=(12, 10), constrained_layout=True)
-    axes_flat = axes.flatten()
+def load_club_points(
+    db_path: Path, limit: int = 4
+) -> tuple[list[tuple[str, int]], dict[str, tuple[list[float], list[float]]]]:
+    if not Path(db_path).exists():
+        raise FileNotFoundError(f"Database not found: {db_path}")
+
+    with sqlite3.connect(db_path) as connection:
+        top_clubs = fetch_top_clubs(connection, limit=limit)
+        club_points: dict[str, tuple[list[float], list[float]]] = {}
+        for club_name, _ in top_clubs:
+            club_points[club_name] = fetch_impact_points(connection, club_name)
+    return top_clubs, club_points
+
+
+def can_estimate_density(x_values: list[float], y_values: list[float]) -> bool:
+    return len(x_values) >= 2 and len(set(x_values)) > 1 and len(set(y_values)) > 1
 
+
+def shared_grid(
+    top_clubs: list[tuple[str, int]], club_points: dict[str, tuple[list[float], list[float]]]
+) -> DensityGrid | None:
+    """One grid (and axis range) shared by every panel, padded around all points."""
     all_x = [x for club, _ in top_clubs for x in club_points.get(club, ([], []))[0]]
     all_y = [y for club, _ in top_clubs for y in club_points.get(club, ([], []))[1]]
+    if not all_x or not all_y:
+        return None
+    return DensityGrid.from_points(all_x, all_y, size=KDE_GRIDSIZE)
+
 
-    x_limits = None
-    y_limits = None
-    if all_x and all_y:
-        x_min, x_max = min(all_x), max(all_x)
-        y_min, y_max = min(all_y), max(all_y)
-        x_pad = max((x_max - x_min) * 0.08, 0.5)
-        y_pad = max((y_max - y_min) * 0.08, 0.5)
-        x_limits = (x_min - x_pad, x_max + x_pad)
-        y_limits = (y_min - y_pad, y_max + y_pad)
+def compute_club_density(
+    x_values: list[float], y_values: list[float], grid: DensityGrid, bw_adjust: float = 1.0
+) -> ClubDensity | None:
+    """Evaluate the filled-KDE grid for one club's strike points.
+
+    Uses the binned/FFT engine in ``services.analytics.strike_density``
+    (same bandwidth rule and iso-proportion levels as ``sns.kdeplot``).
+    Kept separate from drawing so ``golf_chart_pack.py`` can compute each
+    club in its own worker process.
+    """
+    if not can_estimate_density(x_values, y_values):
+        return None
+
+    engine = StrikeDensity(grid, bw_adjust)
+    engine.add(x_values, y_values)
+    density = engine.density()
+    if density is None:
+        return None
+    return grid.xs, grid.ys, density, engine.levels(KDE_THRESH, KDE_LEVELS)
+
+
+def plot_heatmaps(
+    top_clubs: list[tuple[str, int]],
+    club_points: dict[str, tuple[list[float], list[float]]],
+    output_path: Path = OUTPUT_PATH,
+    densities: dict[str, ClubDensity | None] | None = None,
+) -> Path:
+    """Draw the 2x2 heatmap grid; ``densities`` are computed here if omitted."""
+    grid = shared_grid(top_clubs, club_points)
+    if densities is None:
+        densities = {}
+        if grid is not None:
+            for club, _ in top_clubs:
+                densities[club] = compute_club_density(*club_points.get(club, ([], [])), grid)
+
+    sns.set_theme(style="white")
+    fig, axes = plt.subplots(2, 2, figsize=(12, 10), constrained_layout=True)
+    axes_flat = axes.flatten()
 
     for index, axis in enumerate(axes_flat):
         if index >= len(top_clubs):
@@ -84,17 +149,10 @@ def plot_heatmaps(top_clubs: list[tuple[str, int]], club_points: dict[str, tuple
         x_values, y_values = club_points.get(club_name, ([], []))
         plotted_count = len(x_values)
 
-        if plotted_count >= 2 and len(set(x_values)) > 1 and len(set(y_values)) > 1:
-            sns.kdeplot(
-                x=x_values,
-                y=y_values,
-                fill=True,
-                cmap="hot",
-                levels=100,
-                thresh=0.05,
-                bw_adjust=1.0,
-                ax=axis,
-            )
+        density = densities.get(club_name)
+        if density is not None:
+            xs, ys, values, levels = density
+            axis.contourf(xs, ys, values, levels=levels, cmap="hot")
         elif plotted_count > 0:
             axis.scatter(x_values, y_values, color="orangered", alpha=0.85, s=14)
             axis.set_facecolor("#120000")
@@ -107,27 +165,24 @@ def plot_heatmaps(top_clubs: list[tuple[str, int]], club_points: dict[str, tuple
         axis.set_xlabel("impact_x")
         axis.set_ylabel("impact_y")
 
-        if x_limits is not None and y_limits is not None:
-            axis.set_xlim(x_limits)
-            axis.set_ylim(y_limits)
+        if grid is not None:
+            axis.set_xlim(grid.x_min, grid.x_max)
+            axis.set_ylim(grid.y_min, grid.y_max)
 
     fig.suptitle("Strike Location KDE Heatmaps (Top 4 Clubs)", fontsize=14)
-    fig.savefig(OUTPUT_PATH, dpi=150)
+    save_figure_atomic(fig, output_path, dpi=150)
     plt.close(fig)
+    return output_path
 
 
-def main() -> None:
-    if not DB_PATH.exists():
-        raise FileNotFoundError(f"Database not found: {DB_PATH}")
+def render(db_path: Path = DB_PATH, output_path: Path = OUTPUT_PATH) -> Path:
+    """Load the top clubs' strike points from ``db_path`` and write the PNG."""
+    top_clubs, club_points = load_club_points(db_path)
+    return plot_heatmaps(top_clubs, club_points, output_path)
 
-    with sqlite3.connect(DB_PATH) as connection:
-        top_clubs = fetch_top_clubs(connection, limit=4)
-        club_points: dict[str, tuple[list[float], list[float]]] = {}
-        for club_name, _ in top_clubs:
-            club_points[club_name] = fetch_impact_points(connection, club_name)
 
-    plot_heatmaps(top_clubs, club_points)
-    print(OUTPUT_PATH.as_posix())
+def main() -> None:
+    print(render(DB_PATH, OUTPUT_PATH).as_posix())
 
 
 if __name__ == "__main__":
@@ -16,6 +16,8 @@ import statistics
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from shot_stream import ShotTable, ShotView, load_table
+
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -26,6 +28,9 @@ MIN_CARRY = 10.0
 DEFAULT_DB_PATH = Path(__file__).resolve().parents[1] / "golf_stats.db"
 DEFAULT_MIN_SHOTS = 10
 
+# Numeric columns streamed per club (see fetch_shots)
+SHOT_COLUMNS = ("carry", "total", "optix_x", "optix_y", "side_distance", "descent_angle")
+
 # Sentinel values from Uneekor (means "no data")
 SENTINEL_VALUES = {99999.0, -99999.0}
 
@@ -84,14 +89,6 @@ def to_float(value: Any) -> Optional[float]:
         return None
 
 
-def to_float_nonzero(value: Any) -> Optional[float]:
-    """Convert to float, also filtering out zero values (invalid for optix)."""
-    v = to_float(value)
-    if v is not None and v == 0.0:
-        return None
-    return v
-
-
 def safe_mean(values: List[float]) -> float:
     """Return mean or NaN if empty."""
     return statistics.fmean(values) if values else math.nan
@@ -206,8 +203,12 @@ def fetch_shots(
     conn: sqlite3.Connection,
     carry_col: str,
     total_col: str,
-) -> List[Dict[str, Any]]:
-    """Fetch shots with landing and roll columns, excluding unwanted clubs."""
+) -> ShotTable:
+    """Stream shots with landing and roll columns into a per-club ShotTable.
+
+    Sentinel values are stored as missing (NaN); zeros are kept and filtered
+    per metric during analysis.
+    """
     placeholders = ", ".join("?" for _ in EXCLUDED_CLUBS)
     query = f"""
         SELECT
@@ -226,22 +227,20 @@ def fetch_shots(
           AND {carry_col} >= ?
     """
     params = (*sorted(EXCLUDED_CLUBS), MIN_CARRY)
-    cursor = conn.execute(query, params)
-    cols = [d[0] for d in cursor.description]
-    return [dict(zip(cols, row)) for row in cursor.fetchall()]
+    return load_table(conn, query, params, SHOT_COLUMNS, convert=to_float)
 
 
 # ---------------------------------------------------------------------------
 # Analysis
 # ---------------------------------------------------------------------------
 
-def analyze_club(club: str, shots: List[Dict[str, Any]]) -> Dict[str, Any]:
+def analyze_club(club: str, shots: ShotView) -> Dict[str, Any]:
     """Compute landing position, roll, and dispersion stats for a single club."""
 
     # --- Landing position (optix_x, optix_y) ---
-    # Filter out zeros and sentinels for optix values
-    optix_xs = [v for s in shots if (v := to_float_nonzero(s["optix_x"])) is not None]
-    optix_ys = [v for s in shots if (v := to_float_nonzero(s["optix_y"])) is not None]
+    # Filter out zeros (sentinels are already missing) for optix values
+    optix_xs = [v for v in shots.values("optix_x") if v != 0.0]
+    optix_ys = [v for v in shots.values("optix_y") if v != 0.0]
 
     avg_optix_x = safe_mean(optix_xs)
     avg_optix_y = safe_mean(optix_ys)
@@ -257,12 +256,9 @@ def analyze_club(club: str, shots: List[Dict[str, Any]]) -> Dict[str, Any]:
     # --- Roll distance (total - carry) ---
     rolls: List[float] = []
     carries_for_roll: List[float] = []
-    for s in shots:
-        carry = to_float(s["carry"])
-        total = to_float(s["total"])
-        if carry is not None and total is not None and total >= carry:
-            roll = total - carry
-            rolls.append(roll)
+    for carry, total in zip(*shots.paired("carry", "total")):
+        if total >= carry:
+            rolls.append(total - carry)
             carries_for_roll.append(carry)
 
     avg_roll = safe_mean(rolls)
@@ -278,11 +274,8 @@ def analyze_club(club: str, shots: List[Dict[str, Any]]) -> Dict[str, Any]:
     # --- Descent-to-roll correlation ---
     descent_roll_pairs_x: List[float] = []
     descent_roll_pairs_y: List[float] = []
-    for s in shots:
-        carry = to_float(s["carry"])
-        total = to_float(s["total"])
-        descent = to_float(s["descent_angle"])
-        if (carry is not None and total is not None and descent is not None
+    for carry, total, descent in zip(shots["carry"], shots["total"], shots["descent_angle"]):
+        if (carry == carry and total == total and descent == descent
                 and total >= carry and descent > 0):
             descent_roll_pairs_x.append(descent)
             descent_roll_pairs_y.append(total - carry)
@@ -291,7 +284,7 @@ def analyze_club(club: str, shots: List[Dict[str, Any]]) -> Dict[str, Any]:
 
     # --- Side miss tendency from optix_x ---
     # Negative = left, positive = right
-    side_values = [v for s in shots if (v := to_float(s["side_distance"])) is not None]
+    side_values = shots.values("side_distance")
     avg_side = safe_mean(side_values)
 
     if not math.isnan(avg_side):
@@ -600,23 +593,17 @@ def main() -> int:
     with build_connection(args.db) as conn:
         carry_col = resolve_carry_column(conn)
         total_col = detect_total_column(conn)
-        shots = fetch_shots(conn, carry_col, total_col)
+        table = fetch_shots(conn, carry_col, total_col)
 
-    if not shots:
+    if not len(table):
         print("No qualifying shots found in the database.")
         return 1
 
-    # Group by club
-    by_club: Dict[str, List[Dict[str, Any]]] = {}
-    for s in shots:
-        club = s["club"].strip()
-        if club:
-            by_club.setdefault(club, []).append(s)
-
     # Analyze clubs with enough data
     results: List[Dict[str, Any]] = []
     skipped: List[Tuple[str, int]] = []
-    for club, club_shots in by_club.items():
+    for club_shots in table.views():
+        club = club_shots.key
         if len(club_shots) < args.min_shots:
             skipped.append((club, len(club_shots)))
             continue
@@ -636,7 +623,7 @@ def main() -> int:
     sections.append("LANDING ZONE & ROLL DISTANCE ANALYSIS")
     sections.append("=" * 70)
     sections.append(f"Database: {args.db}")
-    sections.append(f"Total qualifying shots: {len(shots)}")
+    sections.append(f"Total qualifying shots: {len(table)}")
     sections.append(f"Clubs analyzed: {len(results)} (min {args.min_shots} shots, carry >= {MIN_CARRY:.0f} yds)")
     sections.append(f"Excluded: {', '.join(sorted(EXCLUDED_CLUBS))}")
     if skipped:
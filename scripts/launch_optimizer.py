@@ -6,9 +6,22 @@ from __future__ import annotations
 import argparse
 import math
 import sqlite3
+import sys
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any, List
 
+# The bootstrap engine lives in the app package at the repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from services.analytics.bootstrap import (  # noqa: E402
+    DEFAULT_CONFIDENCE,
+    DEFAULT_RESAMPLES,
+    DEFAULT_SEED,
+    ConfidenceInterval,
+    bootstrap_club_stats,
+)
+
 
 EXCLUDED_CLUBS = ("Other", "Putter", "Sim Round")
 MIN_SHOTS = 15
@@ -33,6 +46,8 @@ class ClubAnalysis:
     optimal: LaunchConditions
     efficiency: float  # current avg carry / top 10% avg carry * 100
     adjustments: List[str] = field(default_factory=list)
+    carry_ci: ConfidenceInterval | None = None  # bootstrap CI of mean carry
+    p90_ci: ConfidenceInterval | None = None  # bootstrap CI of P90 carry
 
 
 def safe_float(value: Any) -> float | None:
@@ -137,7 +152,18 @@ def compute_adjustments(current: LaunchConditions, optimal: LaunchConditions, cl
     return adjustments
 
 
-def analyze_clubs(db_path: str) -> tuple[int, int, list[ClubAnalysis]]:
+def format_ci(ci: ConfidenceInterval | None, digits: int = 1) -> str:
+    if ci is None:
+        return "-"
+    return f"{safe_round(ci.low, digits)}-{safe_round(ci.high, digits)}"
+
+
+def analyze_clubs(
+    db_path: str,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    confidence: float = DEFAULT_CONFIDENCE,
+    seed: int | None = DEFAULT_SEED,
+) -> tuple[int, int, list[ClubAnalysis]]:
     """Query the database and compute per-club launch optimization data."""
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
@@ -259,15 +285,32 @@ def analyze_clubs(db_path: str) -> tuple[int, int, list[ClubAnalysis]]:
             )
         )
 
+    # Carry uncertainty for all analyzed clubs in one batched bootstrap
+    boot = bootstrap_club_stats(
+        {a.club: [c for c in (safe_float(s[1]) for s in clubs[a.club]) if c is not None] for a in results},
+        n_resamples,
+        confidence,
+        seed,
+    )
+    for a in results:
+        if a.club in boot:
+            a.carry_ci = boot.ci(a.club, "mean")
+            a.p90_ci = boot.ci(a.club, "p90")
+
     # Sort by current carry descending (longest clubs first)
     results.sort(key=lambda a: a.current.carry if not math.isnan(a.current.carry) else 0, reverse=True)
 
     return total_shots, included_shots, results
 
 
-def build_report(db_path: str) -> str:
+def build_report(
+    db_path: str,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    confidence: float = DEFAULT_CONFIDENCE,
+    seed: int | None = DEFAULT_SEED,
+) -> str:
     """Build the full text report."""
-    total_shots, included_shots, analyses = analyze_clubs(db_path)
+    total_shots, included_shots, analyses = analyze_clubs(db_path, n_resamples, confidence, seed)
 
     lines: list[str] = []
     lines.append("LAUNCH CONDITION OPTIMIZER")
@@ -290,6 +333,7 @@ def build_report(db_path: str) -> str:
         "Club",
         "Shots",
         "Cur Carry",
+        "Carry CI",
         "Top Carry",
         "Eff %",
         "Cur LA",
@@ -308,6 +352,7 @@ def build_report(db_path: str) -> str:
             a.club,
             str(a.shot_count),
             safe_round(a.current.carry),
+            format_ci(a.carry_ci),
             safe_round(a.optimal.carry),
             safe_round(a.efficiency),
             safe_round(a.current.launch_angle),
@@ -326,6 +371,10 @@ def build_report(db_path: str) -> str:
     # Legend
     lines.append("Legend: LA=Launch Angle (deg), BS=Ball Speed (mph), Spin (rpm), AA=Attack Angle (deg)")
     lines.append(f"        Eff %=Current Avg Carry / Top {int(TOP_PERCENTILE * 100)}% Avg Carry x 100")
+    lines.append(
+        f"        Carry CI={confidence * 100:.0f}% bootstrap CI of Cur Carry "
+        f"({n_resamples} resamples, seed {seed})"
+    )
     lines.append("")
 
     # --- Per-club recommendations ---
@@ -340,6 +389,8 @@ def build_report(db_path: str) -> str:
             carry_gap_str = f"+{carry_gap:.1f}" if carry_gap > 0 else f"{carry_gap:.1f}"
 
         lines.append(f"\n{a.club} ({a.shot_count} shots) -- efficiency: {safe_round(a.efficiency)}%, carry gap: {carry_gap_str} yd")
+        if a.p90_ci is not None:
+            lines.append(f"  P90 carry: {safe_round(a.p90_ci.estimate)} yd (CI {format_ci(a.p90_ci)})")
         for adj in a.adjustments:
             lines.append(f"  -> {adj}")
 
@@ -378,12 +429,30 @@ def parse_args() -> argparse.Namespace:
         default="golf_stats.db",
         help="Path to SQLite database (default: golf_stats.db)",
     )
+    parser.add_argument(
+        "--resamples",
+        type=int,
+        default=DEFAULT_RESAMPLES,
+        help=f"Bootstrap resamples per club (default: {DEFAULT_RESAMPLES})",
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=DEFAULT_CONFIDENCE,
+        help=f"Confidence level for carry CIs (default: {DEFAULT_CONFIDENCE})",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=DEFAULT_SEED,
+        help=f"Random seed for resampling (default: {DEFAULT_SEED})",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    print(build_report(args.db))
+    print(build_report(args.db, args.resamples, args.confidence, args.seed))
 
 
 if __name__ == "__main__":
@@ -10,6 +10,7 @@ import statistics
 from dataclasses import dataclass
 from typing import Any
 
+from shot_stream import ShotTable, load_table
 
 EXCLUDED_CLUBS = ("Other", "Putter", "Sim Round")
 
@@ -116,120 +117,102 @@ def resolve_carry_column(conn: sqlite3.Connection) -> str:
     raise RuntimeError("shots table is missing both carry_distance and carry columns")
 
 
-def fetch_rows(db_path: str, min_carry: float) -> tuple[list[sqlite3.Row], str]:
+DRILL_COLUMNS = (
+    "carry",
+    "face_angle",
+    "club_path",
+    "face_to_path",
+    "impact_x",
+    "impact_y",
+    "strike_distance",
+)
+
+
+def fetch_shots(db_path: str, min_carry: float) -> tuple[ShotTable, str, tuple[str | None, str | None]]:
+    """Stream filtered shots into a ShotTable.
+
+    Returns (table, carry column name, (earliest, latest) session_date).
+    """
     conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
     carry_col = resolve_carry_column(conn)
 
     placeholders = ", ".join("?" for _ in EXCLUDED_CLUBS)
+    where = f"""
+        WHERE club IS NOT NULL
+          AND TRIM(club) != ''
+          AND club NOT IN ({placeholders})
+          AND {carry_col} IS NOT NULL
+          AND {carry_col} >= ?
+    """
     query = f"""
         SELECT
             club,
             {carry_col} AS carry_distance,
-            ball_speed,
-            smash,
-            launch_angle,
             face_angle,
             club_path,
             face_to_path,
             impact_x,
             impact_y,
-            strike_distance,
-            session_date
+            strike_distance
         FROM shots
-        WHERE club IS NOT NULL
-          AND TRIM(club) != ''
-          AND club NOT IN ({placeholders})
-          AND {carry_col} IS NOT NULL
-          AND {carry_col} >= ?
+        {where}
     """
     params: tuple[Any, ...] = (*EXCLUDED_CLUBS, min_carry)
 
-    cur = conn.cursor()
-    cur.execute(query, params)
-    rows = cur.fetchall()
-    conn.close()
-    return rows, carry_col
-
-
-def build_club_stats(rows: list[sqlite3.Row], min_shots_per_club: int) -> list[ClubStats]:
-    bucket: dict[str, dict[str, list[float]]] = {}
-    for row in rows:
-        club = str(row["club"]).strip()
-        if not club:
-            continue
-        club_data = bucket.setdefault(
-            club,
-            {
-                "carry": [],
-                "face": [],
-                "path": [],
-                "ftp": [],
-                "impact_x_abs": [],
-                "impact_y_abs": [],
-                "strike_distance": [],
-            },
-        )
-        carry_value = safe_float(row["carry_distance"])
-        if carry_value is not None:
-            club_data["carry"].append(carry_value)
-
-        face_value = safe_float(row["face_angle"])
-        if face_value is not None:
-            club_data["face"].append(face_value)
-
-        path_value = safe_float(row["club_path"])
-        if path_value is not None:
-            club_data["path"].append(path_value)
-
-        ftp_value = safe_float(row["face_to_path"])
-        if ftp_value is not None:
-            club_data["ftp"].append(ftp_value)
-
-        impact_x_value = safe_float(row["impact_x"])
-        if impact_x_value is not None:
-            club_data["impact_x_abs"].append(abs(impact_x_value))
-
-        impact_y_value = safe_float(row["impact_y"])
-        if impact_y_value is not None:
-            club_data["impact_y_abs"].append(abs(impact_y_value))
-
-        strike_value = safe_float(row["strike_distance"])
-        if strike_value is not None:
-            club_data["strike_distance"].append(strike_value)
-
+    try:
+        table = load_table(conn, query, params, DRILL_COLUMNS, convert=safe_float)
+        date_range = conn.execute(
+            f"""
+            SELECT MIN(session_date), MAX(session_date)
+            FROM shots
+            {where}
+              AND session_date IS NOT NULL
+              AND session_date != ''
+            """,
+            params,
+        ).fetchone()
+    finally:
+        conn.close()
+    return table, carry_col, (date_range[0], date_range[1])
+
+
+def abs_values(values: list[float]) -> list[float]:
+    return [abs(v) for v in values]
+
+
+def build_club_stats(table: ShotTable, min_shots_per_club: int) -> list[ClubStats]:
     club_stats: list[ClubStats] = []
-    for club, values in bucket.items():
-        shot_count = len(values["carry"])
+    for shots in table.views():
+        shot_count = len(shots.values("carry"))
         if shot_count < min_shots_per_club:
             continue
         club_stats.append(
             ClubStats(
-                club=club,
+                club=shots.key,
                 shots=shot_count,
-                face_avg=mean(values["face"]),
-                face_std=stdev(values["face"]),
-                path_avg=mean(values["path"]),
-                path_std=stdev(values["path"]),
-                ftp_avg=mean(values["ftp"]),
-                ftp_std=stdev(values["ftp"]),
-                impact_x_abs_avg=mean(values["impact_x_abs"]),
-                impact_y_abs_avg=mean(values["impact_y_abs"]),
-                strike_distance_avg=mean(values["strike_distance"]),
-                carry_cv=cv(values["carry"]),
+                face_avg=mean(shots.values("face_angle")),
+                face_std=stdev(shots.values("face_angle")),
+                path_avg=mean(shots.values("club_path")),
+                path_std=stdev(shots.values("club_path")),
+                ftp_avg=mean(shots.values("face_to_path")),
+                ftp_std=stdev(shots.values("face_to_path")),
+                impact_x_abs_avg=mean(abs_values(shots.values("impact_x"))),
+                impact_y_abs_avg=mean(abs_values(shots.values("impact_y"))),
+                strike_distance_avg=mean(shots.values("strike_distance")),
+                carry_cv=cv(shots.values("carry")),
             )
         )
 
     return sorted(club_stats, key=lambda c: c.shots, reverse=True)
 
 
-def detect_weaknesses(rows: list[sqlite3.Row], club_stats: list[ClubStats]) -> list[Weakness]:
-    face_vals = [v for v in (safe_float(r["face_angle"]) for r in rows) if v is not None]
-    path_vals = [v for v in (safe_float(r["club_path"]) for r in rows) if v is not None]
-    ftp_vals = [v for v in (safe_float(r["face_to_path"]) for r in rows) if v is not None]
-    impact_x_abs_vals = [abs(v) for v in (safe_float(r["impact_x"]) for r in rows) if v is not None]
-    impact_y_abs_vals = [abs(v) for v in (safe_float(r["impact_y"]) for r in rows) if v is not None]
-    strike_vals = [v for v in (safe_float(r["strike_distance"]) for r in rows) if v is not None]
+def detect_weaknesses(table: ShotTable, club_stats: list[ClubStats]) -> list[Weakness]:
+    face_vals = table.values("face_angle")
+    path_vals = table.values("club_path")
+    ftp_vals = table.values("face_to_path")
+    impact_x_abs_vals = abs_values(table.values("impact_x"))
+    impact_y_abs_vals = abs_values(table.values("impact_y"))
+    strike_vals = table.values("strike_distance")
 
     weaknesses: list[Weakness] = []
 
@@ -638,19 +621,19 @@ def weakness_to_drill(weakness: Weakness) -> Drill:
 def render_report(
     db_path: str,
     carry_column: str,
-    rows: list[sqlite3.Row],
+    table: ShotTable,
+    date_range: tuple[str | None, str | None],
     club_stats: list[ClubStats],
     drills: list[Drill],
 ) -> str:
-    session_dates = [str(r["session_date"]) for r in rows if r["session_date"]]
-    earliest = min(session_dates) if session_dates else "N/A"
-    latest = max(session_dates) if session_dates else "N/A"
+    earliest = str(date_range[0]) if date_range[0] else "N/A"
+    latest = str(date_range[1]) if date_range[1] else "N/A"
 
     lines: list[str] = []
     lines.append("PERSONALIZED PRACTICE DRILL PRESCRIPTIONS")
     lines.append(f"Database: {db_path}")
     lines.append(f"Carry source column: {carry_column}")
-    lines.append(f"Shots analyzed: {len(rows)}")
+    lines.append(f"Shots analyzed: {len(table)}")
     lines.append(f"Clubs analyzed (min sample met): {len(club_stats)}")
     lines.append(f"Session range: {earliest} -> {latest}")
     lines.append("")
@@ -702,18 +685,18 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> None:
     args = parse_args()
-    rows, carry_column = fetch_rows(args.db_path, args.min_carry)
-    if not rows:
+    table, carry_column, date_range = fetch_shots(args.db_path, args.min_carry)
+    if not len(table):
         print("No shots available after filters (club exclusions + minimum carry).")
         return
 
-    club_stats = build_club_stats(rows, args.min_shots_per_club)
-    weaknesses = detect_weaknesses(rows, club_stats)
+    club_stats = build_club_stats(table, args.min_shots_per_club)
+    weaknesses = detect_weaknesses(table, club_stats)
     drills = sorted((weakness_to_drill(w) for w in weaknesses), key=lambda d: d.severity, reverse=True)
 
     max_drills = max(5, args.top_n)
     drills = drills[: max_drills if len(drills) >= max_drills else len(drills)]
-    report = render_report(args.db_path, carry_column, rows, club_stats, drills)
+    report = render_report(args.db_path, carry_column, table, date_range, club_stats, drills)
     print(report)
 
 
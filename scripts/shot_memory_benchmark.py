@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Compare the memory footprint of per-shot representations used by the scripts.
+
+Measures, with tracemalloc, how much memory N shots x M metrics occupy as:
+  - dicts           {column: float} per shot (old correlation_analysis)
+  - dataclass rows  one object per shot (old warmup_analyzer ShotRow style)
+  - slots rows      one __slots__ object per shot
+  - ShotTable       shared struct-of-arrays with validity masks
+
+Shots are synthetic by default; pass --db to measure real data instead.
+
+Uses only Python stdlib.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import sqlite3
+import tracemalloc
+from dataclasses import make_dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from shot_stream import ColumnGroup, ShotTable, load_table, to_float
+
+DEFAULT_SHOTS = 20000
+DEFAULT_METRICS = 30
+MISSING_RATE = 0.05
+CLUBS = ("Driver", "3 Wood", "5 Iron", "7 Iron", "9 Iron", "PW", "SW")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shots", type=int, default=DEFAULT_SHOTS, help="Synthetic shot count.")
+    parser.add_argument("--metrics", type=int, default=DEFAULT_METRICS, help="Synthetic metrics per shot.")
+    parser.add_argument("--db", type=Path, default=None, help="Measure numeric columns from this SQLite DB.")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for synthetic data.")
+    return parser.parse_args()
+
+
+def synthetic_rows(shots: int, metrics: int, seed: int) -> tuple[list[str], list[tuple[Any, ...]]]:
+    rng = random.Random(seed)
+    names = [f"m{i:02d}" for i in range(metrics)]
+    rows = []
+    for _ in range(shots):
+        values = [None if rng.random() < MISSING_RATE else rng.gauss(100.0, 25.0) for _ in names]
+        rows.append((rng.choice(CLUBS), *as_text(values)))
+    return names, rows
+
+
+def as_text(values: Any) -> list[str | None]:
+    """Keep raw values as text so every layout allocates its own floats,
+    like a fresh cursor fetch does, instead of sharing the input objects."""
+    return [None if v is None else repr(float(v)) for v in values]
+
+
+def db_rows(db_path: Path) -> tuple[list[str], list[tuple[Any, ...]]]:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        info = conn.execute("PRAGMA table_info(shots)").fetchall()
+        names = [row[1] for row in info if str(row[2]).upper() in ("REAL", "INTEGER", "DOUBLE PRECISION")]
+        query = f"SELECT club, {', '.join(names)} FROM shots WHERE club IS NOT NULL"
+        rows = [(r[0], *as_text(r[1:])) for r in conn.execute(query).fetchall()]
+    finally:
+        conn.close()
+    return names, rows
+
+
+def measure(build: Callable[[], Any]) -> tuple[int, int]:
+    """Return (retained bytes, peak bytes) for the object built by ``build``."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return retained, peak
+
+
+def build_dicts(names: list[str], rows: list[tuple[Any, ...]]) -> list[dict[str, Any]]:
+    out = []
+    for row in rows:
+        record: dict[str, Any] = {"_club_name": row[0]}
+        for name, raw in zip(names, row[1:]):
+            v = to_float(raw)
+            if v is not None:
+                record[name] = v
+        out.append(record)
+    return out
+
+
+def build_objects(cls: type, rows: list[tuple[Any, ...]]) -> list[Any]:
+    return [cls(row[0], *(to_float(v) for v in row[1:])) for row in rows]
+
+
+def build_table(names: list[str], rows: list[tuple[Any, ...]]) -> ShotTable:
+    groups: dict[str, ColumnGroup] = {}
+    for row in rows:
+        group = groups.get(row[0])
+        if group is None:
+            group = groups[row[0]] = ColumnGroup(row[0], names)
+        group.append([v if v is not None else float("nan") for v in map(to_float, row[1:])])
+    return ShotTable.from_groups(groups, names)
+
+
+def build_table_from_db(db_path: Path, names: list[str]) -> ShotTable:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        query = f"SELECT club, {', '.join(names)} FROM shots WHERE club IS NOT NULL"
+        return load_table(conn, query, (), names)
+    finally:
+        conn.close()
+
+
+def fmt_bytes(n: int) -> str:
+    return f"{n / (1024 * 1024):8.2f} MiB"
+
+
+def main() -> int:
+    args = parse_args()
+    if args.db is not None:
+        if not args.db.exists():
+            raise SystemExit(f"Database not found: {args.db}")
+        names, rows = db_rows(args.db)
+        source = str(args.db)
+    else:
+        names, rows = synthetic_rows(args.shots, args.metrics, args.seed)
+        source = "synthetic"
+
+    fields = ["club", *names]
+    Row = make_dataclass("Row", fields)
+    SlotRow = make_dataclass("SlotRow", fields, slots=True)
+
+    cases: list[tuple[str, Callable[[], Any]]] = [
+        ("dict per shot", lambda: build_dicts(names, rows)),
+        ("dataclass per shot", lambda: build_objects(Row, rows)),
+        ("__slots__ per shot", lambda: build_objects(SlotRow, rows)),
+        ("ShotTable", lambda: build_table(names, rows)),
+    ]
+    if args.db is not None:
+        cases.append(("ShotTable (streamed)", lambda: build_table_from_db(args.db, names)))
+
+    results = [(label, *measure(build)) for label, build in cases]
+    baseline = results[0][1]
+
+    print(f"Shot memory benchmark -- {len(rows)} shots x {len(names)} metrics ({source})")
+    print(f"{'Layout':<22} {'Retained':>12} {'Peak':>12} {'B/shot':>8} {'vs dict':>8}")
+    for label, retained, peak in results:
+        per_shot = retained / max(1, len(rows))
+        ratio = retained / baseline if baseline else 0.0
+        print(f"{label:<22} {fmt_bytes(retained)} {fmt_bytes(peak)} {per_shot:8.0f} {ratio:7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,380 @@
+"""Streaming, column-oriented shot loader shared by the report scripts.
+
+Scripts used to ``fetchall()`` every qualifying shot and then convert each
+``sqlite3.Row`` into a dict of floats, which kept the raw rows and the
+converted dicts alive at the same time. This module reads the cursor in
+``fetchmany()`` batches and appends each value straight into typed
+``array('d')`` columns (8 bytes per value, NaN = missing), grouping by club
+or session on the fly. Raw rows are dropped batch by batch.
+
+``ShotTable`` is the shared compact container built on top: one typed
+buffer and one validity mask per column, with per-club zero-copy views.
+See ``shot_memory_benchmark.py`` for the footprint compared with the
+dict-per-shot and dataclass-per-shot layouts it replaces.
+
+Import from a script with ``from shot_stream import ...`` -- scripts are run
+as ``python scripts/<name>.py`` so this directory is already on sys.path.
+
+Uses only Python stdlib.
+"""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+from array import array
+from itertools import compress
+from operator import and_
+from typing import Any, Callable, Iterator, Sequence
+
+DEFAULT_BATCH_SIZE = 2000
+NAN = math.nan
+
+Converter = Callable[[Any], "float | None"]
+RowFilter = Callable[[Sequence[float]], bool]
+
+
+def to_float(value: Any) -> float | None:
+    """Default converter: None for NULL, non-numeric, NaN and inf values."""
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(number) or math.isinf(number):
+        return None
+    return number
+
+
+def is_valid(value: float) -> bool:
+    """Return True when a stored column value is present (not NaN)."""
+    return value == value
+
+
+# ---------------------------------------------------------------------------
+# Column storage
+# ---------------------------------------------------------------------------
+
+class ColumnGroup:
+    """Typed column buffers for one group of shots (a club or a session).
+
+    Each numeric column is an ``array('d')`` with NaN marking missing values.
+    ``attrs`` holds text columns captured from the first row of the group
+    (e.g. the session date).
+    """
+
+    __slots__ = ("key", "names", "columns", "attrs")
+
+    def __init__(self, key: str, names: Sequence[str], attrs: dict[str, Any] | None = None):
+        self.key = key
+        self.names = tuple(names)
+        self.columns: dict[str, array] = {name: array("d") for name in self.names}
+        self.attrs: dict[str, Any] = attrs or {}
+
+    def __len__(self) -> int:
+        if not self.names:
+            return 0
+        return len(self.columns[self.names[0]])
+
+    def __getitem__(self, name: str) -> array:
+        return self.columns[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.columns
+
+    def append(self, values: Sequence[float]) -> None:
+        """Append one shot; ``values`` must follow ``names`` order."""
+        for name, value in zip(self.names, values):
+            self.columns[name].append(value)
+
+    def values(self, name: str) -> list[float]:
+        """Return the non-missing values of a column."""
+        return [v for v in self.columns[name] if v == v]
+
+    def paired(self, name_a: str, name_b: str) -> tuple[list[float], list[float]]:
+        """Return values of two columns for shots where both are present."""
+        xs: list[float] = []
+        ys: list[float] = []
+        for a, b in zip(self.columns[name_a], self.columns[name_b]):
+            if a == a and b == b:
+                xs.append(a)
+                ys.append(b)
+        return xs, ys
+
+    def nbytes(self) -> int:
+        """Approximate buffer size of the numeric columns in bytes."""
+        return sum(col.itemsize * len(col) for col in self.columns.values())
+
+
+class ShotTable:
+    """Compact struct-of-arrays shot container shared by the scripts.
+
+    One ``array('d')`` per numeric column plus a ``bytearray`` validity mask
+    per column (1 = present). Missing values are also stored as NaN so the
+    raw buffers can be handed to NumPy unchanged. Rows are laid out
+    contiguously per key (club), so ``view(club)`` returns zero-copy
+    ``memoryview`` slices instead of copying shots into per-club lists.
+    """
+
+    __slots__ = ("names", "columns", "masks", "_ranges")
+
+    def __init__(self, names: Sequence[str]):
+        self.names = tuple(names)
+        self.columns: dict[str, array] = {name: array("d") for name in self.names}
+        self.masks: dict[str, bytearray] = {name: bytearray() for name in self.names}
+        self._ranges: dict[str, tuple[int, int]] = {}
+
+    @classmethod
+    def from_groups(cls, groups: dict[str, ColumnGroup], names: Sequence[str]) -> "ShotTable":
+        """Pack column groups into one table, consuming ``groups``.
+
+        Groups are popped as they are copied so their buffers are released
+        while the table grows; peak overhead is one group, not a second
+        copy of the data.
+        """
+        table = cls(names)
+        for key in list(groups):
+            group = groups.pop(key)
+            start = len(table)
+            for name in table.names:
+                col = group.columns[name]
+                table.columns[name].extend(col)
+                table.masks[name].extend(bytes(v == v for v in col))
+            table._ranges[key] = (start, len(table))
+        return table
+
+    def __len__(self) -> int:
+        if not self.names:
+            return 0
+        return len(self.columns[self.names[0]])
+
+    def __getitem__(self, name: str) -> memoryview:
+        return memoryview(self.columns[name])
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.columns
+
+    @property
+    def keys(self) -> list[str]:
+        """Group keys (clubs) in storage order."""
+        return list(self._ranges)
+
+    def count(self, key: str) -> int:
+        start, stop = self._ranges[key]
+        return stop - start
+
+    def mask(self, name: str) -> memoryview:
+        return memoryview(self.masks[name])
+
+    def values(self, name: str) -> list[float]:
+        """Return the present values of a column."""
+        return list(compress(self.columns[name], self.masks[name]))
+
+    def paired(self, name_a: str, name_b: str) -> tuple[list[float], list[float]]:
+        """Return values of two columns for rows where both are present."""
+        both = bytes(map(and_, self.masks[name_a], self.masks[name_b]))
+        return (
+            list(compress(self.columns[name_a], both)),
+            list(compress(self.columns[name_b], both)),
+        )
+
+    def view(self, key: str) -> "ShotView":
+        """Zero-copy view over the rows of one key (club)."""
+        start, stop = self._ranges[key]
+        return ShotView(self, key, start, stop)
+
+    def views(self) -> Iterator["ShotView"]:
+        for key in self._ranges:
+            yield self.view(key)
+
+    def to_numpy(self, name: str) -> tuple[Any, Any]:
+        """Return (values, mask) as NumPy arrays sharing this table's buffers."""
+        import numpy as np
+
+        return (
+            np.frombuffer(self.columns[name], dtype=np.float64),
+            np.frombuffer(self.masks[name], dtype=np.bool_),
+        )
+
+    def nbytes(self) -> int:
+        """Buffer size of values plus masks in bytes."""
+        total = 0
+        for name in self.names:
+            col = self.columns[name]
+            total += col.itemsize * len(col) + len(self.masks[name])
+        return total
+
+
+class ShotView:
+    """Rows ``start:stop`` of a ShotTable; columns are memoryview slices."""
+
+    __slots__ = ("key", "_table", "start", "stop")
+
+    def __init__(self, table: ShotTable, key: str, start: int, stop: int):
+        self.key = key
+        self._table = table
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, name: str) -> memoryview:
+        return memoryview(self._table.columns[name])[self.start:self.stop]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._table.columns
+
+    def mask(self, name: str) -> memoryview:
+        return memoryview(self._table.masks[name])[self.start:self.stop]
+
+    def values(self, name: str) -> list[float]:
+        return list(compress(self[name], self.mask(name)))
+
+    def paired(self, name_a: str, name_b: str) -> tuple[list[float], list[float]]:
+        both = bytes(map(and_, self.mask(name_a), self.mask(name_b)))
+        return list(compress(self[name_a], both)), list(compress(self[name_b], both))
+
+
+# ---------------------------------------------------------------------------
+# Streaming readers
+# ---------------------------------------------------------------------------
+
+def iter_batches(
+    conn: sqlite3.Connection,
+    query: str,
+    params: Sequence[Any] = (),
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[list[Any]]:
+    """Yield result rows in lists of at most ``batch_size`` rows."""
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+    cursor = conn.execute(query, tuple(params))
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield rows
+    finally:
+        cursor.close()
+
+
+def _convert_row(
+    row: Any,
+    offset: int,
+    count: int,
+    convert: Converter,
+) -> list[float]:
+    values: list[float] = []
+    for idx in range(offset, offset + count):
+        v = convert(row[idx])
+        values.append(NAN if v is None else v)
+    return values
+
+
+def _normalize_key(raw: Any) -> str | None:
+    if raw is None:
+        return None
+    key = str(raw).strip()
+    return key or None
+
+
+def iter_groups(
+    conn: sqlite3.Connection,
+    query: str,
+    params: Sequence[Any],
+    numeric: Sequence[str],
+    attrs: Sequence[str] = (),
+    convert: Converter = to_float,
+    accept: RowFilter | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[ColumnGroup]:
+    """Yield one ColumnGroup per run of consecutive equal keys.
+
+    The query must select ``key, *attrs, *numeric`` in that order and be
+    ORDERED BY the key. Only the group being filled is held in memory, so
+    peak memory is bounded by the largest group rather than the table.
+    """
+    n_attrs = len(attrs)
+    n_numeric = len(numeric)
+    current: ColumnGroup | None = None
+
+    for batch in iter_batches(conn, query, params, batch_size):
+        for row in batch:
+            key = _normalize_key(row[0])
+            if key is None:
+                continue
+            values = _convert_row(row, 1 + n_attrs, n_numeric, convert)
+            if accept is not None and not accept(values):
+                continue
+            if current is None or current.key != key:
+                if current is not None:
+                    yield current
+                current = ColumnGroup(
+                    key,
+                    numeric,
+                    {name: row[1 + i] for i, name in enumerate(attrs)},
+                )
+            current.append(values)
+
+    if current is not None:
+        yield current
+
+
+def group_by_key(
+    conn: sqlite3.Connection,
+    query: str,
+    params: Sequence[Any],
+    numeric: Sequence[str],
+    attrs: Sequence[str] = (),
+    convert: Converter = to_float,
+    accept: RowFilter | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict[str, ColumnGroup]:
+    """Stream an unordered query into a ColumnGroup per key.
+
+    Same column layout as ``iter_groups``. Grouping happens while batches
+    are read, so no intermediate list of rows or dicts is ever built.
+    """
+    n_attrs = len(attrs)
+    n_numeric = len(numeric)
+    groups: dict[str, ColumnGroup] = {}
+
+    for batch in iter_batches(conn, query, params, batch_size):
+        for row in batch:
+            key = _normalize_key(row[0])
+            if key is None:
+                continue
+            values = _convert_row(row, 1 + n_attrs, n_numeric, convert)
+            if accept is not None and not accept(values):
+                continue
+            group = groups.get(key)
+            if group is None:
+                group = ColumnGroup(
+                    key,
+                    numeric,
+                    {name: row[1 + i] for i, name in enumerate(attrs)},
+                )
+                groups[key] = group
+            group.append(values)
+
+    return groups
+
+
+def load_table(
+    conn: sqlite3.Connection,
+    query: str,
+    params: Sequence[Any],
+    numeric: Sequence[str],
+    convert: Converter = to_float,
+    accept: RowFilter | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ShotTable:
+    """Stream a ``key, *numeric`` query into a club-contiguous ShotTable."""
+    groups = group_by_key(
+        conn, query, params, numeric,
+        convert=convert, accept=accept, batch_size=batch_size,
+    )
+    return ShotTable.from_groups(groups, numeric)
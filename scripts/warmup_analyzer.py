@@ -14,7 +14,9 @@ import sqlite3
 from dataclasses import dataclass
 from pathlib import Path
 from statistics import median
-from typing import Any
+from typing import Any, Iterator
+
+from shot_stream import ColumnGroup, iter_groups
 
 EXCLUDED_CLUBS = {"Other", "Putter", "Sim Round"}
 DEFAULT_DB_PATH = Path(__file__).resolve().parents[1] / "golf_stats.db"
@@ -23,23 +25,13 @@ MIN_SESSION_SHOTS = 15
 ROLLING_WINDOW = 5
 STABILIZATION_THRESHOLD = 0.95  # within 5% of session peak
 CONSECUTIVE_WINDOWS_REQUIRED = 3
+SESSION_COLUMNS = ("carry", "smash", "strike_distance")
 
 
 # ---------------------------------------------------------------------------
 # Data classes
 # ---------------------------------------------------------------------------
 
-@dataclass
-class ShotRow:
-    """Single qualifying shot with the metrics we track during warmup."""
-    session_id: str
-    session_date: str
-    shot_number: int  # 1-based position within session
-    carry: float
-    smash: float | None
-    strike_distance: float | None
-
-
 @dataclass
 class SessionWarmup:
     """Warmup analysis result for a single session."""
@@ -198,15 +190,18 @@ def normalize_session_date(raw: Any) -> str:
 def load_sessions(
     conn: sqlite3.Connection,
     min_shots: int,
-) -> dict[str, list[ShotRow]]:
-    """Load shots grouped by session, filtered and ordered by rowid."""
+) -> Iterator[ColumnGroup]:
+    """Stream qualifying sessions one at a time, shots ordered by rowid.
+
+    Each yielded group holds carry/smash/strike_distance columns for one
+    session; only the session being read is kept in memory.
+    """
     columns = get_table_columns(conn, "shots")
     carry_col = carry_column_name(columns)
 
     placeholders = ", ".join("?" for _ in EXCLUDED_CLUBS)
     query = f"""
         SELECT
-            rowid AS row_order,
             session_id,
             session_date,
             {carry_col} AS carry_value,
@@ -219,40 +214,24 @@ def load_sessions(
           AND club NOT IN ({placeholders})
           AND {carry_col} IS NOT NULL
           AND {carry_col} >= ?
-        ORDER BY session_id ASC, row_order ASC
+        ORDER BY session_id ASC, rowid ASC
     """
 
     params: tuple[Any, ...] = (*tuple(EXCLUDED_CLUBS), MIN_CARRY)
-    rows = conn.execute(query, params).fetchall()
-
-    by_session: dict[str, list[ShotRow]] = {}
-    shot_counters: dict[str, int] = {}
-
-    for row in rows:
-        session_id = str(row["session_id"])
-        carry = to_float(row["carry_value"])
-        if carry is None:
-            continue
-
-        shot_counters[session_id] = shot_counters.get(session_id, 0) + 1
-        shot_num = shot_counters[session_id]
-
-        shot = ShotRow(
-            session_id=session_id,
-            session_date=normalize_session_date(row["session_date"]),
-            shot_number=shot_num,
-            carry=carry,
-            smash=to_float(row["smash"]),
-            strike_distance=to_float(row["strike_distance"]),
-        )
-        by_session.setdefault(session_id, []).append(shot)
 
-    # Filter to sessions with enough shots
-    return {
-        sid: shots
-        for sid, shots in by_session.items()
-        if len(shots) >= min_shots
-    }
+    for group in iter_groups(
+        conn,
+        query,
+        params,
+        numeric=SESSION_COLUMNS,
+        attrs=("session_date",),
+        convert=to_float,
+        accept=lambda values: values[0] == values[0],  # carry present
+    ):
+        # Filter to sessions with enough shots
+        if len(group) >= min_shots:
+            group.attrs["session_date"] = normalize_session_date(group.attrs["session_date"])
+            yield group
 
 
 # ---------------------------------------------------------------------------
@@ -314,11 +293,11 @@ def find_stabilization_point(
     return None
 
 
-def analyze_session(shots: list[ShotRow], window: int) -> SessionWarmup:
+def analyze_session(shots: ColumnGroup, window: int) -> SessionWarmup:
     """Analyze warmup pattern for a single session."""
-    carries = [s.carry for s in shots]
-    smashes = [s.smash for s in shots]
-    strikes = [abs(s.strike_distance) if s.strike_distance is not None else None for s in shots]
+    carries = list(shots["carry"])
+    smashes = [v if v == v else None for v in shots["smash"]]
+    strikes = [abs(v) if v == v else None for v in shots["strike_distance"]]
 
     roll_carry = rolling_averages(carries, window)
     roll_smash = rolling_averages(smashes, window)
@@ -341,29 +320,23 @@ def analyze_session(shots: list[ShotRow], window: int) -> SessionWarmup:
     peak_strike = min(strike_rolling_clean) if strike_rolling_clean else None
 
     # First 5 shots performance
-    first5 = shots[:5]
-    first5_carry = safe_mean([s.carry for s in first5]) or 0.0
-    first5_smash = safe_mean_nonnull([s.smash for s in first5])
-    first5_strike = safe_mean_nonnull(
-        [abs(s.strike_distance) if s.strike_distance is not None else None for s in first5]
-    )
+    first5_carry = safe_mean(carries[:5]) or 0.0
+    first5_smash = safe_mean_nonnull(smashes[:5])
+    first5_strike = safe_mean_nonnull(strikes[:5])
 
     # Post-warmup performance
     if warmup_shot is not None and warmup_shot < len(shots):
-        post = shots[warmup_shot:]
-        post_carry = safe_mean([s.carry for s in post])
-        post_smash = safe_mean_nonnull([s.smash for s in post])
-        post_strike = safe_mean_nonnull(
-            [abs(s.strike_distance) if s.strike_distance is not None else None for s in post]
-        )
+        post_carry = safe_mean(carries[warmup_shot:])
+        post_smash = safe_mean_nonnull(smashes[warmup_shot:])
+        post_strike = safe_mean_nonnull(strikes[warmup_shot:])
     else:
         post_carry = None
         post_smash = None
         post_strike = None
 
     return SessionWarmup(
-        session_id=shots[0].session_id,
-        session_date=shots[0].session_date,
+        session_id=shots.key,
+        session_date=shots.attrs["session_date"],
         shot_count=len(shots),
         warmup_length=warmup_shot,
         peak_carry=peak_carry,
@@ -393,20 +366,18 @@ def warmup_length_bucket(length: int) -> str:
 
 
 def build_report(db_path: Path, min_shots: int, window: int) -> str:
+    # Analyze each session as it streams in
+    results: list[SessionWarmup] = []
     with build_connection(db_path) as conn:
-        sessions_map = load_sessions(conn, min_shots=min_shots)
+        for shots in load_sessions(conn, min_shots=min_shots):
+            results.append(analyze_session(shots, window))
 
-    if not sessions_map:
+    if not results:
         return (
             f"No qualifying sessions found (need >= {min_shots} shots per session, "
             f"carry >= {MIN_CARRY}, excluding {', '.join(sorted(EXCLUDED_CLUBS))})."
         )
 
-    # Analyze each session
-    results: list[SessionWarmup] = []
-    for _sid, shots in sessions_map.items():
-        results.append(analyze_session(shots, window))
-
     results.sort(key=lambda r: (r.session_date, r.session_id))
 
     # Sessions with detected warmup
@@ -0,0 +1,343 @@
+"""
+AI Coach Latency Benchmark for GolfDataApp.
+
+Drives canned conversations through the mock provider
+(services.ai.providers.mock_provider) against synthetic shot databases
+of increasing size, and reports per-tool and per-turn latency
+percentiles. Both provider shapes are covered: ``gemini`` runs the
+GeminiCoach function implementations through chat_stream(), ``claude``
+runs the agent tool handlers on the agent's thread pool. No model is
+called and no network is needed, so the numbers isolate the tool and
+data layers; comparing against a saved report flags regressions.
+
+Each conversation starts from a fresh coach (or an invalidated agent
+cache), as after "Reset Conversation" in the app, so the first turns
+include cold reads.
+
+Usage:
+    # 1k, 10k and 50k shots, both shapes; report under logs/benchmarks/
+    python -m services.ai.benchmark
+
+    # Only the agent tools, 10 conversations each, against a baseline
+    python -m services.ai.benchmark --shapes claude --conversations 10 --compare baseline.json
+"""
+import argparse
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ml.benchmarks import DEFAULT_OUTPUT_DIR, DEFAULT_THRESHOLD, _environment, parse_scale
+from ml.synthetic import synthetic_dataset
+from services.ai.providers.mock_provider import MockProvider, ScriptedTurn
+
+REPORT_VERSION = 1
+
+DEFAULT_SIZES = (1_000, 10_000, 50_000)
+
+DEFAULT_CONVERSATIONS = 5
+
+SHAPES = ('gemini', 'claude')
+
+# Canned conversations per provider shape: rounds of tool calls a model
+# would plausibly request for common questions. Session '1' always exists
+# in synthetic data.
+CONVERSATIONS: Dict[str, List[List[ScriptedTurn]]] = {
+    'gemini': [
+        [
+            ScriptedTurn([[('calculate_statistics', {'metric': 'carry', 'club': 'Driver'})]],
+                         "Your driver carry averages well with a tight spread."),
+            ScriptedTurn([[('get_club_gapping', {}), ('get_user_profile', {})]],
+                         "Your gaps are even except between the 5 and 7 iron."),
+        ],
+        [
+            ScriptedTurn([[('list_sessions', {'limit': 10})],
+                          [('get_session_overview', {'session_id': '1'}),
+                           ('query_shot_data', {'session_id': '1', 'limit': 50})]],
+                         "That session was mostly irons with solid contact."),
+            ScriptedTurn([[('find_outliers', {'session_id': '1'})]],
+                         "A few mishits stand out on the toe."),
+        ],
+        [
+            ScriptedTurn([[('analyze_trends', {'club': '7 Iron', 'metric': 'carry'}),
+                           ('analyze_trends', {'club': 'Driver', 'metric': 'ball_speed'})]],
+                         "Both are trending up slightly."),
+            ScriptedTurn([[('query_shot_data', {'club': 'PW', 'limit': 500})]],
+                         "Your wedge distances are consistent."),
+        ],
+    ],
+    'claude': [
+        [
+            ScriptedTurn([[('get_club_stats', {'club': 'Driver'})]],
+                         "Your driver carry averages well with a tight spread."),
+            ScriptedTurn([[('get_club_stats', {}), ('get_trends', {'metric': 'carry'})]],
+                         "Your gaps are even except between the 5 and 7 iron."),
+        ],
+        [
+            ScriptedTurn([[('get_session_list', {})],
+                          [('get_session_summary', {'session_id': '1'}),
+                           ('query_shots', {'session_id': '1', 'limit': 50})]],
+                         "That session was mostly irons with solid contact."),
+            ScriptedTurn([[('query_shots', {'session_id': '1', 'anomalous_only': True})]],
+                         "A few swings were flagged."),
+        ],
+        [
+            ScriptedTurn([[('get_trends', {'metric': 'ball_speed', 'sessions': 20}),
+                           ('get_trends', {'metric': 'smash'})]],
+                         "Both are trending up slightly."),
+            ScriptedTurn([[('query_shots', {'session_id': '2', 'club': 'PW', 'limit': 500})]],
+                         "Your wedge distances are consistent."),
+        ],
+    ],
+}
+
+
+def build_synthetic_db(path: Path, shots: int, seed: int = 0) -> None:
+    """
+    Create an app database at ``path`` holding ``shots`` synthetic shots.
+
+    Points golf_db at the file, creates the schema with golf_db.init_db()
+    and appends ml.synthetic data (columns the schema lacks are dropped).
+    """
+    import golf_db
+
+    golf_db.SQLITE_DB_PATH = str(path)
+    golf_db.init_db()
+
+    df = synthetic_dataset(shots, seed=seed)
+    df['session_date'] = df['date_added'].str[:10]
+    with sqlite3.connect(path) as conn:
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(shots)')}
+        df = df[[c for c in df.columns if c in columns]] if columns else df
+        df.to_sql('shots', conn, if_exists='append', index=False)
+
+
+def percentiles(values: Sequence[float]) -> Dict[str, float]:
+    """Call count and p50/p95/max in milliseconds."""
+    ms = np.asarray(values, dtype=float) * 1000
+    if not len(ms):
+        return {'calls': 0}
+    return {
+        'calls': int(len(ms)),
+        'p50_ms': round(float(np.percentile(ms, 50)), 3),
+        'p95_ms': round(float(np.percentile(ms, 95)), 3),
+        'max_ms': round(float(ms.max()), 3),
+    }
+
+
+def _reset_shared_caches() -> None:
+    """Forget state tied to the previous database (agent snapshot and queries)."""
+    data_access = sys.modules.get('agent.data_access')
+    if data_access is not None:
+        data_access.get_agent_data().invalidate()
+
+
+def run_shape(
+    shape: str,
+    conversations: int,
+    model_latency: float = 0.0,
+) -> Dict[str, Any]:
+    """
+    Run ``conversations`` canned conversations of one shape on the current database.
+
+    Returns:
+        {'turns': percentiles, 'ttft': percentiles, 'tools': {tool: percentiles}}
+    """
+    scripts = CONVERSATIONS[shape]
+    turn_latencies: List[float] = []
+    first_tokens: List[float] = []
+    tool_latencies: Dict[str, List[float]] = {}
+    for i in range(conversations):
+        _reset_shared_caches()
+        script = scripts[i % len(scripts)]
+        provider = MockProvider(model_type=shape, script=script, model_latency=model_latency)
+        for _ in script:
+            result = provider.chat("benchmark")
+            turn_latencies.append(result['latency'])
+            first_tokens.append(result['ttft'])
+        for tool, values in provider.tool_latencies.items():
+            tool_latencies.setdefault(tool, []).extend(values)
+
+    return {
+        'turns': percentiles(turn_latencies),
+        'ttft': percentiles(first_tokens),
+        'tools': {tool: percentiles(values) for tool, values in sorted(tool_latencies.items())},
+    }
+
+
+def run_benchmark(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    shapes: Sequence[str] = SHAPES,
+    conversations: int = DEFAULT_CONVERSATIONS,
+    seed: int = 0,
+    model_latency: float = 0.0,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Benchmark coach turns against synthetic databases.
+
+    Args:
+        sizes: Database sizes (shots)
+        shapes: Provider shapes to drive ('gemini', 'claude')
+        conversations: Conversations per shape and size
+        seed: Synthetic data seed
+        model_latency: Simulated seconds per model round trip (0 isolates the tools)
+        progress: Optional callback for progress messages
+
+    Returns:
+        JSON-serializable report with one result per (shape, size)
+    """
+    unknown = set(shapes) - set(SHAPES)
+    if unknown:
+        raise ValueError(f"Unknown shapes: {sorted(unknown)}; choose from {list(SHAPES)}")
+
+    import golf_db
+    original_path = golf_db.SQLITE_DB_PATH
+    results = []
+    try:
+        with tempfile.TemporaryDirectory(prefix='golf_ai_bench_') as tmpdir:
+            for size in sizes:
+                db_path = Path(tmpdir) / f'golf_{size}.db'
+                start = time.perf_counter()
+                build_synthetic_db(db_path, size, seed=seed)
+                build_seconds = time.perf_counter() - start
+                for shape in shapes:
+                    if progress:
+                        progress(f"{shape} @ {size:,} shots")
+                    results.append({
+                        'key': f'{shape}@{size}',
+                        'shape': shape,
+                        'size': size,
+                        'build_seconds': round(build_seconds, 3),
+                        **run_shape(shape, conversations, model_latency),
+                    })
+    finally:
+        golf_db.SQLITE_DB_PATH = original_path
+        _reset_shared_caches()
+
+    return {
+        'version': REPORT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'seed': seed,
+        'sizes': list(sizes),
+        'conversations': conversations,
+        'model_latency': model_latency,
+        'environment': _environment(),
+        'results': results,
+    }
+
+
+def compare_reports(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """
+    Compare p50 turn and tool latency with a baseline report.
+
+    Returns:
+        One row per shared (shape@size, turn/tool) with baseline, current,
+        ratio and a 'regression' flag
+    """
+    previous = {r['key']: r for r in baseline.get('results', [])}
+    rows = []
+    for result in current.get('results', []):
+        before = previous.get(result['key'])
+        if before is None:
+            continue
+        pairs = [('turn', before['turns'], result['turns'])]
+        pairs += [
+            (f'tool:{tool}', before['tools'][tool], stats)
+            for tool, stats in result['tools'].items() if tool in before['tools']
+        ]
+        for name, old_stats, new_stats in pairs:
+            old, new = old_stats.get('p50_ms'), new_stats.get('p50_ms')
+            if not old or new is None:
+                continue
+            ratio = new / old
+            rows.append({
+                'key': result['key'], 'metric': name, 'baseline': old,
+                'current': new, 'ratio': ratio, 'regression': ratio > threshold,
+            })
+    return rows
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(f"{'shape@size':<18} {'what':<26} {'calls':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for result in report['results']:
+        rows = [('turn', result['turns']), ('first token', result['ttft'])]
+        rows += [(tool, stats) for tool, stats in result['tools'].items()]
+        for name, stats in rows:
+            if not stats.get('calls'):
+                continue
+            print(
+                f"{result['key']:<18} {name:<26} {stats['calls']:>6} "
+                f"{stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['max_ms']:>9.1f}"
+            )
+
+
+def main():
+    """Run the AI coach latency benchmark from command line."""
+    parser = argparse.ArgumentParser(description="Benchmark AI coach turn and tool latency offline")
+    parser.add_argument(
+        '--sizes', nargs='+', default=[str(s) for s in DEFAULT_SIZES],
+        help="Synthetic database sizes, e.g. 1k 10k 100k",
+    )
+    parser.add_argument('--shapes', nargs='+', choices=SHAPES, default=list(SHAPES), help="Provider code paths")
+    parser.add_argument(
+        '--conversations', type=int, default=DEFAULT_CONVERSATIONS,
+        help="Canned conversations per shape and size",
+    )
+    parser.add_argument('--seed', type=int, default=0, help="Synthetic data seed")
+    parser.add_argument(
+        '--model-latency', type=float, default=0.0,
+        help="Simulated seconds per model round trip (default 0: tools only)",
+    )
+    parser.add_argument('--output', type=Path, help="Report path (default: logs/benchmarks/ai_<timestamp>.json)")
+    parser.add_argument('--compare', type=Path, help="Baseline report to compare against")
+    parser.add_argument(
+        '--threshold', type=float, default=DEFAULT_THRESHOLD,
+        help="Ratio to baseline that counts as a regression",
+    )
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        sizes=[parse_scale(s) for s in args.sizes],
+        shapes=args.shapes,
+        conversations=args.conversations,
+        seed=args.seed,
+        model_latency=args.model_latency,
+        progress=lambda msg: print(f"  running {msg}...", file=sys.stderr),
+    )
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output = DEFAULT_OUTPUT_DIR / f"ai_{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    _print_report(report)
+    print(f"\nReport: {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare_reports(report, baseline, args.threshold)
+        regressions = [r for r in rows if r['regression']]
+        print(f"\nCompared with {args.compare}: {len(rows)} metrics, {len(regressions)} regressions")
+        for r in regressions:
+            print(f"  REGRESSION {r['key']} {r['metric']}: {r['baseline']:.3g} -> {r['current']:.3g} ms ({r['ratio']:.2f}x)")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,7 @@ using the same tool-equipped agent as the CLI.
 from __future__ import annotations
 
 import os
+import sys
 import asyncio
 import concurrent.futures
 from services.ai.registry import register_provider
@@ -17,6 +18,8 @@ class ClaudeProvider:
 
     PROVIDER_ID = "claude"
     DISPLAY_NAME = "Claude Golf Coach"
+    # Prompts may carry retrieved past-session context (AI Coach page)
+    USES_SESSION_CONTEXT = True
 
     def __init__(self, model_type: str = "sonnet", thinking_level: str = "medium"):
         self._model_type = model_type
@@ -52,8 +55,11 @@ class ClaudeProvider:
         }
 
     def reset_conversation(self):
-        """Reset conversation state."""
-        pass
+        """Reset conversation state (drops the agent's cached query results)."""
+        # Only loaded once a chat has run; nothing is cached before that
+        data_access = sys.modules.get("agent.data_access")
+        if data_access is not None:
+            data_access.get_agent_data().invalidate()
 
     def set_model(self, model_type: str):
         """Set model type."""
@@ -7,6 +7,8 @@ from services.ai.registry import register_provider
 class GeminiProvider:
     PROVIDER_ID = "gemini"
     DISPLAY_NAME = "Gemini (API)"
+    # Prompts may carry retrieved past-session context (AI Coach page)
+    USES_SESSION_CONTEXT = True
     MODEL_OPTIONS = {
         "Gemini 3.0 Flash": "flash",
         "Gemini 3.0 Pro": "pro",
@@ -25,6 +27,9 @@ class GeminiProvider:
     def chat(self, message: str):
         return self._coach.chat(message)
 
+    def chat_stream(self, message: str):
+        return self._coach.chat_stream(message)
+
     def reset_conversation(self):
         self._coach.reset_conversation()
 
@@ -7,8 +7,8 @@ Uses local ML models when available for enhanced predictions.
 
 from services.ai.registry import register_provider
 
-# Import LocalCoach - handles its own dependency checks
-from local_coach import LocalCoach
+# Import the shared LocalCoach - handles its own dependency checks
+from local_coach import get_coach
 
 
 @register_provider
@@ -17,6 +17,9 @@ class LocalProvider:
 
     PROVIDER_ID = "local"
     DISPLAY_NAME = "Local AI (Offline)"
+    # Intents are matched against the whole message, so retrieved session
+    # lines (which name clubs) would hijack the routing
+    USES_SESSION_CONTEXT = False
 
     def __init__(self, model_type: str = "default", thinking_level: str = "medium"):
         """
@@ -26,7 +29,8 @@ class LocalProvider:
             model_type: Unused, for API compatibility
             thinking_level: Unused, for API compatibility
         """
-        self._coach = LocalCoach()
+        # Shared coach; ML models load once per process via ml.registry
+        self._coach = get_coach()
         self._model_type = model_type
         self._thinking_level = thinking_level
 
@@ -61,9 +65,7 @@ class LocalProvider:
         }
 
     def reset_conversation(self):
-        """Reset conversation state (no-op for local coach)."""
-        # LocalCoach is stateless, so nothing to reset
-        pass
+        """Reset conversation state (no-op: the coach keeps no conversation history)."""
 
     def set_model(self, model_type: str):
         """Set model type (no-op for local coach)."""
@@ -90,6 +92,7 @@ class LocalProvider:
             "requires_api_key": False,
             "works_offline": True,
             "ml_enhanced": self._coach.ml_available,
+            "models": self._coach.get_model_stats(),
             "supported_intents": [
                 "driver_stats", "iron_stats", "club_comparison",
                 "session_analysis", "trend_analysis", "swing_issue",
@@ -0,0 +1,269 @@
+"""
+Mock AI Provider for offline latency measurement.
+
+Replays scripted conversations without any model or network: each turn
+requests a fixed sequence of function-call rounds and ends with a fixed
+reply. The function calls run against the real tool implementations,
+through the same code paths as the cloud providers:
+
+- ``gemini`` shape: a real GeminiCoach driven by a scripted chat
+  session, so rounds go through chat_stream() and its concurrent
+  function execution.
+- ``claude`` shape: the agent tool handlers (agent.tools), awaited
+  together per round on one event loop, as the Agent SDK does.
+
+The module is not imported by services.ai, so the provider only appears
+in the registry for code that imports it (e.g. services.ai.benchmark).
+
+Usage:
+    from services.ai.providers.mock_provider import MockProvider, ScriptedTurn
+
+    turn = ScriptedTurn(rounds=[[('get_club_gapping', {})]], reply='Your gaps look even.')
+    provider = MockProvider(model_type='gemini', script=[turn])
+    result = provider.chat("Any gapping issues?")
+    print(result['latency'], provider.tool_latencies)
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from services.ai.registry import register_provider
+
+# (tool name, arguments)
+ToolCall = Tuple[str, Dict[str, Any]]
+
+
+@dataclass
+class ScriptedTurn:
+    """One assistant turn: rounds of concurrent tool calls, then a reply."""
+    rounds: List[List[ToolCall]] = field(default_factory=list)
+    reply: str = "Done."
+
+
+def _chunk(parts: Sequence[Any]) -> Any:
+    """A streamed response chunk shaped like google.generativeai's."""
+    return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=list(parts)))])
+
+
+class ScriptedChatSession:
+    """
+    Stand-in for a Gemini chat session that follows a ScriptedTurn.
+
+    Each send_message() returns the next round's function calls; once the
+    rounds are used up it streams the reply word by word. ``model_latency``
+    seconds are slept per round trip to model the network, if wanted.
+    """
+
+    def __init__(self, model_latency: float = 0.0):
+        self.model_latency = model_latency
+        self._turn: Optional[ScriptedTurn] = None
+        self._round = 0
+
+    def start_turn(self, turn: ScriptedTurn) -> None:
+        self._turn = turn
+        self._round = 0
+
+    def send_message(self, message: Any, stream: bool = False, **options: Any) -> Iterator[Any]:
+        import google.generativeai as genai
+
+        if self.model_latency:
+            time.sleep(self.model_latency)
+        turn = self._turn or ScriptedTurn()
+        if self._round < len(turn.rounds):
+            calls = turn.rounds[self._round]
+            self._round += 1
+            return iter([_chunk([
+                genai.protos.Part(function_call=genai.protos.FunctionCall(name=name, args=args))
+                for name, args in calls
+            ])])
+        words = turn.reply.split(' ')
+        return iter([
+            _chunk([genai.protos.Part(text=word + (' ' if i < len(words) - 1 else ''))])
+            for i, word in enumerate(words)
+        ])
+
+
+@register_provider
+class MockProvider:
+    """Deterministic provider replaying scripted turns against the real tools."""
+
+    PROVIDER_ID = "mock"
+    DISPLAY_NAME = "Mock (Offline Benchmark)"
+    MODEL_OPTIONS = {
+        "Gemini-shaped": "gemini",
+        "Claude-shaped": "claude",
+    }
+
+    def __init__(
+        self,
+        model_type: str = "gemini",
+        thinking_level: str = "medium",
+        script: Optional[Sequence[ScriptedTurn]] = None,
+        model_latency: float = 0.0,
+    ):
+        """
+        Initialize the mock provider.
+
+        Args:
+            model_type: 'gemini' or 'claude' (which code path to exercise)
+            thinking_level: Unused, for API compatibility
+            script: Turns replayed in order by successive chat() calls
+                (cycling); a turn without rounds just replies
+            model_latency: Seconds slept per simulated model round trip
+        """
+        if model_type not in self.MODEL_OPTIONS.values():
+            raise ValueError(f"Unknown mock shape: {model_type}")
+        self._model_type = model_type
+        self._thinking_level = thinking_level
+        self.script = list(script or [ScriptedTurn()])
+        self.model_latency = model_latency
+        self._turn_index = 0
+        self._lock = threading.Lock()
+        self.tool_latencies: Dict[str, List[float]] = defaultdict(list)
+        self._coach = None
+        self._session: Optional[ScriptedChatSession] = None
+
+    @staticmethod
+    def is_configured() -> bool:
+        """No API key needed."""
+        return True
+
+    # -- shared -------------------------------------------------------------
+
+    def _next_turn(self) -> ScriptedTurn:
+        turn = self.script[self._turn_index % len(self.script)]
+        self._turn_index += 1
+        return turn
+
+    def _record(self, tool: str, seconds: float) -> None:
+        with self._lock:
+            self.tool_latencies[tool].append(seconds)
+
+    # -- gemini shape -------------------------------------------------------
+
+    def _gemini_coach(self):
+        if self._coach is None:
+            from gemini_coach import GeminiCoach
+
+            self._session = ScriptedChatSession(self.model_latency)
+            session = self._session
+
+            class _Model:
+                def __init__(self, **_kwargs):
+                    pass
+
+                def start_chat(self, history=None):
+                    return session
+
+            coach = GeminiCoach(model_factory=_Model)
+            coach.available_functions = {
+                name: self._timed(name, fn) for name, fn in coach.available_functions.items()
+            }
+            self._coach = coach
+        return self._coach
+
+    def _timed(self, name: str, fn):
+        def wrapper(**kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(**kwargs)
+            finally:
+                self._record(name, time.perf_counter() - start)
+        return wrapper
+
+    # -- claude shape -------------------------------------------------------
+
+    async def _agent_turn(self, turn: ScriptedTurn) -> List[Dict[str, Any]]:
+        from agent.tools import ALL_TOOLS
+
+        handlers = {t.name: t.handler for t in ALL_TOOLS}
+
+        async def run(name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+            if name not in handlers:
+                return {"function": name, "arguments": args, "result": f"Unknown tool: {name}"}
+            start = time.perf_counter()
+            try:
+                result = await handlers[name](dict(args))
+            finally:
+                self._record(name, time.perf_counter() - start)
+            text = "".join(block.get("text", "") for block in result.get("content", []))
+            return {"function": name, "arguments": args, "result": text}
+
+        calls: List[Dict[str, Any]] = []
+        for round_calls in turn.rounds:
+            if self.model_latency:
+                await asyncio.sleep(self.model_latency)
+            calls.extend(await asyncio.gather(*(run(name, args) for name, args in round_calls)))
+        if self.model_latency:
+            await asyncio.sleep(self.model_latency)
+        return calls
+
+    # -- provider interface -------------------------------------------------
+
+    def chat_stream(self, message: str) -> Iterator[Dict[str, Any]]:
+        """Stream the next scripted turn (gemini shape) or replay it at once (claude shape)."""
+        if self._model_type == "gemini":
+            coach = self._gemini_coach()
+            self._session.start_turn(self._next_turn())
+            yield from coach.chat_stream(message)
+            return
+
+        start = time.perf_counter()
+        turn = self._next_turn()
+        calls = asyncio.run(self._agent_turn(turn))
+        latency = time.perf_counter() - start
+        if calls:
+            yield {"type": "function_calls", "calls": calls}
+        yield {"type": "text", "text": turn.reply}
+        yield {
+            "type": "done",
+            "response": turn.reply,
+            "function_calls": calls,
+            "model": self.get_model_name(),
+            "thinking_level": self._thinking_level,
+            "ttft": latency,
+            "latency": latency,
+        }
+
+    def chat(self, message: str) -> dict:
+        """
+        Replay the next scripted turn.
+
+        Returns:
+            Dict with 'response', 'function_calls', 'ttft' and 'latency'
+            (same shape as the Gemini provider)
+        """
+        for event in self.chat_stream(message):
+            if event["type"] == "done":
+                return {key: value for key, value in event.items() if key != "type"}
+        return {"response": "", "function_calls": []}
+
+    def reset_conversation(self):
+        """Start the script over and drop cached query results."""
+        self._turn_index = 0
+        if self._coach is not None:
+            self._coach.reset_conversation()
+        if self._model_type == "claude":
+            data_access = sys.modules.get("agent.data_access")
+            if data_access is not None:
+                data_access.get_agent_data().invalidate()
+
+    def set_model(self, model_type: str):
+        """Switch between the gemini and claude shapes."""
+        if model_type in self.MODEL_OPTIONS.values():
+            self._model_type = model_type
+
+    def set_thinking_level(self, level: str):
+        """Set thinking level (no-op)."""
+        self._thinking_level = level
+
+    def get_model_name(self) -> str:
+        """Return the model name."""
+        return f"Mock ({self._model_type})"
@@ -0,0 +1,207 @@
+"""
+Batched bootstrap confidence intervals for per-club carry statistics.
+
+All clubs are resampled together: every club's shots are laid end to end in
+one flat array, a single random draw picks the resample indices for every
+club segment at once, and the per-club mean/median/P10/P90 of every
+resample come out of one sort and a few segmented reductions. There is no
+Python loop over clubs or resamples, so a full bag with 1000 resamples runs
+in a few tens of milliseconds.
+
+Resamples are independent between clubs, so the difference of two clubs'
+bootstrap distributions is itself a bootstrap distribution of the gap.
+``BootstrapResult.difference_ci`` uses that for the gapping decisions in
+the report scripts.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, Sequence
+
+import numpy as np
+
+DEFAULT_RESAMPLES = 1000
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_SEED = 42
+
+STATISTICS = ("mean", "median", "p10", "p90")
+_QUANTILES = {"median": 0.5, "p10": 0.10, "p90": 0.90}
+
+# Upper bound on resample elements held in memory at once (~16 MB of float64).
+_MAX_BLOCK_ELEMENTS = 2_000_000
+
+
+@dataclass(frozen=True)
+class ConfidenceInterval:
+    """Point estimate from the observed sample plus a percentile-bootstrap CI."""
+
+    estimate: float
+    low: float
+    high: float
+
+    @property
+    def width(self) -> float:
+        return self.high - self.low
+
+    def contains(self, value: float) -> bool:
+        return self.low <= value <= self.high
+
+
+@dataclass(frozen=True)
+class ClubBootstrap:
+    club: str
+    shot_count: int
+    mean: ConfidenceInterval
+    median: ConfidenceInterval
+    p10: ConfidenceInterval
+    p90: ConfidenceInterval
+
+
+class BootstrapResult:
+    """Per-club CIs plus the raw bootstrap distributions behind them."""
+
+    def __init__(
+        self,
+        clubs: list[str],
+        counts: np.ndarray,
+        estimates: dict[str, np.ndarray],
+        distributions: dict[str, np.ndarray],
+        confidence: float,
+    ):
+        self.clubs = clubs
+        self.confidence = confidence
+        self._index = {club: i for i, club in enumerate(clubs)}
+        self._counts = counts
+        self._estimates = estimates
+        # stat -> array of shape (n_resamples, n_clubs)
+        self.distributions = distributions
+
+        alpha = (1.0 - confidence) / 2.0
+        self._bounds = {
+            stat: np.quantile(dist, [alpha, 1.0 - alpha], axis=0)
+            for stat, dist in distributions.items()
+        }
+
+    def __contains__(self, club: object) -> bool:
+        return club in self._index
+
+    def __len__(self) -> int:
+        return len(self.clubs)
+
+    @property
+    def n_resamples(self) -> int:
+        return self.distributions["mean"].shape[0]
+
+    def ci(self, club: str, stat: str = "mean") -> ConfidenceInterval:
+        i = self._index[club]
+        low, high = self._bounds[stat][:, i]
+        return ConfidenceInterval(float(self._estimates[stat][i]), float(low), float(high))
+
+    def club(self, club: str) -> ClubBootstrap:
+        return ClubBootstrap(
+            club=club,
+            shot_count=int(self._counts[self._index[club]]),
+            **{stat: self.ci(club, stat) for stat in STATISTICS},
+        )
+
+    def difference_ci(self, club_a: str, club_b: str, stat: str = "mean") -> ConfidenceInterval:
+        """CI of ``stat(club_a) - stat(club_b)``, e.g. the carry gap between two clubs."""
+        i, j = self._index[club_a], self._index[club_b]
+        dist = self.distributions[stat]
+        diff = dist[:, i] - dist[:, j]
+        alpha = (1.0 - self.confidence) / 2.0
+        low, high = np.quantile(diff, [alpha, 1.0 - alpha])
+        estimate = self._estimates[stat][i] - self._estimates[stat][j]
+        return ConfidenceInterval(float(estimate), float(low), float(high))
+
+
+def _segment_quantiles(sorted_values: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """Linear-interpolated quantile of each sorted segment along the last axis."""
+    pos = (counts - 1) * q
+    lower = np.floor(pos).astype(np.intp)
+    upper = np.minimum(lower + 1, counts - 1)
+    frac = pos - lower
+    lo = sorted_values[..., starts + lower]
+    hi = sorted_values[..., starts + upper]
+    return lo + (hi - lo) * frac
+
+
+def _segment_stats(values: np.ndarray, starts: np.ndarray, counts: np.ndarray, offsets: np.ndarray) -> dict[str, np.ndarray]:
+    """Mean/median/P10/P90 per segment for each row of ``values``.
+
+    ``offsets`` holds a per-element shift that keeps segments ordered
+    relative to each other, so a single row-wise sort sorts every segment.
+    """
+    stats = {"mean": np.add.reduceat(values, starts, axis=-1) / counts}
+    shifted = np.sort(values + offsets, axis=-1) - offsets
+    for stat, q in _QUANTILES.items():
+        stats[stat] = _segment_quantiles(shifted, starts, counts, q)
+    return stats
+
+
+def bootstrap_club_stats(
+    samples: Mapping[str, Sequence[float]],
+    n_resamples: int = DEFAULT_RESAMPLES,
+    confidence: float = DEFAULT_CONFIDENCE,
+    seed: int | None = DEFAULT_SEED,
+) -> BootstrapResult:
+    """Bootstrap mean/median/P10/P90 CIs for every club in one batch.
+
+    Args:
+        samples: Club name -> carry values. NaN/inf values are dropped and
+            clubs left with no values are skipped.
+        n_resamples: Bootstrap resamples per club.
+        confidence: Two-sided CI level, e.g. 0.95.
+        seed: Seed for ``numpy.random.default_rng``; same seed, same CIs.
+
+    Returns:
+        BootstrapResult with per-club CIs and bootstrap distributions.
+    """
+    if n_resamples < 1:
+        raise ValueError("n_resamples must be >= 1")
+    if not 0.0 < confidence < 1.0:
+        raise ValueError("confidence must be between 0 and 1")
+
+    clubs: list[str] = []
+    arrays: list[np.ndarray] = []
+    for club, values in samples.items():
+        arr = np.asarray(values, dtype=float)
+        arr = arr[np.isfinite(arr)]
+        if arr.size:
+            clubs.append(club)
+            arrays.append(arr)
+
+    if not clubs:
+        empty = np.empty((n_resamples, 0))
+        return BootstrapResult(
+            [], np.empty(0, dtype=np.intp),
+            {stat: np.empty(0) for stat in STATISTICS},
+            {stat: empty for stat in STATISTICS},
+            confidence,
+        )
+
+    counts = np.array([a.size for a in arrays], dtype=np.intp)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    flat = np.concatenate(arrays)
+    total = flat.size
+
+    segment = np.repeat(np.arange(len(clubs)), counts)
+    span = float(flat.max() - flat.min()) + 1.0
+    offsets = segment * span
+    seg_starts = starts[segment]
+    seg_counts = counts[segment]
+
+    estimates = _segment_stats(flat, starts, counts, offsets)
+
+    rng = np.random.default_rng(seed)
+    block = max(1, _MAX_BLOCK_ELEMENTS // total)
+    parts: dict[str, list[np.ndarray]] = {stat: [] for stat in STATISTICS}
+    for begin in range(0, n_resamples, block):
+        rows = min(block, n_resamples - begin)
+        # Each element draws an index inside its own club's segment.
+        idx = seg_starts + (rng.random((rows, total)) * seg_counts).astype(np.intp)
+        for stat, value in _segment_stats(flat[idx], starts, counts, offsets).items():
+            parts[stat].append(value)
+
+    distributions = {stat: np.concatenate(parts[stat], axis=0) for stat in STATISTICS}
+    return BootstrapResult(clubs, counts, estimates, distributions, confidence)
@@ -0,0 +1,291 @@
+"""
+Binned 2D kernel density engine for strike-location heatmaps.
+
+Exact Gaussian KDE evaluates every shot at every grid point (O(n x grid)).
+This engine instead linearly bins shots onto a fixed face-coordinate grid
+and convolves the bin counts with the Gaussian kernel via FFT, so the cost
+is one bincount over the shots plus an FFT of the grid, independent of n.
+
+The bandwidth follows scipy's ``gaussian_kde`` (Scott's rule on the full
+sample covariance, times ``bw_adjust``), so results match the exact KDE up
+to binning error. Bin counts and covariance moments are both mergeable,
+which is what makes incremental updates exact: ``StrikeDensity.add`` folds
+new shots in without revisiting old ones.
+
+``DensityCache`` keeps one ``StrikeDensity`` per (club, window) and, given
+shot ids, only bins shots it has not seen yet.
+
+Used by ``components/heatmap_chart.py`` and ``scripts/golf_strike_heatmap.py``.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Iterable, Optional, Sequence
+
+import numpy as np
+
+KERNEL_SIGMAS = 4.0
+
+
+@dataclass(frozen=True)
+class DensityGrid:
+    """Fixed evaluation grid; density values are computed at bin centres."""
+
+    x_min: float
+    x_max: float
+    y_min: float
+    y_max: float
+    size: int = 128
+
+    def __post_init__(self):
+        if self.size < 2:
+            raise ValueError("size must be >= 2")
+        if not (self.x_max > self.x_min and self.y_max > self.y_min):
+            raise ValueError("grid bounds must be increasing")
+
+    @classmethod
+    def from_points(
+        cls,
+        x: Sequence[float],
+        y: Sequence[float],
+        size: int = 128,
+        pad_fraction: float = 0.08,
+        min_pad: float = 0.5,
+    ) -> "DensityGrid":
+        """Grid covering the points plus a margin on each side."""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if x.size == 0 or y.size == 0:
+            raise ValueError("cannot size a grid from no points")
+        x_pad = max((x.max() - x.min()) * pad_fraction, min_pad)
+        y_pad = max((y.max() - y.min()) * pad_fraction, min_pad)
+        return cls(x.min() - x_pad, x.max() + x_pad, y.min() - y_pad, y.max() + y_pad, size)
+
+    @property
+    def xs(self) -> np.ndarray:
+        return np.linspace(self.x_min, self.x_max, self.size)
+
+    @property
+    def ys(self) -> np.ndarray:
+        return np.linspace(self.y_min, self.y_max, self.size)
+
+    @property
+    def dx(self) -> float:
+        return (self.x_max - self.x_min) / (self.size - 1)
+
+    @property
+    def dy(self) -> float:
+        return (self.y_max - self.y_min) / (self.size - 1)
+
+
+# Optix face coordinates as plotted by the Streamlit heatmap (axis range -1..1).
+FACE_GRID = DensityGrid(-1.25, 1.25, -1.25, 1.25, 96)
+
+
+class StrikeDensity:
+    """Incrementally updatable binned KDE on one ``DensityGrid``."""
+
+    def __init__(self, grid: DensityGrid, bw_adjust: float = 1.0):
+        self.grid = grid
+        self.bw_adjust = bw_adjust
+        self.counts = np.zeros((grid.size, grid.size))  # [iy, ix]
+        self.n = 0
+        self._mean = np.zeros(2)
+        self._m2 = np.zeros((2, 2))  # sum of outer products of deviations
+        self._density: Optional[np.ndarray] = None
+
+    def add(self, x: Sequence[float], y: Sequence[float]) -> None:
+        """Fold new shots into the bin counts and covariance moments.
+
+        Non-finite points are ignored. Points outside the grid still count
+        towards the bandwidth and normalisation (their mass just falls off
+        the grid), exactly as an exact KDE evaluated on this grid would.
+        """
+        points = np.column_stack([np.asarray(x, dtype=float), np.asarray(y, dtype=float)])
+        points = points[np.isfinite(points).all(axis=1)]
+        if len(points) == 0:
+            return
+
+        # Chan et al. parallel merge of (n, mean, M2).
+        n_new = len(points)
+        mean_new = points.mean(axis=0)
+        dev = points - mean_new
+        m2_new = dev.T @ dev
+        total = self.n + n_new
+        delta = mean_new - self._mean
+        self._m2 = self._m2 + m2_new + np.outer(delta, delta) * (self.n * n_new / total)
+        self._mean = self._mean + delta * (n_new / total)
+        self.n = total
+
+        self._bin(points)
+        self._density = None
+
+    def _bin(self, points: np.ndarray) -> None:
+        grid = self.grid
+        size = grid.size
+        fx = (points[:, 0] - grid.x_min) / grid.dx
+        fy = (points[:, 1] - grid.y_min) / grid.dy
+        inside = (fx >= 0) & (fx <= size - 1) & (fy >= 0) & (fy <= size - 1)
+        fx, fy = fx[inside], fy[inside]
+        if fx.size == 0:
+            return
+        ix = np.minimum(np.floor(fx).astype(np.intp), size - 2)
+        iy = np.minimum(np.floor(fy).astype(np.intp), size - 2)
+        wx = fx - ix
+        wy = fy - iy
+        base = iy * size + ix
+        flat = np.bincount(base, (1 - wx) * (1 - wy), minlength=size * size)
+        flat += np.bincount(base + 1, wx * (1 - wy), minlength=size * size)
+        flat += np.bincount(base + size, (1 - wx) * wy, minlength=size * size)
+        flat += np.bincount(base + size + 1, wx * wy, minlength=size * size)
+        self.counts += flat.reshape(size, size)
+
+    @property
+    def kernel_covariance(self) -> Optional[np.ndarray]:
+        """Scott's-rule kernel covariance, or None if the sample is degenerate."""
+        if self.n < 2:
+            return None
+        factor = self.n ** (-1.0 / 6.0) * self.bw_adjust  # Scott, d=2
+        cov = self._m2 / (self.n - 1) * factor ** 2
+        if np.linalg.det(cov) <= 0 or not np.all(np.diag(cov) > 0):
+            return None
+        return cov
+
+    def density(self) -> Optional[np.ndarray]:
+        """Density at the grid's bin centres, shape ``(size, size)`` as [iy, ix].
+
+        Cached until the next ``add``. Returns None when fewer than two
+        shots or a singular spread make the KDE undefined.
+        """
+        if self._density is not None:
+            return self._density
+        cov = self.kernel_covariance
+        if cov is None:
+            return None
+
+        grid = self.grid
+        kx = int(min(grid.size - 1, np.ceil(KERNEL_SIGMAS * np.sqrt(cov[0, 0]) / grid.dx)))
+        ky = int(min(grid.size - 1, np.ceil(KERNEL_SIGMAS * np.sqrt(cov[1, 1]) / grid.dy)))
+        ox, oy = np.meshgrid(np.arange(-kx, kx + 1) * grid.dx, np.arange(-ky, ky + 1) * grid.dy)
+        inv = np.linalg.inv(cov)
+        quad = inv[0, 0] * ox ** 2 + 2 * inv[0, 1] * ox * oy + inv[1, 1] * oy ** 2
+        kernel = np.exp(-0.5 * quad) / (2 * np.pi * np.sqrt(np.linalg.det(cov)))
+
+        shape = (grid.size + 2 * ky, grid.size + 2 * kx)
+        full = np.fft.irfft2(np.fft.rfft2(self.counts, shape) * np.fft.rfft2(kernel, shape), shape)
+        density = full[ky:ky + grid.size, kx:kx + grid.size] / self.n
+        self._density = np.maximum(density, 0.0)
+        return self._density
+
+    def levels(self, thresh: float = 0.05, count: int = 100) -> Optional[np.ndarray]:
+        """Iso-proportion contour levels (same rule as seaborn's kdeplot)."""
+        density = self.density()
+        if density is None:
+            return None
+        return iso_proportion_levels(density, thresh, count)
+
+
+def iso_proportion_levels(density: np.ndarray, thresh: float = 0.05, count: int = 100) -> np.ndarray:
+    """Density levels enclosing ``1 - p`` of the mass for p in [thresh, 1]."""
+    isoprop = np.linspace(thresh, 1, count)
+    sorted_values = np.sort(density.ravel())[::-1]
+    cumulative = np.cumsum(sorted_values) / sorted_values.sum()
+    idx = np.searchsorted(cumulative, 1 - isoprop)
+    return np.unique(np.take(sorted_values, idx, mode="clip"))
+
+
+def binned_kde(
+    x: Sequence[float],
+    y: Sequence[float],
+    grid: DensityGrid,
+    bw_adjust: float = 1.0,
+) -> Optional[np.ndarray]:
+    """One-shot helper: density of (x, y) on ``grid`` or None if undefined."""
+    engine = StrikeDensity(grid, bw_adjust)
+    engine.add(x, y)
+    return engine.density()
+
+
+class DensityCache:
+    """Thread-safe LRU of ``StrikeDensity`` keyed by (club, window).
+
+    Shots are identified by (shot_id, x, y). ``get`` rebuilds an entry
+    when the grid or bandwidth changes or when a previously seen shot is
+    no longer present (window moved on, shot deleted, impact location
+    edited); otherwise it only adds the shots that are new.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, tuple[StrikeDensity, set]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        club: str,
+        window: str,
+        x: Sequence[float],
+        y: Sequence[float],
+        shot_ids: Optional[Iterable[Hashable]] = None,
+        grid: DensityGrid = FACE_GRID,
+        bw_adjust: float = 1.0,
+    ) -> StrikeDensity:
+        """Return the density for (club, window), updated to these shots.
+
+        Without ``shot_ids`` shots cannot be told apart reliably, so the
+        density is computed fresh and not cached.
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if shot_ids is None:
+            if len(x) != len(y):
+                raise ValueError("x, y and shot_ids must have the same length")
+            engine = StrikeDensity(grid, bw_adjust)
+            engine.add(x, y)
+            return engine
+        # NaN never equals itself, so store missing coordinates as None
+        ids = [
+            (shot_id, None if xi != xi else xi, None if yi != yi else yi)
+            for shot_id, xi, yi in zip(shot_ids, x.tolist(), y.tolist())
+        ]
+        if len(ids) != len(x) or len(x) != len(y):
+            raise ValueError("x, y and shot_ids must have the same length")
+        key = (club, window)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                engine, seen = entry
+                current = set(ids)
+                if engine.grid != grid or engine.bw_adjust != bw_adjust or not seen <= current:
+                    entry = None
+            if entry is None:
+                engine, seen = StrikeDensity(grid, bw_adjust), set()
+                self._entries[key] = (engine, seen)
+
+            new = [i for i, shot_id in enumerate(ids) if shot_id not in seen]
+            if new:
+                engine.add(x[new], y[new])
+                seen.update(ids[i] for i in new)
+
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return engine
+
+    def invalidate(self, club: Optional[str] = None) -> None:
+        """Drop every entry, or only those for one club."""
+        with self._lock:
+            if club is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[0] == club]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+density_cache = DensityCache()
@@ -0,0 +1,494 @@
+"""
+Import-time Anomaly Scoring — swing flaw scores stored next to the shots.
+
+Every imported shot is scored against a SwingFlawDetector fitted on its
+own club's history, and the result (anomaly score, outlier flag, flaw
+names) is written to an indexed ``shot_anomalies`` table. Pages and agent
+tools then filter anomalous shots with one indexed query instead of
+rescoring history on every request.
+
+Detectors are cached per club for the life of the process. A club's
+detector is fitted on first use and refit on a background thread once
+its shot count has grown by ``refit_growth``; scoring never waits for a
+refit. Clubs with too little history are scored with the rule-based
+checks only.
+
+Usage:
+    from services.anomaly_scoring import get_anomaly_scorer
+
+    scorer = get_anomaly_scorer()
+    scorer.score_new()                               # after an import
+    flagged = scorer.anomalous_shots(session_id='84428')
+"""
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from ml.anomaly_detection import (
+    FLAW_COLUMNS,
+    HAS_ML_DEPS,
+    SwingFlawDetector,
+    detect_swing_flaws_frame,
+)
+from services.feature_store import compute_derived_features
+from services.shot_query import db_version
+
+try:
+    import golf_db
+    HAS_GOLF_DB = True
+except ImportError:
+    HAS_GOLF_DB = False
+
+# Shot columns read for scoring and fitting
+SCORE_COLUMNS = [
+    'shot_id', 'session_id', 'club', 'ball_speed', 'club_speed', 'smash',
+    'attack_angle', 'club_path', 'face_angle', 'impact_x', 'impact_y', 'back_spin',
+]
+
+# Clubs with fewer shots than this are scored with rules only
+MIN_FIT_SHOTS = 50
+
+# Most recent shots per club used to fit its detector
+MAX_FIT_SHOTS = 5000
+
+# Refit once a club's shot count has grown by this fraction
+REFIT_GROWTH = 0.25
+
+# Detector label stored for rule-only scores
+RULES_ONLY = 'rules'
+
+# SQLite's default limit on bound parameters per statement
+_MAX_SQL_PARAMS = 900
+
+
+class _FittedDetector:
+    """A club's detector (None if fitting failed) and the club's shot count when fitted."""
+
+    def __init__(self, detector: Optional[SwingFlawDetector], n_shots: int):
+        self.detector = detector
+        self.n_shots = n_shots
+        self.version = f"if:{n_shots}:{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}"
+
+
+class ClubDetectorCache:
+    """
+    In-memory, per-club SwingFlawDetector cache with background refits.
+
+    Usage:
+        cache = ClubDetectorCache(db_path)
+        fitted = cache.get('7 Iron', n_shots=612)
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        min_shots: int = MIN_FIT_SHOTS,
+        refit_growth: float = REFIT_GROWTH,
+        background: bool = True,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: SQLite database holding the shots table
+            min_shots: Minimum club history to fit a detector
+            refit_growth: Fractional growth in club shots that triggers a refit
+            background: Refit on a worker thread (synchronously if False)
+        """
+        self.db_path = db_path
+        self.min_shots = min_shots
+        self.refit_growth = refit_growth
+        self.background = background
+        self._detectors: Dict[str, _FittedDetector] = {}
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def get(self, club: str, n_shots: int) -> Optional[_FittedDetector]:
+        """
+        Fitted detector for a club, or None to score with rules only.
+
+        The first request for a club fits synchronously. Later requests
+        return the cached detector and schedule a refit when ``n_shots``
+        has outgrown the fitted history.
+
+        Args:
+            club: Club name
+            n_shots: Current number of shots stored for the club
+        """
+        if not HAS_ML_DEPS or n_shots < self.min_shots:
+            return None
+        with self._lock:
+            fitted = self._detectors.get(club)
+        if fitted is None:
+            fitted = self._refit(club, n_shots)
+        elif n_shots >= fitted.n_shots * (1 + self.refit_growth):
+            self._schedule_refit(club, n_shots)
+        return fitted if fitted.detector is not None else None
+
+    def clubs(self) -> List[str]:
+        """Clubs with a cached, fitted detector."""
+        with self._lock:
+            return sorted(c for c, f in self._detectors.items() if f.detector is not None)
+
+    def wait(self) -> None:
+        """Block until scheduled refits finish."""
+        with self._lock:
+            pending = list(self._pending.values())
+        for future in pending:
+            future.result()
+
+    def _schedule_refit(self, club: str, n_shots: int) -> None:
+        if not self.background:
+            self._refit(club, n_shots)
+            return
+        with self._lock:
+            if club in self._pending:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='detector-refit')
+            future = self._executor.submit(self._refit, club, n_shots)
+            self._pending[club] = future
+        future.add_done_callback(lambda _: self._clear_pending(club))
+
+    def _clear_pending(self, club: str) -> None:
+        with self._lock:
+            self._pending.pop(club, None)
+
+    def _history(self, club: str) -> pd.DataFrame:
+        """Most recent shots for a club."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            available = {row[1] for row in conn.execute('PRAGMA table_info(shots)')}
+            columns = [c for c in SCORE_COLUMNS if c in available]
+            order = 'ORDER BY date_added DESC' if 'date_added' in available else ''
+            return pd.read_sql_query(
+                f'SELECT {", ".join(columns)} FROM shots WHERE club = ? {order} LIMIT ?',
+                conn, params=(club, MAX_FIT_SHOTS),
+            )
+        finally:
+            conn.close()
+
+    def _refit(self, club: str, n_shots: int) -> _FittedDetector:
+        """
+        Fit a club's detector and swap it into the cache.
+
+        Args:
+            club: Club name
+            n_shots: Club's total shot count, compared against later counts
+                (the fit itself uses at most MAX_FIT_SHOTS of them)
+        """
+        history = self._history(club)
+        # Fill smash where it was not recorded, as scoring does
+        history['smash'] = compute_derived_features(history)['smash']
+        detector = SwingFlawDetector()
+        try:
+            detector.fit(history)
+        except ValueError:
+            # Too few complete rows; retry once the club has grown
+            detector = None
+        fitted = _FittedDetector(detector, n_shots)
+        with self._lock:
+            self._detectors[club] = fitted
+        return fitted
+
+
+class AnomalyScorer:
+    """
+    Scores shots per club and stores the results in ``shot_anomalies``.
+
+    Usage:
+        scorer = AnomalyScorer()
+        scorer.score_new()
+        flagged = scorer.anomalous_shots(club='Driver', limit=20)
+    """
+
+    CREATE_ANOMALIES_SQL = '''
+        CREATE TABLE IF NOT EXISTS shot_anomalies (
+            shot_id TEXT PRIMARY KEY,
+            session_id TEXT,
+            club TEXT,
+            anomaly_score REAL,
+            is_outlier INTEGER NOT NULL DEFAULT 0,
+            flaw_count INTEGER NOT NULL DEFAULT 0,
+            flaws TEXT,
+            detector TEXT,
+            scored_at TEXT
+        )
+    '''
+
+    CREATE_INDEXES_SQL = [
+        'CREATE INDEX IF NOT EXISTS idx_shot_anomalies_outlier ON shot_anomalies(is_outlier, anomaly_score)',
+        'CREATE INDEX IF NOT EXISTS idx_shot_anomalies_session ON shot_anomalies(session_id, is_outlier)',
+        'CREATE INDEX IF NOT EXISTS idx_shot_anomalies_club ON shot_anomalies(club, is_outlier)',
+    ]
+
+    def __init__(self, db_path: Optional[str] = None, cache: Optional[ClubDetectorCache] = None):
+        """
+        Initialize the scorer.
+
+        Args:
+            db_path: SQLite database path (golf_db.SQLITE_DB_PATH if not given)
+            cache: Detector cache (a new one for ``db_path`` if not given)
+        """
+        if db_path:
+            self.db_path = db_path
+        elif HAS_GOLF_DB:
+            self.db_path = golf_db.SQLITE_DB_PATH
+        else:
+            self.db_path = str(Path(__file__).parent.parent / 'golf_stats.db')
+        self.cache = cache or ClubDetectorCache(self.db_path)
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the database (never creates it) and the scores table.
+
+        Raises:
+            sqlite3.OperationalError: If the database file does not exist
+        """
+        if db_version(self.db_path) is None:
+            raise sqlite3.OperationalError(f'unable to open database file: {self.db_path}')
+        conn = sqlite3.connect(self.db_path)
+        if not self._initialized:
+            conn.execute(self.CREATE_ANOMALIES_SQL)
+            for index_sql in self.CREATE_INDEXES_SQL:
+                conn.execute(index_sql)
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def _club_counts(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        return dict(conn.execute('SELECT club, COUNT(*) FROM shots WHERE club IS NOT NULL GROUP BY club'))
+
+    def score(self, df: pd.DataFrame, club_counts: Optional[Dict[str, int]] = None) -> pd.DataFrame:
+        """
+        Score shots with their club's detector (vectorized per club).
+
+        Args:
+            df: Shots with a 'club' column and the swing metrics
+            club_counts: Stored shots per club (read from the DB if None)
+
+        Returns:
+            DataFrame indexed like ``df`` with 'anomaly_score',
+            'is_outlier', 'flaw_count', 'flaws' and 'detector'
+        """
+        columns = ['anomaly_score', 'is_outlier', 'flaw_count', 'flaws', 'detector']
+        if df.empty:
+            return pd.DataFrame(columns=columns, index=df.index)
+        if club_counts is None:
+            conn = self._connect()
+            try:
+                club_counts = self._club_counts(conn)
+            finally:
+                conn.close()
+
+        parts = []
+        clubs = df['club'] if 'club' in df.columns else pd.Series(None, index=df.index, dtype=object)
+        for club, group in df.groupby(clubs.fillna(''), sort=False):
+            fitted = self.cache.get(club, club_counts.get(club, 0)) if club else None
+            if fitted is not None:
+                frame = fitted.detector.detect_frame(group)
+                frame['detector'] = fitted.version
+            else:
+                frame = detect_swing_flaws_frame(group)
+                frame['detector'] = RULES_ONLY
+            flags = frame[FLAW_COLUMNS].to_numpy(dtype=bool)
+            names = np.array([col[len('flaw_'):] for col in FLAW_COLUMNS])
+            frame['flaws'] = [','.join(names[row]) for row in flags]
+            parts.append(frame[columns])
+        return pd.concat(parts).reindex(df.index)
+
+    def store(self, df: pd.DataFrame, scores: pd.DataFrame) -> int:
+        """Upsert scores for shots (``df`` supplies shot_id/session_id/club)."""
+        if df.empty:
+            return 0
+        scored_at = datetime.now(timezone.utc).isoformat()
+        session_ids = df['session_id'] if 'session_id' in df.columns else pd.Series(None, index=df.index)
+        rows = [
+            (str(shot_id), session_id, club, float(score), int(bool(outlier)), int(count), flaws, detector, scored_at)
+            for shot_id, session_id, club, score, outlier, count, flaws, detector in zip(
+                df['shot_id'], session_ids, df.get('club', pd.Series(None, index=df.index)),
+                scores['anomaly_score'], scores['is_outlier'], scores['flaw_count'],
+                scores['flaws'], scores['detector'],
+            )
+        ]
+        conn = self._connect()
+        try:
+            conn.executemany(
+                'INSERT OR REPLACE INTO shot_anomalies (shot_id, session_id, club, anomaly_score, '
+                'is_outlier, flaw_count, flaws, detector, scored_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                rows,
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        return len(rows)
+
+    def prune(self, conn: sqlite3.Connection) -> int:
+        """
+        Drop scores of shots that were deleted or moved to another session or club.
+
+        Moved shots are scored again by the next ``score_new()``.
+
+        Returns:
+            Number of rows removed
+        """
+        cursor = conn.execute('''
+            DELETE FROM shot_anomalies
+            WHERE NOT EXISTS (
+                SELECT 1 FROM shots s
+                WHERE s.shot_id = shot_anomalies.shot_id
+                  AND s.session_id IS shot_anomalies.session_id
+                  AND s.club IS shot_anomalies.club
+            )
+        ''')
+        conn.commit()
+        return cursor.rowcount
+
+    def _read_shots(self, conn: sqlite3.Connection, select: str, shot_ids: List[str]) -> pd.DataFrame:
+        """Scoring columns of the given shots."""
+        parts = []
+        for start in range(0, len(shot_ids), _MAX_SQL_PARAMS):
+            chunk = shot_ids[start:start + _MAX_SQL_PARAMS]
+            parts.append(pd.read_sql_query(
+                f'SELECT {select} FROM shots s WHERE s.shot_id IN ({", ".join("?" * len(chunk))})',
+                conn, params=chunk,
+            ))
+        return pd.concat(parts, ignore_index=True)
+
+    def score_new(self, batch_size: int = 5000) -> int:
+        """
+        Score every stored shot that has no anomaly row yet.
+
+        Scores of deleted or moved shots are pruned first. Unscored shot
+        IDs are collected up front, then shots are read, scored and
+        written ``batch_size`` at a time.
+
+        Args:
+            batch_size: Shots scored and written per batch
+
+        Returns:
+            Number of shots scored
+        """
+        conn = self._connect()
+        try:
+            available = {row[1] for row in conn.execute('PRAGMA table_info(shots)')}
+            if 'shot_id' not in available:
+                return 0
+            select = ', '.join(f's.{c}' for c in SCORE_COLUMNS if c in available)
+            self.prune(conn)
+            unscored = [row[0] for row in conn.execute(
+                '''
+                SELECT s.shot_id
+                FROM shots s
+                LEFT JOIN shot_anomalies a ON a.shot_id = s.shot_id
+                WHERE a.shot_id IS NULL
+                '''
+            )]
+            club_counts = self._club_counts(conn)
+        finally:
+            conn.close()
+
+        total = 0
+        for start in range(0, len(unscored), batch_size):
+            conn = self._connect()
+            try:
+                batch = self._read_shots(conn, select, unscored[start:start + batch_size])
+            finally:
+                conn.close()
+            total += self.store(batch, self.score(batch, club_counts))
+        return total
+
+    def rescore(self, club: Optional[str] = None) -> int:
+        """
+        Drop stored scores (for one club or all) and score those shots again.
+
+        Useful after a refit, since stored scores keep the detector that
+        produced them.
+        """
+        conn = self._connect()
+        try:
+            if club is None:
+                conn.execute('DELETE FROM shot_anomalies')
+            else:
+                conn.execute('DELETE FROM shot_anomalies WHERE club = ?', (club,))
+            conn.commit()
+        finally:
+            conn.close()
+        return self.score_new()
+
+    def anomalous_shots(
+        self,
+        session_id: Optional[str] = None,
+        club: Optional[str] = None,
+        min_score: Optional[float] = None,
+        limit: int = 100,
+    ) -> pd.DataFrame:
+        """
+        Stored anomalous shots, most anomalous first.
+
+        Without ``min_score`` only shots flagged as outliers are returned;
+        with it, any shot scoring at least ``min_score``. Scores are joined
+        to ``shots``, so deleted shots are skipped and moved shots report
+        their current session and club.
+
+        Args:
+            session_id: Restrict to one session
+            club: Restrict to one club
+            min_score: Minimum anomaly score (0-1)
+            limit: Maximum rows
+
+        Returns:
+            DataFrame with shot_id, session_id, club, anomaly_score,
+            is_outlier, flaw_count and flaws
+        """
+        clauses, params = [], []
+        if min_score is None:
+            clauses.append('a.is_outlier = 1')
+        else:
+            clauses.append('a.anomaly_score >= ?')
+            params.append(min_score)
+        if session_id is not None:
+            clauses.append('s.session_id = ?')
+            params.append(str(session_id))
+        if club is not None:
+            clauses.append('s.club = ?')
+            params.append(club)
+        params.append(limit)
+
+        conn = self._connect()
+        try:
+            return pd.read_sql_query(
+                'SELECT a.shot_id, s.session_id, s.club, a.anomaly_score, a.is_outlier, a.flaw_count, a.flaws '
+                'FROM shot_anomalies a JOIN shots s ON s.shot_id = a.shot_id '
+                f'WHERE {" AND ".join(clauses)} '
+                'ORDER BY a.anomaly_score DESC LIMIT ?',
+                conn, params=params,
+            )
+        finally:
+            conn.close()
+
+    def anomalous_shot_ids(self, session_id: Optional[str] = None) -> Set[str]:
+        """IDs of shots flagged as outliers (optionally in one session)."""
+        return set(self.anomalous_shots(session_id=session_id, limit=-1)['shot_id'])
+
+
+_default_scorer: Optional[AnomalyScorer] = None
+_default_lock = threading.Lock()
+
+
+def get_anomaly_scorer() -> AnomalyScorer:
+    """Get the shared AnomalyScorer (and its detector cache) for the app database."""
+    global _default_scorer
+    db_path = golf_db.SQLITE_DB_PATH if HAS_GOLF_DB else None
+    with _default_lock:
+        if _default_scorer is None or (db_path and _default_scorer.db_path != db_path):
+            _default_scorer = AnomalyScorer(db_path)
+        return _default_scorer
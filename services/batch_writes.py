@@ -0,0 +1,186 @@
+"""
+Batch Writes — many session metadata updates in one SQLite transaction.
+
+``golf_db.update_shot_metadata()`` commits, logs and syncs every call on
+its own, so retagging dozens of sessions costs dozens of transactions,
+change_log writes and Supabase round trips. ``apply_session_updates()``
+applies a whole list of (session_id, field, value) updates in a single
+transaction and records them as one change_log batch (one row per
+update, sharing a batch id); if anything fails, nothing is written.
+
+Stats recomputation and the cloud sync are deferred until the batch has
+committed: ``sync_session_updates()`` pushes it to Supabase with one
+request per distinct (field, value), and ``golf_db.batch_update_sessions()``
+runs both and recomputes session stats once per touched session.
+
+Usage:
+    result = apply_session_updates(db_path, [
+        SessionUpdate('84512', 'shot_tag', 'Warmup'),
+        SessionUpdate('84513', 'session_type', 'Driver Focus'),
+    ], allowed_fields=golf_db.ALLOWED_UPDATE_FIELDS)
+    print(result.updated_shots, result.missing_sessions)
+"""
+import sqlite3
+import uuid
+from collections import defaultdict
+from contextlib import closing
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+BATCH_OPERATION = 'batch_update'
+
+# Session ids per Supabase request (they travel in the URL filter)
+SYNC_CHUNK_SIZE = 200
+
+
+@dataclass(frozen=True)
+class SessionUpdate:
+    """Set ``field`` to ``value`` on every shot of a session."""
+    session_id: str
+    field: str
+    value: Any
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch of session updates."""
+    batch_id: str
+    updates: List[SessionUpdate] = field(default_factory=list)
+    shots_by_update: List[int] = field(default_factory=list)
+    missing_sessions: List[str] = field(default_factory=list)
+    logged: int = 0  # change_log rows written
+    sync_error: Optional[str] = None
+
+    @property
+    def updated_shots(self) -> int:
+        return sum(self.shots_by_update)
+
+    @property
+    def touched_sessions(self) -> List[str]:
+        """Sessions with at least one updated shot, in request order."""
+        return list(dict.fromkeys(
+            u.session_id for u, n in zip(self.updates, self.shots_by_update) if n
+        ))
+
+
+def _coerce(update: Any) -> SessionUpdate:
+    if isinstance(update, SessionUpdate):
+        return update
+    if isinstance(update, dict):
+        return SessionUpdate(str(update['session_id']), update['field'], update['value'])
+    session_id, field_name, value = update
+    return SessionUpdate(str(session_id), field_name, value)
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+
+
+def apply_session_updates(
+    db_path: str,
+    updates: Iterable[Any],
+    allowed_fields: Optional[Iterable[str]] = None,
+    operation: str = BATCH_OPERATION,
+) -> BatchResult:
+    """
+    Apply session metadata updates in one transaction.
+
+    Args:
+        db_path: SQLite database path
+        updates: SessionUpdate objects, (session_id, field, value) tuples
+            or dicts with those keys; applied in order
+        allowed_fields: Fields that may be written (e.g.
+            golf_db.ALLOWED_UPDATE_FIELDS); any shots column if None
+        operation: change_log operation name
+
+    Returns:
+        BatchResult with shots updated per update and sessions that had no shots
+
+    Raises:
+        ValueError: A field is not allowed or not a shots column
+        sqlite3.Error: The transaction failed (and was rolled back)
+    """
+    updates = [_coerce(u) for u in updates]
+    result = BatchResult(batch_id=uuid.uuid4().hex[:12], updates=updates)
+    if not updates:
+        return result
+
+    fields = {u.field for u in updates}
+    if allowed_fields is not None:
+        invalid = sorted(fields - set(allowed_fields))
+        if invalid:
+            raise ValueError(
+                f"Invalid field(s): {', '.join(invalid)}. Allowed fields: {', '.join(sorted(allowed_fields))}"
+            )
+
+    with closing(sqlite3.connect(db_path, timeout=30)) as conn:
+        columns = set(_columns(conn, 'shots'))
+        unknown = sorted(fields - columns)
+        if unknown:
+            raise ValueError(f"Not a shots column: {', '.join(unknown)}")
+        has_change_log = bool(_columns(conn, 'change_log'))
+
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            for update in updates:
+                cursor = conn.execute(
+                    f'UPDATE shots SET "{update.field}" = ? WHERE session_id = ?',
+                    (update.value, update.session_id),
+                )
+                result.shots_by_update.append(cursor.rowcount)
+            if has_change_log:
+                log_rows = [
+                    (operation, 'session', update.session_id,
+                     f"{update.field} = {update.value!r} ({count} shots, batch {result.batch_id})")
+                    for update, count in zip(updates, result.shots_by_update) if count
+                ]
+                conn.executemany(
+                    'INSERT INTO change_log (operation, entity_type, entity_id, details) VALUES (?, ?, ?, ?)',
+                    log_rows,
+                )
+                result.logged = len(log_rows)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            result.shots_by_update.clear()
+            raise
+
+    updated = {u.session_id for u, n in zip(updates, result.shots_by_update) if n}
+    result.missing_sessions = [s for s in dict.fromkeys(u.session_id for u in updates) if s not in updated]
+    return result
+
+
+def _sync_groups(result: BatchResult) -> Dict[Tuple[str, Any], List[str]]:
+    """Touched sessions grouped by (field, value); the last update of a field wins."""
+    final: Dict[Tuple[str, str], Any] = {}
+    for update, count in zip(result.updates, result.shots_by_update):
+        if count:
+            final[(update.session_id, update.field)] = update.value
+    groups: Dict[Tuple[str, Any], List[str]] = defaultdict(list)
+    for (session_id, field_name), value in final.items():
+        groups[(field_name, value)].append(session_id)
+    return groups
+
+
+def sync_session_updates(client: Any, result: BatchResult) -> Optional[str]:
+    """
+    Push a committed batch to Supabase.
+
+    Sends one update per distinct (field, value), filtered on the
+    sessions it applies to, instead of one request per session.
+
+    Args:
+        client: Supabase client (golf_db.supabase)
+        result: Result of apply_session_updates()
+
+    Returns:
+        None on success, otherwise the error message (the local write stands)
+    """
+    try:
+        for (field_name, value), session_ids in _sync_groups(result).items():
+            for start in range(0, len(session_ids), SYNC_CHUNK_SIZE):
+                chunk: Sequence[str] = session_ids[start:start + SYNC_CHUNK_SIZE]
+                client.table('shots').update({field_name: value}).in_('session_id', list(chunk)).execute()
+    except Exception as e:
+        return str(e)
+    return None
@@ -12,6 +12,7 @@ import pandas as pd
 import golf_db
 from services.time_window import filter_by_window, DEFAULT_WINDOW
 from services.data_quality import filter_outliers, get_outlier_summary
+from services.feature_store import attach_features
 
 
 @st.cache_data(show_spinner=False, ttl=60)
@@ -38,9 +39,9 @@ def get_session_data(session_id: str = None, read_mode: str = "auto") -> pd.Data
         read_mode: Data source mode ("auto", "sqlite", "supabase")
 
     Returns:
-        DataFrame of shot data
+        DataFrame of shot data with derived feature columns
     """
-    return golf_db.get_session_data(session_id, read_mode=read_mode)
+    return attach_features(golf_db.get_session_data(session_id, read_mode=read_mode))
 
 
 @st.cache_data(show_spinner=False, ttl=60)
@@ -52,9 +53,9 @@ def get_all_shots(read_mode: str = "auto") -> pd.DataFrame:
         read_mode: Data source mode
 
     Returns:
-        DataFrame of all shot data
+        DataFrame of all shot data with derived feature columns
     """
-    return golf_db.get_all_shots(read_mode=read_mode)
+    return attach_features(golf_db.get_all_shots(read_mode=read_mode))
 
 
 @st.cache_data(show_spinner=False, ttl=300)
@@ -148,6 +149,13 @@ def get_session_aggregates(session_id: str) -> dict:
     return golf_db.get_session_aggregates(session_id)
 
 
+@st.cache_data(show_spinner=False, ttl=60)
+def get_anomalous_shots(session_id: str = None, club: str = None, limit: int = 100) -> pd.DataFrame:
+    """Get shots flagged by import-time swing flaw scoring, most anomalous first."""
+    from services.anomaly_scoring import get_anomaly_scorer
+    return get_anomaly_scorer().anomalous_shots(session_id=session_id, club=club, limit=limit)
+
+
 def get_filtered_shots(
     session_id: str = None,
     read_mode: str = "auto",
@@ -233,6 +241,7 @@ def clear_session_cache():
     get_club_profile.clear()
     get_rolling_averages.clear()
     get_session_aggregates.clear()
+    get_anomalous_shots.clear()
 
 
 def clear_all_caches():
@@ -0,0 +1,447 @@
+"""
+Feature Store — derived shot features computed once and persisted.
+
+Derived columns (face-to-path, strike distance, smash, spin loft, spin
+efficiency) used to be re-derived ad hoc by the ML models, the agent tools
+and the report scripts. This module computes them with vectorized pandas
+operations and stores them in a ``shot_features`` table next to ``shots``,
+keyed by shot_id and stamped with ``FEATURE_SCHEMA_VERSION`` and a
+fingerprint of the shot's input columns.
+
+Rows are written only by ``backfill()``, after an import or sync; it
+touches shots without features and prunes rows of deleted shots. When
+the formulas change, bump ``FEATURE_SCHEMA_VERSION`` and stale rows are
+recomputed on the next backfill. A shot whose inputs changed (re-imported
+or corrected with the same shot_id) no longer matches its fingerprint and
+is recomputed the same way. ``attach()`` is read-only: shots without
+current stored features get them computed in memory.
+
+Usage:
+    from services.feature_store import FeatureStore, compute_derived_features
+
+    store = FeatureStore()
+    store.backfill()              # after an import / schema bump
+    df = store.attach(shots_df)   # adds FEATURE_COLUMNS to any shot frame
+
+    # Pure computation, no DB
+    features = compute_derived_features(shots_df)
+"""
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from services.shot_query import db_version
+
+try:
+    import golf_db
+    HAS_GOLF_DB = True
+except ImportError:
+    HAS_GOLF_DB = False
+
+# Bump when a formula below changes or a column is added
+FEATURE_SCHEMA_VERSION = 1
+
+FEATURE_COLUMNS = [
+    'face_to_path',
+    'strike_distance',
+    'smash',
+    'spin_loft',
+    'spin_efficiency',
+]
+
+# Raw shot columns the features are derived from
+INPUT_COLUMNS = [
+    'ball_speed', 'club_speed', 'smash', 'face_angle', 'club_path',
+    'impact_x', 'impact_y', 'dynamic_loft', 'attack_angle',
+    'launch_angle', 'back_spin',
+]
+
+# Baseline driver spin used by spin_efficiency when dynamic loft is unknown
+_EXPECTED_SPIN = 2500
+
+# SQLite's default limit on bound parameters per statement
+_MAX_SQL_PARAMS = 900
+
+# Above this many shot IDs, load() scans the table instead of chunking
+_FULL_SCAN_THRESHOLD = 10 * _MAX_SQL_PARAMS
+
+
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    """Numeric column (NaN where missing, or all-NaN if absent)."""
+    if name not in df.columns:
+        return pd.Series(np.nan, index=df.index, dtype=float)
+    return pd.to_numeric(df[name], errors='coerce').astype(float)
+
+
+def input_fingerprint(df: pd.DataFrame) -> pd.Series:
+    """
+    Hash of each shot's INPUT_COLUMNS, used to detect changed shots.
+
+    Kept below 2**52 so it survives pandas reading a nullable INTEGER
+    column as float.
+
+    Args:
+        df: Shot data with any of INPUT_COLUMNS
+
+    Returns:
+        int64 Series indexed like ``df``
+    """
+    inputs = pd.DataFrame({col: _column(df, col) for col in INPUT_COLUMNS}, index=df.index)
+    hashed = pd.util.hash_pandas_object(inputs, index=False).to_numpy() >> np.uint64(12)
+    return pd.Series(hashed.astype(np.int64), index=df.index)
+
+
+def compute_derived_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compute derived shot features for every row at once.
+
+    Formulas match ml.anomaly_detection.compute_swing_metrics; missing
+    inputs give NaN rather than a guessed default.
+
+    Args:
+        df: Shot data with any of INPUT_COLUMNS
+
+    Returns:
+        DataFrame indexed like ``df`` with FEATURE_COLUMNS
+    """
+    ball_speed = _column(df, 'ball_speed')
+    club_speed = _column(df, 'club_speed')
+    dynamic_loft = _column(df, 'dynamic_loft')
+    launch_angle = _column(df, 'launch_angle')
+    back_spin = _column(df, 'back_spin')
+
+    # Keep a recorded smash; otherwise ball/club speed (0 means not measured)
+    smash = _column(df, 'smash').where(lambda s: s > 0)
+    computed_smash = (ball_speed / club_speed).where((club_speed > 0) & (ball_speed > 0))
+    smash = smash.fillna(computed_smash)
+
+    # Launch/loft ratio when loft is known, else spin relative to a driver baseline
+    from_loft = (launch_angle / dynamic_loft).where(dynamic_loft > 0, 0.0)
+    from_spin = np.minimum(1.0, _EXPECTED_SPIN / back_spin.clip(lower=1))
+    use_loft = dynamic_loft.notna() & (dynamic_loft != 0) & (launch_angle > 0)
+    spin_efficiency = from_loft.where(use_loft, from_spin)
+
+    return pd.DataFrame({
+        'face_to_path': _column(df, 'face_angle') - _column(df, 'club_path'),
+        'strike_distance': np.hypot(_column(df, 'impact_x'), _column(df, 'impact_y')),
+        'smash': smash,
+        'spin_loft': dynamic_loft - _column(df, 'attack_angle'),
+        'spin_efficiency': spin_efficiency,
+    }, index=df.index)
+
+
+class FeatureStore:
+    """
+    SQLite-backed store of derived shot features.
+
+    Usage:
+        store = FeatureStore()
+        store.backfill()
+        df = store.attach(golf_db.get_session_data(session_id))
+    """
+
+    CREATE_FEATURES_SQL = f'''
+        CREATE TABLE IF NOT EXISTS shot_features (
+            shot_id TEXT PRIMARY KEY,
+            schema_version INTEGER NOT NULL,
+            computed_at TEXT,
+            input_hash INTEGER,
+            {", ".join(f"{col} REAL" for col in FEATURE_COLUMNS)}
+        )
+    '''
+
+    CREATE_INDEXES_SQL = [
+        'CREATE INDEX IF NOT EXISTS idx_shot_features_version ON shot_features(schema_version)',
+    ]
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: SQLite database path (golf_db.SQLITE_DB_PATH if not given)
+        """
+        if db_path:
+            self.db_path = db_path
+        elif HAS_GOLF_DB:
+            self.db_path = golf_db.SQLITE_DB_PATH
+        else:
+            self.db_path = str(Path(__file__).parent.parent / 'golf_stats.db')
+        self._initialized = False
+
+    def _connect(self, create: bool = True) -> sqlite3.Connection:
+        """
+        Open the database (never creates it).
+
+        Args:
+            create: Create or migrate the features table (write paths only)
+
+        Raises:
+            sqlite3.OperationalError: If the database file does not exist
+        """
+        if db_version(self.db_path) is None:
+            raise sqlite3.OperationalError(f'unable to open database file: {self.db_path}')
+        conn = sqlite3.connect(self.db_path)
+        if create and not self._initialized:
+            self._init_tables(conn)
+            self._initialized = True
+        return conn
+
+    def _init_tables(self, conn: sqlite3.Connection) -> None:
+        """Create the features table and add columns new to this schema."""
+        conn.execute(self.CREATE_FEATURES_SQL)
+        for index_sql in self.CREATE_INDEXES_SQL:
+            conn.execute(index_sql)
+
+        existing = {row[1] for row in conn.execute('PRAGMA table_info(shot_features)')}
+        if 'input_hash' not in existing:
+            conn.execute('ALTER TABLE shot_features ADD COLUMN input_hash INTEGER')
+        for col in FEATURE_COLUMNS:
+            if col not in existing:
+                conn.execute(f'ALTER TABLE shot_features ADD COLUMN {col} REAL')
+        conn.commit()
+
+    def store(self, df: pd.DataFrame, features: Optional[pd.DataFrame] = None) -> int:
+        """
+        Compute (unless given) and upsert features for a batch of shots.
+
+        Args:
+            df: Shots with a shot_id column
+            features: Precomputed ``compute_derived_features(df)``
+
+        Returns:
+            Number of rows written
+        """
+        if df.empty or 'shot_id' not in df.columns:
+            return 0
+        if features is None:
+            features = compute_derived_features(df)
+
+        computed_at = datetime.now(timezone.utc).isoformat()
+        values = features[FEATURE_COLUMNS].astype(object).where(features[FEATURE_COLUMNS].notna(), None)
+        rows = [
+            (shot_id, FEATURE_SCHEMA_VERSION, computed_at, int(input_hash), *feature_row)
+            for shot_id, input_hash, feature_row in zip(
+                df['shot_id'], input_fingerprint(df), values.itertuples(index=False, name=None),
+            )
+        ]
+
+        columns = ['shot_id', 'schema_version', 'computed_at', 'input_hash', *FEATURE_COLUMNS]
+        sql = (
+            f'INSERT OR REPLACE INTO shot_features ({", ".join(columns)}) '
+            f'VALUES ({", ".join("?" * len(columns))})'
+        )
+        conn = self._connect()
+        try:
+            conn.executemany(sql, rows)
+            conn.commit()
+        finally:
+            conn.close()
+        return len(rows)
+
+    @staticmethod
+    def _input_select(conn: sqlite3.Connection) -> Optional[str]:
+        """Select list of shot_id and the input columns the shots table has."""
+        shot_columns = {row[1] for row in conn.execute('PRAGMA table_info(shots)')}
+        if 'shot_id' not in shot_columns:
+            return None
+        return ', '.join(['s.shot_id'] + [f's.{c}' for c in INPUT_COLUMNS if c in shot_columns])
+
+    def _stale_ids(self, conn: sqlite3.Connection, batch_size: int) -> List[str]:
+        """Shots with no features, an older schema version or changed inputs."""
+        select = self._input_select(conn)
+        if select is None:
+            return []
+        query = f'''
+            SELECT {select}, f.schema_version AS _version, f.input_hash AS _hash
+            FROM shots s
+            LEFT JOIN shot_features f ON f.shot_id = s.shot_id
+        '''
+        stale: List[str] = []
+        for chunk in pd.read_sql_query(query, conn, chunksize=batch_size):
+            changed = (
+                chunk['_version'].isna()
+                | (chunk['_version'] < FEATURE_SCHEMA_VERSION)
+                | (chunk['_hash'] != input_fingerprint(chunk))
+            )
+            stale.extend(chunk.loc[changed, 'shot_id'].astype(str))
+        return stale
+
+    def _read_shots(self, conn: sqlite3.Connection, shot_ids: List[str]) -> pd.DataFrame:
+        """Input columns of the given shots."""
+        select = self._input_select(conn)
+        parts = []
+        for start in range(0, len(shot_ids), _MAX_SQL_PARAMS):
+            chunk = shot_ids[start:start + _MAX_SQL_PARAMS]
+            placeholders = ', '.join('?' * len(chunk))
+            parts.append(pd.read_sql_query(
+                f'SELECT {select} FROM shots s WHERE s.shot_id IN ({placeholders})', conn, params=chunk,
+            ))
+        return pd.concat(parts, ignore_index=True)
+
+    def prune(self) -> int:
+        """
+        Drop features of shots that are no longer in the shots table.
+
+        Returns:
+            Number of rows removed
+        """
+        conn = self._connect()
+        try:
+            cursor = conn.execute('''
+                DELETE FROM shot_features
+                WHERE NOT EXISTS (SELECT 1 FROM shots s WHERE s.shot_id = shot_features.shot_id)
+            ''')
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def backfill(self, batch_size: int = 5000) -> int:
+        """
+        Compute features for every shot that is missing them or is stale.
+
+        Prunes rows of deleted shots, reads the input columns of every shot
+        to find new, outdated or changed ones, then recomputes only those,
+        ``batch_size`` at a time.
+
+        Args:
+            batch_size: Shots read and written per batch
+
+        Returns:
+            Number of shots (re)computed
+        """
+        self.prune()
+        conn = self._connect()
+        try:
+            stale = self._stale_ids(conn, batch_size)
+        finally:
+            conn.close()
+
+        written = 0
+        for start in range(0, len(stale), batch_size):
+            conn = self._connect()
+            try:
+                batch = self._read_shots(conn, stale[start:start + batch_size])
+            finally:
+                conn.close()
+            written += self.store(batch)
+        return written
+
+    def load(self, shot_ids: List[str]) -> pd.DataFrame:
+        """
+        Current-version features for the given shots.
+
+        Args:
+            shot_ids: Shot IDs to look up
+
+        Returns:
+            DataFrame indexed by shot_id with input_hash and FEATURE_COLUMNS
+            (missing or stale-version shots are absent; empty if the table
+            has not been created or migrated by backfill() yet)
+
+        Raises:
+            sqlite3.Error: If the database does not exist or cannot be read
+        """
+        wanted = ['shot_id', 'schema_version', 'input_hash', *FEATURE_COLUMNS]
+        columns = ', '.join(['shot_id', 'input_hash', *FEATURE_COLUMNS])
+        parts = []
+        conn = self._connect(create=False)
+        try:
+            existing = {row[1] for row in conn.execute('PRAGMA table_info(shot_features)')}
+            if not set(wanted) <= existing:
+                shot_ids = []
+            elif len(shot_ids) > _FULL_SCAN_THRESHOLD:
+                # One scan beats hundreds of IN (...) round trips
+                full = pd.read_sql_query(
+                    f'SELECT {columns} FROM shot_features WHERE schema_version = ?',
+                    conn, params=(FEATURE_SCHEMA_VERSION,),
+                )
+                parts.append(full[full['shot_id'].isin(shot_ids)])
+                shot_ids = []
+            for start in range(0, len(shot_ids), _MAX_SQL_PARAMS):
+                chunk = list(shot_ids[start:start + _MAX_SQL_PARAMS])
+                placeholders = ', '.join('?' * len(chunk))
+                parts.append(pd.read_sql_query(
+                    f'SELECT {columns} FROM shot_features '
+                    f'WHERE schema_version = ? AND shot_id IN ({placeholders})',
+                    conn, params=(FEATURE_SCHEMA_VERSION, *chunk),
+                ))
+        finally:
+            conn.close()
+        if not parts:
+            return pd.DataFrame(columns=['input_hash', *FEATURE_COLUMNS]).rename_axis('shot_id')
+        return pd.concat(parts, ignore_index=True).set_index('shot_id')
+
+    def attach(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Return a copy of ``df`` with FEATURE_COLUMNS from the store.
+
+        Read-only: shots missing from the store (or stored under an older
+        schema version or from different inputs) get their features
+        computed from ``df`` in memory; persisting them is left to
+        backfill(). Values already present in ``df``'s own feature columns
+        are kept; only missing ones are filled. Without a shot_id column,
+        or if the database is unavailable, features are computed in memory.
+
+        Args:
+            df: Shot data, e.g. from golf_db.get_session_data()
+
+        Returns:
+            DataFrame with derived feature columns
+        """
+        result = df.copy()
+
+        def fill(features: pd.DataFrame) -> pd.DataFrame:
+            for col in FEATURE_COLUMNS:
+                values = pd.Series(features[col].to_numpy(dtype=float), index=result.index)
+                if col in result.columns:
+                    values = pd.to_numeric(result[col], errors='coerce').fillna(values)
+                result[col] = values.astype(float)
+            return result
+
+        if df.empty:
+            for col in FEATURE_COLUMNS:
+                if col not in result.columns:
+                    result[col] = pd.Series(dtype=float)
+            return result
+        if 'shot_id' not in df.columns:
+            return fill(compute_derived_features(df))
+
+        ids = df['shot_id'].astype(str)
+        try:
+            stored = self.load(ids.unique().tolist())
+        except (sqlite3.Error, OSError):
+            return fill(compute_derived_features(df))
+
+        stored_hash = stored['input_hash'].reindex(ids.to_numpy()).to_numpy()
+        missing = pd.Series(stored_hash != input_fingerprint(df).to_numpy(), index=df.index)
+        if missing.any():
+            fresh = df[missing.to_numpy()]
+            fresh_features = compute_derived_features(fresh)
+            fresh_features.index = ids[missing].to_numpy()
+            fresh_features = fresh_features[~fresh_features.index.duplicated()]
+            stored = pd.concat([stored[~stored.index.isin(fresh_features.index)], fresh_features])
+
+        return fill(stored.reindex(ids.to_numpy()))
+
+
+_default_store: Optional[FeatureStore] = None
+
+
+def get_feature_store() -> FeatureStore:
+    """Get the shared FeatureStore for the app database."""
+    global _default_store
+    db_path = golf_db.SQLITE_DB_PATH if HAS_GOLF_DB else None
+    if _default_store is None or (db_path and _default_store.db_path != db_path):
+        _default_store = FeatureStore(db_path)
+    return _default_store
+
+
+def attach_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Add precomputed derived features to a shot frame (see FeatureStore.attach)."""
+    return get_feature_store().attach(df)
@@ -0,0 +1,509 @@
+"""
+Session Index — local retrieval of the sessions relevant to a question.
+
+To find history that bears on a question, the coaches otherwise list
+sessions and then query them one by one, a tool round trip each. This
+module keeps a small in-memory index with one vector per session, built
+with NumPy from the shots table (no network, no model):
+
+- a TF-IDF vector over the session's words: club names weighted by their
+  share of shots, session type, shot tags, and labels derived from its
+  Big 3 averages (fade/draw, open/closed face, path direction, centered
+  or off-center strikes);
+- a z-scored numeric profile (carry, speed, smash, launch, spin, face,
+  path, face-to-path, strike distance).
+
+``search()`` ranks sessions against a question's words (restricted to a
+"last N weeks" window when the question has one; most recent first when
+no word matches), ``similar()`` finds the sessions closest to a given one
+on both vectors, and ``context()`` renders the top hits as compact
+prompt lines. The index rebuilds itself when the database file changes.
+
+Usage:
+    from services.session_index import get_session_index
+
+    index = get_session_index()
+    for hit in index.search("when did my driver fade?", k=3):
+        print(hit.describe())
+    prompt = index.context("how were my wedges last month?") + "\\n\\n" + question
+"""
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from contextlib import closing
+from dataclasses import dataclass, field, replace
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import golf_db
+    HAS_GOLF_DB = True
+except ImportError:
+    HAS_GOLF_DB = False
+
+from services.shot_query import _table_columns, db_version
+from services.stats_cube import SENTINEL_VALUE, ZERO_IS_MISSING, parse_window
+
+DEFAULT_K = 5
+
+# Session-level averages kept in the numeric profile
+NUMERIC_FEATURES = [
+    'carry', 'ball_speed', 'smash', 'launch_angle', 'back_spin',
+    'face_angle', 'club_path', 'face_to_path', 'strike_distance',
+]
+
+# Averages shown per hit in prompt context
+CONTEXT_FEATURES = (
+    ('carry', 'carry', '{:.0f}'),
+    ('smash', 'smash', '{:.2f}'),
+    ('face_angle', 'face', '{:+.1f}°'),
+    ('club_path', 'path', '{:+.1f}°'),
+    ('strike_distance', 'strike', '{:.1f}'),
+)
+
+# Average degrees beyond which a session gets a shape label, and a strong one
+SHAPE_THRESHOLD = 1.5
+STRONG_SHAPE_THRESHOLD = 4.0
+
+# Strike distance quantiles (across sessions) for centered / off-center labels
+STRIKE_QUANTILES = (0.25, 0.75)
+
+# Share of the numeric profile (vs. words) in similar()
+NUMERIC_WEIGHT = 0.5
+
+_SOURCE_COLUMNS = [
+    'session_id', 'session_date', 'date_added', 'session_type', 'club', 'shot_tag',
+    'impact_x', 'impact_y',
+]
+
+_ALIASES = (
+    (r'\bpitching wedge\b', 'pw'),
+    (r'\bgap wedge\b', 'gw'),
+    (r'\bsand wedge\b', 'sw'),
+    (r'\blob wedge\b', 'lw'),
+    (r'\bwedges\b', 'wedge'),
+    (r'\birons\b', 'iron'),
+    (r'\bwoods\b', 'wood'),
+    (r'\bdrives\b', 'driver'),
+    (r'\bslices\b|\bslicing\b', 'slice'),
+    (r'\bhooks\b|\bhooking\b', 'hook'),
+    (r'\bfades\b|\bfading\b', 'fade'),
+    (r'\bdraws\b|\bdrawing\b', 'draw'),
+    (r'\bmishits?\b|\bthin\b|\bfat\b', 'offcenter'),
+    (r'\boff[- ]cent(?:er|re)\b', 'offcenter'),
+    (r'\bin[- ]to[- ]out\b', 'inout'),
+    (r'\bout[- ]to[- ]in\b|\bover the top\b', 'outin'),
+    (r'\bsolid\b|\bpure\b|\bsweet spot\b', 'centered'),
+)
+
+# Club categories added to a club's own words
+_CLUB_CATEGORIES = {'pw': 'wedge', 'gw': 'wedge', 'sw': 'wedge', 'lw': 'wedge', 'aw': 'wedge'}
+
+_STOPWORDS = frozenset(
+    'a an and any are at be been did do does for from had has have how i in is it last '
+    'me my of on or over past session sessions shot shots show tell than that the this '
+    'to was were what when where which with you your'.split()
+)
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Session ids are only read where the question introduces one ("session
+# 84512", "#84512"), never from bare numbers like "last 3 months" or "7 iron"
+_SESSION_ID_RE = re.compile(
+    r'\bsession\s+(?:id\s+)?#?([\w-]+)\b(?!\s*(?:day|week|month|year)s?\b)|#([\w-]+)'
+)
+
+# Derived labels as written in prompt context
+_LABEL_TEXT = {
+    'open': 'open face', 'closed': 'closed face',
+    'inout': 'in-to-out path', 'outin': 'out-to-in path',
+    'centered': 'centered strikes', 'offcenter': 'off-center strikes',
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased words with aliases applied and stopwords removed."""
+    text = str(text or '').lower()
+    for pattern, replacement in _ALIASES:
+        text = re.sub(pattern, replacement, text)
+    return [t for t in _TOKEN_RE.findall(text) if t not in _STOPWORDS]
+
+
+def _club_terms(club: str) -> List[str]:
+    """A club's words, its joined name ('7iron') and its category."""
+    words = tokenize(club)
+    terms = list(words)
+    if len(words) > 1:
+        terms.append(''.join(words))
+    terms += [_CLUB_CATEGORIES[w] for w in words if w in _CLUB_CATEGORIES]
+    return terms
+
+
+def _query_terms(question: str) -> List[str]:
+    """Question words plus joined neighbours, so '7 iron' matches '7iron'."""
+    words = tokenize(question)
+    return words + [a + b for a, b in zip(words, words[1:])]
+
+
+def _shape_labels(stats: Dict[str, float], strike_bounds: Tuple[float, float]) -> List[str]:
+    labels = []
+    face_to_path = stats.get('face_to_path')
+    if face_to_path is not None and not math.isnan(face_to_path):
+        if face_to_path > SHAPE_THRESHOLD:
+            labels.append('fade')
+            if face_to_path > STRONG_SHAPE_THRESHOLD:
+                labels.append('slice')
+        elif face_to_path < -SHAPE_THRESHOLD:
+            labels.append('draw')
+            if face_to_path < -STRONG_SHAPE_THRESHOLD:
+                labels.append('hook')
+        else:
+            labels.append('straight')
+    face = stats.get('face_angle')
+    if face is not None and not math.isnan(face) and abs(face) > SHAPE_THRESHOLD:
+        labels.append('open' if face > 0 else 'closed')
+    path = stats.get('club_path')
+    if path is not None and not math.isnan(path) and abs(path) > SHAPE_THRESHOLD:
+        labels.append('inout' if path > 0 else 'outin')
+    strike = stats.get('strike_distance')
+    if strike is not None and not math.isnan(strike):
+        low, high = strike_bounds
+        if strike <= low:
+            labels.append('centered')
+        elif strike >= high:
+            labels.append('offcenter')
+    return labels
+
+
+@dataclass
+class SessionHit:
+    """One retrieved session with its summary."""
+    session_id: str
+    score: float
+    date: Optional[str]
+    session_type: Optional[str]
+    shots: int
+    clubs: Dict[str, float]  # club -> share of shots, largest first
+    stats: Dict[str, float] = field(default_factory=dict)
+    tags: List[str] = field(default_factory=list)
+    labels: List[str] = field(default_factory=list)
+
+    def describe(self) -> str:
+        """One compact line for a prompt."""
+        head = f"{self.session_id} ({self.date or 'undated'}"
+        head += f", {self.session_type})" if self.session_type else ")"
+        clubs = ', '.join(f"{club} {share:.0%}" for club, share in list(self.clubs.items())[:3])
+        parts = [f"{head}: {self.shots} shots", clubs]
+        numbers = [
+            f"{label} {fmt.format(self.stats[key])}"
+            for key, label, fmt in CONTEXT_FEATURES
+            if self.stats.get(key) is not None and not math.isnan(self.stats[key])
+        ]
+        if numbers:
+            parts.append(' '.join(numbers))
+        if self.labels:
+            parts.append(', '.join(_LABEL_TEXT.get(label, label) for label in self.labels))
+        if self.tags:
+            parts.append('tags ' + ', '.join(self.tags[:3]))
+        return '; '.join(p for p in parts if p)
+
+    def to_dict(self) -> Dict:
+        return {
+            'session_id': self.session_id,
+            'score': round(self.score, 3),
+            'date': self.date,
+            'session_type': self.session_type,
+            'shots': self.shots,
+            'clubs': {club: round(share, 2) for club, share in self.clubs.items()},
+            'stats': {k: round(v, 2) for k, v in self.stats.items() if not math.isnan(v)},
+            'tags': self.tags,
+            'labels': self.labels,
+        }
+
+
+@dataclass(frozen=True)
+class _IndexSnapshot:
+    """One build of the index; replaced whole, never modified."""
+    version: Optional[Tuple] = None
+    sessions: Tuple[SessionHit, ...] = ()
+    dates: np.ndarray = field(default_factory=lambda: np.array([], dtype=object))
+    positions: Dict[str, int] = field(default_factory=dict)  # session_id -> row
+    vocabulary: Dict[str, int] = field(default_factory=dict)
+    idf: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    text: np.ndarray = field(default_factory=lambda: np.zeros((0, 0)))
+    numeric: np.ndarray = field(default_factory=lambda: np.zeros((0, len(NUMERIC_FEATURES))))
+
+
+class SessionIndex:
+    """
+    In-memory TF-IDF and numeric index over sessions.
+
+    Each build produces a new snapshot that is swapped in with one
+    assignment; a query reads the snapshot once, so a rebuild on another
+    thread never mixes two builds in one answer.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the index.
+
+        Args:
+            db_path: SQLite database path (defaults to golf_db's database)
+        """
+        if db_path is None:
+            if HAS_GOLF_DB:
+                db_path = golf_db.SQLITE_DB_PATH
+            else:
+                db_path = str(Path(__file__).parent.parent / 'golf_stats.db')
+        self.db_path = db_path
+        self._lock = threading.Lock()  # one build at a time
+        self._snapshot = _IndexSnapshot()
+
+    def available(self) -> bool:
+        """Whether the database exists."""
+        return db_version(self.db_path) is not None
+
+    def __len__(self) -> int:
+        return len(self._current().sessions)
+
+    # ------------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------------
+
+    def _load_shots(self) -> pd.DataFrame:
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            available = set(_table_columns(conn))
+            columns = [c for c in _SOURCE_COLUMNS + NUMERIC_FEATURES if c in available]
+            if 'session_id' not in columns:
+                return pd.DataFrame()
+            select = ', '.join(f'"{c}"' for c in columns)
+            return pd.read_sql_query(f'SELECT {select} FROM shots WHERE session_id IS NOT NULL', conn)
+
+    @staticmethod
+    def _clean(df: pd.DataFrame) -> pd.DataFrame:
+        df = df.copy()
+        df['session_id'] = df['session_id'].astype(str)
+        for column in NUMERIC_FEATURES + ['impact_x', 'impact_y']:
+            if column not in df.columns:
+                df[column] = np.nan
+            values = pd.to_numeric(df[column], errors='coerce').replace(SENTINEL_VALUE, np.nan)
+            if column in ZERO_IS_MISSING:
+                values = values.replace(0, np.nan)
+            df[column] = values.astype(float)
+        df['face_to_path'] = df['face_to_path'].fillna(df['face_angle'] - df['club_path'])
+        df['strike_distance'] = df['strike_distance'].fillna(np.hypot(df['impact_x'], df['impact_y']))
+        dates = df['session_date'] if 'session_date' in df.columns else pd.Series(np.nan, index=df.index)
+        if 'date_added' in df.columns:
+            dates = dates.fillna(df['date_added'])
+        df['_date'] = dates.astype('string').str[:10]
+        return df
+
+    def _build(self, version: Tuple) -> _IndexSnapshot:
+        shots = self._load_shots()
+        sessions: List[SessionHit] = []
+        documents: List[Counter] = []
+        if shots.empty:
+            return _IndexSnapshot(version=version)
+
+        shots = self._clean(shots)
+        for column in ('club', 'session_type', 'shot_tag'):
+            if column not in shots.columns:
+                shots[column] = None
+        grouped = shots.groupby('session_id', sort=False)
+        means = grouped[NUMERIC_FEATURES].mean()
+        sizes = grouped.size()
+        latest = grouped['_date'].max()
+        strike = means['strike_distance'].dropna()
+        strike_bounds = (
+            tuple(strike.quantile(list(STRIKE_QUANTILES))) if len(strike) >= 4 else (-np.inf, np.inf)
+        )
+
+        # Club mix, most common type and tags per session, each in one pass
+        clubs_by_session: Dict[str, Dict[str, float]] = {}
+        club_counts = shots.groupby(['session_id', 'club']).size().sort_values(ascending=False, kind='stable')
+        for (session_id, club), n in club_counts.items():
+            clubs_by_session.setdefault(session_id, {})[str(club)] = n / sizes[session_id]
+        type_counts = shots.groupby(['session_id', 'session_type']).size().sort_values(ascending=False, kind='stable')
+        type_by_session = {}
+        for (session_id, session_type), _ in type_counts.items():
+            type_by_session.setdefault(session_id, str(session_type))
+        tags_by_session = shots.dropna(subset=['shot_tag']).groupby('session_id')['shot_tag'].unique()
+
+        for session_id, row in means.iterrows():
+            stats = {k: float(v) for k, v in row.items()}
+            clubs = clubs_by_session.get(session_id, {})
+            session_type = type_by_session.get(session_id)
+            tags = sorted(map(str, tags_by_session.get(session_id, [])))
+            date_value = latest.get(session_id)
+            labels = _shape_labels(stats, strike_bounds)
+
+            terms: Counter = Counter()
+            for club, share in clubs.items():
+                for term in _club_terms(club):
+                    terms[term] += share
+            for term in tokenize(session_type or '') + [t for tag in tags for t in tokenize(tag)] + labels:
+                terms[term] += 1.0
+
+            sessions.append(SessionHit(
+                session_id=str(session_id), score=0.0,
+                date=None if pd.isna(date_value) else str(date_value),
+                session_type=session_type, shots=int(sizes[session_id]), clubs=clubs,
+                stats=stats, tags=tags, labels=labels,
+            ))
+            documents.append(terms)
+
+        vocabulary = {term: i for i, term in enumerate(sorted({t for doc in documents for t in doc}))}
+        tf = np.zeros((len(documents), len(vocabulary)))
+        for row, doc in enumerate(documents):
+            for term, weight in doc.items():
+                tf[row, vocabulary[term]] = weight
+        df_counts = (tf > 0).sum(axis=0)
+        idf = np.log((1 + len(documents)) / (1 + df_counts)) + 1
+        text = tf * idf
+        norms = np.linalg.norm(text, axis=1, keepdims=True)
+        text = np.divide(text, norms, out=np.zeros_like(text), where=norms > 0)
+
+        # z-scores; unmeasured features count as average
+        spread = means.std(ddof=0).replace(0, np.nan)
+        numeric = ((means - means.mean()) / spread).fillna(0).to_numpy(dtype=float)
+        norms = np.linalg.norm(numeric, axis=1, keepdims=True)
+        numeric = np.divide(numeric, norms, out=np.zeros_like(numeric), where=norms > 0)
+
+        return _IndexSnapshot(
+            version=version,
+            sessions=tuple(sessions),
+            dates=np.array([s.date or '' for s in sessions], dtype=object),
+            positions={s.session_id: i for i, s in enumerate(sessions)},
+            vocabulary=vocabulary, idf=idf, text=text, numeric=numeric,
+        )
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Rebuild if the database changed since the last build.
+
+        Returns:
+            True if the index was rebuilt
+        """
+        version = db_version(self.db_path)
+        if version is None:
+            return False
+        with self._lock:
+            if not force and version == self._snapshot.version:
+                return False
+            self._snapshot = self._build(version)
+            return True
+
+    def _current(self) -> _IndexSnapshot:
+        """The snapshot to answer from, rebuilt first if the database changed."""
+        self.refresh()
+        return self._snapshot
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _hits(snapshot: _IndexSnapshot, scores: np.ndarray, candidates: np.ndarray, k: int) -> List[SessionHit]:
+        # Highest score first, most recent first among equals
+        order = sorted(candidates, key=lambda i: snapshot.dates[i], reverse=True)
+        order = sorted(order, key=lambda i: -round(float(scores[i]), 6))
+        return [replace(snapshot.sessions[i], score=float(scores[i])) for i in order[:k]]
+
+    def search(
+        self,
+        question: str,
+        k: int = DEFAULT_K,
+        since: Optional[date] = None,
+    ) -> List[SessionHit]:
+        """
+        The sessions most relevant to a question.
+
+        A session id introduced in the question ("session 84512" or
+        "#84512") returns that session and the ones most similar to it.
+        Otherwise sessions are ranked by
+        TF-IDF similarity to the question's words; if none of them is
+        known, the most recent sessions are returned (score 0).
+
+        Args:
+            question: Free-text question
+            k: Number of sessions
+            since: Only sessions on or after this date (default: parsed
+                from phrases like "last 3 weeks" in the question)
+        """
+        snapshot = self._current()
+        if not snapshot.sessions or k <= 0:
+            return []
+
+        ids = {session_id.lower(): i for session_id, i in snapshot.positions.items()}
+        mentioned = [
+            ids[t] for pair in _SESSION_ID_RE.findall(str(question).lower()) for t in pair if t in ids
+        ]
+        if mentioned:
+            i = mentioned[0]
+            return [replace(snapshot.sessions[i], score=1.0)] + self._similar(snapshot, i, k - 1)
+
+        since = since or parse_window(question)
+        candidates = np.arange(len(snapshot.sessions))
+        if since is not None:
+            candidates = candidates[snapshot.dates[candidates] >= since.isoformat()]
+
+        query = np.zeros(len(snapshot.vocabulary))
+        for term, count in Counter(_query_terms(question)).items():
+            if term in snapshot.vocabulary:
+                query[snapshot.vocabulary[term]] += count
+        query *= snapshot.idf
+        norm = np.linalg.norm(query)
+        scores = snapshot.text @ (query / norm) if norm > 0 else np.zeros(len(snapshot.sessions))
+        return self._hits(snapshot, scores, candidates, k)
+
+    def similar(self, session_id: str, k: int = DEFAULT_K) -> List[SessionHit]:
+        """Sessions closest to ``session_id`` on words and numeric profile (itself excluded)."""
+        snapshot = self._current()
+        i = snapshot.positions.get(str(session_id))
+        if i is None:
+            return []
+        return self._similar(snapshot, i, k)
+
+    def _similar(self, snapshot: _IndexSnapshot, i: int, k: int) -> List[SessionHit]:
+        if k <= 0:
+            return []
+        scores = (
+            (1 - NUMERIC_WEIGHT) * (snapshot.text @ snapshot.text[i])
+            + NUMERIC_WEIGHT * (snapshot.numeric @ snapshot.numeric[i])
+        )
+        candidates = np.array([j for j in range(len(snapshot.sessions)) if j != i], dtype=int)
+        return self._hits(snapshot, scores, candidates, k)
+
+    def context(self, question: str, k: int = DEFAULT_K) -> str:
+        """
+        Prompt lines describing the sessions most relevant to a question.
+
+        Returns:
+            '' when there are no sessions
+        """
+        hits = self.search(question, k=k)
+        if not hits:
+            return ''
+        matched = any(hit.score > 0 for hit in hits)
+        title = 'Relevant sessions' if matched else 'Most recent sessions'
+        lines = [f"{title} (retrieved locally; query them for detail):"]
+        lines += [f"- {hit.describe()}" for hit in hits]
+        return '\n'.join(lines)
+
+
+_default_index: Optional[SessionIndex] = None
+
+
+def get_session_index() -> SessionIndex:
+    """Get the shared SessionIndex for the app database."""
+    global _default_index
+    db_path = golf_db.SQLITE_DB_PATH if HAS_GOLF_DB else None
+    if _default_index is None or (db_path and _default_index.db_path != db_path):
+        _default_index = SessionIndex(db_path)
+    return _default_index
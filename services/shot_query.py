@@ -0,0 +1,220 @@
+"""
+Shot Query — filtered, limit-aware reads of the shots table.
+
+The coaches used to load every shot with ``golf_db.get_all_shots()`` and
+then filter by session, club, tag or session type in pandas, only to keep
+the first ``limit`` rows. ``query_shots()`` pushes those predicates, the
+column list and the LIMIT into SQL instead; ``golf_db.query_shots()``
+exposes it for the app database.
+
+``ShotQueryCache`` sits on top for one conversation: repeated function
+calls in a chat turn reuse the previous result until the database file
+changes or the conversation is reset.
+
+Usage:
+    import golf_db
+    df = golf_db.query_shots(club='Driver', columns=['carry', 'smash'], limit=50)
+
+    cache = ShotQueryCache()
+    df = cache.query_shots(session_id='123', club='7 Iron')
+"""
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import closing
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+
+try:
+    import golf_db
+    HAS_GOLF_DB = True
+except ImportError:
+    HAS_GOLF_DB = False
+
+# Filters accepted by query_shots(); a filter on a column the table lacks
+# is ignored, matching the old pandas behaviour
+FILTER_COLUMNS = ('session_id', 'club', 'shot_tag', 'session_type')
+
+DEFAULT_CACHE_SIZE = 32
+
+
+def db_version(db_path) -> Optional[Tuple]:
+    """
+    Cheap change marker for a SQLite file: (mtime, size) of the database
+    and of its WAL. None if the file cannot be stat'ed.
+    """
+    if not isinstance(db_path, (str, os.PathLike)):
+        return None
+    version = []
+    for suffix in ('', '-wal'):
+        try:
+            stat = os.stat(f"{os.fspath(db_path)}{suffix}")
+        except OSError:
+            if suffix:
+                continue
+            return None
+        version.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(version)
+
+
+def _table_columns(conn: sqlite3.Connection) -> list:
+    return [row[1] for row in conn.execute('PRAGMA table_info(shots)')]
+
+
+def query_shots(
+    db_path,
+    session_id: Optional[str] = None,
+    club: Optional[str] = None,
+    shot_tag: Optional[str] = None,
+    session_type: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+    limit: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Read matching shots with the filtering done by SQLite.
+
+    Args:
+        db_path: SQLite database path
+        session_id: Only this session
+        club: Only this club (case-insensitive)
+        shot_tag: Only shots with this tag
+        session_type: Only shots of this session type
+        columns: Columns to return (unknown names are dropped); all if None
+        limit: Maximum rows, in table order
+
+    Returns:
+        DataFrame of matching shots
+
+    Raises:
+        sqlite3.Error: If the database file does not exist, or it or the
+            shots table cannot be read
+    """
+    filters = {'session_id': session_id, 'club': club, 'shot_tag': shot_tag, 'session_type': session_type}
+    # Connecting would create an empty database file in its place
+    if db_version(db_path) is None:
+        raise sqlite3.OperationalError(f'unable to open database file: {db_path}')
+    with closing(sqlite3.connect(db_path)) as conn:
+        available = _table_columns(conn)
+        if not available:
+            raise sqlite3.OperationalError('no such table: shots')
+
+        if columns is None:
+            select = '*'
+        else:
+            wanted = [c for c in dict.fromkeys(columns) if c in available]
+            if not wanted:
+                return pd.DataFrame()
+            select = ', '.join(f'"{c}"' for c in wanted)
+
+        where, params = [], []
+        for column, value in filters.items():
+            if value is None or column not in available:
+                continue
+            collate = ' COLLATE NOCASE' if column == 'club' else ''
+            where.append(f'"{column}" = ?{collate}')
+            params.append(value)
+
+        sql = f'SELECT {select} FROM shots'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY rowid'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+        return pd.read_sql_query(sql, conn, params=params)
+
+
+def filter_frame(
+    df: pd.DataFrame,
+    session_id: Optional[str] = None,
+    club: Optional[str] = None,
+    shot_tag: Optional[str] = None,
+    session_type: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+    limit: Optional[int] = None,
+) -> pd.DataFrame:
+    """The same filters as query_shots() applied to an in-memory frame."""
+    if session_id is not None and 'session_id' in df.columns:
+        df = df[df['session_id'].astype(str) == str(session_id)]
+    if club is not None and 'club' in df.columns:
+        df = df[df['club'].astype(str).str.lower() == club.lower()]
+    if shot_tag is not None and 'shot_tag' in df.columns:
+        df = df[df['shot_tag'] == shot_tag]
+    if session_type is not None and 'session_type' in df.columns:
+        df = df[df['session_type'] == session_type]
+    if columns is not None:
+        df = df[[c for c in dict.fromkeys(columns) if c in df.columns]]
+    if limit is not None:
+        df = df.head(int(limit))
+    return df
+
+
+class ShotQueryCache:
+    """
+    Small LRU cache of query_shots() results for one conversation.
+
+    Entries are keyed by the query arguments and dropped as soon as the
+    database file changes. Returned frames are shared between hits, so
+    callers must not modify them in place.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE, query_fn=None, db_path=None):
+        """
+        Args:
+            maxsize: Maximum cached results
+            query_fn: Query function taking query_shots() keyword filters
+                (defaults to golf_db.query_shots)
+            db_path: Database whose changes invalidate the cache
+                (defaults to golf_db.SQLITE_DB_PATH)
+        """
+        self.maxsize = maxsize
+        self._query_fn = query_fn
+        self._db_path = db_path
+        self._entries: 'OrderedDict[Tuple, pd.DataFrame]' = OrderedDict()
+        self._version: Optional[Tuple] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _current_version(self) -> Optional[Tuple]:
+        db_path = self._db_path
+        if db_path is None and HAS_GOLF_DB:
+            db_path = getattr(golf_db, 'SQLITE_DB_PATH', None)
+        return db_version(db_path)
+
+    @staticmethod
+    def _key(filters: Dict[str, Any]) -> Tuple:
+        return tuple(sorted(
+            (name, tuple(value) if isinstance(value, (list, tuple)) else value)
+            for name, value in filters.items()
+        ))
+
+    def query_shots(self, **filters) -> pd.DataFrame:
+        """Cached query_shots() with the same keyword filters."""
+        key = self._key(filters)
+        version = self._current_version()
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        query_fn = self._query_fn or golf_db.query_shots
+        df = query_fn(**filters)
+
+        with self._lock:
+            self._entries[key] = df
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return df
+
+    def clear(self) -> None:
+        """Forget all cached results (e.g. when a conversation resets)."""
+        with self._lock:
+            self._entries.clear()
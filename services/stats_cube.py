@@ -0,0 +1,650 @@
+"""
+Stats Cube — pre-aggregated club × session × metric statistics.
+
+The coaches and agent tools answer questions like "average carry by club"
+or "how is my smash trending" by recomputing means, deviations and
+quantiles from every raw shot. This module keeps one cell per
+(club, session, metric) in a ``shot_cube`` table holding count, sum, sum
+of squares, min, max and a mergeable quantile sketch, so any roll-up
+(by club, by session, over a date range) merges cells instead of
+scanning shots: O(cells), independent of shot count.
+
+Cells are maintained per session. ``refresh()`` compares each session's
+shot count, newest rowid and a hash of the columns the cells are built
+from with what the cube last saw, and rebuilds only sessions that changed
+(new imports, deletes, and in-place edits such as club renames or tag
+updates), so it runs after every import and lazily before queries when
+the database file changed.
+
+Values that mean "not measured" are ignored: NaN, the 99999 sentinel, and
+0 for metrics that cannot really be zero (distances, speeds, spin, launch).
+
+Usage:
+    from services.stats_cube import get_stats_cube
+
+    cube = get_stats_cube()
+    cube.refresh()                       # after an import
+    by_club = cube.stats(['carry'], by=('club',), since='2025-01-01')
+    trend = cube.stats(['carry'], by=('session_id',), clubs=['Driver'])
+"""
+import json
+import math
+import re
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import golf_db
+    HAS_GOLF_DB = True
+except ImportError:
+    HAS_GOLF_DB = False
+
+from services.shot_query import db_version
+
+# Bump when cell contents change meaning; every session is rebuilt
+CUBE_SCHEMA_VERSION = 1
+
+CUBE_METRICS = [
+    'carry', 'total', 'ball_speed', 'club_speed', 'smash',
+    'launch_angle', 'back_spin', 'side_spin', 'face_angle', 'club_path',
+    'attack_angle', 'dynamic_loft', 'impact_x', 'impact_y', 'side_distance',
+]
+
+# Metrics where 0 means "not measured" rather than a real reading
+ZERO_IS_MISSING = {'carry', 'total', 'ball_speed', 'club_speed', 'smash', 'launch_angle', 'back_spin'}
+
+# Launch monitor placeholder for a failed reading
+SENTINEL_VALUE = 99999
+
+# Pseudo-metric counting every shot in a cell, measured or not
+SHOTS_METRIC = '_shots'
+
+DEFAULT_QUANTILES = (0.1, 0.5, 0.9)
+
+# SQLite's default limit on bound parameters per statement
+_MAX_SQL_PARAMS = 900
+
+DateLike = Union[str, date, datetime]
+
+# Date columns a session's cells are stamped from
+_DATE_COLUMNS = ('session_date', 'date_added')
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with bounded relative error.
+
+    Values fall into logarithmic buckets (DDSketch-style): bucket ``i``
+    covers ``(gamma**(i-1), gamma**i]`` with ``gamma = (1+a)/(1-a)``, so
+    any quantile is within ``a`` (relative) of an exact one. Merging two
+    sketches adds their bucket counts, which makes per-cell sketches
+    combinable into per-club or per-month answers.
+    """
+
+    # Magnitudes below this count as zero
+    MIN_MAGNITUDE = 1e-9
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.positive.values()) + sum(self.negative.values())
+
+    def buckets(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized bucket assignment.
+
+        Returns:
+            (sign, key) arrays: sign is -1, 0 (zero bucket) or 1 and key
+            the logarithmic bucket of the magnitude
+        """
+        magnitudes = np.abs(values)
+        sign = np.where(magnitudes < self.MIN_MAGNITUDE, 0, np.sign(values)).astype(np.int8)
+        with np.errstate(divide='ignore'):
+            keys = np.ceil(np.log(np.maximum(magnitudes, self.MIN_MAGNITUDE)) / self._log_gamma)
+        return sign, np.where(sign == 0, 0, keys).astype(np.int64)
+
+    def add_counts(self, sign: int, key: int, n: int) -> None:
+        """Add ``n`` values to one bucket (as returned by buckets())."""
+        if sign > 0:
+            self.positive[key] = self.positive.get(key, 0) + n
+        elif sign < 0:
+            self.negative[key] = self.negative.get(key, 0) + n
+        else:
+            self.zero_count += n
+
+    def add(self, values) -> 'QuantileSketch':
+        """Add an array of values (non-finite values are skipped)."""
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        sign, keys = self.buckets(values)
+        pairs, counts = np.unique(np.stack([sign.astype(np.int64), keys]), axis=1, return_counts=True)
+        for (sg, key), n in zip(pairs.T.tolist(), counts.tolist()):
+            self.add_counts(sg, key, n)
+        return self
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Add another sketch's counts into this one (same accuracy)."""
+        if not math.isclose(other.gamma, self.gamma):
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for key, n in other.positive.items():
+            self.positive[key] = self.positive.get(key, 0) + n
+        for key, n in other.negative.items():
+            self.negative[key] = self.negative.get(key, 0) + n
+        self.zero_count += other.zero_count
+        return self
+
+    def _bucket_value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate q-quantile (0..1), or None for an empty sketch."""
+        total = self.count
+        if total == 0:
+            return None
+        rank = q * (total - 1)
+        seen = 0
+        # Most negative first: large magnitudes of the negative store
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._bucket_value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._bucket_value(key)
+        return self._bucket_value(max(self.positive)) if self.positive else 0.0
+
+    def to_json(self) -> str:
+        return json.dumps({
+            'a': self.relative_accuracy,
+            'z': self.zero_count,
+            'p': sorted(self.positive.items()),
+            'n': sorted(self.negative.items()),
+        }, separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, text: str) -> 'QuantileSketch':
+        data = json.loads(text)
+        sketch = cls(data['a'])
+        sketch.zero_count = data['z']
+        sketch.positive = {int(k): int(v) for k, v in data['p']}
+        sketch.negative = {int(k): int(v) for k, v in data['n']}
+        return sketch
+
+
+def _as_date_text(value: Optional[DateLike]) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _sql_value(value):
+    """Plain Python value SQLite can bind (NaN -> NULL, numpy -> builtin)."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def valid_values(series: pd.Series, metric: str) -> pd.Series:
+    """Numeric readings of ``metric`` with missing-value markers removed."""
+    values = pd.to_numeric(series, errors='coerce')
+    mask = values.notna() & (values != SENTINEL_VALUE)
+    if metric in ZERO_IS_MISSING:
+        mask &= values != 0
+    return values[mask]
+
+
+def _group_sketches(keys: pd.DataFrame, values: np.ndarray) -> pd.Series:
+    """One sketch (as JSON) per (club, session_id) group, bucketed in one pass."""
+    sign, bucket = QuantileSketch().buckets(values)
+    counts = keys.assign(sign=sign, bucket=bucket).value_counts(sort=False).sort_index()
+    sketches: Dict[Tuple, QuantileSketch] = {}
+    for (club, session_id, sg, key), n in counts.items():
+        group = (club, session_id)
+        if group not in sketches:
+            sketches[group] = QuantileSketch()
+        sketches[group].add_counts(sg, key, n)
+    return pd.Series({group: sketch.to_json() for group, sketch in sketches.items()})
+
+
+def compute_cells(df: pd.DataFrame, metrics: Sequence[str] = CUBE_METRICS) -> pd.DataFrame:
+    """
+    Aggregate shots into cube cells.
+
+    Args:
+        df: Shots with club, session_id, date columns and metric columns
+        metrics: Metrics to aggregate (missing columns are skipped)
+
+    Returns:
+        DataFrame with club, session_id, metric, session_date, n, total,
+        total_sq, min, max and sketch (JSON) per cell
+    """
+    columns = ['club', 'session_id', 'metric', 'session_date', 'n', 'total', 'total_sq', 'min', 'max', 'sketch']
+    if df.empty or 'club' not in df.columns or 'session_id' not in df.columns:
+        return pd.DataFrame(columns=columns)
+
+    df = df[df['club'].notna() & df['session_id'].notna()]
+    keys = df[['club', 'session_id']].astype(str)
+    dates = df['session_date'] if 'session_date' in df.columns else pd.Series(np.nan, index=df.index)
+    if 'date_added' in df.columns:
+        dates = dates.fillna(df['date_added'])
+    session_dates = dates.astype(object).where(dates.notna(), None).groupby(keys['session_id']).max()
+
+    frames = []
+    shots = keys.groupby(['club', 'session_id']).size().rename('n').reset_index()
+    shots['metric'] = SHOTS_METRIC
+    frames.append(shots)
+
+    for metric in metrics:
+        if metric not in df.columns:
+            continue
+        values = valid_values(df[metric], metric)
+        if values.empty:
+            continue
+        frame = keys.loc[values.index].assign(value=values.to_numpy(dtype=float))
+        frame['value_sq'] = frame['value'] ** 2
+        grouped = frame.groupby(['club', 'session_id'])
+        agg = grouped['value'].agg(n='count', total='sum', min='min', max='max')
+        agg['total_sq'] = grouped['value_sq'].sum()
+        agg['sketch'] = _group_sketches(frame[['club', 'session_id']], frame['value'].to_numpy())
+        agg = agg.reset_index()
+        agg['metric'] = metric
+        frames.append(agg)
+
+    cells = pd.concat(frames, ignore_index=True)
+    cells['session_date'] = cells['session_id'].map(session_dates)
+    return cells.reindex(columns=columns)
+
+
+class StatsCube:
+    """
+    Club × session × metric aggregates stored next to the shots table.
+
+    Usage:
+        cube = StatsCube()
+        cube.refresh()
+        cube.stats(['carry', 'smash'], by=('club',))
+    """
+
+    CREATE_CUBE_SQL = '''
+        CREATE TABLE IF NOT EXISTS shot_cube (
+            club TEXT NOT NULL,
+            session_id TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            session_date TEXT,
+            n INTEGER NOT NULL,
+            total REAL,
+            total_sq REAL,
+            min REAL,
+            max REAL,
+            sketch TEXT,
+            PRIMARY KEY (club, session_id, metric)
+        )
+    '''
+
+    CREATE_SESSIONS_SQL = '''
+        CREATE TABLE IF NOT EXISTS shot_cube_sessions (
+            session_id TEXT PRIMARY KEY,
+            shot_count INTEGER NOT NULL,
+            max_rowid INTEGER NOT NULL,
+            content_hash INTEGER,
+            schema_version INTEGER NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    '''
+
+    CREATE_INDEX_SQL = (
+        'CREATE INDEX IF NOT EXISTS idx_shot_cube_metric_date ON shot_cube (metric, session_date)',
+        'CREATE INDEX IF NOT EXISTS idx_shot_cube_session ON shot_cube (session_id)',
+    )
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the cube.
+
+        Args:
+            db_path: SQLite database path (defaults to golf_db's database)
+        """
+        if db_path is None:
+            if HAS_GOLF_DB:
+                db_path = golf_db.SQLITE_DB_PATH
+            else:
+                db_path = str(Path(__file__).parent.parent / 'golf_stats.db')
+        self.db_path = db_path
+        self._initialized = False
+        self._checked_version: Optional[Tuple] = None
+        # One refresh at a time; concurrent readers wait for it
+        self._refresh_lock = threading.Lock()
+
+    def available(self) -> bool:
+        """Whether the database exists (the cube never creates it)."""
+        return db_version(self.db_path) is not None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        if not self._initialized:
+            conn.execute(self.CREATE_CUBE_SQL)
+            conn.execute(self.CREATE_SESSIONS_SQL)
+            existing = {row[1] for row in conn.execute('PRAGMA table_info(shot_cube_sessions)')}
+            if 'content_hash' not in existing:
+                # Rows from before the column existed compare as changed
+                conn.execute('ALTER TABLE shot_cube_sessions ADD COLUMN content_hash INTEGER')
+            for sql in self.CREATE_INDEX_SQL:
+                conn.execute(sql)
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    @staticmethod
+    def _fingerprints(
+        conn: sqlite3.Connection,
+        session_ids: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Per-session change markers: shot count, newest rowid and a content
+        hash.
+
+        The hash covers each club's shot count, metric totals and latest
+        dates within the session, so renaming a club or editing a value
+        changes it. SQLite does the aggregation; pandas only hashes one
+        row per (session, club).
+
+        Args:
+            conn: Connection from _connect()
+            session_ids: Restrict to these sessions (all if None)
+        """
+        available = {row[1] for row in conn.execute('PRAGMA table_info(shots)')}
+        if 'club' not in available:
+            return pd.DataFrame(columns=['session_id', 'shot_count', 'max_rowid', 'content_hash'])
+        aggregates = [f'MAX({c}) AS "{c}"' for c in _DATE_COLUMNS if c in available]
+        aggregates += [f'total({m}) AS "{m}"' for m in CUBE_METRICS if m in available]
+        where, params = 'session_id IS NOT NULL', []
+        if session_ids is not None:
+            where = f'CAST(session_id AS TEXT) IN ({",".join("?" * len(session_ids))})'
+            params = list(session_ids)
+        select = ', '.join([
+            'CAST(session_id AS TEXT) AS session_id', 'club', 'COUNT(*) AS shot_count',
+            'MAX(rowid) AS max_rowid', *aggregates,
+        ])
+        groups = pd.read_sql_query(
+            f'SELECT {select} FROM shots WHERE {where} GROUP BY CAST(session_id AS TEXT), club',
+            conn, params=params,
+        )
+        content = groups.drop(columns=['session_id', 'max_rowid'])
+        groups['content_hash'] = pd.util.hash_pandas_object(content, index=False).to_numpy()
+        sessions = groups.groupby('session_id', sort=False).agg(
+            shot_count=('shot_count', 'sum'),
+            max_rowid=('max_rowid', 'max'),
+            content_hash=('content_hash', 'sum'),
+        )
+        # Kept below 2**52 so it survives pandas reading a nullable column as float
+        hashes = sessions['content_hash'].to_numpy(dtype=np.uint64) >> np.uint64(12)
+        sessions['content_hash'] = hashes.astype(np.int64)
+        return sessions.reset_index()
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def stale_sessions(self) -> Tuple[List[str], List[str]]:
+        """
+        Sessions whose cells are out of date.
+
+        Returns:
+            (changed, removed): sessions to rebuild and sessions no longer
+            in the shots table
+        """
+        with closing(self._connect()) as conn:
+            current = self._fingerprints(conn)
+            seen = pd.read_sql_query(
+                'SELECT session_id, shot_count, max_rowid, content_hash FROM shot_cube_sessions '
+                'WHERE schema_version = ?',
+                conn, params=(CUBE_SCHEMA_VERSION,),
+            )
+            all_seen = {row[0] for row in conn.execute('SELECT session_id FROM shot_cube_sessions')}
+
+        merged = current.merge(seen, on='session_id', how='left', suffixes=('', '_seen'))
+        changed = merged[
+            (merged['shot_count'] != merged['shot_count_seen'])
+            | (merged['max_rowid'] != merged['max_rowid_seen'])
+            | (merged['content_hash'] != merged['content_hash_seen'])
+        ]['session_id'].tolist()
+        removed = sorted(all_seen - set(current['session_id']))
+        return changed, removed
+
+    def refresh_sessions(self, session_ids: Iterable[str]) -> int:
+        """
+        Rebuild the cells of the given sessions from their shots.
+
+        Returns:
+            Number of sessions rebuilt
+        """
+        session_ids = [str(s) for s in dict.fromkeys(session_ids)]
+        if not session_ids:
+            return 0
+
+        now = datetime.now(timezone.utc).isoformat()
+        with closing(self._connect()) as conn:
+            for start in range(0, len(session_ids), _MAX_SQL_PARAMS):
+                chunk = session_ids[start:start + _MAX_SQL_PARAMS]
+                marks = ','.join('?' * len(chunk))
+                # Read before the shots: a write in between leaves an older
+                # fingerprint, so the session is simply rebuilt again
+                fingerprints = self._fingerprints(conn, chunk)
+                shots = pd.read_sql_query(
+                    f'SELECT * FROM shots WHERE CAST(session_id AS TEXT) IN ({marks})',
+                    conn, params=chunk,
+                )
+                cells = compute_cells(shots)
+
+                conn.execute(f'DELETE FROM shot_cube WHERE session_id IN ({marks})', chunk)
+                conn.execute(f'DELETE FROM shot_cube_sessions WHERE session_id IN ({marks})', chunk)
+                conn.executemany(
+                    'INSERT INTO shot_cube (club, session_id, metric, session_date, n, total, total_sq, '
+                    'min, max, sketch) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (tuple(_sql_value(v) for v in row) for row in cells.itertuples(index=False, name=None)),
+                )
+                conn.executemany(
+                    'INSERT INTO shot_cube_sessions (session_id, shot_count, max_rowid, content_hash, '
+                    'schema_version, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+                    [
+                        (row.session_id, int(row.shot_count), int(row.max_rowid), int(row.content_hash),
+                         CUBE_SCHEMA_VERSION, now)
+                        for row in fingerprints.itertuples(index=False)
+                    ],
+                )
+                conn.commit()
+        return len(session_ids)
+
+    def remove_sessions(self, session_ids: Iterable[str]) -> None:
+        """Drop the cells of sessions that no longer exist."""
+        session_ids = [str(s) for s in session_ids]
+        with closing(self._connect()) as conn:
+            for start in range(0, len(session_ids), _MAX_SQL_PARAMS):
+                chunk = session_ids[start:start + _MAX_SQL_PARAMS]
+                marks = ','.join('?' * len(chunk))
+                conn.execute(f'DELETE FROM shot_cube WHERE session_id IN ({marks})', chunk)
+                conn.execute(f'DELETE FROM shot_cube_sessions WHERE session_id IN ({marks})', chunk)
+            conn.commit()
+
+    def refresh(self) -> int:
+        """
+        Bring the cube up to date with the shots table.
+
+        Only sessions whose shot count, newest shot or cell inputs
+        changed are rebuilt.
+
+        Returns:
+            Number of sessions rebuilt or removed
+        """
+        with self._refresh_lock:
+            changed, removed = self.stale_sessions()
+            if removed:
+                self.remove_sessions(removed)
+            rebuilt = self.refresh_sessions(changed)
+            self._checked_version = db_version(self.db_path)
+        return rebuilt + len(removed)
+
+    def ensure_fresh(self) -> None:
+        """Refresh only if the database file changed since the last check."""
+        version = db_version(self.db_path)
+        if version is None or version != self._checked_version:
+            self.refresh()
+
+    def rebuild(self) -> int:
+        """Drop every cell and rebuild the cube from scratch."""
+        with closing(self._connect()) as conn:
+            conn.execute('DELETE FROM shot_cube')
+            conn.execute('DELETE FROM shot_cube_sessions')
+            conn.commit()
+        return self.refresh()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def cells(
+        self,
+        metrics: Sequence[str],
+        clubs: Optional[Sequence[str]] = None,
+        session_ids: Optional[Sequence[str]] = None,
+        since: Optional[DateLike] = None,
+        until: Optional[DateLike] = None,
+    ) -> pd.DataFrame:
+        """Raw cells matching the filters (club match is case-insensitive)."""
+        where = [f"metric IN ({','.join('?' * len(metrics))})"]
+        params: list = list(metrics)
+        if clubs:
+            where.append(f"LOWER(club) IN ({','.join('?' * len(clubs))})")
+            params.extend(c.lower() for c in clubs)
+        if session_ids:
+            where.append(f"session_id IN ({','.join('?' * len(session_ids))})")
+            params.extend(str(s) for s in session_ids)
+        if since is not None:
+            where.append('session_date >= ?')
+            params.append(_as_date_text(since))
+        if until is not None:
+            where.append('session_date < ?')
+            params.append(_as_date_text(until))
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(
+                f"SELECT * FROM shot_cube WHERE {' AND '.join(where)}", conn, params=params,
+            )
+
+    def stats(
+        self,
+        metrics: Sequence[str],
+        by: Sequence[str] = ('club',),
+        clubs: Optional[Sequence[str]] = None,
+        session_ids: Optional[Sequence[str]] = None,
+        since: Optional[DateLike] = None,
+        until: Optional[DateLike] = None,
+        quantiles: Optional[Sequence[float]] = DEFAULT_QUANTILES,
+        refresh: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Roll cells up into statistics.
+
+        Args:
+            metrics: Metrics to report (CUBE_METRICS or SHOTS_METRIC)
+            by: Grouping columns: any of 'club', 'session_id' (empty for
+                one overall row per metric)
+            clubs: Only these clubs
+            session_ids: Only these sessions
+            since: Only sessions on or after this date
+            until: Only sessions before this date
+            quantiles: Quantiles to estimate from the merged sketches
+                (columns ``q10``, ``q50``, ...); None skips them
+            refresh: Refresh the cube first if the database changed
+
+        Returns:
+            One row per group and metric with count, mean, std, min, max,
+            sessions, last_date and the requested quantiles
+        """
+        unknown = [m for m in metrics if m not in CUBE_METRICS and m != SHOTS_METRIC]
+        if unknown:
+            raise ValueError(f"Metrics not in the cube: {unknown}")
+        by = list(by)
+        if refresh:
+            self.ensure_fresh()
+
+        cells = self.cells(metrics, clubs=clubs, session_ids=session_ids, since=since, until=until)
+        quantile_columns = [f"q{round(q * 100):d}" for q in (quantiles or ())]
+        columns = by + ['metric', 'count', 'mean', 'std', 'min', 'max', 'sessions', 'last_date'] + quantile_columns
+        if cells.empty:
+            return pd.DataFrame(columns=columns)
+
+        keys = by + ['metric']
+        grouped = cells.groupby(keys, sort=True)
+        result = grouped.agg(
+            count=('n', 'sum'), total=('total', 'sum'), total_sq=('total_sq', 'sum'),
+            min=('min', 'min'), max=('max', 'max'),
+            sessions=('session_id', 'nunique'), last_date=('session_date', 'max'),
+        )
+        n = result['count'].astype(float)
+        # All-null for SHOTS_METRIC-only queries, which would leave them object dtype
+        result[['total', 'total_sq', 'min', 'max']] = result[['total', 'total_sq', 'min', 'max']].astype(float)
+        result['mean'] = result['total'] / n
+        variance = (result['total_sq'] - result['total'] ** 2 / n) / (n - 1)
+        result['std'] = np.sqrt(variance.clip(lower=0)).where(n > 1)
+        shots_only = result.index.get_level_values('metric') == SHOTS_METRIC
+        result.loc[shots_only, ['mean', 'std', 'min', 'max']] = np.nan
+
+        if quantiles:
+            def as_tuple(key):
+                return key if isinstance(key, tuple) else (key,)
+
+            merged = {}
+            for key, group in grouped['sketch']:
+                sketch = QuantileSketch()
+                for text in group.dropna():
+                    sketch.merge(QuantileSketch.from_json(text))
+                merged[as_tuple(key)] = sketch
+            for q, column in zip(quantiles, quantile_columns):
+                result[column] = [merged[as_tuple(key)].quantile(q) for key in result.index]
+
+        return result.reset_index().reindex(columns=columns)
+
+
+def parse_window(text: str, today: Optional[date] = None) -> Optional[date]:
+    """
+    Start date for phrases like "last 3 months", "past 2 weeks" or
+    "last 30 days" in a question, or None if there is none.
+    """
+    match = re.search(r'\b(?:last|past)\s+(\d+)?\s*(day|week|month|year)s?\b', text.lower())
+    if not match:
+        return None
+    amount = int(match.group(1) or 1)
+    days = {'day': 1, 'week': 7, 'month': 30, 'year': 365}[match.group(2)]
+    return (today or date.today()) - timedelta(days=amount * days)
+
+
+_default_cube: Optional[StatsCube] = None
+
+
+def get_stats_cube() -> StatsCube:
+    """Get the shared StatsCube for the app database."""
+    global _default_cube
+    db_path = golf_db.SQLITE_DB_PATH if HAS_GOLF_DB else None
+    if _default_cube is None or (db_path and _default_cube.db_path != db_path):
+        _default_cube = StatsCube(db_path)
+    return _default_cube
@@ -32,6 +32,7 @@ class SyncResult:
     duration_seconds: float = 0.0
     errors: List[str] = field(default_factory=list)
     error_message: str = ''
+    model_update: str = ''  # Post-sync distance model action, e.g. 'skipped: no drift'
 
 
 # ── Credential helpers ────────────────────────────────────────
@@ -93,7 +94,8 @@ def run_sync(
     max_sessions: int = 10,
 ) -> SyncResult:
     """
-    Run the full sync pipeline: discover -> backfill -> reclassify dates.
+    Run the full sync pipeline: discover -> backfill -> reclassify dates
+    -> retrain the distance model if it drifted.
 
     Synchronous wrapper around the async automation pipeline.
 
@@ -148,6 +150,7 @@ def run_sync(
         "shots": result.total_shots,
         "errors": len(result.errors),
         "duration_sec": round(result.duration_seconds, 1),
+        "model_update": result.model_update,
     })
 
     return result
@@ -249,6 +252,30 @@ async def _async_sync_pipeline(
     except Exception as e:
         errors.append(f"Stats recompute warning: {e}")
 
+    # ── Phase 5: Derived features, anomaly scores and aggregates for new shots ──
+    if result.sessions_imported > 0:
+        status("Computing shot features...")
+        try:
+            from services.feature_store import get_feature_store
+            get_feature_store().backfill()
+        except Exception as e:
+            errors.append(f"Feature backfill warning: {e}")
+        try:
+            from services.anomaly_scoring import get_anomaly_scorer
+            get_anomaly_scorer().score_new()
+        except Exception as e:
+            errors.append(f"Anomaly scoring warning: {e}")
+        try:
+            from services.stats_cube import get_stats_cube
+            get_stats_cube().refresh()
+        except Exception as e:
+            errors.append(f"Stats cube warning: {e}")
+
+    # ── Phase 6: Distance model drift check / retrain ──
+    if result.sessions_imported > 0:
+        status("Checking distance model accuracy...")
+        result.model_update = update_distance_model(errors)
+
     # Final status
     result.errors = errors
     if result.sessions_failed > 0 and result.sessions_imported > 0:
@@ -261,6 +288,34 @@ async def _async_sync_pipeline(
     return result
 
 
+def update_distance_model(errors: List[str]) -> str:
+    """
+    Post-sync step: retrain the distance model only if new shots show drift.
+
+    Continues boosting the existing model on the new shots (with a periodic
+    full rebuild); see ml.train_models.retrain_distance_model. The first
+    model is left to an explicit ``python -m ml.train_models`` run, so a
+    sync never trains from scratch. Failures are recorded as warnings and
+    never fail the sync.
+
+    Returns:
+        Short description of the action taken, e.g. 'skipped: no drift ...'
+    """
+    try:
+        from ml.train_models import HAS_ML_DEPS, retrain_distance_model
+    except ImportError:
+        return 'skipped: ML dependencies not installed'
+    if not HAS_ML_DEPS:
+        return 'skipped: ML dependencies not installed'
+
+    try:
+        retrain = retrain_distance_model(train_if_missing=False)
+    except Exception as e:
+        errors.append(f"Model retrain warning: {e}")
+        return 'failed'
+    return f"{retrain.action}: {retrain.reason}"
+
+
 # ── History & status helpers ──────────────────────────────────
 
 def get_sync_history(limit: int = 10) -> List[Dict[str, Any]]:
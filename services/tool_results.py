@@ -0,0 +1,248 @@
+"""
+Tool Results — compact, size-bounded encoding of shot tables for LLM tools.
+
+Tool results are pasted into the model context on every turn, so their
+size is paid for in latency and tokens. ``encode_table()`` renders a
+pipe-delimited text table (agent tools) and ``encode_json()`` a
+column-oriented JSON payload (Gemini function calls). Both build the
+output column by column with pandas string/JSON routines rather than
+per-row Python, and both enforce a byte budget: a result that does not
+fit is replaced by a summary — per-club aggregates, percentiles of the
+numeric columns and evenly spaced sample rows.
+
+Every result reports its size next to the size of the plain full
+encoding (all rows, row-oriented), so callers can see the bytes saved.
+
+Usage:
+    result = encode_table(df, ['club', 'carry', 'smash'])
+    print(result.text, result.bytes_saved)
+
+    payload = encode_json(df, budget_bytes=4000).text
+"""
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# ~2k tokens at the usual ~4 bytes per token
+DEFAULT_BUDGET_BYTES = 8000
+BYTES_PER_TOKEN = 4
+
+SUMMARY_PERCENTILES = (0.1, 0.5, 0.9)
+
+NO_DATA = '(no data)'
+MISSING = '-'
+
+
+@dataclass
+class EncodedResult:
+    """An encoded tool result and its size accounting."""
+    text: str
+    rows: int
+    summarized: bool
+    raw_bytes: int  # full, row-oriented encoding of every row
+
+    @property
+    def encoded_bytes(self) -> int:
+        return len(self.text.encode('utf-8'))
+
+    @property
+    def bytes_saved(self) -> int:
+        return max(0, self.raw_bytes - self.encoded_bytes)
+
+    @property
+    def estimated_tokens(self) -> int:
+        return -(-self.encoded_bytes // BYTES_PER_TOKEN)
+
+
+def _select(df: pd.DataFrame, columns: Optional[Sequence[str]]) -> pd.DataFrame:
+    if columns is None:
+        return df
+    return df[[c for c in dict.fromkeys(columns) if c in df.columns]]
+
+
+def _numeric_columns(df: pd.DataFrame) -> List[str]:
+    return [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])]
+
+
+def _render_lines(df: pd.DataFrame, decimals: int) -> pd.Series:
+    """One pipe-delimited line per row, built column-wise."""
+    numeric = set(_numeric_columns(df))
+    cells = []
+    for column in df.columns:
+        values = df[column]
+        if column in numeric:
+            values = values.round(decimals)
+        cells.append(values.astype(str).where(values.notna(), MISSING))
+    if len(cells) == 1:
+        return cells[0].reset_index(drop=True)
+    return cells[0].str.cat(cells[1:], sep=' | ').reset_index(drop=True)
+
+
+def _table(header: Sequence[str], lines: pd.Series) -> str:
+    head = ' | '.join(str(c) for c in header)
+    return '\n'.join([head, '-' * len(head), *lines.tolist()])
+
+
+def _sample_positions(total: int, count: int) -> np.ndarray:
+    """``count`` evenly spaced row positions out of ``total`` (first and last included)."""
+    if count >= total:
+        return np.arange(total)
+    if count <= 0:
+        return np.arange(0)
+    return np.unique(np.linspace(0, total - 1, count).round().astype(int))
+
+
+def _fit_sample(lines: pd.Series, budget: int) -> np.ndarray:
+    """Largest evenly spaced sample of lines whose total size fits ``budget``."""
+    sizes = lines.str.len().to_numpy() + 1
+    count = min(len(lines), int(budget // max(1.0, sizes.mean())))
+    positions = _sample_positions(len(lines), count)
+    while len(positions) and sizes[positions].sum() > budget:
+        count -= 1
+        positions = _sample_positions(len(lines), count)
+    return positions
+
+
+def _group_summary(df: pd.DataFrame, group_by: Optional[str], decimals: int) -> Optional[pd.DataFrame]:
+    numeric = [c for c in _numeric_columns(df) if c != group_by]
+    if not group_by or group_by not in df.columns:
+        return None
+    grouped = df.groupby(group_by, sort=True, dropna=False)
+    summary = grouped[numeric].mean().round(decimals) if numeric else pd.DataFrame(index=grouped.size().index)
+    summary.insert(0, 'shots', grouped.size())
+    return summary.reset_index()
+
+
+def _percentiles(df: pd.DataFrame, group_by: Optional[str], decimals: int) -> Optional[pd.DataFrame]:
+    numeric = [c for c in _numeric_columns(df) if c != group_by]
+    if not numeric:
+        return None
+    quantiles = df[numeric].quantile(list(SUMMARY_PERCENTILES)).round(decimals)
+    quantiles.index = [f"p{round(q * 100):d}" for q in SUMMARY_PERCENTILES]
+    return quantiles.T
+
+
+def _truncate(text: str, budget_bytes: int) -> str:
+    """Cut text at the last full line within the budget."""
+    data = text.encode('utf-8')
+    if len(data) <= budget_bytes:
+        return text
+    cut = data[:budget_bytes].decode('utf-8', errors='ignore')
+    return cut[:cut.rfind('\n')] if '\n' in cut else cut
+
+
+def encode_table(
+    df: pd.DataFrame,
+    columns: Optional[Sequence[str]] = None,
+    budget_bytes: Optional[int] = DEFAULT_BUDGET_BYTES,
+    group_by: Optional[str] = 'club',
+    decimals: int = 1,
+) -> EncodedResult:
+    """
+    Render shots as a pipe-delimited text table within a byte budget.
+
+    Args:
+        df: Rows to encode
+        columns: Columns to include (missing names are skipped); all if None
+        budget_bytes: Maximum result size; None for no limit
+        group_by: Column for per-group aggregates when summarizing
+        decimals: Rounding for numeric columns
+
+    Returns:
+        EncodedResult whose text is the full table if it fits, otherwise
+        a summary with per-group aggregates, percentiles and sample rows
+    """
+    subset = _select(df, columns)
+    if subset.empty or not len(subset.columns):
+        return EncodedResult(NO_DATA, rows=0, summarized=False, raw_bytes=len(NO_DATA))
+
+    lines = _render_lines(subset, decimals)
+    text = _table(subset.columns, lines)
+    raw_bytes = len(text.encode('utf-8'))
+    if budget_bytes is None or raw_bytes <= budget_bytes:
+        return EncodedResult(text, rows=len(subset), summarized=False, raw_bytes=raw_bytes)
+
+    parts = [
+        f"{len(subset)} rows ({raw_bytes} bytes as a full table) exceed the "
+        f"{budget_bytes}-byte result budget; summary follows."
+    ]
+    groups = _group_summary(subset, group_by, decimals)
+    if groups is not None:
+        parts += [f"\nBy {group_by}:", _table(groups.columns, _render_lines(groups, decimals))]
+    percentiles = _percentiles(subset, group_by, decimals)
+    if percentiles is not None:
+        table = percentiles.reset_index(names='column')
+        parts += ["\nPercentiles:", _table(table.columns, _render_lines(table, decimals))]
+
+    summary = '\n'.join(parts)
+    # Room left after the sample's title, header and rule lines
+    header_bytes = 2 * len(' | '.join(map(str, subset.columns))) + 80
+    remaining = budget_bytes - len(summary.encode('utf-8')) - header_bytes
+    positions = _fit_sample(lines, remaining) if remaining > 0 else np.arange(0)
+    if len(positions):
+        summary += f"\n\nSample rows ({len(positions)} of {len(subset)}, evenly spaced):\n"
+        summary += _table(subset.columns, lines.iloc[positions])
+
+    return EncodedResult(_truncate(summary, budget_bytes), rows=len(subset), summarized=True, raw_bytes=raw_bytes)
+
+
+def _split_json(df: pd.DataFrame, decimals: int) -> Dict[str, Any]:
+    return json.loads(df.to_json(orient='split', index=False, double_precision=decimals))
+
+
+def encode_json(
+    df: pd.DataFrame,
+    columns: Optional[Sequence[str]] = None,
+    budget_bytes: Optional[int] = DEFAULT_BUDGET_BYTES,
+    group_by: Optional[str] = 'club',
+    decimals: int = 2,
+) -> EncodedResult:
+    """
+    Encode shots as compact column-oriented JSON within a byte budget.
+
+    The payload is ``{"count": n, "shots": {"columns": [...], "data": [[...]]}}``;
+    column names appear once instead of once per row. If that does not fit,
+    ``shots`` is replaced by ``summarized: true``, ``full_bytes`` and ``by_<group_by>``
+    aggregates, ``percentiles`` and an evenly spaced ``sample`` of rows.
+
+    Args:
+        df: Rows to encode
+        columns: Columns to include (missing names are skipped); all if None
+        budget_bytes: Maximum result size; None for no limit
+        group_by: Column for per-group aggregates when summarizing
+        decimals: Decimal places kept for floats
+
+    Returns:
+        EncodedResult with the JSON text
+    """
+    subset = _select(df, columns)
+    records = subset.to_json(orient='records', double_precision=decimals)
+    raw_bytes = len(f'{{"count": {len(subset)}, "shots": {records}}}')
+    shots = subset.to_json(orient='split', index=False, double_precision=decimals)
+    text = f'{{"count": {len(subset)}, "shots": {shots}}}'
+    if budget_bytes is None or len(text) <= budget_bytes or subset.empty:
+        return EncodedResult(text, rows=len(subset), summarized=False, raw_bytes=raw_bytes)
+
+    payload: Dict[str, Any] = {'count': len(subset), 'summarized': True, 'full_bytes': raw_bytes}
+    groups = _group_summary(subset, group_by, decimals)
+    if groups is not None:
+        payload[f'by_{group_by}'] = _split_json(groups, decimals)
+    percentiles = _percentiles(subset, group_by, decimals)
+    if percentiles is not None:
+        payload['percentiles'] = _split_json(percentiles.reset_index(names='column'), decimals)
+
+    text = json.dumps(payload, default=str)
+    # Average row size from the full rendering sizes the sample
+    row_bytes = max(1.0, len(shots) / len(subset))
+    count = int((budget_bytes - len(text) - 40 - len(json.dumps(list(map(str, subset.columns))))) // row_bytes)
+    while count > 0:
+        sample = _split_json(subset.iloc[_sample_positions(len(subset), count)], decimals)
+        candidate = json.dumps({**payload, 'sample': sample}, default=str)
+        if len(candidate) <= budget_bytes:
+            text = candidate
+            break
+        count = int(count * 0.8)
+    return EncodedResult(text, rows=len(subset), summarized=True, raw_bytes=raw_bytes)
@@ -151,6 +151,35 @@ class TestScraperClubMapping(unittest.TestCase):
         shot_data = mock_db.save_shot.call_args[0][0]
         self.assertEqual(shot_data['session_date'], '2026-02-01')
 
+    @patch('services.stats_cube.get_stats_cube')
+    @patch('services.feature_store.get_feature_store')
+    @patch('services.anomaly_scoring.get_anomaly_scorer')
+    @patch('golf_scraper.golf_db')
+    @patch('golf_scraper.request_with_retries')
+    @patch('golf_scraper.upload_shot_images', return_value={})
+    def test_scraper_scores_anomalies_once_per_import(self, mock_images, mock_request, mock_db,
+                                                      mock_scorer, mock_features, mock_cube):
+        shot = {'id': 1, 'ball_speed': 70, 'club_speed': 48,
+                'carry_distance': 250, 'total_distance': 270}
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [
+            {'id': 1, 'name': 'Driver', 'club_name': 'DRIVER', 'shots': [shot]},
+            {'id': 2, 'name': '7 Iron', 'club_name': 'IRON7', 'shots': [dict(shot, id=2)]},
+            {'id': 3, 'name': 'PW', 'club_name': 'WEDGE_PITCHING', 'shots': [dict(shot, id=3)]},
+        ]
+        mock_request.return_value = mock_response
+
+        result = golf_scraper.run_scraper(
+            'https://my.uneekor.com/report?id=99999&key=testkey',
+            lambda msg: None
+        )
+
+        self.assertEqual(result['total_shots_imported'], 3)
+        mock_scorer.return_value.score_new.assert_called_once_with()
+        mock_features.return_value.backfill.assert_called_once_with()
+
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,157 @@
+"""Tests for agent/daemon.py — warm agent daemon and its socket client.
+
+The daemon runs on a background event loop with a temporary socket;
+agent.core's option factory and single_query are patched, so neither the
+Claude CLI nor a database is needed.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+_project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+_MOCK_DEPS = ("golf_db", "dotenv", "supabase", "automation", "automation.naming_conventions")
+_saved_modules: dict = {}
+core = None  # Set by setUpModule
+daemon = None
+
+
+def setUpModule():
+    global core, daemon
+    for dep in _MOCK_DEPS:
+        _saved_modules[dep] = sys.modules.get(dep)
+        sys.modules[dep] = MagicMock(name=dep)
+    import agent.core as _core
+    import agent.daemon as _daemon
+    core, daemon = _core, _daemon
+
+
+def tearDownModule():
+    for dep, original in _saved_modules.items():
+        if original is None:
+            sys.modules.pop(dep, None)
+        else:
+            sys.modules[dep] = original
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets not available")
+class TestAgentDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(prefix="gad")
+        self.path = os.path.join(self.tmpdir, "agent.sock")
+        self.options = object()
+        self.prompts = []
+
+        async def fake_query(prompt, options=None, **_):
+            self.prompts.append((prompt, options))
+            if prompt == "boom":
+                raise RuntimeError("api down")
+            return f"answer: {prompt}"
+
+        patches = [
+            patch.object(core, "create_golf_agent_options", return_value=self.options),
+            patch.object(core, "single_query", fake_query),
+            patch.object(daemon.AgentDaemon, "_warm"),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(shutil.rmtree, self.tmpdir, True)
+
+    def _start(self):
+        server = daemon.AgentDaemon(self.path)
+        thread = threading.Thread(target=asyncio.run, args=(server.serve_forever(),), daemon=True)
+        thread.start()
+        deadline = time.monotonic() + 5
+        while daemon.ping(self.path) is None:
+            self.assertLess(time.monotonic(), deadline, "daemon did not start")
+            time.sleep(0.01)
+        return server, thread
+
+    def _stop(self, thread):
+        self.assertTrue(daemon.stop(self.path))
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+    def test_queries_reuse_options(self):
+        server, thread = self._start()
+        try:
+            self.assertEqual(daemon.forward("driver?", self.path), "answer: driver?")
+            self.assertEqual(daemon.forward("irons?", self.path), "answer: irons?")
+            self.assertEqual([options for _, options in self.prompts], [self.options, self.options])
+            self.assertEqual(daemon.ping(self.path)["queries"], 2)
+        finally:
+            self._stop(thread)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_errors_are_reported(self):
+        _, thread = self._start()
+        try:
+            with self.assertRaisesRegex(daemon.DaemonError, "api down"):
+                daemon.forward("boom", self.path)
+            self.assertFalse(daemon.request({"op": "nope"}, self.path)["ok"])
+            # Still serving after a failed query
+            self.assertEqual(daemon.forward("again", self.path), "answer: again")
+        finally:
+            self._stop(thread)
+
+    def test_not_running(self):
+        self.assertIsNone(daemon.forward("hi", self.path))
+        self.assertFalse(daemon.stop(self.path))
+
+    def test_stale_socket_is_replaced(self):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.path)
+        stale.close()  # file left behind, nobody listening
+        self.assertIsNone(daemon.forward("hi", self.path))
+
+        _, thread = self._start()
+        try:
+            self.assertEqual(daemon.forward("hi", self.path), "answer: hi")
+        finally:
+            self._stop(thread)
+
+    def test_second_daemon_refuses_to_start(self):
+        _, thread = self._start()
+        try:
+            with self.assertRaises(daemon.DaemonError):
+                asyncio.run(daemon.AgentDaemon(self.path).start())
+        finally:
+            self._stop(thread)
+
+
+class TestCliDaemonErrors(unittest.TestCase):
+    """Daemon failures end the CLI with a message on stderr, not a traceback."""
+
+    def _main(self, *argv):
+        import agent.cli as cli
+        with patch.object(sys, "argv", ["golf-agent", *argv]), \
+                patch("sys.stderr") as stderr, self.assertRaises(SystemExit) as exit_:
+            cli.main()
+        self.assertEqual(exit_.exception.code, 1)
+        return "".join(call.args[0] for call in stderr.write.call_args_list)
+
+    def test_serve_refused(self):
+        error = daemon.DaemonError("An agent daemon is already listening on /tmp/x")
+        with patch.object(daemon, "serve", side_effect=error):
+            self.assertIn("already listening", self._main("--daemon"))
+
+    def test_stop_failed(self):
+        with patch.object(daemon, "stop", side_effect=daemon.DaemonError("invalid response")):
+            self.assertIn("invalid response", self._main("--stop-daemon"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,7 +14,7 @@ import json
 import os
 import sys
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pandas as pd
 
@@ -193,9 +193,18 @@ class TestQueryShots(unittest.TestCase):
     def setUp(self):
         self.mock_db = _golf_db_mock
         self.mock_db.reset_mock()
+        tools_module.get_agent_data().invalidate()
+
+    def _serve(self, df):
+        """Answer golf_db.query_shots like SQLite would, from df."""
+        from services.shot_query import filter_frame
+        self.mock_db.query_shots.side_effect = lambda **filters: filter_frame(df, **filters)
+
+    def tearDown(self):
+        self.mock_db.query_shots.side_effect = None
 
     def test_returns_shots(self):
-        self.mock_db.get_session_data.return_value = _make_shots_df(3)
+        self._serve(_make_shots_df(3))
         result = run_async(tools_module.query_shots.handler({"session_id": "sess_1"}))
         self.assertIn("content", result)
         text = result["content"][0]["text"]
@@ -203,28 +212,64 @@ class TestQueryShots(unittest.TestCase):
         self.assertIn("sess_1", text)
 
     def test_empty_session(self):
-        self.mock_db.get_session_data.return_value = pd.DataFrame()
+        self._serve(pd.DataFrame(columns=["shot_id", "session_id", "club"]))
         result = run_async(tools_module.query_shots.handler({"session_id": "missing"}))
         text = result["content"][0]["text"]
         self.assertIn("No shots found", text)
 
     def test_club_filter(self):
-        self.mock_db.get_session_data.return_value = _make_multi_club_df()
+        self._serve(_make_multi_club_df())
         result = run_async(tools_module.query_shots.handler({"session_id": "sess_1", "club": "7 Iron"}))
         text = result["content"][0]["text"]
         self.assertIn("4 shots", text)
 
     def test_club_filter_no_match(self):
-        self.mock_db.get_session_data.return_value = _make_shots_df(3, club="Driver")
+        self._serve(_make_shots_df(3, club="Driver"))
         result = run_async(tools_module.query_shots.handler({"session_id": "sess_1", "club": "Putter"}))
         text = result["content"][0]["text"]
         self.assertIn("No shots found for club", text)
 
     def test_limit(self):
-        self.mock_db.get_session_data.return_value = _make_shots_df(10)
+        self._serve(_make_shots_df(10))
         result = run_async(tools_module.query_shots.handler({"session_id": "sess_1", "limit": 3}))
         text = result["content"][0]["text"]
         self.assertIn("3 shots", text)
+        self.assertEqual(self.mock_db.query_shots.call_args.kwargs["limit"], 3)
+
+    def test_repeated_query_is_cached(self):
+        self._serve(_make_shots_df(3))
+        for _ in range(2):
+            run_async(tools_module.query_shots.handler({"session_id": "sess_1"}))
+        self.assertEqual(self.mock_db.query_shots.call_count, 1)
+
+    def test_large_result_is_summarized(self):
+        self._serve(_make_multi_club_df())
+        with patch.object(tools_module, "RESULT_BUDGET_BYTES", 300):
+            result = run_async(tools_module.query_shots.handler({"session_id": "sess_1"}))
+        text = result["content"][0]["text"]
+        self.assertIn("summary follows", text)
+        self.assertLessEqual(len(text.split(":\n", 1)[1]), 300)
+        stats = tools_module.get_agent_data().latency_stats()["query_shots"]
+        self.assertGreater(stats["bytes_saved"], 0)
+
+    def test_anomalous_only(self):
+        df = _make_shots_df(5)
+        self._serve(df)
+        flagged = pd.DataFrame({
+            "shot_id": [df["shot_id"].iloc[3], df["shot_id"].iloc[1]],
+            "anomaly_score": [0.9, 0.7],
+            "flaws": ["over_the_top", ""],
+        })
+        scorer = MagicMock()
+        scorer.anomalous_shots.return_value = flagged
+        with patch("services.anomaly_scoring.get_anomaly_scorer", return_value=scorer):
+            result = run_async(tools_module.query_shots.handler(
+                {"session_id": "sess_1", "anomalous_only": True}
+            ))
+        text = result["content"][0]["text"]
+        self.assertIn("2 shots", text)
+        self.assertIn("over_the_top", text)
+        self.assertLess(text.index(str(df["shot_id"].iloc[3])), text.index(str(df["shot_id"].iloc[1])))
 
 
 class TestGetSessionList(unittest.TestCase):
@@ -233,6 +278,7 @@ class TestGetSessionList(unittest.TestCase):
     def setUp(self):
         self.mock_db = _golf_db_mock
         self.mock_db.reset_mock()
+        tools_module.get_agent_data().invalidate()
 
     def test_returns_sessions(self):
         self.mock_db.get_unique_sessions.return_value = [
@@ -258,6 +304,7 @@ class TestGetSessionSummary(unittest.TestCase):
     def setUp(self):
         self.mock_db = _golf_db_mock
         self.mock_db.reset_mock()
+        tools_module.get_agent_data().invalidate()
 
     def test_returns_json_summary(self):
         self.mock_db.get_session_data.return_value = _make_shots_df(5)
@@ -283,6 +330,7 @@ class TestGetClubStats(unittest.TestCase):
     def setUp(self):
         self.mock_db = _golf_db_mock
         self.mock_db.reset_mock()
+        tools_module.get_agent_data().invalidate()
 
     def test_returns_all_clubs(self):
         self.mock_db.get_all_shots.return_value = _make_multi_club_df()
@@ -305,6 +353,19 @@ class TestGetClubStats(unittest.TestCase):
         result = run_async(tools_module.get_club_stats.handler({}))
         self.assertIn("No shot data", result["content"][0]["text"])
 
+    def test_zero_readings_follow_cube_rules(self):
+        # A square face (0.0) is a reading; a 0 carry means "not measured"
+        self.mock_db.get_all_shots.return_value = pd.DataFrame({
+            "club": ["Driver"] * 3,
+            "carry": [0.0, 200.0, 220.0],
+            "face_angle": [0.0, 0.0, 3.0],
+            "club_path": [0.0, 2.0, 99999.0],
+        })
+        stats = json.loads(run_async(tools_module.get_club_stats.handler({}))["content"][0]["text"])
+        self.assertEqual(stats[0]["avg_carry"], 210.0)
+        self.assertEqual(stats[0]["avg_face_angle"], 1.0)
+        self.assertEqual(stats[0]["avg_club_path"], 1.0)
+
     def test_unknown_club_filter(self):
         self.mock_db.get_all_shots.return_value = _make_multi_club_df()
         result = run_async(tools_module.get_club_stats.handler({"club": "Putter"}))
@@ -317,6 +378,7 @@ class TestGetTrends(unittest.TestCase):
     def setUp(self):
         self.mock_db = _golf_db_mock
         self.mock_db.reset_mock()
+        tools_module.get_agent_data().invalidate()
 
     def test_carry_trend(self):
         # Create data spanning two sessions
@@ -346,6 +408,32 @@ class TestGetTrends(unittest.TestCase):
         self.assertIn("Unknown metric", result["content"][0]["text"])
 
 
+class TestFindSessions(unittest.TestCase):
+    """Test find_sessions tool."""
+
+    def test_hits_rendered_one_per_line(self):
+        from services.session_index import SessionHit
+
+        index = MagicMock()
+        index.search.return_value = [
+            SessionHit("s1", 0.9, "2026-02-01", "Driver Focus", 40, {"Driver": 0.8, "3 Wood": 0.2},
+                       {"carry": 245.0}, ["Warmup"], ["fade"]),
+        ]
+        with patch.object(tools_module, "get_session_index", return_value=index):
+            result = run_async(tools_module.find_sessions.handler({"query": "driver fade", "k": 3}))
+        text = result["content"][0]["text"]
+        index.search.assert_called_once_with("driver fade", k=3)
+        self.assertIn("1 sessions for 'driver fade'", text)
+        self.assertIn("- s1 (2026-02-01, Driver Focus): 40 shots; Driver 80%", text)
+
+    def test_no_sessions(self):
+        index = MagicMock()
+        index.search.return_value = []
+        with patch.object(tools_module, "get_session_index", return_value=index):
+            result = run_async(tools_module.find_sessions.handler({"query": "anything"}))
+        self.assertIn("No sessions found", result["content"][0]["text"])
+
+
 # ---------------------------------------------------------------------------
 # Write tool tests
 # ---------------------------------------------------------------------------
@@ -356,6 +444,7 @@ class TestTagSession(unittest.TestCase):
     def setUp(self):
         self.mock_db = _golf_db_mock
         self.mock_db.reset_mock()
+        tools_module.get_agent_data().invalidate()
 
     def test_tags_shots(self):
         self.mock_db.get_session_data.return_value = _make_shots_df(3)
@@ -386,6 +475,7 @@ class TestUpdateSessionType(unittest.TestCase):
     def setUp(self):
         self.mock_db = _golf_db_mock
         self.mock_db.reset_mock()
+        tools_module.get_agent_data().invalidate()
 
     def test_updates_type(self):
         self.mock_db.get_session_data.return_value = _make_shots_df(4)
@@ -419,6 +509,7 @@ class TestBatchRenameSessions(unittest.TestCase):
     def setUp(self):
         self.mock_db = _golf_db_mock
         self.mock_db.reset_mock()
+        tools_module.get_agent_data().invalidate()
 
     def test_renames(self):
         self.mock_db.batch_update_session_names.return_value = 5
@@ -428,6 +519,139 @@ class TestBatchRenameSessions(unittest.TestCase):
         self.mock_db.batch_update_session_names.assert_called_once()
 
 
+class TestBulkUpdateSessions(unittest.TestCase):
+    """Test bulk_update_sessions tool."""
+
+    def setUp(self):
+        self.mock_db = _golf_db_mock
+        self.mock_db.reset_mock()
+        self.mock_db.batch_update_sessions.side_effect = None
+        tools_module.get_agent_data().invalidate()
+
+    def test_one_batch_call(self):
+        self.mock_db.batch_update_sessions.return_value = MagicMock(
+            updated_shots=30, touched_sessions=["1", "2"], missing_sessions=["9"],
+            batch_id="abc", sync_error=None,
+        )
+        result = run_async(tools_module.bulk_update_sessions.handler({"updates": [
+            {"session_id": "1", "tag": "Warmup", "session_type": "Driver Focus"},
+            {"session_id": "2", "tag": "Warmup"},
+            {"session_id": "9", "tag": "Warmup"},
+            {"session_id": "3"},
+        ]}))
+        text = result["content"][0]["text"]
+        self.mock_db.batch_update_sessions.assert_called_once_with([
+            ("1", "shot_tag", "Warmup"), ("1", "session_type", "Driver Focus"),
+            ("2", "shot_tag", "Warmup"), ("9", "shot_tag", "Warmup"),
+        ])
+        self.assertIn("Updated 30 shots across 2 sessions", text)
+        self.assertIn("No shots found for sessions: 9", text)
+        self.assertIn("Skipped entries without a session_id or field: 3", text)
+
+    def test_rejected_field_reported(self):
+        self.mock_db.batch_update_sessions.side_effect = ValueError("Invalid field(s): x")
+        result = run_async(tools_module.bulk_update_sessions.handler(
+            {"updates": [{"session_id": "1", "tag": "Warmup"}]}
+        ))
+        self.assertIn("Update rejected", result["content"][0]["text"])
+
+    def test_empty_and_oversized(self):
+        text = run_async(tools_module.bulk_update_sessions.handler({"updates": []}))["content"][0]["text"]
+        self.assertIn("No updates", text)
+        entries = [{"session_id": str(i), "tag": "x"} for i in range(tools_module.BULK_UPDATE_LIMIT + 1)]
+        text = run_async(tools_module.bulk_update_sessions.handler({"updates": entries}))["content"][0]["text"]
+        self.assertIn("Too many updates", text)
+        self.mock_db.batch_update_sessions.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# Async data access tests
+# ---------------------------------------------------------------------------
+
+class TestAgentDataAccess(unittest.TestCase):
+    """Test the thread-pool adapter, shared snapshot and instrumentation."""
+
+    def setUp(self):
+        self.mock_db = _golf_db_mock
+        self.mock_db.reset_mock()
+        self.data_module = sys.modules["agent.data_access"]
+        self.data = self.data_module.AgentDataAccess(max_workers=2)
+
+    def tearDown(self):
+        self.data.shutdown()
+
+    def test_concurrent_reads_overlap(self):
+        import time as _time
+
+        def slow_session(**kwargs):
+            _time.sleep(0.2)
+            return _make_shots_df(2)
+
+        self.mock_db.get_session_data.side_effect = slow_session
+
+        async def both():
+            start = _time.perf_counter()
+            await asyncio.gather(self.data.session_data("a"), self.data.session_data("b"))
+            return _time.perf_counter() - start
+
+        try:
+            self.assertLess(run_async(both()), 0.35)
+        finally:
+            self.mock_db.get_session_data.side_effect = None
+
+    def test_snapshot_loaded_once_for_concurrent_callers(self):
+        self.mock_db.get_all_shots.return_value = _make_multi_club_df()
+
+        async def three():
+            return await asyncio.gather(*(self.data.all_shots() for _ in range(3)))
+
+        frames = run_async(three())
+        self.assertEqual(self.mock_db.get_all_shots.call_count, 1)
+        self.assertTrue(all(f is frames[0] for f in frames))
+
+        self.data.invalidate()
+        run_async(self.data.all_shots())
+        self.assertEqual(self.mock_db.get_all_shots.call_count, 2)
+
+    def test_cancelled_caller_does_not_poison_snapshot(self):
+        import threading as _threading
+
+        self.data.shutdown()
+        self.data = self.data_module.AgentDataAccess(max_workers=1)
+        self.mock_db.get_all_shots.return_value = _make_multi_club_df()
+        release = _threading.Event()
+        # Occupy the only worker so the snapshot load is still queued
+        blocker = self.data._pool().submit(release.wait, 5)
+
+        async def timed_out():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(self.data.all_shots(), 0.1)
+
+        run_async(timed_out())
+        release.set()
+        blocker.result()
+        df = run_async(self.data.all_shots())
+        self.assertEqual(len(df), len(_make_multi_club_df()))
+
+    def test_timeout_returns_text_and_is_recorded(self):
+        data = tools_module.get_agent_data()
+
+        @self.data_module.instrumented("slow_tool", timeout=0.05)
+        async def slow_tool(args):
+            await asyncio.sleep(1)
+
+        result = run_async(slow_tool({}))
+        self.assertIn("timed out", result["content"][0]["text"])
+        self.assertEqual(data.latency_stats()["slow_tool"]["timeouts"], 1)
+
+    def test_tool_latency_recorded(self):
+        self.mock_db.get_unique_sessions.return_value = []
+        run_async(tools_module.get_session_list.handler({}))
+        stats = tools_module.get_agent_data().latency_stats()["get_session_list"]
+        self.assertGreaterEqual(stats["calls"], 1)
+        self.assertGreaterEqual(stats["max_ms"], stats["p50_ms"])
+
+
 # ---------------------------------------------------------------------------
 # Export tests
 # ---------------------------------------------------------------------------
@@ -436,10 +660,10 @@ class TestExports(unittest.TestCase):
     """Test ALL_TOOLS and TOOL_NAMES exports."""
 
     def test_all_tools_count(self):
-        self.assertEqual(len(tools_module.ALL_TOOLS), 8)
+        self.assertEqual(len(tools_module.ALL_TOOLS), 10)
 
     def test_tool_names_format(self):
-        self.assertEqual(len(tools_module.TOOL_NAMES), 8)
+        self.assertEqual(len(tools_module.TOOL_NAMES), 10)
         for name in tools_module.TOOL_NAMES:
             self.assertTrue(name.startswith("mcp__golf__"), f"Bad prefix: {name}")
 
@@ -454,9 +678,11 @@ class TestExports(unittest.TestCase):
             "get_session_summary",
             "get_club_stats",
             "get_trends",
+            "find_sessions",
             "tag_session",
             "update_session_type",
             "batch_rename_sessions",
+            "bulk_update_sessions",
         }
         actual = {t.name for t in tools_module.ALL_TOOLS}
         self.assertEqual(actual, expected)
@@ -477,6 +703,7 @@ class TestContentFormat(unittest.TestCase):
     def setUp(self):
         self.mock_db = _golf_db_mock
         self.mock_db.reset_mock()
+        tools_module.get_agent_data().invalidate()
 
     def test_text_result_format(self):
         self.mock_db.get_unique_sessions.return_value = []
@@ -0,0 +1,165 @@
+"""Tests for services/anomaly_scoring.py."""
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from ml.anomaly_detection import HAS_ML_DEPS
+from services import anomaly_scoring
+from services.anomaly_scoring import RULES_ONLY, AnomalyScorer, ClubDetectorCache
+
+
+def _shots(n, club, start=0, session_id='s1', seed=0):
+    rng = np.random.default_rng(seed)
+    club_speed = rng.uniform(80, 110, n)
+    return pd.DataFrame({
+        'shot_id': [f'{club}_{start + i}' for i in range(n)],
+        'session_id': session_id,
+        'club': club,
+        'date_added': pd.date_range('2025-01-01', periods=n, freq='min').astype(str),
+        'club_speed': club_speed,
+        'ball_speed': club_speed * rng.normal(1.45, 0.02, n),
+        'smash': np.nan,
+        'attack_angle': rng.normal(-1, 1, n),
+        'club_path': rng.normal(0, 1.5, n),
+        'face_angle': rng.normal(0, 1, n),
+        'impact_x': rng.normal(0, 3, n),
+        'impact_y': rng.normal(0, 3, n),
+        'back_spin': rng.normal(3000, 300, n),
+    })
+
+
+@unittest.skipUnless(HAS_ML_DEPS, "scikit-learn not installed")
+class TestAnomalyScorer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'golf.db')
+        self._insert(pd.concat([_shots(120, 'Driver'), _shots(10, 'SW', session_id='s2')]))
+        self.scorer = AnomalyScorer(self.db_path)
+
+    def tearDown(self):
+        self.scorer.cache.wait()
+        self.tmpdir.cleanup()
+
+    def _insert(self, df):
+        with sqlite3.connect(self.db_path) as conn:
+            df.to_sql('shots', conn, index=False, if_exists='append')
+
+    def _stored(self):
+        with sqlite3.connect(self.db_path) as conn:
+            return pd.read_sql_query('SELECT * FROM shot_anomalies', conn).set_index('shot_id')
+
+    def test_scores_new_shots_once(self):
+        self.assertEqual(self.scorer.score_new(), 130)
+        self.assertEqual(self.scorer.score_new(), 0)
+        stored = self._stored()
+        self.assertTrue(stored['anomaly_score'].between(0, 1).all())
+
+    def test_small_club_uses_rules_only(self):
+        self.scorer.score_new()
+        stored = self._stored()
+        self.assertTrue((stored.loc[stored['club'] == 'SW', 'detector'] == RULES_ONLY).all())
+        self.assertTrue(stored.loc[stored['club'] == 'Driver', 'detector'].str.startswith('if:').all())
+        self.assertEqual(self.scorer.cache.clubs(), ['Driver'])
+
+    def test_flags_planted_anomaly(self):
+        bad = _shots(1, 'Driver', start=999, seed=5)
+        bad[['club_path', 'face_angle', 'impact_x', 'attack_angle']] = [9.0, -6.0, 25.0, -9.0]
+        self._insert(bad)
+        self.scorer.score_new()
+
+        flagged = self.scorer.anomalous_shots()
+        self.assertEqual(flagged['shot_id'].iloc[0], 'Driver_999')
+        self.assertIn('inconsistent_contact', flagged['flaws'].iloc[0])
+        self.assertTrue(flagged['anomaly_score'].is_monotonic_decreasing)
+
+    def test_anomalous_shots_filters(self):
+        self.scorer.score_new()
+        everything = self.scorer.anomalous_shots(min_score=0.0, limit=1000)
+        self.assertEqual(len(everything), 130)
+        only_s2 = self.scorer.anomalous_shots(session_id='s2', min_score=0.0)
+        self.assertEqual(set(only_s2['club']), {'SW'})
+        self.assertEqual(len(self.scorer.anomalous_shots(club='Driver', min_score=0.0, limit=5)), 5)
+
+    def test_outlier_query_uses_index(self):
+        self.scorer.score_new()
+        with sqlite3.connect(self.db_path) as conn:
+            plan = conn.execute(
+                'EXPLAIN QUERY PLAN SELECT * FROM shot_anomalies WHERE is_outlier = 1 '
+                'ORDER BY anomaly_score DESC'
+            ).fetchall()
+        self.assertIn('idx_shot_anomalies_outlier', str(plan))
+
+    def test_growth_triggers_background_refit(self):
+        self.scorer.score_new()
+        first = self.scorer.cache.get('Driver', 120)
+
+        self._insert(_shots(60, 'Driver', start=120, seed=1))
+        self.scorer.score_new()
+        self.scorer.cache.wait()
+        refit = self.scorer.cache.get('Driver', 180)
+        self.assertIsNot(refit, first)
+        self.assertEqual(refit.n_shots, 180)
+
+    def test_no_refit_below_growth_threshold(self):
+        cache = ClubDetectorCache(self.db_path, background=False)
+        first = cache.get('Driver', 120)
+        self.assertIs(cache.get('Driver', 130), first)
+
+    def test_capped_history_does_not_refit_forever(self):
+        with mock.patch.object(anomaly_scoring, 'MAX_FIT_SHOTS', 60):
+            cache = ClubDetectorCache(self.db_path, background=False)
+            first = cache.get('Driver', 120)
+            self.assertEqual(first.n_shots, 120)
+            cache.get('Driver', 120)
+            self.assertIs(cache.get('Driver', 120), first)
+            self.assertIs(cache._detectors['Driver'], first)
+
+    def test_score_new_streams_batches(self):
+        with mock.patch.object(self.scorer, 'store', wraps=self.scorer.store) as store:
+            self.assertEqual(self.scorer.score_new(batch_size=50), 130)
+        self.assertEqual([len(c.args[0]) for c in store.call_args_list], [50, 50, 30])
+
+    def test_deleted_and_moved_shots_are_pruned(self):
+        self.scorer.score_new()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM shots WHERE shot_id = 'SW_0'")
+            conn.execute("UPDATE shots SET session_id = 's3' WHERE shot_id = 'SW_1'")
+
+        listed = self.scorer.anomalous_shots(session_id='s2', min_score=0.0)
+        self.assertNotIn('SW_0', set(listed['shot_id']))
+        self.assertNotIn('SW_1', set(listed['shot_id']))
+        moved = self.scorer.anomalous_shots(session_id='s3', min_score=0.0)
+        self.assertEqual(list(moved['shot_id']), ['SW_1'])
+
+        self.assertEqual(self.scorer.score_new(), 1)
+        stored = self._stored()
+        self.assertNotIn('SW_0', stored.index)
+        self.assertEqual(stored.loc['SW_1', 'session_id'], 's3')
+
+    def test_rescore_replaces_club_rows(self):
+        self.scorer.score_new()
+        self.assertEqual(self.scorer.rescore('SW'), 10)
+        self.assertEqual(len(self._stored()), 130)
+
+    def test_missing_database_is_not_created(self):
+        missing = os.path.join(self.tmpdir.name, 'missing.db')
+        scorer = AnomalyScorer(missing, cache=self.scorer.cache)
+        with self.assertRaises(sqlite3.OperationalError):
+            scorer.anomalous_shots()
+        with self.assertRaises(sqlite3.OperationalError):
+            scorer.score_new()
+        self.assertFalse(os.path.exists(missing))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Tests for services/batch_writes.py."""
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.batch_writes import SessionUpdate, apply_session_updates, sync_session_updates
+
+ALLOWED = ('shot_tag', 'session_type')
+
+
+class TestApplySessionUpdates(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('CREATE TABLE shots (shot_id TEXT PRIMARY KEY, session_id TEXT, club TEXT, '
+                         'shot_tag TEXT, session_type TEXT)')
+            conn.execute('CREATE TABLE change_log (log_id INTEGER PRIMARY KEY, operation TEXT, '
+                         'entity_type TEXT, entity_id TEXT, details TEXT)')
+            conn.executemany(
+                'INSERT INTO shots (shot_id, session_id, club) VALUES (?, ?, ?)',
+                [(f's{i}', str(i % 3), 'Driver') for i in range(9)],
+            )
+
+    def tearDown(self):
+        os.remove(self.db_path)
+
+    def _query(self, sql):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(sql).fetchall()
+
+    def test_updates_and_one_log_batch(self):
+        result = apply_session_updates(self.db_path, [
+            SessionUpdate('0', 'shot_tag', 'Warmup'),
+            ('1', 'session_type', 'Driver Focus'),
+            {'session_id': '1', 'field': 'shot_tag', 'value': 'Warmup'},
+            ('missing', 'shot_tag', 'Warmup'),
+        ], allowed_fields=ALLOWED)
+
+        self.assertEqual(result.shots_by_update, [3, 3, 3, 0])
+        self.assertEqual(result.updated_shots, 9)
+        self.assertEqual(result.touched_sessions, ['0', '1'])
+        self.assertEqual(result.missing_sessions, ['missing'])
+        self.assertEqual(self._query("SELECT COUNT(*) FROM shots WHERE shot_tag = 'Warmup'"), [(6,)])
+        self.assertEqual(self._query("SELECT DISTINCT session_type FROM shots WHERE session_id = '1'"),
+                         [('Driver Focus',)])
+
+        log = self._query('SELECT operation, entity_id, details FROM change_log ORDER BY log_id')
+        self.assertEqual(result.logged, 3)
+        self.assertEqual([row[1] for row in log], ['0', '1', '1'])
+        self.assertTrue(all(row[0] == 'batch_update' and result.batch_id in row[2] for row in log))
+
+    def test_failure_rolls_back_whole_batch(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("CREATE TRIGGER no_boom BEFORE UPDATE ON shots WHEN NEW.shot_tag = 'boom' "
+                         "BEGIN SELECT RAISE(ABORT, 'rejected'); END")
+        with self.assertRaises(sqlite3.Error):
+            apply_session_updates(self.db_path, [('0', 'shot_tag', 'ok'), ('1', 'shot_tag', 'boom')])
+        self.assertEqual(self._query('SELECT COUNT(*) FROM shots WHERE shot_tag IS NOT NULL'), [(0,)])
+        self.assertEqual(self._query('SELECT COUNT(*) FROM change_log'), [(0,)])
+
+    def test_field_allowlist(self):
+        with self.assertRaisesRegex(ValueError, 'Allowed fields'):
+            apply_session_updates(self.db_path, [('0', 'club; DROP TABLE shots', 'x')], allowed_fields=ALLOWED)
+        with self.assertRaisesRegex(ValueError, 'Not a shots column'):
+            apply_session_updates(self.db_path, [('0', 'sidebar_label', 'x')])
+
+    def test_without_change_log_table(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('DROP TABLE change_log')
+        result = apply_session_updates(self.db_path, [('2', 'shot_tag', 'Range')])
+        self.assertEqual(result.updated_shots, 3)
+        self.assertEqual(result.logged, 0)
+
+
+class TestSyncSessionUpdates(unittest.TestCase):
+
+    def test_one_request_per_field_value(self):
+        fd, db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.addCleanup(os.remove, db_path)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute('CREATE TABLE shots (shot_id TEXT, session_id TEXT, shot_tag TEXT)')
+            conn.executemany('INSERT INTO shots VALUES (?, ?, NULL)', [(f's{i}', str(i)) for i in range(4)])
+        result = apply_session_updates(db_path, [
+            ('0', 'shot_tag', 'Warmup'), ('1', 'shot_tag', 'Warmup'), ('2', 'shot_tag', 'Warmup'),
+            ('3', 'shot_tag', 'Range'), ('9', 'shot_tag', 'Warmup'),
+        ])
+
+        client = MagicMock()
+        self.assertIsNone(sync_session_updates(client, result))
+        update = client.table.return_value.update
+        self.assertEqual(update.call_count, 2)
+        self.assertEqual({c.args[0]['shot_tag'] for c in update.call_args_list}, {'Warmup', 'Range'})
+        in_calls = update.return_value.in_.call_args_list
+        self.assertEqual(sorted(tuple(c.args[1]) for c in in_calls), [('0', '1', '2'), ('3',)])
+
+    def test_error_is_returned(self):
+        result = MagicMock(updates=[SessionUpdate('1', 'shot_tag', 'x')], shots_by_update=[2])
+        client = MagicMock()
+        client.table.side_effect = RuntimeError('offline')
+        self.assertEqual(sync_session_updates(client, result), 'offline')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""Tests for services/analytics/bootstrap.py."""
+import unittest
+
+import numpy as np
+
+from services.analytics.bootstrap import bootstrap_club_stats
+
+
+def _bag(seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "Driver": rng.normal(230, 10, 120),
+        "7 Iron": rng.normal(155, 7, 60),
+        "PW": rng.normal(115, 6, 15),
+    }
+
+
+class TestBootstrapClubStats(unittest.TestCase):
+
+    def test_estimates_match_numpy(self):
+        bag = _bag()
+        result = bootstrap_club_stats(bag, n_resamples=200)
+        for club, values in bag.items():
+            stats = result.club(club)
+            self.assertAlmostEqual(stats.mean.estimate, np.mean(values))
+            self.assertAlmostEqual(stats.median.estimate, np.median(values))
+            self.assertAlmostEqual(stats.p10.estimate, np.quantile(values, 0.10))
+            self.assertAlmostEqual(stats.p90.estimate, np.quantile(values, 0.90))
+            self.assertEqual(stats.shot_count, len(values))
+
+    def test_intervals_contain_estimate_and_shrink_with_n(self):
+        rng = np.random.default_rng(3)
+        result = bootstrap_club_stats(
+            {"small": rng.normal(150, 8, 12), "large": rng.normal(150, 8, 600)},
+            n_resamples=500,
+        )
+        for club in ("small", "large"):
+            ci = result.ci(club, "mean")
+            self.assertTrue(ci.contains(ci.estimate))
+        self.assertLess(result.ci("large").width, result.ci("small").width)
+
+    def test_seeded_results_are_reproducible(self):
+        bag = _bag()
+        a = bootstrap_club_stats(bag, n_resamples=100, seed=7)
+        b = bootstrap_club_stats(bag, n_resamples=100, seed=7)
+        c = bootstrap_club_stats(bag, n_resamples=100, seed=8)
+        np.testing.assert_array_equal(a.distributions["p90"], b.distributions["p90"])
+        self.assertFalse(np.array_equal(a.distributions["p90"], c.distributions["p90"]))
+
+    def test_resamples_stay_within_each_club(self):
+        result = bootstrap_club_stats({"a": [1.0, 2.0, 3.0], "b": [100.0, 101.0]}, n_resamples=300)
+        self.assertTrue(np.all(result.distributions["mean"][:, 0] <= 3.0))
+        self.assertTrue(np.all(result.distributions["mean"][:, 1] >= 100.0))
+
+    def test_difference_ci_for_gap(self):
+        result = bootstrap_club_stats(_bag(), n_resamples=400)
+        gap = result.difference_ci("Driver", "7 Iron")
+        self.assertAlmostEqual(
+            gap.estimate, result.ci("Driver").estimate - result.ci("7 Iron").estimate
+        )
+        self.assertLess(gap.low, gap.estimate)
+        self.assertGreater(gap.high, gap.estimate)
+        self.assertGreater(gap.low, 60)
+
+    def test_drops_non_finite_and_empty_clubs(self):
+        result = bootstrap_club_stats({"a": [np.nan, 150.0, 152.0], "b": [np.nan]}, n_resamples=50)
+        self.assertEqual(result.clubs, ["a"])
+        self.assertEqual(result.club("a").shot_count, 2)
+
+    def test_small_block_size_matches_single_block(self):
+        import services.analytics.bootstrap as bootstrap
+
+        bag = _bag()
+        full = bootstrap_club_stats(bag, n_resamples=50, seed=1)
+        original = bootstrap._MAX_BLOCK_ELEMENTS
+        bootstrap._MAX_BLOCK_ELEMENTS = 1
+        try:
+            chunked = bootstrap_club_stats(bag, n_resamples=50, seed=1)
+        finally:
+            bootstrap._MAX_BLOCK_ELEMENTS = original
+        self.assertEqual(chunked.n_resamples, 50)
+        self.assertAlmostEqual(chunked.ci("Driver").estimate, full.ci("Driver").estimate)
+
+    def test_validates_arguments(self):
+        with self.assertRaises(ValueError):
+            bootstrap_club_stats(_bag(), n_resamples=0)
+        with self.assertRaises(ValueError):
+            bootstrap_club_stats(_bag(), confidence=1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,216 @@
+"""Tests for services/feature_store.py."""
+import math
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services import feature_store
+from services.feature_store import (
+    FEATURE_COLUMNS,
+    FEATURE_SCHEMA_VERSION,
+    FeatureStore,
+    compute_derived_features,
+)
+
+
+def _shots(n=4):
+    return pd.DataFrame({
+        'shot_id': [f's{i}' for i in range(n)],
+        'ball_speed': [150.0, 120.0, 100.0, 0.0][:n],
+        'club_speed': [100.0, 90.0, 0.0, 80.0][:n],
+        'smash': [None, 1.35, None, None][:n],
+        'face_angle': [2.0, -1.0, 0.5, None][:n],
+        'club_path': [4.0, 1.0, 0.5, 2.0][:n],
+        'impact_x': [3.0, 0.0, None, 1.0][:n],
+        'impact_y': [4.0, 0.0, 2.0, 1.0][:n],
+        'dynamic_loft': [14.0, None, 20.0, 0.0][:n],
+        'attack_angle': [-4.0, -2.0, 1.0, 3.0][:n],
+        'launch_angle': [10.5, 18.0, 16.0, 12.0][:n],
+        'back_spin': [2800.0, 6000.0, 5000.0, 2000.0][:n],
+    })
+
+
+class TestComputeDerivedFeatures(unittest.TestCase):
+
+    def test_formulas(self):
+        features = compute_derived_features(_shots())
+        self.assertEqual(list(features.columns), FEATURE_COLUMNS)
+
+        self.assertAlmostEqual(features['face_to_path'][0], -2.0)
+        self.assertAlmostEqual(features['strike_distance'][0], 5.0)
+        self.assertAlmostEqual(features['smash'][0], 1.5)
+        self.assertAlmostEqual(features['spin_loft'][0], 18.0)
+        self.assertAlmostEqual(features['spin_efficiency'][0], 10.5 / 14.0)
+
+    def test_recorded_smash_is_kept(self):
+        self.assertAlmostEqual(compute_derived_features(_shots())['smash'][1], 1.35)
+
+    def test_missing_inputs_give_nan(self):
+        features = compute_derived_features(_shots())
+        self.assertTrue(math.isnan(features['strike_distance'][2]))
+        self.assertTrue(math.isnan(features['smash'][2]))
+        self.assertTrue(math.isnan(features['face_to_path'][3]))
+        self.assertTrue(math.isnan(features['spin_loft'][1]))
+
+    def test_spin_efficiency_falls_back_to_spin(self):
+        features = compute_derived_features(_shots())
+        self.assertAlmostEqual(features['spin_efficiency'][1], 2500 / 6000)
+        self.assertAlmostEqual(features['spin_efficiency'][3], 1.0)
+
+    def test_matches_scalar_swing_metrics(self):
+        from ml.anomaly_detection import compute_swing_metrics
+        row = _shots().iloc[0]
+        metrics = compute_swing_metrics(
+            club_path=row.club_path, face_angle=row.face_angle,
+            attack_angle=row.attack_angle, dynamic_loft=row.dynamic_loft,
+            impact_x=row.impact_x, impact_y=row.impact_y,
+            ball_speed=row.ball_speed, club_speed=row.club_speed,
+            back_spin=row.back_spin, launch_angle=row.launch_angle,
+        )
+        features = compute_derived_features(_shots()).iloc[0]
+        self.assertAlmostEqual(features['spin_efficiency'], metrics.spin_efficiency)
+        self.assertAlmostEqual(features['strike_distance'], metrics.impact_consistency)
+
+    def test_missing_columns(self):
+        features = compute_derived_features(pd.DataFrame({'ball_speed': [150.0]}))
+        self.assertTrue(features[FEATURE_COLUMNS].drop(columns='spin_efficiency').isna().all().all())
+
+
+class TestFeatureStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'golf.db')
+        with sqlite3.connect(self.db_path) as conn:
+            _shots().to_sql('shots', conn, index=False)
+        self.store = FeatureStore(self.db_path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _stored(self):
+        with sqlite3.connect(self.db_path) as conn:
+            return pd.read_sql_query('SELECT * FROM shot_features ORDER BY shot_id', conn)
+
+    def test_backfill_computes_missing_then_nothing(self):
+        self.assertEqual(self.store.backfill(), 4)
+        stored = self._stored()
+        self.assertEqual(len(stored), 4)
+        self.assertTrue((stored['schema_version'] == FEATURE_SCHEMA_VERSION).all())
+        self.assertAlmostEqual(stored['strike_distance'][0], 5.0)
+        self.assertEqual(self.store.backfill(), 0)
+
+    def test_backfill_recomputes_stale_rows(self):
+        self.store.backfill()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("UPDATE shot_features SET schema_version = 0 WHERE shot_id = 's1'")
+        self.assertEqual(self.store.backfill(), 1)
+
+    def test_backfill_streams_batches(self):
+        with mock.patch.object(self.store, 'store', wraps=self.store.store) as store:
+            self.assertEqual(self.store.backfill(batch_size=3), 4)
+        self.assertEqual([len(c.args[0]) for c in store.call_args_list], [3, 1])
+
+    def test_changed_inputs_are_recomputed(self):
+        self.store.backfill()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("UPDATE shots SET impact_x = 6, impact_y = 8 WHERE shot_id = 's0'")
+        self.assertEqual(self.store.backfill(), 1)
+        self.assertAlmostEqual(self._stored()['strike_distance'][0], 10.0)
+
+        corrected = _shots().assign(face_angle=[5.0, -1.0, 0.5, None])
+        result = self.store.attach(corrected)
+        self.assertAlmostEqual(result['face_to_path'][0], 1.0)
+        self.assertAlmostEqual(self._stored()['face_to_path'][0], -2.0)
+
+    def test_backfill_prunes_deleted_shots(self):
+        self.store.backfill()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM shots WHERE shot_id = 's2'")
+        self.assertEqual(self.store.backfill(), 0)
+        self.assertEqual(list(self._stored()['shot_id']), ['s0', 's1', 's3'])
+
+    def test_missing_database_is_not_created(self):
+        missing = os.path.join(self.tmpdir.name, 'missing.db')
+        result = FeatureStore(missing).attach(_shots())
+        self.assertAlmostEqual(result['strike_distance'][0], 5.0)
+        self.assertFalse(os.path.exists(missing))
+
+    def test_attach_keeps_existing_feature_values(self):
+        self.store.backfill()
+        df = _shots().assign(strike_distance=[7.5, None, None, None])
+        result = self.store.attach(df)
+        self.assertEqual(result['strike_distance'][0], 7.5)
+        self.assertAlmostEqual(result['strike_distance'][1], 0.0)
+
+    def test_attach_reads_stored_features(self):
+        self.store.backfill()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("UPDATE shot_features SET spin_loft = 99 WHERE shot_id = 's0'")
+        result = self.store.attach(_shots())
+        self.assertEqual(result['spin_loft'][0], 99)
+        self.assertAlmostEqual(result['strike_distance'][0], 5.0)
+
+    def test_attach_computes_missing_in_memory(self):
+        df = _shots()
+        result = self.store.attach(df)
+        self.assertNotIn('shot_features', self._tables())
+        expected = compute_derived_features(df)
+        pd.testing.assert_frame_equal(
+            result[FEATURE_COLUMNS].reset_index(drop=True), expected.reset_index(drop=True),
+        )
+
+    def test_attach_recomputes_stale_version(self):
+        self.store.backfill()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("UPDATE shot_features SET spin_loft = 99, schema_version = 0")
+        result = self.store.attach(_shots())
+        self.assertAlmostEqual(result['spin_loft'][0], 18.0)
+        self.assertTrue((self._stored()['schema_version'] == 0).all())
+
+    def test_attach_preserves_order_and_duplicates(self):
+        df = _shots().iloc[[2, 0, 0]].reset_index(drop=True)
+        result = self.store.attach(df)
+        self.assertEqual(list(result['shot_id']), ['s2', 's0', 's0'])
+        self.assertAlmostEqual(result['strike_distance'][1], 5.0)
+        self.assertTrue(np.isnan(result['strike_distance'][0]))
+
+    def test_attach_without_shot_id_computes_in_memory(self):
+        result = self.store.attach(_shots().drop(columns='shot_id'))
+        self.assertAlmostEqual(result['strike_distance'][0], 5.0)
+        self.assertNotIn('shot_features', self._tables())
+
+    def test_attach_large_id_list_scans_table(self):
+        self.store.backfill()
+        with mock.patch.object(feature_store, '_FULL_SCAN_THRESHOLD', 2):
+            result = self.store.attach(_shots())
+        self.assertAlmostEqual(result['strike_distance'][0], 5.0)
+
+    def test_attach_empty_frame(self):
+        result = self.store.attach(pd.DataFrame(columns=['shot_id']))
+        for col in FEATURE_COLUMNS:
+            self.assertIn(col, result.columns)
+
+    def test_missing_feature_columns_are_migrated(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('CREATE TABLE shot_features (shot_id TEXT PRIMARY KEY, '
+                         'schema_version INTEGER NOT NULL, computed_at TEXT, smash REAL)')
+        self.store.backfill()
+        self.assertIn('spin_efficiency', self._stored().columns)
+
+    def _tables(self):
+        with sqlite3.connect(self.db_path) as conn:
+            return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""Tests for GeminiCoach streaming chat and concurrent function calls.
+
+The Gemini API is replaced by a scripted chat session, so no key or
+network access is needed.
+"""
+import json
+import os
+import sys
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# Ensure project root is importable
+_project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+try:
+    import google.generativeai as genai
+    HAS_GENAI = True
+except ImportError:
+    HAS_GENAI = False
+
+_ORIGINAL_GOLF_DB = None
+gemini_coach = None  # Set by setUpModule
+
+
+def setUpModule():
+    global _ORIGINAL_GOLF_DB, gemini_coach
+    if not HAS_GENAI:
+        return
+    _ORIGINAL_GOLF_DB = sys.modules.get("golf_db")
+    sys.modules["golf_db"] = MagicMock(name="golf_db")
+    sys.modules.pop("gemini_coach", None)
+    import gemini_coach as _gemini_coach
+    gemini_coach = _gemini_coach
+
+
+def tearDownModule():
+    if not HAS_GENAI:
+        return
+    if _ORIGINAL_GOLF_DB is None:
+        sys.modules.pop("golf_db", None)
+    else:
+        sys.modules["golf_db"] = _ORIGINAL_GOLF_DB
+    sys.modules.pop("gemini_coach", None)
+
+
+def _chunk(*parts):
+    return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=list(parts)))])
+
+
+def _text(text):
+    return genai.protos.Part(text=text)
+
+
+def _call(name, **args):
+    return genai.protos.Part(function_call=genai.protos.FunctionCall(name=name, args=args))
+
+
+class _ScriptedSession:
+    """Chat session replaying one list of chunks per send_message()."""
+
+    def __init__(self, *turns):
+        self.turns = list(turns)
+        self.sent = []
+        self.options = []
+
+    def send_message(self, message, stream=False, **options):
+        self.sent.append(message)
+        self.options.append(options)
+        return iter(self.turns.pop(0))
+
+
+@unittest.skipUnless(HAS_GENAI, "google-generativeai not installed")
+class TestGeminiChatStream(unittest.TestCase):
+
+    def _coach(self, session):
+        with patch.object(gemini_coach.genai, "configure"), \
+                patch.object(gemini_coach.genai, "GenerativeModel") as model:
+            model.return_value.start_chat.return_value = session
+            return gemini_coach.GeminiCoach(api_key="test-key")
+
+    def test_text_streams_in_chunks(self):
+        coach = self._coach(_ScriptedSession([_chunk(_text("Nice ")), _chunk(_text("swing."))]))
+        events = list(coach.chat_stream("hi"))
+        self.assertEqual([e["text"] for e in events if e["type"] == "text"], ["Nice ", "swing."])
+        done = events[-1]
+        self.assertEqual(done["type"], "done")
+        self.assertEqual(done["response"], "Nice swing.")
+        self.assertLessEqual(done["ttft"], done["latency"])
+
+    def test_function_calls_run_concurrently(self):
+        session = _ScriptedSession(
+            [_chunk(_call("slow_a", n=1), _call("slow_b", n=2))],
+            [_chunk(_text("Done."))],
+        )
+        coach = self._coach(session)
+
+        def slow(name):
+            def fn(n):
+                time.sleep(0.2)
+                return json.dumps({"name": name, "n": n})
+            return fn
+
+        coach.available_functions = {"slow_a": slow("a"), "slow_b": slow("b")}
+        start = time.perf_counter()
+        result = coach.chat("compare")
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual(result["response"], "Done.")
+        self.assertEqual([c["function"] for c in result["function_calls"]], ["slow_a", "slow_b"])
+        self.assertEqual(json.loads(result["function_calls"][1]["result"])["n"], 2)
+        # Both results go back to the model in one message
+        reply = session.sent[1]
+        self.assertEqual([p.function_response.name for p in reply.parts], ["slow_a", "slow_b"])
+
+    def test_unknown_function_reports_error_to_model(self):
+        session = _ScriptedSession([_chunk(_call("nope"))], [_chunk(_text("Sorry."))])
+        result = self._coach(session).chat("hi")
+        self.assertIn("Unknown function", result["function_calls"][0]["result"])
+        self.assertEqual(result["response"], "Sorry.")
+
+    def test_calls_past_round_limit_are_refused_and_answered(self):
+        rounds = [[_chunk(_call("count", n=i))] for i in range(3)]
+        session = _ScriptedSession(*rounds, [_chunk(_text("Enough."))])
+        coach = self._coach(session)
+        coach.MAX_FUNCTION_ROUNDS = 2
+        executed = []
+        coach.available_functions = {"count": lambda n: executed.append(n) or "{}"}
+
+        result = coach.chat("loop")
+        self.assertEqual(executed, [0, 1])
+        self.assertEqual(result["response"], "Enough.")
+        self.assertIn("limit reached", result["function_calls"][2]["result"])
+        # The refused call is still answered, with function calling disabled
+        self.assertEqual(session.sent[3].parts[0].function_response.name, "count")
+        self.assertEqual(session.options[3], {"tool_config": coach.NO_FUNCTION_CALLS})
+        self.assertEqual(session.options[:3], [{}, {}, {}])
+
+    def test_api_error_is_returned(self):
+        session = MagicMock()
+        session.send_message.side_effect = RuntimeError("quota")
+        result = self._coach(session).chat("hi")
+        self.assertEqual(result["error"], "quota")
+        self.assertIn("latency", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
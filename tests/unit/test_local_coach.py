@@ -4,10 +4,12 @@ Unit tests for Local Coach and Local Provider.
 Tests template-based coaching without cloud dependencies.
 """
 
+import re
 import sys
 from pathlib import Path
 
 import unittest
+from unittest.mock import patch
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -83,6 +85,64 @@ class TestLocalCoachResponse(unittest.TestCase):
         self.assertIsNotNone(response.message)
 
 
+@unittest.skipUnless(HAS_DEPS, "pandas not installed")
+class TestLocalCoachIntentRegex(unittest.TestCase):
+    """The combined intent regex must route like one search per pattern."""
+
+    QUERIES = [
+        "How's my driver doing?", "compare my driver and 7 iron", "7i vs 5i",
+        "How consistent am I?", "show my gapping", "analyze my last session",
+        "yardages for each club", "where is my 9 iron gap", "hello",
+    ]
+
+    def _first_match(self, query):
+        for intent, pattern in LocalCoach.INTENT_PATTERNS.items():
+            match = re.search(pattern, query.lower())
+            if match:
+                return intent, next((g for g in match.groups() if g), None)
+        return 'general', None
+
+    def test_matches_pattern_order(self):
+        coach = LocalCoach()
+        for query in self.QUERIES:
+            with self.subTest(query=query):
+                self.assertEqual(coach._detect_intent(query), self._first_match(query))
+
+
+@unittest.skipUnless(HAS_DEPS, "pandas not installed")
+class TestLocalCoachResponseCache(unittest.TestCase):
+    """Repeated questions are answered from the response cache."""
+
+    def setUp(self):
+        self.coach = LocalCoach()
+        self.version = ((1, 100),)
+        patcher = patch.object(LocalCoach, '_data_version', side_effect=lambda: self.version)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_repeat_is_cached(self):
+        with patch.object(self.coach, '_handle_consistency', return_value=CoachResponse("ok")) as handler:
+            self.coach.get_response("How consistent am I?")
+            second = self.coach.get_response("how CONSISTENT am i")
+        self.assertEqual(handler.call_count, 1)
+        self.assertEqual(second.message, "ok")
+        self.assertEqual(self.coach.response_hits, 1)
+
+    def test_data_change_invalidates(self):
+        with patch.object(self.coach, '_handle_consistency', return_value=CoachResponse("ok")) as handler:
+            self.coach.get_response("How consistent am I?")
+            self.version = ((2, 200),)
+            self.coach.get_response("How consistent am I?")
+        self.assertEqual(handler.call_count, 2)
+
+    def test_lru_eviction(self):
+        self.coach.RESPONSE_CACHE_SIZE = 1
+        with patch.object(self.coach, '_handle_club_stats', return_value=CoachResponse("ok")) as handler:
+            for query in ("7 iron", "5 iron", "7 iron"):
+                self.coach.get_response(query)
+        self.assertEqual(handler.call_count, 3)
+
+
 @unittest.skipUnless(HAS_DEPS, "pandas not installed")
 class TestLocalCoachMLProperty(unittest.TestCase):
     """Test ML availability property."""
@@ -127,6 +187,33 @@ class TestLocalProvider(unittest.TestCase):
         self.assertIn('function_calls', result)
         self.assertIsInstance(result['function_calls'], list)
 
+    def test_provider_prompt_is_routed_unchanged(self):
+        """Retrieved session context is not added, so intents route on the question."""
+        from services.ai.providers.local_provider import LocalProvider
+
+        self.assertFalse(getattr(LocalProvider, 'USES_SESSION_CONTEXT', True))
+        provider = LocalProvider()
+        expected = {
+            "show my gapping": 'gapping',
+            "How consistent am I?": 'consistency',
+            "What's my trend?": 'trend_analysis',
+        }
+        with patch.object(provider._coach, 'get_response', wraps=provider._coach.get_response) as get_response:
+            for question, intent in expected.items():
+                provider.chat(question)
+                routed = get_response.call_args.args[0]
+                self.assertEqual(provider._coach._detect_intent(routed)[0], intent)
+
+    def test_reset_conversation_keeps_shared_cache(self):
+        """One conversation's reset does not drop answers shared with others."""
+        from services.ai.providers.local_provider import LocalProvider
+
+        first, second = LocalProvider(), LocalProvider()
+        self.assertIs(first._coach, second._coach)
+        with patch.object(first._coach, 'clear_query_cache') as clear:
+            first.reset_conversation()
+        clear.assert_not_called()
+
     def test_provider_model_name(self):
         """Model name should reflect ML availability."""
         from services.ai.providers.local_provider import LocalProvider
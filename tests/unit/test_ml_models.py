@@ -23,12 +23,14 @@ try:
         ShotShapeClassifier,
         ShotShape,
         classify_shot_shape,
+        classify_shot_shapes,
         ClassificationResult,
     )
     from ml.anomaly_detection import (
         SwingFlawDetector,
         SwingFlaw,
         detect_swing_flaws,
+        detect_swing_flaws_frame,
         compute_swing_metrics,
         FlawDetectionResult,
     )
@@ -36,6 +38,12 @@ try:
 except ImportError:
     HAS_DEPS = False
 
+try:
+    import ml.train_models as train_models
+    HAS_XGB = train_models.HAS_ML_DEPS
+except ImportError:
+    HAS_XGB = False
+
 
 @unittest.skipUnless(HAS_DEPS, "numpy/sklearn not installed")
 class TestShotShapeClassification(unittest.TestCase):
@@ -142,6 +150,49 @@ class TestShotShapeClassifier(unittest.TestCase):
         self.assertEqual(len(shapes), 3)
         self.assertEqual(shapes.iloc[0], 'straight')
 
+    def test_vectorized_rules_match_scalar(self):
+        """classify_shot_shapes should agree with classify_shot_shape row by row."""
+        rows = [
+            (None, None, None, None),
+            (0.0, 0.0, None, None),
+            (-2.0, 1.0, None, 5.0),
+            (-9.0, 0.0, -3000.0, None),
+            (8.0, 0.5, None, None),
+            (-1.0, -4.0, None, None),
+            (1.0, 4.0, 100.0, None),
+            (None, None, -1000.0, None),
+            (None, None, 4000.0, -12.0),
+            (None, 3.0, 150.0, None),
+        ]
+        df = pd.DataFrame(rows, columns=['face_angle', 'club_path', 'side_spin', 'side_distance'])
+        frame = classify_shot_shapes(df.astype(float))
+
+        for i, row in enumerate(rows):
+            expected = classify_shot_shape(*row)
+            self.assertEqual(frame['shape'].iloc[i], expected.shape.value)
+            self.assertAlmostEqual(frame['confidence'].iloc[i], expected.confidence)
+
+    def test_trained_frame_has_probability_columns(self):
+        """Trained classify_frame should match classify and expose class probabilities."""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'face_angle': rng.uniform(-8, 8, 120),
+            'club_path': rng.uniform(-8, 8, 120),
+        })
+        df['shot_shape'] = classify_shot_shapes(df)['shape']
+        self.classifier.train(df)
+
+        frame = self.classifier.classify_frame(df.head(10))
+        prob_cols = [c for c in frame.columns if c.startswith('prob_')]
+        self.assertTrue(prob_cols)
+        np.testing.assert_allclose(frame[prob_cols].sum(axis=1), 1.0)
+        for i in range(10):
+            single = self.classifier.classify(
+                face_angle=df['face_angle'].iloc[i], club_path=df['club_path'].iloc[i]
+            )
+            self.assertEqual(frame['shape'].iloc[i], single.shape.value)
+            self.assertAlmostEqual(frame['confidence'].iloc[i], single.confidence)
+
 
 @unittest.skipUnless(HAS_DEPS, "numpy/sklearn not installed")
 class TestSwingFlawDetection(unittest.TestCase):
@@ -206,6 +257,30 @@ class TestSwingFlawDetection(unittest.TestCase):
         )
         self.assertIn(SwingFlaw.CLUBFACE_CONTROL, result.flaws)
 
+    def test_frame_rules_match_scalar(self):
+        """detect_swing_flaws_frame should agree with detect_swing_flaws row by row."""
+        rows = [
+            {'ball_speed': 165, 'club_speed': 110, 'attack_angle': -1.0, 'club_path': 0.0},
+            {'club_path': -8.0},
+            {'ball_speed': 130, 'club_speed': 100, 'back_spin': 4000},
+            {'ball_speed': 100, 'back_spin': 3500, 'smash': 1.45},
+            {'impact_x': 20.0, 'impact_y': 15.0, 'attack_angle': 10.0},
+            {'impact_x': 20.0, 'attack_angle': -7.0, 'face_angle': -8.0},
+            {'ball_speed': 170, 'club_speed': 110, 'face_angle': 7.0, 'club_path': -9.0},
+            {},
+        ]
+        df = pd.DataFrame(rows, dtype=float)
+        frame = detect_swing_flaws_frame(df)
+
+        for i, row in enumerate(rows):
+            expected = detect_swing_flaws(**row)
+            flagged = [c[len('flaw_'):] for c in frame.columns
+                       if c.startswith('flaw_') and c != 'flaw_count' and frame[c].iloc[i]]
+            self.assertEqual(sorted(flagged),
+                             sorted(f.value for f in expected.flaws if f != SwingFlaw.NONE))
+            self.assertAlmostEqual(frame['anomaly_score'].iloc[i], expected.anomaly_score)
+            self.assertEqual(bool(frame['is_outlier'].iloc[i]), expected.is_outlier)
+
 
 @unittest.skipUnless(HAS_DEPS, "numpy/sklearn not installed")
 class TestSwingMetrics(unittest.TestCase):
@@ -274,6 +349,354 @@ class TestSwingFlawDetector(unittest.TestCase):
         self.assertIn('flaw_counts', analysis)
         self.assertIn('recommendations', analysis)
 
+    def test_fitted_frame_matches_detect(self):
+        """Fitted detect_frame should match per-shot detect with one scoring pass."""
+        rng = np.random.default_rng(0)
+        n = 80
+        df = pd.DataFrame({
+            'ball_speed': rng.normal(150, 10, n),
+            'club_speed': rng.normal(105, 5, n),
+            'attack_angle': rng.normal(-2, 3, n),
+            'club_path': rng.normal(0, 4, n),
+            'face_angle': rng.normal(0, 3, n),
+            'impact_x': rng.normal(0, 8, n),
+            'impact_y': rng.normal(0, 8, n),
+        })
+        df['smash'] = df['ball_speed'] / df['club_speed']
+        self.detector.fit(df)
+
+        frame = self.detector.detect_frame(df)
+        for i in range(0, n, 7):
+            single = self.detector.detect(**df.iloc[i].to_dict())
+            self.assertAlmostEqual(frame['anomaly_score'].iloc[i], single.anomaly_score)
+            self.assertEqual(bool(frame['is_outlier'].iloc[i]), single.is_outlier)
+            self.assertEqual(bool(frame['ml_outlier'].iloc[i]), single.details['ml_outlier'])
+
+
+def _distance_shots(rng, n, start, bias=0.0):
+    df = pd.DataFrame({
+        'ball_speed': rng.normal(150, 10, n),
+        'launch_angle': rng.normal(12, 2, n),
+        'back_spin': rng.normal(2500, 300, n),
+        'club_speed': rng.normal(105, 5, n),
+        'attack_angle': rng.normal(0, 2, n),
+        'dynamic_loft': rng.normal(14, 2, n),
+    })
+    df['carry'] = df['ball_speed'] * 1.6 - df['back_spin'] / 500 + bias + rng.normal(0, 2, n)
+    df['date_added'] = pd.date_range(start, periods=n, freq='min').astype(str)
+    return df
+
+
+@unittest.skipUnless(HAS_DEPS and HAS_XGB, "xgboost not installed")
+class TestIncrementalRetraining(unittest.TestCase):
+    """Test drift-gated incremental retraining of the distance model."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.original_trusted = train_models.TRUSTED_MODEL_DIR
+        train_models.TRUSTED_MODEL_DIR = Path(self.tmpdir.name)
+        self.predictor = train_models.DistancePredictor(Path(self.tmpdir.name) / 'distance.joblib')
+        self.rng = np.random.default_rng(0)
+        self.base = _distance_shots(self.rng, 400, '2025-01-01')
+
+    def tearDown(self):
+        train_models.TRUSTED_MODEL_DIR = self.original_trusted
+        self.tmpdir.cleanup()
+
+    def _retrain(self, df, **kwargs):
+        return train_models.retrain_distance_model(self.predictor, df, **kwargs)
+
+    def test_first_run_builds_full_model_with_watermark(self):
+        result = self._retrain(self.base)
+        self.assertEqual(result.action, 'full')
+        self.assertEqual(result.metadata.data_watermark[:16], '2025-01-01T06:39')
+
+    def test_missing_model_or_too_little_data_is_skipped(self):
+        result = self._retrain(self.base, train_if_missing=False)
+        self.assertEqual((result.action, result.reason), ('skipped', 'no model trained yet'))
+        self.assertFalse(Path(self.predictor.model_path).exists())
+
+        result = self._retrain(self.base.head(20))
+        self.assertEqual(result.action, 'skipped')
+        self.assertIn('Insufficient training data', result.reason)
+
+    def test_skips_without_new_shots_or_drift(self):
+        self._retrain(self.base)
+        self.assertEqual(self._retrain(self.base).action, 'skipped')
+
+        same = pd.concat([self.base, _distance_shots(self.rng, 100, '2025-02-01')])
+        result = self._retrain(same)
+        self.assertEqual(result.action, 'skipped')
+        self.assertFalse(result.drift.drifted)
+
+    def test_drift_triggers_incremental_update(self):
+        self._retrain(self.base)
+        trees_before = self.predictor.model.get_booster().num_boosted_rounds()
+        drifted = pd.concat([self.base, _distance_shots(self.rng, 100, '2025-02-01', bias=15)])
+
+        result = self._retrain(drifted, incremental_rounds=20)
+        self.assertEqual(result.action, 'incremental')
+        self.assertTrue(result.drift.drifted)
+        self.assertLess(result.metadata.metrics['mae'], result.metadata.metrics['holdout_previous_mae'])
+        self.assertEqual(result.metadata.incremental_updates, 1)
+
+        _, saved = train_models.load_model(self.predictor.model_path)
+        self.assertEqual(saved.training_mode, 'incremental')
+        model, _ = train_models.load_model(self.predictor.model_path)
+        self.assertEqual(model.get_booster().num_boosted_rounds(), trees_before + 20)
+
+        # Watermark moved past the new shots
+        self.assertEqual(self._retrain(drifted).action, 'skipped')
+
+    def test_update_is_compared_on_same_holdout(self):
+        self._retrain(self.base)
+        old_model, metadata = self.predictor.model, self.predictor.metadata
+        df_new = _distance_shots(self.rng, 100, '2025-02-01', bias=15)
+
+        _, updated = train_models.continue_training(old_model, metadata, df_new, rounds=10)
+        X, y = train_models.prepare_features(df_new, metadata.target)
+        X_hold = X.reindex(columns=metadata.features, fill_value=0.0).iloc[-20:]
+        expected = np.mean(np.abs(y.iloc[-20:] - old_model.predict(X_hold)))
+        self.assertAlmostEqual(updated.metrics['holdout_previous_mae'], expected, places=4)
+
+    def test_periodic_full_rebuild(self):
+        self._retrain(self.base)
+        drifted = pd.concat([self.base, _distance_shots(self.rng, 100, '2025-02-01', bias=15)])
+        result = self._retrain(drifted, full_rebuild_every=1)
+        self.assertEqual(result.action, 'full')
+        self.assertEqual(result.metadata.incremental_updates, 0)
+
+
+@unittest.skipUnless(HAS_DEPS and HAS_XGB, "xgboost not installed")
+class TestHyperparameterSearch(unittest.TestCase):
+    """Test the distance model hyperparameter search."""
+
+    def setUp(self):
+        from ml.hyperparameter_search import search_hyperparameters
+        self.search = search_hyperparameters
+        self.df = _distance_shots(np.random.default_rng(3), 200, '2025-01-01')
+
+    def test_halving_narrows_candidates(self):
+        result = self.search(self.df, n_trials=6, workers=1, cv_folds=3, min_rounds=20, max_rounds=60)
+        rounds = sorted({t.rounds for t in result.trials})
+        self.assertEqual(rounds, [20, 60])
+        self.assertEqual(len(result.trials), 6 + 2)
+        self.assertEqual(result.best.cv_mae, min(t.cv_mae for t in result.trials if t.rounds == 60))
+        self.assertLessEqual(result.hyperparameters['n_estimators'], 60)
+
+    def test_random_search_is_seeded(self):
+        kwargs = dict(strategy='random', n_trials=3, workers=1, cv_folds=3, max_rounds=40)
+        a = self.search(self.df, **kwargs)
+        b = self.search(self.df, **kwargs)
+        self.assertEqual(a.hyperparameters, b.hyperparameters)
+        self.assertEqual(a.features, b.features)
+        self.assertEqual(len(a.trials), 3)
+
+    def test_winning_configuration_persists_in_metadata(self):
+        result = self.search(self.df, strategy='random', n_trials=2, workers=1, cv_folds=3, max_rounds=40)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            original = train_models.TRUSTED_MODEL_DIR
+            train_models.TRUSTED_MODEL_DIR = Path(tmpdir)
+            try:
+                predictor = train_models.DistancePredictor(Path(tmpdir) / 'distance.joblib')
+                predictor.train(self.df, cross_validate=False, search=result.summary())
+                _, metadata = train_models.load_model(predictor.model_path)
+            finally:
+                train_models.TRUSTED_MODEL_DIR = original
+        self.assertEqual(metadata.search['hyperparameters'], result.hyperparameters)
+        self.assertEqual(metadata.hyperparameters, result.hyperparameters)
+        self.assertEqual(metadata.features, result.features)
+
+    def test_rejects_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            self.search(self.df, strategy='grid')
+
+
+@unittest.skipUnless(HAS_DEPS and HAS_XGB, "xgboost not installed")
+class TestClubModels(unittest.TestCase):
+    """Test per-club distance model shards."""
+
+    def setUp(self):
+        from ml import club_models
+        self.club_models = club_models
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.manifest = Path(self.tmpdir.name) / 'manifest.json'
+        self.original_trusted = train_models.TRUSTED_MODEL_DIR
+        train_models.TRUSTED_MODEL_DIR = Path(self.tmpdir.name)
+
+        rng = np.random.default_rng(1)
+        driver = _distance_shots(rng, 120, '2025-01-01', bias=40)
+        driver['club'] = 'Driver'
+        iron = _distance_shots(rng, 120, '2025-01-01', bias=-40)
+        iron['club'] = '7 Iron'
+        wedge = _distance_shots(rng, 20, '2025-01-01')
+        wedge['club'] = 'SW'
+        self.df = pd.concat([driver, iron, wedge], ignore_index=True)
+
+    def tearDown(self):
+        train_models.TRUSTED_MODEL_DIR = self.original_trusted
+        self.tmpdir.cleanup()
+
+    def _train(self, **kwargs):
+        return self.club_models.train_club_models(
+            self.df, workers=1, manifest_path=self.manifest, **kwargs
+        )
+
+    def test_trains_shards_and_global_fallback(self):
+        outcomes = self._train()
+        self.assertEqual(outcomes['Driver'], 'trained')
+        self.assertEqual(outcomes['7 Iron'], 'trained')
+        self.assertIn('global model', outcomes['SW'])
+        self.assertEqual(outcomes[self.club_models.GLOBAL_SHARD], 'trained')
+
+        predictor = self.club_models.ClubDistancePredictor(self.manifest)
+        self.assertEqual(predictor.clubs, ['7 Iron', 'Driver'])
+        self.assertEqual(predictor.shard_key('SW'), self.club_models.GLOBAL_SHARD)
+
+    def test_shards_load_lazily_and_route_by_club(self):
+        self._train()
+        predictor = self.club_models.ClubDistancePredictor(self.manifest)
+        self.assertEqual(predictor.loaded_shards(), [])
+
+        driver = predictor.predict(club='Driver', ball_speed=150, launch_angle=12, back_spin=2500)
+        self.assertEqual(predictor.loaded_shards(), ['Driver'])
+        iron = predictor.predict(club='7 Iron', ball_speed=150, launch_angle=12, back_spin=2500)
+        self.assertGreater(driver.predicted_value - iron.predicted_value, 50)
+
+        batch = predictor.predict_batch(self.df.head(5).iloc[::-1])
+        self.assertEqual(list(batch.index), [4, 3, 2, 1, 0])
+
+    def test_single_club_retrain_touches_one_shard(self):
+        self._train()
+        manifest = self.club_models.read_manifest(self.manifest)
+        iron_file = Path(self.tmpdir.name) / manifest['shards']['7 Iron']['file']
+        iron_mtime = iron_file.stat().st_mtime_ns
+        global_trained = manifest['shards'][self.club_models.GLOBAL_SHARD]['trained_at']
+
+        self.assertEqual(self._train(clubs=['Driver']), {'Driver': 'trained'})
+        manifest = self.club_models.read_manifest(self.manifest)
+        self.assertEqual(iron_file.stat().st_mtime_ns, iron_mtime)
+        self.assertEqual(manifest['shards'][self.club_models.GLOBAL_SHARD]['trained_at'], global_trained)
+
+    def test_only_changed_picks_clubs_with_new_shots(self):
+        self._train()
+        self.assertEqual(self._train(only_changed=True), {})
+
+        extra = _distance_shots(np.random.default_rng(2), 30, '2025-03-01', bias=-40)
+        extra['club'] = '7 Iron'
+        self.df = pd.concat([self.df, extra], ignore_index=True)
+        self.assertEqual(self._train(only_changed=True), {'7 Iron': 'trained'})
+
+
+@unittest.skipUnless(HAS_DEPS and HAS_XGB, "xgboost not installed")
+class TestFastInference(unittest.TestCase):
+    """Test compiled single-shot inference against the original models."""
+
+    @classmethod
+    def setUpClass(cls):
+        import contextlib
+        import io
+        from ml import fast_inference
+        from ml.synthetic import synthetic_dataset
+        cls.fast_inference = fast_inference
+        cls.shots = synthetic_dataset(400, seed=3)
+
+        cls.predictor = train_models.DistancePredictor()
+        with contextlib.redirect_stdout(io.StringIO()):
+            model, metadata = train_models.train_distance_model(cls.shots, cross_validate=False)
+        cls.predictor.model, cls.predictor.metadata = model, metadata
+        cls.predictor._feature_names = metadata.features
+
+        cls.detector = SwingFlawDetector()
+        cls.detector.fit(cls.shots)
+
+    def test_distance_matches_xgboost(self):
+        fast = self.fast_inference.compile_distance_model(self.predictor)
+        for row in self.shots.head(50).to_dict('records'):
+            kwargs = {k: row[k] for k in self.fast_inference.DISTANCE_INPUTS}
+            expected = self.predictor.predict(**kwargs).predicted_value
+            self.assertAlmostEqual(fast.predict(**kwargs), expected, places=3)
+
+    def test_distance_defaults_and_missing_values(self):
+        fast = self.fast_inference.compile_distance_model(self.predictor)
+        expected = self.predictor.predict(ball_speed=150).predicted_value
+        self.assertAlmostEqual(fast.predict(ball_speed=150), expected, places=3)
+
+        x = np.array([150, np.nan, 2500, 100, 0, 14], dtype=np.float32)
+        dmatrix_pred = float(self.predictor.model.predict(x[None, :])[0])
+        self.assertAlmostEqual(fast.predict_array(x), dmatrix_pred, places=3)
+
+    def test_distance_batch_matches_predict_batch(self):
+        fast = self.fast_inference.compile_distance_model(self.predictor)
+        df = self.shots.head(40)
+        np.testing.assert_allclose(
+            fast.predict_batch(df).to_numpy(), self.predictor.predict_batch(df).to_numpy(), atol=1e-3,
+        )
+
+    def test_flaw_scorer_matches_isolation_forest(self):
+        fast = self.fast_inference.compile_flaw_detector(self.detector)
+        X = self.shots[self.detector._feature_names].head(50)
+        expected = self.detector.model.score_samples(self.detector.scaler.transform(X))
+        actual = [fast.score_array(row) for row in X.to_numpy(dtype=float)]
+        np.testing.assert_allclose(actual, expected, atol=1e-9)
+
+    def test_flaw_detect_matches_detector(self):
+        fast = self.fast_inference.compile_flaw_detector(self.detector)
+        cols = ['ball_speed', 'club_speed', 'attack_angle', 'club_path', 'face_angle', 'impact_x', 'impact_y', 'back_spin']
+        for row in self.shots[cols].head(30).to_dict('records'):
+            expected = self.detector.detect(**row)
+            actual = fast.detect(**row)
+            self.assertEqual(actual.flaws, expected.flaws)
+            self.assertEqual(actual.is_outlier, expected.is_outlier)
+            self.assertAlmostEqual(actual.anomaly_score, expected.anomaly_score, places=9)
+
+    def test_unfitted_detector_cannot_compile(self):
+        with self.assertRaises(ValueError):
+            self.fast_inference.compile_flaw_detector(SwingFlawDetector())
+
+
+@unittest.skipUnless(HAS_DEPS and HAS_XGB, "xgboost not installed")
+class TestBenchmarks(unittest.TestCase):
+    """Test the benchmark harness and report comparison."""
+
+    def test_synthetic_dataset_is_deterministic(self):
+        from ml.synthetic import synthetic_dataset
+        pd.testing.assert_frame_equal(synthetic_dataset(200, seed=1), synthetic_dataset(200, seed=1))
+        self.assertFalse(synthetic_dataset(200, seed=1).equals(synthetic_dataset(200, seed=2)))
+
+    def test_parse_scale(self):
+        from ml.benchmarks import parse_scale
+        self.assertEqual(parse_scale('10k'), 10_000)
+        self.assertEqual(parse_scale('1M'), 1_000_000)
+        self.assertEqual(parse_scale('2500'), 2500)
+
+    def test_small_run_reports_every_operation(self):
+        from ml.benchmarks import SUITES, run_benchmarks
+        report = run_benchmarks(scales=[300], single_calls=5)
+        keys = {r['key'] for r in report['results']}
+        for model in SUITES:
+            for operation in ('fit', 'predict_batch', 'predict_single'):
+                self.assertIn(f'{model}.{operation}@300', keys)
+        single = [r for r in report['results'] if r['operation'] == 'predict_single']
+        self.assertTrue(all(r['p50_us'] > 0 for r in single))
+
+    def test_compare_flags_regressions(self):
+        from ml.benchmarks import compare_reports
+
+        def report(seconds, p50, memory):
+            return {'results': [
+                {'key': 'm.fit@1', 'seconds': seconds, 'p50_us': None, 'peak_memory_mb': memory},
+                {'key': 'm.predict_single@1', 'seconds': 1.0, 'p50_us': p50, 'peak_memory_mb': 0.0},
+            ]}
+
+        rows = compare_reports(report(2.0, 100, 10.0), report(1.0, 110, 12.0))
+        flagged = {(r['key'], r['metric']) for r in rows if r['regression']}
+        self.assertEqual(flagged, {('m.fit@1', 'seconds')})
+
+        # Large ratio on a tiny memory delta is noise
+        rows = compare_reports(report(1.0, 100, 3.0), report(1.0, 100, 1.0))
+        self.assertFalse(any(r['regression'] for r in rows))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,159 @@
+"""Tests for the offline mock provider and the AI coach benchmark helpers.
+
+The mock provider replays scripted tool calls through the real GeminiCoach
+and agent tool code paths; here the tool functions themselves are stubbed
+so no database is needed.
+"""
+import json
+import os
+import sys
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# Ensure project root is importable
+_project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+try:
+    import google.generativeai  # noqa: F401
+    HAS_GENAI = True
+except ImportError:
+    HAS_GENAI = False
+
+_ORIGINAL_GOLF_DB = None
+mock_provider = None  # Set by setUpModule
+benchmark = None
+
+
+def setUpModule():
+    global _ORIGINAL_GOLF_DB, mock_provider, benchmark
+    _ORIGINAL_GOLF_DB = sys.modules.get("golf_db")
+    sys.modules["golf_db"] = MagicMock(name="golf_db")
+    sys.modules.pop("gemini_coach", None)
+    from services.ai.providers import mock_provider as _mock_provider
+    from services.ai import benchmark as _benchmark
+    mock_provider = _mock_provider
+    benchmark = _benchmark
+
+
+def tearDownModule():
+    if _ORIGINAL_GOLF_DB is None:
+        sys.modules.pop("golf_db", None)
+    else:
+        sys.modules["golf_db"] = _ORIGINAL_GOLF_DB
+    sys.modules.pop("gemini_coach", None)
+
+
+def _turn(rounds, reply="Done."):
+    return mock_provider.ScriptedTurn(rounds=rounds, reply=reply)
+
+
+@unittest.skipUnless(HAS_GENAI, "google-generativeai not installed")
+class TestMockProviderGemini(unittest.TestCase):
+
+    def test_scripted_calls_run_coach_functions(self):
+        import gemini_coach
+
+        seen = []
+
+        def gapping(self):
+            time.sleep(0.01)
+            return json.dumps({"gaps": []})
+
+        def sessions(self, limit=20):
+            seen.append(limit)
+            return json.dumps({"count": limit})
+
+        script = [_turn([[("get_club_gapping", {}), ("list_sessions", {"limit": 5})]], "Even gaps.")]
+        with patch.object(gemini_coach.GeminiCoach, "_get_club_gapping", gapping), \
+                patch.object(gemini_coach.GeminiCoach, "_list_sessions", sessions):
+            provider = mock_provider.MockProvider(model_type="gemini", script=script)
+            result = provider.chat("gaps?")
+
+        self.assertEqual(result["response"], "Even gaps.")
+        self.assertEqual([c["function"] for c in result["function_calls"]], ["get_club_gapping", "list_sessions"])
+        # Gemini sends numbers as floats; the coach hands functions ints again
+        self.assertEqual(seen, [5])
+        self.assertIsInstance(seen[0], int)
+        self.assertGreaterEqual(provider.tool_latencies["get_club_gapping"][0], 0.01)
+        self.assertLessEqual(result["ttft"], result["latency"])
+
+    def test_reply_only_turn_streams_text(self):
+        provider = mock_provider.MockProvider(model_type="gemini", script=[_turn([], "Nice swing today.")])
+        events = list(provider.chat_stream("hi"))
+        self.assertEqual("".join(e["text"] for e in events if e["type"] == "text"), "Nice swing today.")
+        self.assertEqual(events[-1]["function_calls"], [])
+
+
+class TestMockProviderClaude(unittest.TestCase):
+
+    def _tools(self):
+        async def club_stats(args):
+            return {"content": [{"type": "text", "text": f"stats for {args.get('club', 'all')}"}]}
+
+        return SimpleNamespace(ALL_TOOLS=[SimpleNamespace(name="get_club_stats", handler=club_stats)])
+
+    def test_rounds_run_agent_handlers(self):
+        script = [_turn([[("get_club_stats", {"club": "Driver"}), ("nope", {})]], "Long and straight.")]
+        provider = mock_provider.MockProvider(model_type="claude", script=script)
+        with patch.dict(sys.modules, {"agent.tools": self._tools()}):
+            result = provider.chat("driver?")
+
+        self.assertEqual(result["response"], "Long and straight.")
+        self.assertEqual(result["function_calls"][0]["result"], "stats for Driver")
+        self.assertIn("Unknown tool", result["function_calls"][1]["result"])
+        self.assertEqual(list(provider.tool_latencies), ["get_club_stats"])
+
+    def test_script_cycles_and_resets(self):
+        provider = mock_provider.MockProvider(model_type="claude", script=[_turn([], "one"), _turn([], "two")])
+        replies = [provider.chat("x")["response"] for _ in range(3)]
+        self.assertEqual(replies, ["one", "two", "one"])
+        provider.reset_conversation()
+        self.assertEqual(provider.chat("x")["response"], "one")
+
+    def test_unknown_shape_rejected(self):
+        with self.assertRaises(ValueError):
+            mock_provider.MockProvider(model_type="gpt")
+
+
+class TestBenchmarkHelpers(unittest.TestCase):
+
+    def test_percentiles(self):
+        stats = benchmark.percentiles([0.001, 0.002, 0.003, 0.010])
+        self.assertEqual(stats["calls"], 4)
+        self.assertAlmostEqual(stats["p50_ms"], 2.5)
+        self.assertAlmostEqual(stats["max_ms"], 10.0)
+        self.assertEqual(benchmark.percentiles([]), {"calls": 0})
+
+    def test_compare_flags_regressions(self):
+        def report(turn_ms, tool_ms):
+            return {"results": [{
+                "key": "claude@1000",
+                "turns": {"p50_ms": turn_ms},
+                "tools": {"get_club_stats": {"p50_ms": tool_ms}},
+            }]}
+
+        rows = benchmark.compare_reports(report(10.0, 30.0), report(10.0, 10.0))
+        flagged = {r["metric"] for r in rows if r["regression"]}
+        self.assertEqual(flagged, {"tool:get_club_stats"})
+
+    @unittest.skipUnless(HAS_GENAI, "google-generativeai not installed")
+    def test_gemini_conversations_name_real_functions(self):
+        import gemini_coach
+
+        coach = gemini_coach.GeminiCoach(model_factory=MagicMock())
+        names = {
+            name
+            for turns in benchmark.CONVERSATIONS["gemini"]
+            for turn in turns
+            for round_calls in turn.rounds
+            for name, _ in round_calls
+        }
+        self.assertLessEqual(names, set(coach.available_functions))
+
+
+if __name__ == "__main__":
+    unittest.main()
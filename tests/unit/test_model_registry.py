@@ -0,0 +1,124 @@
+"""Tests for ml/registry.py."""
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from ml.registry import ModelRegistry
+
+
+class _CountingLoader:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self, path=None):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        payload = Path(path).read_text() if path else "static"
+        return {"payload": payload, "buffer": bytearray(256 * 1024)}
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "model.bin"
+        self.path.write_text("v1")
+        self.registry = ModelRegistry(check_interval=0.0)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_loads_once_and_shares_instance(self):
+        loader = _CountingLoader()
+        self.registry.register("m", loader, path=self.path)
+        first = self.registry.get("m")
+        self.assertIs(self.registry.get("m"), first)
+        self.assertEqual(loader.calls, 1)
+
+    def test_concurrent_first_get_loads_once(self):
+        loader = _CountingLoader(delay=0.05)
+        self.registry.register("m", loader, path=self.path)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.registry.get("m")))
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(loader.calls, 1)
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def test_hot_reload_on_file_change(self):
+        loader = _CountingLoader()
+        self.registry.register("m", loader, path=self.path)
+        self.assertEqual(self.registry.get("m")["payload"], "v1")
+
+        self.path.write_text("v2-longer")
+        later = time.time() + 5
+        os.utime(self.path, (later, later))
+        self.assertEqual(self.registry.get("m")["payload"], "v2-longer")
+        self.assertEqual(loader.calls, 2)
+
+    def test_check_interval_throttles_stat(self):
+        registry = ModelRegistry(check_interval=3600)
+        registry.register("m", _CountingLoader(), path=self.path)
+        registry.get("m")
+        self.path.write_text("v2-longer")
+        self.assertEqual(registry.get("m")["payload"], "v1")
+
+    def test_missing_file_returns_none(self):
+        loader = _CountingLoader()
+        self.registry.register("m", loader, path=Path(self.tmpdir.name) / "absent.bin")
+        self.assertIsNone(self.registry.get("m"))
+        self.assertEqual(loader.calls, 0)
+
+    def test_failed_reload_keeps_previous_instance(self):
+        state = {"fail": False}
+
+        def loader(path):
+            if state["fail"]:
+                raise ValueError("corrupt")
+            return Path(path).read_text()
+
+        self.registry.register("m", loader, path=self.path)
+        self.assertEqual(self.registry.get("m"), "v1")
+        state["fail"] = True
+        self.path.write_text("broken!")
+        self.assertEqual(self.registry.get("m"), "v1")
+
+    def test_stats_report_load_time_and_memory(self):
+        self.registry.register("m", _CountingLoader(), path=self.path,
+                               version=lambda model: model["payload"])
+        self.registry.register("static", _CountingLoader())
+        self.registry.get("m")
+        self.registry.get("m")
+
+        stats = {s.name: s for s in self.registry.stats()}
+        self.assertTrue(stats["m"].loaded)
+        self.assertEqual(stats["m"].version, "v1")
+        self.assertEqual(stats["m"].hits, 2)
+        self.assertGreater(stats["m"].load_time_ms, 0)
+        self.assertGreaterEqual(stats["m"].memory_bytes, 256 * 1024)
+        self.assertFalse(stats["static"].loaded)
+
+    def test_invalidate_forces_reload(self):
+        loader = _CountingLoader()
+        self.registry.register("static", loader)
+        first = self.registry.get("static")
+        self.registry.invalidate("static")
+        self.assertIsNot(self.registry.get("static"), first)
+        self.assertEqual(loader.calls, 2)
+
+    def test_unknown_model_raises(self):
+        with self.assertRaises(KeyError):
+            self.registry.get("nope")
+
+
+if __name__ == "__main__":
+    unittest.main()
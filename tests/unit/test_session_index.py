@@ -0,0 +1,180 @@
+"""Tests for services/session_index.py."""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import unittest
+from datetime import date, timedelta
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.session_index import SessionIndex, tokenize
+
+
+def _session(session_id, day, clubs, face, path, strike, session_type='Practice', tag=None, carry=150.0):
+    rows = []
+    for i, club in enumerate(clubs):
+        rows.append({
+            'shot_id': f'{session_id}-{i}',
+            'session_id': session_id,
+            'session_date': day,
+            'session_type': session_type,
+            'club': club,
+            'shot_tag': tag,
+            'carry': carry + i % 3,
+            'smash': 1.4,
+            'face_angle': face,
+            'club_path': path,
+            'impact_x': strike,
+            'impact_y': 0.0,
+        })
+    return rows
+
+
+def _shots():
+    return pd.DataFrame(
+        # Driver sessions with a fade (face open to path)
+        _session('101', '2026-01-10', ['Driver'] * 8 + ['7 Iron'] * 2, face=2.5, path=-1.0, strike=0.4,
+                 session_type='Driver Focus', carry=240.0)
+        + _session('104', '2025-12-01', ['Driver'] * 7 + ['PW'] * 3, face=2.0, path=-1.5, strike=0.5,
+                   session_type='Driver Focus', carry=235.0)
+        # Wedge warmup, square and centered
+        + _session('102', '2026-01-05', ['PW'] * 5 + ['SW'] * 5, face=0.2, path=0.0, strike=0.1, tag='Warmup',
+                   carry=100.0)
+        # Irons with a draw, struck off-center
+        + _session('103', '2025-11-20', ['7 Iron'] * 9 + ['Driver'], face=-2.0, path=2.0, strike=1.5,
+                   carry=160.0)
+    )
+
+
+class TestTokenize(unittest.TestCase):
+
+    def test_aliases_and_stopwords(self):
+        self.assertEqual(tokenize('How were my Pitching Wedge shots?'), ['pw'])
+        self.assertEqual(tokenize('slicing the driver, off-center'), ['slice', 'driver', 'offcenter'])
+
+
+class TestSessionIndex(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        with sqlite3.connect(self.db_path) as conn:
+            _shots().to_sql('shots', conn, index=False)
+        self.index = SessionIndex(self.db_path)
+
+    def tearDown(self):
+        os.remove(self.db_path)
+
+    def _ids(self, hits):
+        return [hit.session_id for hit in hits]
+
+    def test_club_and_shape_words_rank_sessions(self):
+        self.assertEqual(self._ids(self.index.search('my driver fade', k=2)), ['101', '104'])
+        self.assertEqual(self._ids(self.index.search('how are my wedges', k=1)), ['102'])
+        self.assertEqual(self._ids(self.index.search('7 iron draw', k=1)), ['103'])
+        self.assertEqual(self._ids(self.index.search('warmup', k=1)), ['102'])
+
+    def test_hit_summary(self):
+        hit = self.index.search('driver', k=1)[0]
+        self.assertEqual(hit.date, '2026-01-10')
+        self.assertEqual(hit.session_type, 'Driver Focus')
+        self.assertEqual(hit.shots, 10)
+        self.assertEqual(hit.clubs, {'Driver': 0.8, '7 Iron': 0.2})
+        self.assertAlmostEqual(hit.stats['face_to_path'], 3.5)
+        self.assertIn('fade', hit.labels)
+        self.assertIn('Driver 80%', hit.describe())
+
+    def test_unknown_words_fall_back_to_recent(self):
+        hits = self.index.search('hello there', k=4)
+        self.assertEqual(self._ids(hits), ['101', '102', '104', '103'])
+        self.assertTrue(all(hit.score == 0 for hit in hits))
+
+    def test_window_restricts_candidates(self):
+        hits = self.index.search('driver', k=5, since=date(2026, 1, 1))
+        self.assertEqual(self._ids(hits), ['101', '102'])
+
+    def test_session_id_returns_similar_sessions(self):
+        hits = self.index.search('sessions like #104', k=2)
+        self.assertEqual(self._ids(hits), ['104', '101'])
+        self.assertNotIn('104', self._ids(self.index.similar('104', k=3)))
+
+    def test_context_lines(self):
+        context = self.index.context('driver fade', k=2)
+        lines = context.split('\n')
+        self.assertTrue(lines[0].startswith('Relevant sessions'))
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].startswith('- 101 (2026-01-10, Driver Focus): 10 shots'))
+
+    def test_rebuilds_when_database_changes(self):
+        self.assertEqual(len(self.index), 4)
+        self.assertFalse(self.index.refresh())
+        time.sleep(0.01)
+        with sqlite3.connect(self.db_path) as conn:
+            pd.DataFrame(_session('105', '2026-02-01', ['SW'] * 4, 0.0, 0.0, 0.2)).to_sql(
+                'shots', conn, index=False, if_exists='append')
+        os.utime(self.db_path, (time.time() + 1, time.time() + 1))
+        self.assertEqual(self._ids(self.index.search('hello', k=1)), ['105'])
+
+    def test_rebuild_swaps_a_new_snapshot(self):
+        before = self.index._current()
+        with sqlite3.connect(self.db_path) as conn:
+            pd.DataFrame(_session('105', '2026-02-01', ['SW'] * 4, 0.0, 0.0, 0.2)).to_sql(
+                'shots', conn, index=False, if_exists='append')
+        self.assertTrue(self.index.refresh(force=True))
+        after = self.index._current()
+        self.assertIsNot(before, after)
+        # A query still holding the old build sees it unchanged
+        self.assertEqual(len(before.sessions), 4)
+        self.assertEqual(before.text.shape[0], 4)
+        self.assertEqual(len(after.sessions), 5)
+        self.assertEqual(after.positions['105'], 4)
+
+    def test_empty_and_missing_database(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('DELETE FROM shots')
+        self.index.refresh(force=True)
+        self.assertEqual(self.index.search('driver'), [])
+        self.assertEqual(self.index.context('driver'), '')
+        self.assertEqual(SessionIndex(self.db_path + '.missing').search('driver'), [])
+
+
+class TestSessionIdMentions(unittest.TestCase):
+    """Small integer session ids are only matched when introduced as ids."""
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        recent = (date.today() - timedelta(days=10)).isoformat()
+        with sqlite3.connect(self.db_path) as conn:
+            pd.DataFrame(
+                _session('3', recent, ['PW'] * 6, face=0.0, path=0.0, strike=0.2, carry=100.0)
+                + _session('7', recent, ['Driver'] * 6, face=2.5, path=-1.0, strike=0.5, carry=240.0)
+                + _session('12', recent, ['7 Iron'] * 6, face=-2.0, path=2.0, strike=1.0, carry=160.0)
+            ).to_sql('shots', conn, index=False)
+        self.index = SessionIndex(self.db_path)
+
+    def tearDown(self):
+        os.remove(self.db_path)
+
+    def _top(self, question):
+        hit = self.index.search(question, k=1)[0]
+        return hit.session_id, hit.score
+
+    def test_numbers_in_windows_and_clubs_are_not_ids(self):
+        self.assertEqual(self._top('driver carry over the last 3 months')[0], '7')
+        self.assertEqual(self._top('how is my 7 iron')[0], '12')
+        self.assertNotEqual(self._top('my session 3 weeks ago')[1], 1.0)
+
+    def test_introduced_ids_anchor(self):
+        self.assertEqual(self._top('how did session 3 go'), ('3', 1.0))
+        self.assertEqual(self._top('compare #7 with my irons'), ('7', 1.0))
+        self.assertEqual(self._top('session id 12'), ('12', 1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
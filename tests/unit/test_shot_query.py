@@ -0,0 +1,119 @@
+"""Tests for services/shot_query.py."""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.shot_query import ShotQueryCache, filter_frame, query_shots
+
+
+def _shots():
+    return pd.DataFrame({
+        'shot_id': [f's{i}' for i in range(8)],
+        'session_id': ['1', '1', '1', '2', '2', '2', '3', '3'],
+        'club': ['Driver', '7 Iron', 'driver', 'Driver', 'PW', '7 Iron', 'Driver', 'PW'],
+        'shot_tag': ['Warmup', None, None, 'Practice', None, 'Practice', None, None],
+        'carry': [250.0, 160.0, 245.0, 255.0, 120.0, 165.0, 260.0, 118.0],
+    })
+
+
+class TestQueryShots(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'golf.db')
+        with sqlite3.connect(self.db_path) as conn:
+            _shots().to_sql('shots', conn, index=False)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_filters_match_pandas(self):
+        df = _shots()
+        cases = [
+            {'session_id': '1'},
+            {'club': 'DRIVER'},
+            {'session_id': '2', 'shot_tag': 'Practice'},
+            {'club': '7 Iron', 'columns': ['shot_id', 'carry'], 'limit': 1},
+        ]
+        for filters in cases:
+            with self.subTest(filters=filters):
+                expected = filter_frame(df, **filters).reset_index(drop=True)
+                actual = query_shots(self.db_path, **filters)
+                pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+    def test_limit_and_columns_pushed_down(self):
+        df = query_shots(self.db_path, club='Driver', columns=['carry', 'nope'], limit=2)
+        self.assertEqual(list(df.columns), ['carry'])
+        self.assertEqual(len(df), 2)
+
+    def test_filter_on_missing_column_is_ignored(self):
+        df = query_shots(self.db_path, session_type='Range')
+        self.assertEqual(len(df), 8)
+
+    def test_missing_table_raises(self):
+        empty = os.path.join(self.tmpdir.name, 'empty.db')
+        sqlite3.connect(empty).close()
+        with self.assertRaises(sqlite3.Error):
+            query_shots(empty)
+
+    def test_missing_database_is_not_created(self):
+        missing = os.path.join(self.tmpdir.name, 'missing.db')
+        with self.assertRaises(sqlite3.Error):
+            query_shots(missing)
+        self.assertFalse(os.path.exists(missing))
+
+
+class TestShotQueryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'golf.db')
+        with sqlite3.connect(self.db_path) as conn:
+            _shots().to_sql('shots', conn, index=False)
+        self.query_fn = MagicMock(side_effect=lambda **f: query_shots(self.db_path, **f))
+        self.cache = ShotQueryCache(maxsize=2, query_fn=self.query_fn, db_path=self.db_path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_repeat_query_hits_cache(self):
+        first = self.cache.query_shots(club='PW', columns=['carry'])
+        second = self.cache.query_shots(columns=['carry'], club='PW')
+        self.assertIs(first, second)
+        self.assertEqual(self.query_fn.call_count, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_lru_eviction(self):
+        self.cache.query_shots(session_id='1')
+        self.cache.query_shots(session_id='2')
+        self.cache.query_shots(session_id='1')
+        self.cache.query_shots(session_id='3')  # evicts session 2
+        self.cache.query_shots(session_id='2')
+        self.assertEqual(self.query_fn.call_count, 4)
+
+    def test_database_change_invalidates(self):
+        self.cache.query_shots(club='PW')
+        time.sleep(0.01)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("INSERT INTO shots (shot_id, session_id, club, carry) VALUES ('s9', '4', 'PW', 121)")
+        self.assertEqual(len(self.cache.query_shots(club='PW')), 3)
+        self.assertEqual(self.query_fn.call_count, 2)
+
+    def test_clear(self):
+        self.cache.query_shots(club='PW')
+        self.cache.clear()
+        self.cache.query_shots(club='PW')
+        self.assertEqual(self.query_fn.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+"""Tests for services/stats_cube.py."""
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.stats_cube import (
+    SHOTS_METRIC,
+    QuantileSketch,
+    StatsCube,
+    compute_cells,
+    parse_window,
+)
+
+
+def _shots(seed=0, sessions=6, per_session=40):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for s in range(sessions):
+        for i in range(per_session):
+            club = ['Driver', '7 Iron', 'PW'][i % 3]
+            base = {'Driver': 240, '7 Iron': 155, 'PW': 115}[club]
+            rows.append({
+                'shot_id': f'{s}-{i}',
+                'session_id': str(100 + s),
+                'session_date': f'2025-0{1 + s}-15',
+                'club': club,
+                'carry': float(rng.normal(base, 8)),
+                'ball_speed': float(rng.normal(base * 0.6, 3)),
+                'face_angle': float(rng.normal(0, 2)),
+            })
+    df = pd.DataFrame(rows)
+    df.loc[::17, 'carry'] = 0  # misreads
+    df.loc[::23, 'ball_speed'] = 99999  # sentinel
+    return df
+
+
+def _valid(series):
+    return series[(series != 0) & (series != 99999)].dropna()
+
+
+class TestQuantileSketch(unittest.TestCase):
+
+    def test_quantiles_within_relative_accuracy(self):
+        values = np.random.default_rng(1).lognormal(5, 0.5, 5000)
+        sketch = QuantileSketch(0.01).add(values)
+        for q in (0.1, 0.5, 0.9):
+            exact = np.quantile(values, q)
+            self.assertAlmostEqual(sketch.quantile(q) / exact, 1.0, delta=0.02)
+
+    def test_merge_matches_single_sketch(self):
+        values = np.random.default_rng(2).normal(0, 10, 2000)
+        whole = QuantileSketch().add(values)
+        merged = QuantileSketch().add(values[:700]).merge(QuantileSketch().add(values[700:]))
+        self.assertEqual(merged.count, whole.count)
+        for q in (0.1, 0.5, 0.9):
+            self.assertAlmostEqual(merged.quantile(q), whole.quantile(q))
+
+    def test_json_round_trip(self):
+        sketch = QuantileSketch().add([-3.0, 0.0, 1.5, 2.5, 40.0])
+        restored = QuantileSketch.from_json(sketch.to_json())
+        self.assertEqual(restored.count, 5)
+        self.assertAlmostEqual(restored.quantile(0.5), sketch.quantile(0.5))
+
+    def test_empty_sketch(self):
+        self.assertIsNone(QuantileSketch().quantile(0.5))
+
+
+class TestComputeCells(unittest.TestCase):
+
+    def test_cells_match_pandas(self):
+        df = _shots()
+        cells = compute_cells(df).set_index(['club', 'session_id', 'metric'])
+        for (club, session_id), group in df.groupby(['club', 'session_id']):
+            carry = _valid(group['carry'])
+            cell = cells.loc[(club, session_id, 'carry')]
+            self.assertEqual(cell['n'], len(carry))
+            self.assertAlmostEqual(cell['total'], carry.sum())
+            self.assertAlmostEqual(cell['min'], carry.min())
+            self.assertEqual(cells.loc[(club, session_id, SHOTS_METRIC)]['n'], len(group))
+
+    def test_rows_without_club_are_skipped(self):
+        df = _shots(sessions=1)
+        df.loc[0, 'club'] = None
+        cells = compute_cells(df)
+        self.assertEqual(cells[cells['metric'] == SHOTS_METRIC]['n'].sum(), len(df) - 1)
+
+
+class TestStatsCube(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'golf.db')
+        self.df = _shots()
+        with sqlite3.connect(self.db_path) as conn:
+            self.df.to_sql('shots', conn, index=False)
+        self.cube = StatsCube(self.db_path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_stats_match_pandas(self):
+        table = self.cube.stats(['carry', 'ball_speed'])
+        for club, group in self.df.groupby('club'):
+            for metric in ('carry', 'ball_speed'):
+                values = _valid(group[metric])
+                row = table[(table['club'] == club) & (table['metric'] == metric)].iloc[0]
+                self.assertEqual(row['count'], len(values))
+                self.assertAlmostEqual(row['mean'], values.mean())
+                self.assertAlmostEqual(row['std'], values.std())
+                self.assertAlmostEqual(row['max'], values.max())
+                self.assertAlmostEqual(row['q50'] / values.median(), 1.0, delta=0.02)
+                self.assertEqual(row['sessions'], group['session_id'].nunique())
+
+    def test_zero_is_kept_for_signed_metrics(self):
+        self.df.loc[0, 'face_angle'] = 0.0
+        with sqlite3.connect(self.db_path) as conn:
+            self.df.to_sql('shots', conn, index=False, if_exists='replace')
+        table = self.cube.stats(['face_angle'], by=(), quantiles=None)
+        self.assertEqual(table.iloc[0]['count'], len(self.df))
+
+    def test_filters_and_grouping(self):
+        overall = self.cube.stats(['carry'], by=(), clubs=['driver'], quantiles=None)
+        self.assertEqual(len(overall), 1)
+        driver = _valid(self.df[self.df['club'] == 'Driver']['carry'])
+        self.assertAlmostEqual(overall.iloc[0]['mean'], driver.mean())
+
+        recent = self.cube.stats([SHOTS_METRIC], by=(), since='2025-05-01', quantiles=None)
+        self.assertEqual(recent.iloc[0]['count'], (self.df['session_date'] >= '2025-05-01').sum())
+
+        by_session = self.cube.stats(['carry'], by=('session_id',), quantiles=None)
+        self.assertEqual(list(by_session['session_id']), sorted(self.df['session_id'].unique()))
+
+    def test_incremental_refresh(self):
+        self.cube.refresh()
+        self.assertEqual(self.cube.stale_sessions(), ([], []))
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT INTO shots (shot_id, session_id, session_date, club, carry) "
+                "VALUES ('new', '200', '2025-09-01', 'Driver', 250.0)"
+            )
+            conn.execute("DELETE FROM shots WHERE session_id = '100'")
+        changed, removed = self.cube.stale_sessions()
+        self.assertEqual((changed, removed), (['200'], ['100']))
+
+        self.assertEqual(self.cube.refresh(), 2)
+        sessions = self.cube.stats([SHOTS_METRIC], by=('session_id',), quantiles=None)
+        self.assertNotIn('100', set(sessions['session_id']))
+        self.assertIn('200', set(sessions['session_id']))
+
+    def test_in_place_edits_are_rebuilt(self):
+        self.cube.refresh()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("UPDATE shots SET club = 'RENAMED' WHERE club = 'Driver'")
+            conn.execute("UPDATE shots SET carry = 300.0 WHERE shot_id = '1-1'")
+        changed, removed = self.cube.stale_sessions()
+        self.assertEqual(sorted(changed), sorted(self.df['session_id'].unique()))
+        self.assertEqual(removed, [])
+
+        self.cube.refresh()
+        clubs = set(self.cube.stats(['carry'], by=('club',))['club'])
+        self.assertIn('RENAMED', clubs)
+        self.assertNotIn('Driver', clubs)
+        self.assertEqual(self.cube.stale_sessions(), ([], []))
+
+    def test_unknown_metric_raises(self):
+        with self.assertRaises(ValueError):
+            self.cube.stats(['not_a_metric'])
+
+
+class TestParseWindow(unittest.TestCase):
+
+    def test_phrases(self):
+        today = date(2026, 3, 31)
+        self.assertEqual(parse_window('carry over the last 3 months', today), date(2025, 12, 31))
+        self.assertEqual(parse_window('past week', today), date(2026, 3, 24))
+        self.assertEqual(parse_window('last 10 days please', today), date(2026, 3, 21))
+        self.assertIsNone(parse_window('my driver', today))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""Tests for services/analytics/strike_density.py."""
+import unittest
+
+import numpy as np
+
+from services.analytics.strike_density import (
+    DensityCache,
+    DensityGrid,
+    StrikeDensity,
+    binned_kde,
+    iso_proportion_levels,
+)
+
+
+def _points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(0.0, 0.3, n)
+    y = 0.4 * x + rng.normal(0.0, 0.2, n)
+    return x, y
+
+
+class TestBinnedKde(unittest.TestCase):
+
+    def test_matches_exact_gaussian_kde(self):
+        from scipy.stats import gaussian_kde
+
+        x, y = _points(400)
+        grid = DensityGrid.from_points(x, y, size=120)
+        binned = binned_kde(x, y, grid)
+
+        gx, gy = np.meshgrid(grid.xs, grid.ys)
+        exact = gaussian_kde([x, y])([gx.ravel(), gy.ravel()]).reshape(gx.shape)
+        self.assertLess(np.abs(binned - exact).max() / exact.max(), 0.01)
+
+    def test_integrates_to_about_one(self):
+        x, y = _points(300)
+        grid = DensityGrid.from_points(x, y, size=100, pad_fraction=0.5)
+        density = binned_kde(x, y, grid)
+        self.assertAlmostEqual(density.sum() * grid.dx * grid.dy, 1.0, delta=0.05)
+
+    def test_undefined_for_single_or_degenerate_points(self):
+        grid = DensityGrid(-1, 1, -1, 1, 32)
+        self.assertIsNone(binned_kde([0.1], [0.2], grid))
+        self.assertIsNone(binned_kde([0.1, 0.2, 0.3], [0.5, 0.5, 0.5], grid))
+
+    def test_levels_are_increasing(self):
+        x, y = _points(200)
+        density = binned_kde(x, y, DensityGrid.from_points(x, y, size=64))
+        levels = iso_proportion_levels(density, thresh=0.05, count=20)
+        self.assertTrue(np.all(np.diff(levels) > 0))
+
+
+class TestStrikeDensity(unittest.TestCase):
+
+    def test_incremental_equals_batch(self):
+        x, y = _points(500)
+        grid = DensityGrid.from_points(x, y, size=80)
+
+        engine = StrikeDensity(grid)
+        engine.add(x[:200], y[:200])
+        engine.density()
+        engine.add(x[200:], y[200:])
+
+        np.testing.assert_allclose(engine.density(), binned_kde(x, y, grid), atol=1e-12)
+        self.assertEqual(engine.n, 500)
+
+    def test_ignores_non_finite_points(self):
+        grid = DensityGrid(-1, 1, -1, 1, 32)
+        engine = StrikeDensity(grid)
+        engine.add([0.1, np.nan, 0.3], [0.2, 0.4, np.inf])
+        self.assertEqual(engine.n, 1)
+
+
+class TestDensityCache(unittest.TestCase):
+
+    def test_only_new_shot_ids_are_added(self):
+        cache = DensityCache()
+        grid = DensityGrid(-1, 1, -1, 1, 32)
+        x, y = _points(50)
+
+        first = cache.get("7 Iron", "6mo", x[:30], y[:30], shot_ids=range(30), grid=grid)
+        second = cache.get("7 Iron", "6mo", x, y, shot_ids=range(50), grid=grid)
+        self.assertIs(first, second)
+        self.assertEqual(second.n, 50)
+
+    def test_rebuilds_when_shots_leave_the_window(self):
+        cache = DensityCache()
+        grid = DensityGrid(-1, 1, -1, 1, 32)
+        x, y = _points(50)
+
+        first = cache.get("7 Iron", "6mo", x, y, shot_ids=range(50), grid=grid)
+        second = cache.get("7 Iron", "6mo", x[10:], y[10:], shot_ids=range(10, 50), grid=grid)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.n, 40)
+
+    def test_edited_impact_location_rebuilds(self):
+        cache = DensityCache()
+        grid = DensityGrid(-1, 1, -1, 1, 32)
+        x, y = _points(20)
+
+        first = cache.get("7 Iron", "6mo", x, y, shot_ids=range(20), grid=grid)
+        edited_x = x.copy()
+        edited_x[3] = 0.9
+        second = cache.get("7 Iron", "6mo", edited_x, y, shot_ids=range(20), grid=grid)
+        self.assertIsNot(first, second)
+        np.testing.assert_allclose(second.density(), binned_kde(edited_x, y, grid))
+
+        x[5] = np.nan
+        third = cache.get("7 Iron", "6mo", x, y, shot_ids=range(20), grid=grid)
+        self.assertIs(cache.get("7 Iron", "6mo", x, y, shot_ids=range(20), grid=grid), third)
+
+    def test_without_shot_ids_is_not_cached(self):
+        cache = DensityCache()
+        grid = DensityGrid(-1, 1, -1, 1, 16)
+        x, y = _points(10)
+        first = cache.get("Driver", "all", x, y, grid=grid)
+        second = cache.get("Driver", "all", x[::-1], y[::-1], grid=grid)
+        self.assertIsNot(first, second)
+        self.assertEqual(len(cache), 0)
+
+    def test_keys_are_separate_and_lru_bounded(self):
+        cache = DensityCache(max_entries=2)
+        grid = DensityGrid(-1, 1, -1, 1, 16)
+        x, y = _points(10)
+        for club in ("Driver", "7 Iron", "PW"):
+            cache.get(club, "all", x, y, shot_ids=range(10), grid=grid)
+        self.assertEqual(len(cache), 2)
+        cache.invalidate("PW")
+        self.assertEqual(len(cache), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -20,6 +20,7 @@ from services.sync_service import (
     SyncResult,
     _async_sync_pipeline,
     get_automation_status,
+    update_distance_model,
 )
 
 
@@ -404,6 +405,24 @@ class TestAsyncPipelineLogic(unittest.TestCase):
         self.assertFalse(auth_failed)
 
 
+class TestUpdateDistanceModel(unittest.TestCase):
+    """Tests for the post-sync distance model step."""
+
+    @patch('ml.train_models.retrain_distance_model')
+    def test_reports_retrain_action(self, mock_retrain):
+        mock_retrain.return_value = MagicMock(action='skipped', reason='no drift')
+        errors = []
+        self.assertEqual(update_distance_model(errors), 'skipped: no drift')
+        self.assertEqual(errors, [])
+        mock_retrain.assert_called_once_with(train_if_missing=False)
+
+    @patch('ml.train_models.retrain_distance_model', side_effect=ValueError('boom'))
+    def test_failure_is_a_warning(self, mock_retrain):
+        errors = []
+        self.assertEqual(update_distance_model(errors), 'failed')
+        self.assertIn('Model retrain warning: boom', errors)
+
+
 class TestGetAutomationStatus(unittest.TestCase):
     """Tests for get_automation_status."""
 
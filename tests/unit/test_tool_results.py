@@ -0,0 +1,83 @@
+"""Tests for services/tool_results.py."""
+import json
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.tool_results import encode_json, encode_table
+
+
+def _shots(n=300):
+    rng = np.random.default_rng(0)
+    clubs = np.array(['Driver', '7 Iron', 'PW'])[np.arange(n) % 3]
+    df = pd.DataFrame({
+        'shot_id': [f's{i}' for i in range(n)],
+        'club': clubs,
+        'carry': rng.normal(180, 40, n),
+        'smash': rng.normal(1.4, 0.05, n),
+    })
+    df.loc[df.index == 5, 'carry'] = np.nan
+    return df
+
+
+class TestEncodeTable(unittest.TestCase):
+
+    def test_small_result_is_full_table(self):
+        df = _shots(4)
+        result = encode_table(df, ['club', 'carry', 'nope'])
+        lines = result.text.split('\n')
+        self.assertEqual(lines[0], 'club | carry')
+        self.assertEqual(len(lines), 2 + 4)
+        self.assertEqual(lines[2], f"Driver | {round(df['carry'][0], 1)}")
+        self.assertFalse(result.summarized)
+        self.assertEqual(result.bytes_saved, 0)
+
+    def test_missing_values_render_as_dash(self):
+        result = encode_table(_shots(6), ['shot_id', 'carry'], budget_bytes=None)
+        self.assertIn('s5 | -', result.text)
+
+    def test_over_budget_is_summarized(self):
+        df = _shots()
+        result = encode_table(df, budget_bytes=1500)
+        self.assertTrue(result.summarized)
+        self.assertLessEqual(result.encoded_bytes, 1500)
+        self.assertIn('By club:', result.text)
+        self.assertIn('Percentiles:', result.text)
+        self.assertIn('Sample rows', result.text)
+        self.assertIn('s0 |', result.text)
+        self.assertEqual(result.bytes_saved, result.raw_bytes - result.encoded_bytes)
+
+    def test_empty(self):
+        self.assertEqual(encode_table(pd.DataFrame(), ['club']).text, '(no data)')
+
+
+class TestEncodeJson(unittest.TestCase):
+
+    def test_column_oriented_payload(self):
+        df = _shots(6)
+        result = encode_json(df, ['club', 'carry'])
+        payload = json.loads(result.text)
+        self.assertEqual(payload['count'], 6)
+        self.assertEqual(payload['shots']['columns'], ['club', 'carry'])
+        self.assertEqual(payload['shots']['data'][0], ['Driver', round(df['carry'][0], 2)])
+        self.assertIsNone(payload['shots']['data'][5][1])
+        self.assertGreater(result.bytes_saved, 0)  # vs. to_dict('records')
+
+    def test_over_budget_is_summarized(self):
+        result = encode_json(_shots(), budget_bytes=1200)
+        payload = json.loads(result.text)
+        self.assertLessEqual(len(result.text), 1200)
+        self.assertTrue(payload['summarized'])
+        self.assertEqual(payload['count'], 300)
+        self.assertEqual(len(payload['by_club']['data']), 3)
+        self.assertIn('sample', payload)
+
+
+if __name__ == '__main__':
+    unittest.main()